@@ -0,0 +1,9 @@
+"""Performance benchmarks for honeybee.
+
+Benchmarks are not part of the tests. Run them from the root folder of the repository:
+
+    python -m benchmarks.run --size medium --save  # create or update the baselines
+    python -m benchmarks.run --size medium
+
+See benchmarks/run.py for all the options.
+"""
@@ -0,0 +1,246 @@
+"""Run benchmarks and compare the results against the stored baselines.
+
+Each benchmark runs in a separate process so peak memory is measured for that
+benchmark only.
+
+Usage:
+
+    # run all the benchmarks for medium size and compare them against baselines
+    python -m benchmarks.run --size medium
+    # run two benchmarks and save the results as the new baselines
+    python -m benchmarks.run --size small --only results_load annual_metrics --save
+
+Exit code is 1 if any of the benchmarks is slower or uses more memory than the
+baseline by more than tolerance or if there is no baseline for size. Benchmarks with
+missing dependencies (e.g. ladybug or Radiance for recipe benchmarks) are reported as
+skipped.
+"""
+import argparse
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import traceback
+
+from .suite import BENCHMARKS, SIZES, SkipBenchmark, get_benchmark
+
+try:
+    import resource
+except ImportError:
+    # windows
+    resource = None
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), 'baselines.json')
+
+
+def _max_rss():
+    """Peak resident memory of this process in megabytes."""
+    if not resource:
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in bytes on mac and in kilobytes on linux
+    return rss / 1048576.0 if sys.platform == 'darwin' else rss / 1024.0
+
+
+def run_benchmark(name, size, repeat=3):
+    """Run a benchmark in this process.
+
+    Returns:
+        A dictionary with time (minimum of all the runs in seconds), times, max_rss
+        and rss_increase (in megabytes). Raises SkipBenchmark if a dependency of the
+        benchmark is missing.
+    """
+    folder = tempfile.mkdtemp(prefix='hb_benchmark_')
+    try:
+        func = get_benchmark(name)(SIZES[size], folder)
+        rss_before = _max_rss()
+        times = []
+        for _ in xrange(repeat):
+            start = time.time()
+            func()
+            times.append(time.time() - start)
+        rss_after = _max_rss()
+    finally:
+        shutil.rmtree(folder, ignore_errors=True)
+
+    return {
+        'time': min(times),
+        'times': times,
+        'max_rss': rss_after,
+        'rss_increase': None if rss_after is None else rss_after - rss_before
+    }
+
+
+def run_child(name, size, repeat, output_file):
+    """Run a benchmark in a separate process and return the results."""
+    command = [sys.executable, '-m', 'benchmarks.run', '--child', name,
+               '--size', size, '--repeat', str(repeat), '--output', output_file]
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with open(os.devnull, 'w') as devnull:
+        subprocess.call(command, cwd=root, stdout=devnull)
+
+    try:
+        with open(output_file, 'rb') as inf:
+            return json.load(inf)
+    except (IOError, ValueError):
+        return {'error': 'Benchmark process failed.'}
+
+
+def load_baselines(baseline_file):
+    """Load baselines from file. Returns an empty dictionary if file doesn't exist."""
+    if not os.path.isfile(baseline_file):
+        return {}
+    with open(baseline_file, 'rb') as inf:
+        return json.load(inf)
+
+
+def save_baselines(baseline_file, baselines, size, results):
+    """Save benchmark results as the new baselines for size."""
+    baseline = baselines.setdefault(size, {})
+    for name, result in results.iteritems():
+        if 'error' not in result and 'skipped' not in result:
+            baseline[name] = {'time': result['time'],
+                              'rss_increase': result['rss_increase']}
+    baselines['metadata'] = {
+        'platform': platform.platform(),
+        'python': platform.python_version(),
+        'date': time.strftime('%Y-%m-%d %H:%M')
+    }
+    with open(baseline_file, 'wb') as outf:
+        json.dump(baselines, outf, indent=2, sort_keys=True)
+    return baseline_file
+
+
+def compare(result, baseline, tolerance=0.1):
+    """Compare a result against the baseline.
+
+    Returns:
+        A list of status. Status can be error, skipped, new, slower, faster,
+        more memory or ok.
+    """
+    if 'error' in result:
+        return ['error']
+    if 'skipped' in result:
+        return ['skipped']
+    if not baseline:
+        return ['new']
+
+    status = []
+    if result['time'] > baseline['time'] * (1 + tolerance):
+        status.append('slower')
+    elif result['time'] < baseline['time'] * (1 - tolerance):
+        status.append('faster')
+
+    rss, base_rss = result.get('rss_increase'), baseline.get('rss_increase')
+    # ignore small changes in memory
+    if rss is not None and base_rss is not None and \
+            rss > max(base_rss * (1 + tolerance), base_rss + 1):
+        status.append('more memory')
+
+    return status or ['ok']
+
+
+def report(results, baseline, tolerance=0.1):
+    """Create a table of results and comparison to baseline.
+
+    Returns:
+        report as a string, is_regression
+    """
+    def _mb(value):
+        return '-' if value is None else '%.1f' % value
+
+    lines = ['{:<16}{:>12}{:>12}{:>10}{:>12}  {}'.format(
+        'benchmark', 'time (s)', 'base (s)', 'rss (MB)', 'base (MB)', 'status')]
+    is_regression = False
+    for name, result in results:
+        base = baseline.get(name)
+        status = compare(result, base, tolerance)
+        if 'slower' in status or 'more memory' in status:
+            is_regression = True
+        if 'error' in result:
+            lines.append('{:<16}{:>12}{:>12}{:>10}{:>12}  error: {}'.format(
+                name, '-', '-', '-', '-', result['error'].strip().split('\n')[-1]))
+            continue
+        if 'skipped' in result:
+            lines.append('{:<16}{:>12}{:>12}{:>10}{:>12}  skipped: {}'.format(
+                name, '-', '-', '-', '-', result['skipped']))
+            continue
+        lines.append('{:<16}{:>12.3f}{:>12}{:>10}{:>12}  {}'.format(
+            name, result['time'], '%.3f' % base['time'] if base else '-',
+            _mb(result['rss_increase']), _mb(base['rss_increase']) if base else '-',
+            ', '.join(status)))
+    return '\n'.join(lines), is_regression
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Run honeybee benchmarks.')
+    parser.add_argument('--size', default='small', choices=sorted(SIZES),
+                        help='Size of the synthetic building (default: small).')
+    parser.add_argument('--only', nargs='+', metavar='NAME',
+                        help='Name of benchmarks to run (default: all).')
+    parser.add_argument('--repeat', type=int, default=3,
+                        help='Number of runs for each benchmark (default: 3).')
+    parser.add_argument('--baseline', default=BASELINE_FILE,
+                        help='Path to baselines file.')
+    parser.add_argument('--save', action='store_true',
+                        help='Save the results as the new baselines.')
+    parser.add_argument('--tolerance', type=float, default=0.1,
+                        help='Relative change which is reported (default: 0.1).')
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    parser.add_argument('--output', help=argparse.SUPPRESS)
+    args = parser.parse_args(args)
+
+    if args.child:
+        try:
+            result = run_benchmark(args.child, args.size, args.repeat)
+        except SkipBenchmark as e:
+            result = {'skipped': str(e)}
+        except Exception:
+            result = {'error': traceback.format_exc()}
+        with open(args.output, 'wb') as outf:
+            json.dump(result, outf)
+        return 0
+
+    names = args.only or [name for name, _ in BENCHMARKS]
+    for name in names:
+        get_benchmark(name)
+
+    baselines = load_baselines(args.baseline)
+    if not args.save and not baselines.get(args.size):
+        print('There is no baseline for size {} in {}.\nRun the benchmarks on this '
+              'machine with --save to create the baselines.'
+              .format(args.size, args.baseline))
+        return 1
+
+    results = []
+    handle, output_file = tempfile.mkstemp(suffix='.json')
+    os.close(handle)
+    try:
+        for name in names:
+            print('running {} [{}]...'.format(name, args.size))
+            if os.path.isfile(output_file):
+                os.remove(output_file)
+            results.append((name, run_child(name, args.size, args.repeat,
+                                            output_file)))
+    finally:
+        if os.path.isfile(output_file):
+            os.remove(output_file)
+
+    table, is_regression = report(results, baselines.get(args.size, {}),
+                                  args.tolerance)
+    print('\n' + table)
+
+    if args.save:
+        print('\nsaved baselines to %s' % save_baselines(
+            args.baseline, baselines, args.size, dict(results)))
+        return 0
+
+    return 1 if is_regression else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,206 @@
+"""Benchmark definitions.
+
+Each benchmark is a function that takes the size parameters and a working folder,
+prepares the inputs and returns a function without arguments which will be timed.
+Use benchmark decorator to add a new benchmark to the suite. Raise SkipBenchmark if
+a dependency of the benchmark is not available.
+
+Usage:
+
+    @benchmark('grid_write')
+    def grid_write(params, folder):
+        building = SyntheticBuilding(**params['building'])
+        return lambda: building.analysis_grids[0].write(folder, 'grid.pts')
+"""
+import os
+
+from honeybee import config
+from honeybee.radiance.radfile import RadFile
+from honeybee.radiance.radparser import parse_from_file
+
+from .synthetic import SyntheticBuilding, write_result_matrix
+
+EPW_FILE = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'tests', 'room',
+                        'epws', 'USA_MA_Boston-City.WSO_TMY.epw')
+
+SIZES = {
+    'small': {
+        'building': {'room_count': 2, 'window_count': 1, 'state_count': 2,
+                     'grid_size': 1},
+        'hour_count': 8760
+    },
+    'medium': {
+        'building': {'room_count': 8, 'window_count': 2, 'state_count': 2,
+                     'grid_size': 0.5},
+        'hour_count': 8760
+    },
+    'large': {
+        'building': {'room_count': 40, 'window_count': 4, 'state_count': 3,
+                     'grid_size': 0.5},
+        'hour_count': 8760
+    }
+}
+"""Parameters for synthetic buildings and result matrices."""
+
+BENCHMARKS = []
+"""List of (name, function) for all the benchmarks in order of definition."""
+
+
+class SkipBenchmark(Exception):
+    """Raised by a benchmark if a dependency is missing."""
+    pass
+
+
+def benchmark(name):
+    """Decorator to add a function to the benchmarks."""
+    def register(func):
+        BENCHMARKS.append((name, func))
+        return func
+    return register
+
+
+def get_benchmark(name):
+    """Get a benchmark function by name."""
+    for n, func in BENCHMARKS:
+        if n == name:
+            return func
+    raise ValueError(
+        'Failed to find benchmark: {}. Valid benchmarks are:\n{}'.format(
+            name, ', '.join(n for n, _ in BENCHMARKS)))
+
+
+def write_synthetic_results(building, folder, hour_count=8760):
+    """Write synthetic total and direct result files for a building.
+
+    Files are named as recipe result files (e.g. scene..default.ill and
+    sun..scene..default.ill) and include the values for all the analysis grids.
+
+    Returns:
+        A list of (source, state, total file, direct file).
+    """
+    sources = [('scene', 'default')]
+    for wg in building.window_groups:
+        sources.extend((wg.name, state.name) for state in wg.states)
+
+    results = []
+    for count, (source, state) in enumerate(sources):
+        name = '{}..{}.ill'.format(source, state)
+        total = write_result_matrix(os.path.join(folder, name), building.point_count,
+                                    hour_count, seed=2 * count)
+        direct = write_result_matrix(os.path.join(folder, 'sun..' + name),
+                                     building.point_count, hour_count,
+                                     seed=2 * count + 1, max_value=1000)
+        results.append((source, state, total, direct))
+    return results
+
+
+@benchmark('building')
+def building(params, folder):
+    """Generate the synthetic building and analysis grids."""
+    return lambda: SyntheticBuilding(**params['building'])
+
+
+@benchmark('scene_write')
+def scene_write(params, folder):
+    """Write the scene as opaque and blacked Radiance files."""
+    bldg = SyntheticBuilding(**params['building'])
+    rad_file = RadFile(bldg.surfaces)
+
+    def write():
+        rad_file.write(folder, 'scene.rad', mkdir=True)
+        rad_file.write_geometries_blacked(folder, 'scene_blacked.rad', mkdir=True)
+    return write
+
+
+@benchmark('radparser')
+def radparser(params, folder):
+    """Parse the Radiance file of the scene."""
+    bldg = SyntheticBuilding(**params['building'])
+    rad_file = RadFile(bldg.surfaces).write(folder, 'scene.rad', mkdir=True)
+    return lambda: parse_from_file(rad_file)
+
+
+@benchmark('grid_write')
+def grid_write(params, folder):
+    """Write test points for all the analysis grids."""
+    bldg = SyntheticBuilding(**params['building'])
+
+    def write():
+        for ag in bldg.analysis_grids:
+            ag.write(folder, '%s.pts' % ag.name, mkdir=True)
+    return write
+
+
+@benchmark('results_load')
+def results_load(params, folder):
+    """Load total and direct values for all the sources into analysis grids."""
+    bldg = SyntheticBuilding(**params['building'])
+    hoys = range(params['hour_count'])
+    results = write_synthetic_results(bldg, folder, params['hour_count'])
+
+    def load():
+        for ag in bldg.analysis_grids:
+            ag.unload()
+        for source, state, total, direct in results:
+            start_line = 0
+            for ag in bldg.analysis_grids:
+                ag.set_coupled_values_from_file(
+                    total, direct, hoys, source, state, start_line=start_line,
+                    header=True, check_point_count=False)
+                start_line += len(ag)
+    return load
+
+
+@benchmark('annual_metrics')
+def annual_metrics(params, folder):
+    """Calculate annual metrics for loaded analysis grids."""
+    bldg = SyntheticBuilding(**params['building'])
+    hoys = range(params['hour_count'])
+    for source, state, total, direct in \
+            write_synthetic_results(bldg, folder, params['hour_count']):
+        start_line = 0
+        for ag in bldg.analysis_grids:
+            ag.set_coupled_values_from_file(
+                total, direct, hoys, source, state, start_line=start_line,
+                header=True, check_point_count=False)
+            start_line += len(ag)
+
+    def calculate():
+        for ag in bldg.analysis_grids:
+            ag.annual_metrics()
+    return calculate
+
+
+def _daylight_coeff_recipe(params):
+    """Create a daylight coefficient recipe for a synthetic building."""
+    # the import is here to keep the rest of benchmarks independent from ladybug
+    try:
+        from honeybee.radiance.sky.skymatrix import SkyMatrix
+        from honeybee.radiance.recipe.daylightcoeff.gridbased import \
+            DaylightCoeffGridBased
+    except ImportError as e:
+        raise SkipBenchmark('ladybug is not installed ({}).'.format(e))
+    if not config.radbin_path:
+        raise SkipBenchmark('Radiance is not installed.')
+
+    bldg = SyntheticBuilding(**params['building'])
+    sky = SkyMatrix.from_epw_file(EPW_FILE)
+    return bldg, DaylightCoeffGridBased(sky, bldg.analysis_grids,
+                                        hb_objects=bldg.hb_objects)
+
+
+@benchmark('recipe_write')
+def recipe_write(params, folder):
+    """Write a daylight coefficient recipe."""
+    bldg, recipe = _daylight_coeff_recipe(params)
+    return lambda: recipe.write(folder, 'benchmark')
+
+
+@benchmark('recipe_results')
+def recipe_results(params, folder):
+    """Load results of a daylight coefficient recipe from synthetic result files."""
+    bldg, recipe = _daylight_coeff_recipe(params)
+    results = write_synthetic_results(bldg, folder, len(recipe.result_hoys))
+    recipe._result_files = [total for _, _, total, _ in results]
+    recipe._isCalculated = True
+    return recipe.results
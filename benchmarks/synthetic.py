@@ -0,0 +1,141 @@
+"""Synthetic buildings and result matrices for benchmarks.
+
+Usage:
+
+    building = SyntheticBuilding(room_count=10, window_count=2, state_count=2)
+    print(building.point_count)
+    write_result_matrix('c:/ladybug/total.ill', building.point_count, 8760)
+"""
+import os
+import random
+
+from honeybee.room import Room
+from honeybee.hbdynamicsurface import HBDynamicSurface
+from honeybee.radiance.properties import RadianceProperties
+from honeybee.radiance.material.glass import Glass
+from honeybee.surfaceproperties import SurfaceProperties, SurfaceState
+
+
+class SyntheticBuilding(object):
+    """A row of rooms with window groups on the back wall of each room.
+
+    Attributes:
+        room_count: Number of rooms.
+        window_count: Number of window groups for each room.
+        state_count: Number of states for each window group.
+        grid_size: Grid size for analysis grids. Each room has an analysis grid.
+        width: Width of each room (Default: 4).
+        depth: Depth of each room (Default: 6).
+        height: Height of each room (Default: 3).
+    """
+
+    def __init__(self, room_count=4, window_count=2, state_count=1, grid_size=0.5,
+                 width=4, depth=6, height=3):
+        assert room_count > 0 and window_count >= 0 and state_count > 0, \
+            ValueError('Invalid input for synthetic building.')
+        self.room_count = room_count
+        self.window_count = window_count
+        self.state_count = state_count
+        self.grid_size = grid_size
+        self.rooms = []
+        self.window_groups = []
+        self.analysis_grids = []
+
+        glass = [Glass.by_single_trans_value('glass_%d' % count, 0.6 / (count + 1))
+                 for count in xrange(state_count)]
+
+        for count in xrange(room_count):
+            room = Room(origin=(count * width, 0, 0), width=width, depth=depth,
+                        height=height)
+            room.name = 'room_%d' % count
+            for srf in room.surfaces:
+                srf.name = 'room_%d_%s' % (count, srf.name)
+            self.rooms.append(room)
+
+            grid = room.generate_test_points(grid_size)
+            grid.name = 'room_%d' % count
+            self.analysis_grids.append(grid)
+
+            self.window_groups.extend(
+                self._window_groups(count, count * width, width, height, glass))
+
+    def _window_groups(self, room_id, x, width, height, glass):
+        """Create window groups in the back wall of a room."""
+        if not self.window_count:
+            return []
+        slot = float(width) / self.window_count
+        sill = 0.8
+        top = min(sill + 1.5, height - 0.2)
+        window_groups = []
+        for count in xrange(self.window_count):
+            x0 = x + slot * count + slot * 0.2
+            x1 = x + slot * (count + 1) - slot * 0.2
+            states = [
+                SurfaceState('state_%d' % state_id, SurfaceProperties(
+                    None, RadianceProperties(mat)))
+                for state_id, mat in enumerate(glass[1:], 1)]
+            wg = HBDynamicSurface.from_rad_ep_properties(
+                'room_%d_wg_%d' % (room_id, count),
+                [[(x0, 0, sill), (x1, 0, sill), (x1, 0, top), (x0, 0, top)]],
+                5, True, True, RadianceProperties(glass[0]), states=states)
+            window_groups.append(wg)
+        return window_groups
+
+    @property
+    def hb_objects(self):
+        """Rooms and window groups."""
+        return self.rooms + self.window_groups
+
+    @property
+    def surfaces(self):
+        """All the surfaces in the building."""
+        return [srf for room in self.rooms for srf in room.surfaces] + \
+            self.window_groups
+
+    @property
+    def point_count(self):
+        """Total number of test points."""
+        return sum(len(ag) for ag in self.analysis_grids)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """SyntheticBuilding representation."""
+        return 'SyntheticBuilding: #{} rooms, #{} window groups, #{} points'.format(
+            self.room_count, len(self.window_groups), self.point_count)
+
+
+def write_result_matrix(file_path, point_count, hour_count=8760, seed=0,
+                        max_value=2000, header=True):
+    """Write a synthetic illuminance matrix in Radiance ascii format.
+
+    Values are zero for night hours and random for day hours.
+
+    Args:
+        file_path: Path to output file.
+        point_count: Number of rows.
+        hour_count: Number of columns (Default: 8760).
+        seed: Seed for random values.
+        max_value: Maximum value (Default: 2000).
+        header: Set to False to write the file without the Radiance header.
+
+    Returns:
+        file_path
+    """
+    rnd = random.Random(seed)
+    folder = os.path.dirname(file_path)
+    if folder and not os.path.isdir(folder):
+        os.makedirs(folder)
+    is_day = [8 <= hour % 24 < 18 for hour in xrange(hour_count)]
+    with open(file_path, 'wb') as outf:
+        if header:
+            outf.write('#?RADIANCE\nNROWS={}\nNCOLS={}\nNCOMP=1\nFORMAT=ascii\n\n'
+                       .format(point_count, hour_count))
+        for _ in xrange(point_count):
+            scale = rnd.random() * max_value
+            outf.write('\t'.join(
+                str(int(scale * rnd.random())) if day else '0' for day in is_day))
+            outf.write('\n')
+    return file_path
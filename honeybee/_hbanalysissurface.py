@@ -4,6 +4,7 @@ from hbobject import HBObject
 from surfaceproperties import SurfaceProperties, SurfaceState
 import surfacetype
 import geometryoperation as go
+from vectormath import vectorarray as va
 from surfacetype import Floor, Wall, Window, Ceiling
 from radiance.radfile import RadFile
 from radiance.material.glass import Glass
@@ -57,6 +58,7 @@ class HBAnalysisSurface(HBObject):
                  is_type_set_by_user=False, states=None):
         """Initialize Honeybee Surface."""
         self._childSurfaces = ()
+        self._polyline_cache = None
         self._states = []
         if not name:
             name = util.random_name()
@@ -365,15 +367,9 @@ class HBAnalysisSurface(HBObject):
         as self.points.
         """
         if self.is_relative_system:
-            ptgroups = range(len(self.points))
-            for count, ptGroup in enumerate(self.points):
-                ptgroups[count] = [
-                    (pt[0] + self.origin[0],
-                     pt[1] + self.origin[1],
-                     pt[2] + self.origin[2])
-                    for pt in ptGroup
-                ]
-            return ptgroups
+            origin = tuple(self.origin)
+            return [list(va.to_tuples(va.translate(va.to_array(ptGroup), origin)))
+                    for ptGroup in self.points]
         else:
             return self.points
 
@@ -459,7 +455,7 @@ class HBAnalysisSurface(HBObject):
     @property
     def normals(self):
         """Return surface normals for all faces."""
-        return tuple(go.normal_from_points(pts) for pts in self.points)
+        return go.normals_from_point_groups(self.points)
 
     @property
     def normals_angle_difference(self):
@@ -540,19 +536,34 @@ class HBAnalysisSurface(HBObject):
         if self.is_child_surface or not self.has_child_surfaces:
             vertices = self.absolute_points
         else:
-            # get points for first glass face
-            glass_points = [childSrf.absolute_points[0]
-                            for childSrf in self.children_surfaces]
-
-            face_points = self.absolute_points[0]
-
-            vertices = (AnalsysiSurfacePolyline(face_points, glass_points).polyline,)
+            vertices = (self._polyline(),)
 
         if flipped:
             return tuple(tuple(reversed(pts)) for pts in vertices)
         else:
             return vertices
 
+    def _polyline(self):
+        """Get the single polyline for surface and its fenestrations.
+
+        Bridging the fenestrations is expensive for surfaces with many fenestrations.
+        The polyline is cached and only recalculated if surface points or points of
+        child surfaces has changed.
+        """
+        # get points for first glass face
+        glass_points = tuple(tuple(tuple(pt) for pt in childSrf.absolute_points[0])
+                             for childSrf in self.children_surfaces)
+        face_points = tuple(tuple(pt) for pt in self.absolute_points[0])
+        key = (face_points, glass_points)
+
+        cache = getattr(self, '_polyline_cache', None)
+        if cache and cache[0] == key:
+            return cache[1]
+
+        polyline = tuple(AnalsysiSurfacePolyline(face_points, glass_points).polyline)
+        self._polyline_cache = (key, polyline)
+        return polyline
+
     def to_rad_string(self, mode=1, include_materials=False,
                       flipped=False, blacked=False):
         """Get full radiance file as a string.
@@ -654,7 +665,14 @@ class HBAnalysisSurface(HBObject):
 
 
 class AnalsysiSurfacePolyline(object):
-    """Calculate AnalysisSurfacePolyline for surface with fenestrations."""
+    """Calculate AnalysisSurfacePolyline for surface with fenestrations.
+
+    Fenestrations are bridged one by one starting from the surface. In each step the
+    fenestration with the closest vertex to the last bridged polygon is bridged next.
+    Bounding boxes are used as a lower bound for distances so the vertices of
+    fenestrations which can't be closer than the closest one found so far are never
+    compared.
+    """
 
     __slots__ = ('startIndex', '_ptListA', '_ptListB')
 
@@ -680,20 +698,76 @@ class AnalsysiSurfacePolyline(object):
                          (pt2[1] - pt1[1]) ** 2 +
                          (pt2[2] - pt1[2]) ** 2)
 
-    def __shortest_distance(self, pt_list1, pt_list2):
+    @staticmethod
+    def bounding_box(pts):
+        """Return min and max point of the bounding box for a list of points."""
+        xs, ys, zs = zip(*((pt[0], pt[1], pt[2]) for pt in pts))
+        return (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
+
+    @staticmethod
+    def _box_distance_squared(box1, box2):
+        """Squared distance between two bounding boxes."""
+        d = 0
+        for i in xrange(3):
+            gap = max(box2[0][i] - box1[1][i], box1[0][i] - box2[1][i], 0)
+            d += gap * gap
+        return d
+
+    @staticmethod
+    def __shortest_distance(pt_list1, pt_list2, box2, limit):
+        """Find the closest vertices between two point lists.
+
+        Vertices in pt_list1 which are farther than limit from the bounding box of
+        pt_list2 are skipped. Distances are squared.
+        """
         dist = float('inf')
         xi = None
         yi = None
+        (x0, y0, z0), (x1, y1, z1) = box2
         for xCount, xpt in enumerate(pt_list1):
+            px, py, pz = xpt[0], xpt[1], xpt[2]
+            gx = max(x0 - px, px - x1, 0)
+            gy = max(y0 - py, py - y1, 0)
+            gz = max(z0 - pz, pz - z1, 0)
+            if gx * gx + gy * gy + gz * gz > limit:
+                continue
             for yCount, ypt in enumerate(pt_list2):
-                d = self.distance(xpt, ypt)
+                dx = ypt[0] - px
+                dy = ypt[1] - py
+                dz = ypt[2] - pz
+                d = dx * dx + dy * dy + dz * dz
                 if d < dist:
                     dist, xi, yi = d, xCount, yCount
 
         return dist, xi, yi
 
-    def __add_points(self, source, target):
-        d, si, ti = self.__shortest_distance(source, target)
+    def __closest_target(self, source, targets, boxes):
+        """Find the target with the closest vertex to source.
+
+        Returns the index of the target and the index of the closest vertices in
+        source and target. If two targets are at the same distance the first one in
+        the list will be returned.
+        """
+        source_box = self.bounding_box(source)
+        candidates = sorted(
+            (self._box_distance_squared(source_box, box), count)
+            for count, box in enumerate(boxes))
+
+        best = float('inf')
+        result = None
+        for lower_bound, count in candidates:
+            if lower_bound > best:
+                # the rest of the targets are all farther
+                break
+            d, si, ti = self.__shortest_distance(
+                source, targets[count], boxes[count], best)
+            if d < best or (d == best and count < result[0]):
+                best = d
+                result = count, si, ti
+
+        return result
+
+    def __add_points(self, source, si, ti):
         if self.startIndex < si:
             start = self.startIndex
             end = si
@@ -709,13 +783,15 @@ class AnalsysiSurfacePolyline(object):
 
     def __calculate_polyline(self, source, targets):
         """calculate single polyline for HBSurface with Fenestration."""
-        # sort point groups
-        sorted_targets = sorted(
-            targets, key=lambda target: self.__shortest_distance(source, target)[0])
-
-        self.__add_points(source, sorted_targets[0])
-
-        if len(sorted_targets) > 1:
-            self.__calculate_polyline(sorted_targets[0], sorted_targets[1:])
-        else:
-            self.__add_points(sorted_targets[0], sorted_targets[0])
+        source = list(source)
+        targets = [list(target) for target in targets]
+        boxes = [self.bounding_box(target) for target in targets]
+
+        while targets:
+            count, si, ti = self.__closest_target(source, targets, boxes)
+            self.__add_points(source, si, ti)
+            source = targets.pop(count)
+            boxes.pop(count)
+
+        # close the loop on the last fenestration
+        self.__add_points(source, 0, 0)
@@ -13,6 +13,7 @@ Usage:
 import os
 import sys
 import json
+import subprocess
 
 
 class Folders(object):
@@ -248,6 +249,201 @@ class Folders(object):
                         self.__defaultPath[key] = p.strip()
 
 
+def _user_cache_folder():
+    """Path to honeybee folder in user cache directory."""
+    if os.name == 'nt':
+        folder = os.environ.get('LOCALAPPDATA') or os.path.expanduser('~')
+    elif sys.platform == 'darwin':
+        folder = os.path.expanduser('~/Library/Caches')
+    else:
+        folder = os.environ.get('XDG_CACHE_HOME') or os.path.expanduser('~/.cache')
+    return os.path.join(folder, 'honeybee')
+
+
+class RadianceEnvironment(object):
+    """Radiance executables, version and RAYPATH from a one-time probe.
+
+    The probes are cached in a json file in the user cache folder (e.g.
+    ~/.cache/honeybee/radiance_env.json) with one entry for each pair of Radiance
+    folders. A cached probe is reused as long as PATH and the Radiance folders are not
+    changed. Use radiance_environment function to get the environment for the current
+    configuration instead of initiating this class.
+
+    Attributes:
+        radbin_path: Path to Radiance binaries folder.
+        radlib_path: Path to Radiance libraries folder.
+        executables: A dictionary of executable names and full paths. Names are in
+            lower case and are available both with and without extension.
+        version: Radiance version as a string. Empty if the version couldn't be found.
+        raypath: Value of RAYPATH for Radiance commands.
+        has_radlib: True if radlib_path is an existing folder.
+
+    Usage:
+
+        env = radiance_environment()
+        print(env.version)
+        print(env.executable('rtrace'))
+    """
+
+    cache_file = os.path.join(_user_cache_folder(), 'radiance_env.json')
+
+    def __init__(self, radbin_path, radlib_path, executables=None, version='',
+                 raypath='', has_radlib=False, key=None):
+        self.radbin_path = radbin_path
+        self.radlib_path = radlib_path
+        self.executables = executables or {}
+        self.version = version
+        self.raypath = raypath
+        self.has_radlib = has_radlib
+        self.key = key or self.environment_key(radbin_path, radlib_path)
+
+    @staticmethod
+    def environment_key(radbin_path, radlib_path):
+        """A key to check if a cached probe is still valid.
+
+        The key changes if PATH, RAYPATH or the Radiance folders are changed or if any
+        file is added to or removed from the folders.
+        """
+        def mtime(folder):
+            try:
+                return os.path.getmtime(folder)
+            except (OSError, TypeError):
+                return None
+
+        return [os.environ.get('PATH', ''), os.environ.get('RAYPATH', ''),
+                radbin_path, mtime(radbin_path), radlib_path, mtime(radlib_path)]
+
+    @classmethod
+    def probe(cls, radbin_path, radlib_path):
+        """Find Radiance executables, version and RAYPATH."""
+        executables = {}
+        if radbin_path and os.path.isdir(radbin_path):
+            for name in os.listdir(radbin_path):
+                fp = os.path.join(radbin_path, name)
+                if not os.path.isfile(fp):
+                    continue
+                executables[name.lower()] = fp
+                executables.setdefault(os.path.splitext(name)[0].lower(), fp)
+
+        version = ''
+        rtrace = executables.get('rtrace')
+        if rtrace:
+            try:
+                p = subprocess.Popen([rtrace, '-version'], stdout=subprocess.PIPE,
+                                     stderr=subprocess.STDOUT)
+                version = p.communicate()[0].strip()
+            except OSError:
+                pass
+
+        has_radlib = bool(radlib_path) and os.path.isdir(radlib_path)
+        raypath = os.environ.get('RAYPATH') or (
+            os.pathsep.join(('.', radlib_path)) if has_radlib else '')
+
+        return cls(radbin_path, radlib_path, executables, version, raypath,
+                   has_radlib)
+
+    @staticmethod
+    def _load_cache(cache_file):
+        """Load the dictionary of cached environments from file."""
+        try:
+            with open(cache_file, 'rb') as inf:
+                cache = json.load(inf)
+        except (IOError, ValueError):
+            return {}
+        return cache if isinstance(cache, dict) else {}
+
+    @classmethod
+    def from_cache(cls, radbin_path, radlib_path, cache_file=None):
+        """Load environment from the cache file or probe it if the cache is invalid.
+
+        The new probe will be written to the cache file next to the probes for other
+        Radiance folders.
+        """
+        cache_file = cache_file or cls.cache_file
+        key = cls.environment_key(radbin_path, radlib_path)
+        entry = '{}|{}'.format(radbin_path, radlib_path)
+        try:
+            env = cls.from_json(cls._load_cache(cache_file)[entry])
+        except (KeyError, TypeError):
+            env = None
+
+        if env is None or env.key != key:
+            env = cls.probe(radbin_path, radlib_path)
+            # reload the cache in case another process has updated it
+            cache = cls._load_cache(cache_file)
+            cache[entry] = env.to_json()
+            temp_file = '{}.{}.tmp'.format(cache_file, os.getpid())
+            try:
+                folder = os.path.dirname(cache_file)
+                if folder and not os.path.isdir(folder):
+                    os.makedirs(folder)
+                with open(temp_file, 'wb') as outf:
+                    json.dump(cache, outf)
+                if os.name == 'nt' and os.path.isfile(cache_file):
+                    os.remove(cache_file)
+                os.rename(temp_file, cache_file)
+            except (IOError, OSError):
+                # the folder is not writable. use the probe for this session.
+                pass
+        return env
+
+    @classmethod
+    def from_json(cls, env_json):
+        """Create the environment from a dictionary."""
+        return cls(env_json['radbin_path'], env_json['radlib_path'],
+                   env_json['executables'], env_json['version'],
+                   env_json['raypath'], env_json['has_radlib'], env_json['key'])
+
+    def executable(self, name):
+        """Full path to an executable (e.g. rtrace, rtrace.exe). None if not found."""
+        return self.executables.get(name.lower())
+
+    def has_executable(self, name):
+        """Check if an executable is available."""
+        return name.lower() in self.executables
+
+    def to_json(self):
+        """Return the environment as a dictionary."""
+        return {'radbin_path': self.radbin_path, 'radlib_path': self.radlib_path,
+                'executables': self.executables, 'version': self.version,
+                'raypath': self.raypath, 'has_radlib': self.has_radlib,
+                'key': self.key}
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """RadianceEnvironment representation."""
+        return 'RadianceEnvironment: {} ({})'.format(
+            self.radbin_path, self.version or 'unknown version')
+
+
+_radiance_environments = {}
+
+
+def radiance_environment(radbin=None, radlib=None, refresh=False):
+    """Get the Radiance environment for the current configuration.
+
+    The environment is probed once per session for each Radiance folder and is
+    cached on disk between the sessions.
+
+    Args:
+        radbin: Path to Radiance binaries folder (Default: radbin_path).
+        radlib: Path to Radiance libraries folder (Default: radlib_path).
+        refresh: Set to True to probe the environment again if PATH or the Radiance
+            folders are changed since the last probe.
+    """
+    radbin = radbin_path if radbin is None else radbin
+    radlib = radlib_path if radlib is None else radlib
+    env = _radiance_environments.get((radbin, radlib))
+    if env is None or \
+            (refresh and env.key != RadianceEnvironment.environment_key(radbin, radlib)):
+        env = RadianceEnvironment.from_cache(radbin, radlib)
+        _radiance_environments[(radbin, radlib)] = env
+    return env
+
+
 f = Folders(mute=False)
 
 radlib_path = f.radlib_path
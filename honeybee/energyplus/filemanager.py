@@ -1,8 +1,57 @@
 """A collection of auxiliary funtions for working with radiance files and objects."""
-import re
+from ..hbzone import HBZone
+from ..hbsurface import HBSurface
+from ..hbfensurface import HBFenSurface
+from .geometryrules import GlobalGeometryRules
+
+from collections import OrderedDict
 import os
 
 
+def iter_energy_plus_objects(stream, object_types=None, offset=0):
+    """Yield EnergyPlus objects from a stream one by one.
+
+    The stream is read line by line in a single pass. Comments [!] are removed and
+    objects which span several lines or share a line are handled.
+
+    Args:
+        stream: An iterable of lines (e.g. an open file or a list of strings).
+        object_types: An optional list of lower case object types. If provided only
+            the objects of these types will be yielded.
+        offset: Offset of the first line in the file. Use this input if the stream
+            doesn't start from the beginning of the file.
+
+    Returns:
+        A generator of (offset, fields) for each object. offset is the position of the
+        object in the file and fields is the list of stripped fields. The first field is
+        the object type.
+    """
+    if object_types is not None:
+        object_types = set(object_types)
+    start = None
+    buffer = []
+    for line in stream:
+        parts = line.split('!', 1)[0].split(';')
+        last = len(parts) - 1
+        column = 0
+        for count, part in enumerate(parts):
+            if start is None:
+                stripped = part.lstrip()
+                if stripped:
+                    start = offset + column + len(part) - len(stripped)
+            if start is not None:
+                buffer.append(part)
+                if count != last:
+                    # end of object
+                    fields = [f.strip() for f in ''.join(buffer).split(',')]
+                    if object_types is None or fields[0].lower() in object_types:
+                        yield start, fields
+                    start = None
+                    buffer = []
+            column += len(part) + 1
+        offset += len(line)
+
+
 def get_energy_plus_objects_from_string(ep_file_string):
     """
     Parse idf file string.
@@ -13,6 +62,11 @@ def get_energy_plus_objects_from_string(ep_file_string):
     Returns:
         A list of strings. Each string represents a differnt Radiance Object
     """
+    return _collect_energy_plus_objects(ep_file_string.splitlines(True))
+
+
+def _collect_energy_plus_objects(stream):
+    """Collect zones, surfaces, materials, constructions and schedules from a stream."""
     _epObjects = {"zone": {}, "buildingsurface:detailed": {},
                   "fenestrationsurface:detailed": {}, "material": {},
                   "windowmaterial": {}, "construction": {}, "schedule": {},
@@ -20,26 +74,14 @@ def get_energy_plus_objects_from_string(ep_file_string):
                   "shading:site:detailed": {}, "shading:building:detailed": {},
                   "shading:zone:detailed": {}}
 
-    raw_ep_objects = re.findall(
-        r'.[^;]*;.*[^$]',
-        "\n" + ep_file_string + "\n",
-        re.MULTILINE)
-
-    for obj in raw_ep_objects:
-        # seperate each segment of EnergyPlus object
-        segments = [seg.split("!")[0]
-                    for seg in re.findall(r'.+[,|;]', obj, re.MULTILINE)]
-
-        # clean the objects and join them into a single comma separated string
-        segments = "".join(segments).replace("\t", "").replace(" ", "")[:-1].split(",")
-
-        # first segment is the type and the second one is the name
-        # for now we're just collecting zones, surfaces, materials, constructions
-        # and schedules. We should later use EnergyPlus.idd file to collect all
-        # the objects.
+    # for now we're just collecting zones, surfaces, materials, constructions
+    # and schedules. We should later use EnergyPlus.idd file to collect all
+    # the objects.
+    for _, fields in iter_energy_plus_objects(stream, _epObjects):
+        segments = [f.replace("\t", "").replace(" ", "") for f in fields]
         try:
             _epObjects[segments[0].lower()][segments[1]] = segments
-        except KeyError:
+        except IndexError:
             pass
 
     return _epObjects
@@ -65,7 +107,162 @@ def get_energy_plus_objects_from_file(ep_file_path):
         raise ValueError("Can't find %s." % ep_file_path)
 
     with open(ep_file_path, "r") as epFile:
-        return get_energy_plus_objects_from_string("".join(epFile.readlines()))
+        return _collect_energy_plus_objects(epFile)
+
+
+class EnergyPlusFileIndex(object):
+    """An index of objects in an EnergyPlus file.
+
+    The file is read once to find the position of every object. Objects are only
+    parsed when they are requested.
+
+    Args:
+        file_path: Path to an EnergyPlus idf file.
+
+    Usage:
+
+        idf = EnergyPlusFileIndex('c:/ladybug/5ZoneAirCooled.idf')
+        print(idf.names('zone'))
+        print(idf.get_ep_string('zone', 'SPACE1-1'))
+        zones = idf.hb_zones()
+    """
+
+    def __init__(self, file_path):
+        """Create an index for an EnergyPlus file."""
+        if not os.path.isfile(file_path):
+            raise ValueError("Can't find %s." % file_path)
+        self._file_path = file_path
+        self._index = {}
+        self._build_index()
+
+    @property
+    def file_path(self):
+        """Path to EnergyPlus file."""
+        return self._file_path
+
+    @property
+    def index(self):
+        """Index as a dictionary {object_type: {name: offset}}.
+
+        object types are lower case.
+        """
+        return self._index
+
+    @property
+    def object_types(self):
+        """List of object types in file."""
+        return tuple(self._index.keys())
+
+    def _build_index(self):
+        # read the file in binary mode so the offsets match the position in file
+        with open(self.file_path, 'rb') as inf:
+            for offset, fields in iter_energy_plus_objects(inf):
+                name = fields[1] if len(fields) > 1 else ''
+                self._index.setdefault(fields[0].lower(), OrderedDict())[name] = offset
+
+    def names(self, object_type):
+        """Get names of objects for an object type in the order of the file."""
+        try:
+            return tuple(self._index[object_type.lower()].keys())
+        except KeyError:
+            return ()
+
+    def count(self, object_type):
+        """Number of objects for an object type."""
+        return len(self._index.get(object_type.lower(), ()))
+
+    def get_object(self, object_type, name):
+        """Load an object from file.
+
+        Returns:
+            A list of fields. The first field is the object type.
+        """
+        try:
+            offset = self._index[object_type.lower()][name]
+        except KeyError:
+            raise ValueError(
+                'Failed to find {}: {} in {}.'.format(object_type, name, self.file_path))
+
+        with open(self.file_path, 'rb') as inf:
+            inf.seek(offset)
+            for _, fields in iter_energy_plus_objects(inf, offset=offset):
+                return fields
+
+    def get_ep_string(self, object_type, name):
+        """Load an object from file as an EnergyPlus string."""
+        return ','.join(self.get_object(object_type, name)) + ';'
+
+    def iter_objects(self, object_types):
+        """Yield fields for all the objects of input types in a single pass.
+
+        Args:
+            object_types: A list of object types.
+        """
+        object_types = [ot.lower() for ot in object_types]
+        if not any(ot in self._index for ot in object_types):
+            return
+        with open(self.file_path, 'rb') as inf:
+            for _, fields in iter_energy_plus_objects(inf, object_types):
+                yield fields
+
+    def geometry_rules(self):
+        """Get GlobalGeometryRules from file."""
+        for fields in self.iter_objects(('globalgeometryrules',)):
+            return GlobalGeometryRules(*(f for f in fields[1:4] if f))
+        return GlobalGeometryRules()
+
+    def hb_zones(self):
+        """Create HBZones with surfaces, fenestration surfaces from file.
+
+        All the zones and surfaces are created from a single pass through the file.
+        Surfaces and fenestration surfaces can be listed before their parents.
+
+        Returns:
+            A list of HBZones.
+        """
+        geometry_rules = self.geometry_rules()
+        zones = OrderedDict()
+        surfaces = {}
+        # surfaces and fenestration surfaces that are listed before their parent
+        orphan_surfaces = []
+        orphan_fen_surfaces = []
+        for fields in self.iter_objects(('zone', 'buildingsurface:detailed',
+                                         'fenestrationsurface:detailed')):
+            object_type = fields[0].lower()
+            ep_string = ','.join(fields) + ';'
+            if object_type == 'zone':
+                zone = HBZone.from_ep_string(ep_string, geometry_rules)
+                zones[zone.name] = zone
+            elif object_type == 'buildingsurface:detailed':
+                srf = HBSurface.from_ep_string(ep_string)
+                surfaces[srf.name] = srf
+                zone_name = fields[4].replace(' ', '')
+                try:
+                    zones[zone_name].add_surface(srf)
+                except KeyError:
+                    orphan_surfaces.append((zone_name, srf))
+            else:
+                fen_srf = HBFenSurface.from_ep_string(ep_string)
+                parent_name = fields[4].replace(' ', '')
+                try:
+                    surfaces[parent_name].add_fenestration_surface(fen_srf)
+                except KeyError:
+                    orphan_fen_surfaces.append((parent_name, fen_srf))
+
+        for parent_name, fen_srf in orphan_fen_surfaces:
+            try:
+                surfaces[parent_name].add_fenestration_surface(fen_srf)
+            except KeyError:
+                print('Failed to find surface {} for {}.'.format(
+                    parent_name, fen_srf.name))
+
+        for zone_name, srf in orphan_surfaces:
+            try:
+                zones[zone_name].add_surface(srf)
+            except KeyError:
+                print('Failed to find zone {} for {}.'.format(zone_name, srf.name))
+
+        return zones.values()
 
 
 if __name__ == "__main__":
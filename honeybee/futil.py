@@ -32,6 +32,29 @@ def get_radiance_path_lines():
         return ""
 
 
+def missing_files(file_paths):
+    """Return the files and folders in file_paths that don't exist.
+
+    Each folder is listed only once which is much faster than checking a large number
+    of files one by one.
+    """
+    listings = {}
+    missing = []
+    for fp in file_paths:
+        folder, name = os.path.split(os.path.abspath(str(fp)))
+        if folder not in listings:
+            try:
+                names = os.listdir(folder)
+            except OSError:
+                names = ()
+            if os.name == 'nt':
+                names = (n.lower() for n in names)
+            listings[folder] = set(names)
+        if (name.lower() if os.name == 'nt' else name) not in listings[folder]:
+            missing.append(fp)
+    return missing
+
+
 def preparedir(target_dir, remove_content=True):
     """Prepare a folder for analysis.
 
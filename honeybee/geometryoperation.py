@@ -1,5 +1,6 @@
 """Collection of methods for geometrical operations."""
 from vectormath.euclid import math, Vector3
+from vectormath import vectorarray
 
 
 def strip_point_list(pts):
@@ -50,6 +51,21 @@ def normal_from_points(pts):
         return tuple(v1.cross(v2).normalize())
 
 
+def normals_from_point_groups(point_groups):
+    """Calculate normal vectors for a list of point groups.
+
+    This is the batched version of normal_from_points and returns a list of normal
+    vectors as tuples. One for each group of points.
+    """
+    vertices = vectorarray.to_array(pt for pts in point_groups for pt in pts)
+    offsets = [0]
+    for pts in point_groups:
+        if len(pts) < 3:
+            raise ValueError('Length of input points should be 3!')
+        offsets.append(offsets[-1] + len(pts))
+    return vectorarray.to_tuples(vectorarray.polygon_normals(vertices, offsets))
+
+
 def up_vector_from_points(pts):
     """Calculate up vector for a surface from points."""
     x_axis = Vector3(pts[1][0] - pts[0][0],
@@ -0,0 +1,515 @@
+"""Array-backed collection of Honeybee surfaces.
+
+HBSurfaceCollection keeps the geometry of a whole model in a few flat arrays instead of
+one Python object per surface. Normals, areas and surface types are calculated for all
+the surfaces in a single loop and each surface is accessible as a lightweight
+HBSurfaceView which can be used in place of an HBSurface for writing Radiance files
+(e.g. RadFile(collection) or as input for recipes).
+"""
+import surfacetype
+from hbsurface import HBSurface
+from array import array
+import math
+import os
+
+
+class HBSurfaceCollection(object):
+    """A collection of planar surfaces stored in contiguous arrays.
+
+    Attributes:
+        vertices: Flat array of vertex coordinates (x0, y0, z0, x1, y1, z1, ...).
+        face_offsets: Index of the first vertex for each surface. The last item is the
+            total number of vertices. Vertices for surface i are between
+            face_offsets[i] and face_offsets[i + 1].
+        normals: Flat array of unit normal vectors (nx0, ny0, nz0, nx1, ...).
+        areas: Array of surface areas.
+        surface_type_keys: Array of surface type keys (e.g. 0.0 for Wall).
+        material_ids: Index of surface material in materials. -1 means the default
+            material for surface type.
+        materials: List of unique Radiance materials.
+
+    Usage:
+
+        collection = HBSurfaceCollection()
+        collection.add_surface('floor', ((0, 0, 0), (0, 10, 0), (10, 10, 0), (10, 0, 0)))
+        collection.add_surface('wall', ((0, 0, 0), (10, 0, 0), (10, 0, 3), (0, 0, 3)))
+        print(collection[1].surface_type)
+        > Surface Type: Wall
+        RadFile(collection).write('c:/ladybug/test', 'model.rad')
+    """
+
+    __slots__ = ('_names', '_vertices', '_face_offsets', '_type_keys', '_is_type_set',
+                 '_material_ids', '_materials', '_material_index', '_normals',
+                 '_areas', '_calculated_count', '_name_index')
+
+    def __init__(self):
+        """Create an empty collection."""
+        self._names = []
+        self._name_index = {}
+        self._vertices = array('d')
+        self._face_offsets = array('l', (0,))
+        self._type_keys = array('d')
+        self._is_type_set = array('b')
+        self._material_ids = array('l')
+        self._materials = []
+        self._material_index = {}
+        # calculated values
+        self._normals = array('d')
+        self._areas = array('d')
+        self._calculated_count = 0
+
+    @classmethod
+    def from_hb_surfaces(cls, hb_surfaces, include_children=True):
+        """Create a collection from a list of HBSurfaces.
+
+        Non-planar surfaces with several point groups will be added as separate
+        surfaces and named the same way as RadFile names them (e.g. name_0, name_1).
+
+        Args:
+            hb_surfaces: A list of HBSurfaces.
+            include_children: Set to False to ignore child surfaces (Default: True).
+        """
+        collection = cls()
+        for srf in hb_surfaces:
+            srfs = [srf]
+            if include_children and srf.has_child_surfaces:
+                srfs.extend(srf.children_surfaces)
+            for s in srfs:
+                type_key = s.surface_type.typeId
+                points = s.points
+                if len(points) == 1:
+                    collection.add_surface(s.name, points[0], type_key,
+                                           s.radiance_material)
+                    continue
+                for count, pts in enumerate(points):
+                    collection.add_surface('{}_{}'.format(s.name, count), pts,
+                                           type_key, s.radiance_material)
+        return collection
+
+    @property
+    def isHBSurfaceCollection(self):
+        """Return True for HBSurfaceCollection."""
+        return True
+
+    @property
+    def vertices(self):
+        """Flat array of vertex coordinates."""
+        return self._vertices
+
+    @property
+    def face_offsets(self):
+        """Index of the first vertex for each surface."""
+        return self._face_offsets
+
+    @property
+    def names(self):
+        """List of surface names."""
+        return self._names
+
+    @property
+    def materials(self):
+        """List of unique Radiance materials."""
+        return self._materials
+
+    @property
+    def material_ids(self):
+        """Index of material for each surface. -1 is the default material."""
+        return self._material_ids
+
+    @property
+    def normals(self):
+        """Flat array of surface unit normals."""
+        self.calculate()
+        return self._normals
+
+    @property
+    def areas(self):
+        """Array of surface areas."""
+        self.calculate()
+        return self._areas
+
+    @property
+    def surface_type_keys(self):
+        """Array of surface type keys."""
+        self.calculate()
+        return self._type_keys
+
+    @property
+    def total_area(self):
+        """Total area of all the surfaces."""
+        return sum(self.areas)
+
+    def _material_id(self, material):
+        """Get index for a material. Add the material to materials if it is new."""
+        if material is None:
+            return -1
+        assert hasattr(material, 'isRadianceMaterial'), \
+            '{} is not a valid Radiance material.'.format(material)
+        key = material.name
+        try:
+            mat_id = self._material_index[key]
+        except KeyError:
+            mat_id = len(self._materials)
+            self._materials.append(material)
+            self._material_index[key] = mat_id
+        else:
+            # material names must be unique in a Radiance scene
+            if self._materials[mat_id] is not material and \
+                    self._materials[mat_id].to_rad_string() != material.to_rad_string():
+                raise ValueError(
+                    'Found two different materials with the same name: {}'.format(key))
+        return mat_id
+
+    def add_surface(self, name, points, surface_type=None, material=None):
+        """Add a planar surface to collection.
+
+        Args:
+            name: A unique name for surface.
+            points: A list of 3 or more points as (x, y, z). Points should be sorted.
+            surface_type: Optional surface type key or SurfaceType. If None the type
+                will be assigned based on surface normal.
+            material: Optional Radiance material. If None the default material for
+                surface type will be used.
+
+        Returns:
+            Index of the new surface.
+        """
+        assert name not in self._name_index, \
+            'Duplicate surface name: {}'.format(name)
+        assert len(points) > 2, \
+            'Surface {} has less than 3 points.'.format(name)
+
+        if surface_type is None:
+            type_key, is_type_set = -1, 0
+        else:
+            type_key = getattr(surface_type, 'typeId', surface_type)
+            try:
+                surfacetype.SurfaceTypes.get_type_by_key(type_key)
+            except KeyError:
+                raise ValueError('%s is not a valid surface type.' % surface_type)
+            is_type_set = 1
+
+        vertices = self._vertices
+        for pt in points:
+            vertices.extend((pt[0], pt[1], pt[2]))
+
+        index = len(self._names)
+        self._names.append(name)
+        self._name_index[name] = index
+        self._face_offsets.append(self._face_offsets[-1] + len(points))
+        self._type_keys.append(type_key)
+        self._is_type_set.append(is_type_set)
+        self._material_ids.append(self._material_id(material))
+        return index
+
+    def add_surfaces(self, names, point_groups, surface_types=None, materials=None):
+        """Add several surfaces to collection.
+
+        Args:
+            names: A list of unique names.
+            point_groups: A list of point lists. One for each name.
+            surface_types: Optional list of surface types.
+            materials: Optional list of Radiance materials.
+        """
+        count = len(names)
+        assert len(point_groups) == count, \
+            'Length of names [%d] and point groups [%d] must be the same.' % (
+                count, len(point_groups))
+        surface_types = surface_types or [None] * count
+        materials = materials or [None] * count
+        for name, pts, st, mat in zip(names, point_groups, surface_types, materials):
+            self.add_surface(name, pts, st, mat)
+
+    def calculate(self):
+        """Calculate normals, areas and surface types for new surfaces.
+
+        Normals and areas are calculated using Newell's method which also works for
+        non-convex polygons. Values are only calculated for surfaces which are added
+        after the last calculation.
+        """
+        start = self._calculated_count
+        end = len(self._names)
+        if start == end:
+            return
+
+        vt = self._vertices
+        offsets = self._face_offsets
+        normals = self._normals
+        areas = self._areas
+        type_keys = self._type_keys
+        is_type_set = self._is_type_set
+        base_type = surfacetype.SurfaceTypes.get_base_type_by_normal_angle
+        sqrt = math.sqrt
+        acos = math.acos
+        degrees = math.degrees
+
+        for i in xrange(start, end):
+            st = offsets[i] * 3
+            en = offsets[i + 1] * 3
+            nx = ny = nz = 0.0
+            x1, y1, z1 = vt[en - 3], vt[en - 2], vt[en - 1]
+            for j in xrange(st, en, 3):
+                x2, y2, z2 = vt[j], vt[j + 1], vt[j + 2]
+                nx += (y1 - y2) * (z1 + z2)
+                ny += (z1 - z2) * (x1 + x2)
+                nz += (x1 - x2) * (y1 + y2)
+                x1, y1, z1 = x2, y2, z2
+            length = sqrt(nx * nx + ny * ny + nz * nz)
+            if length == 0:
+                raise ValueError(
+                    'Surface {} has zero area.'.format(self._names[i]))
+            nx, ny, nz = nx / length, ny / length, nz / length
+            normals.extend((nx, ny, nz))
+            areas.append(length / 2.0)
+            if not is_type_set[i]:
+                angle = degrees(acos(max(-1.0, min(1.0, nz))))
+                type_keys[i] = base_type(angle)
+
+        self._calculated_count = end
+
+    def surface_type(self, index):
+        """Get surface type for a surface as a SurfaceType object."""
+        return surfacetype.SurfaceTypes.get_type_by_key(
+            self.surface_type_keys[index])()
+
+    def radiance_material(self, index):
+        """Get Radiance material for a surface."""
+        mat_id = self._material_ids[index]
+        if mat_id == -1:
+            return surfacetype.SurfaceTypes.get_type_by_key(
+                self.surface_type_keys[index]).radiance_material
+        return self._materials[mat_id]
+
+    def set_radiance_material(self, index, material):
+        """Set Radiance material for a surface."""
+        self._material_ids[index] = self._material_id(material)
+
+    def points(self, index, flipped=False):
+        """Get points for a surface as a tuple of (x, y, z) tuples."""
+        vt = self._vertices
+        st = self._face_offsets[index] * 3
+        en = self._face_offsets[index + 1] * 3
+        pts = tuple((vt[j], vt[j + 1], vt[j + 2]) for j in xrange(st, en, 3))
+        return tuple(reversed(pts)) if flipped else pts
+
+    def normal(self, index):
+        """Get unit normal for a surface."""
+        normals = self.normals
+        return normals[index * 3], normals[index * 3 + 1], normals[index * 3 + 2]
+
+    def index(self, name):
+        """Get index of a surface by name."""
+        return self._name_index[name]
+
+    def to_hb_surface(self, index):
+        """Create a full HBSurface for a surface in collection."""
+        srf = HBSurface(self._names[index], self.points(index),
+                        self.surface_type_keys[index], is_name_set_by_user=True,
+                        is_type_set_by_user=bool(self._is_type_set[index]))
+        if self._material_ids[index] != -1:
+            srf.radiance_material = self._materials[self._material_ids[index]]
+        return srf
+
+    def to_hb_surfaces(self):
+        """Create full HBSurfaces for all the surfaces in collection."""
+        return tuple(self.to_hb_surface(i) for i in xrange(len(self)))
+
+    def _iter_materials(self, blacked=False):
+        """Yield unique materials for all the surfaces in collection."""
+        used = set(self._material_ids)
+        if -1 in used:
+            # default materials by type
+            self.calculate()
+            used.remove(-1)
+            ids = self._material_ids
+            keys = set(self._type_keys[i] for i in xrange(len(self)) if ids[i] == -1)
+            defaults = {}
+            for key in keys:
+                mat = surfacetype.SurfaceTypes.get_type_by_key(key).radiance_material
+                if mat.name not in self._material_index:
+                    defaults[mat.name] = mat
+            for name in sorted(defaults):
+                yield defaults[name]
+        for mat_id in sorted(used):
+            yield self._materials[mat_id]
+
+    def _iter_polygons(self, flipped=False):
+        """Yield Radiance polygon strings for all the surfaces in collection."""
+        self.calculate()
+        vt = self._vertices
+        offsets = self._face_offsets
+        names = self._names
+        for i in xrange(len(names)):
+            st = offsets[i] * 3
+            en = offsets[i + 1] * 3
+            if flipped:
+                coordinates = []
+                for j in xrange(en - 3, st - 3, -3):
+                    coordinates.extend((vt[j], vt[j + 1], vt[j + 2]))
+            else:
+                coordinates = vt[st:en]
+            yield '%s polygon %s\n0\n0\n%d %s' % (
+                self.radiance_material(i).name, names[i], en - st,
+                ' '.join(str(v) for v in coordinates))
+
+    def to_rad_string(self, include_materials=True, flipped=False):
+        """Get Radiance definition for all the surfaces."""
+        geo = '\n\n'.join(self._iter_polygons(flipped))
+        if not include_materials:
+            return geo
+        mat = '\n\n'.join(m.to_rad_string() for m in self._iter_materials())
+        return '%s\n\n%s' % (mat, geo)
+
+    def write(self, folder, filename, include_materials=True, flipped=False,
+              mkdir=False):
+        """Write surfaces to a Radiance file.
+
+        Polygons are written to file one by one and the full string is never created
+        in memory.
+
+        Returns:
+            Full path to file.
+        """
+        if not os.path.isdir(folder):
+            if not mkdir:
+                raise ValueError('Failed to find %s.' % folder)
+            os.makedirs(folder)
+        file_path = os.path.join(folder, filename)
+        with open(file_path, 'w') as outf:
+            if include_materials:
+                for mat in self._iter_materials():
+                    outf.write(mat.to_rad_string() + '\n\n')
+            for polygon in self._iter_polygons(flipped):
+                outf.write(polygon + '\n\n')
+        return file_path
+
+    def __len__(self):
+        """Number of surfaces."""
+        return len(self._names)
+
+    def __getitem__(self, index):
+        """Get a lightweight view for a surface."""
+        count = len(self._names)
+        if index < 0:
+            index += count
+        if not 0 <= index < count:
+            raise IndexError('Surface index out of range: %d' % index)
+        return HBSurfaceView(self, index)
+
+    def __iter__(self):
+        """Iterate over surface views."""
+        for i in xrange(len(self._names)):
+            yield HBSurfaceView(self, i)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Collection representation."""
+        return 'HBSurfaceCollection: #%d' % len(self)
+
+
+class HBSurfaceView(object):
+    """A lightweight view to a surface in HBSurfaceCollection.
+
+    A view doesn't keep any data and reads the values from the collection. It can be
+    used in place of an HBSurface with no child surfaces in RadFile and recipes. Use
+    to_hb_surface to get a full HBSurface.
+    """
+
+    __slots__ = ('_collection', '_index')
+
+    def __init__(self, collection, index):
+        self._collection = collection
+        self._index = index
+
+    @property
+    def isHBAnalysisSurface(self):
+        """Return True for HBAnalysisSurface."""
+        return True
+
+    @property
+    def isHBSurface(self):
+        """Return True for HBSurface."""
+        return True
+
+    @property
+    def isHBFenSurface(self):
+        """Return False for HBSurface."""
+        return False
+
+    @property
+    def isHBDynamicSurface(self):
+        """Return False for HBSurface."""
+        return False
+
+    @property
+    def collection(self):
+        """Parent collection."""
+        return self._collection
+
+    @property
+    def index(self):
+        """Index of surface in collection."""
+        return self._index
+
+    @property
+    def name(self):
+        """Surface name."""
+        return self._collection.names[self._index]
+
+    @property
+    def points(self):
+        """Surface points as a list of point groups similar to HBSurface.points."""
+        return (self._collection.points(self._index),)
+
+    @property
+    def normal(self):
+        """Surface unit normal."""
+        return self._collection.normal(self._index)
+
+    @property
+    def area(self):
+        """Surface area."""
+        return self._collection.areas[self._index]
+
+    @property
+    def surface_type(self):
+        """Surface type."""
+        return self._collection.surface_type(self._index)
+
+    @property
+    def radiance_material(self):
+        """Get and set Radiance material."""
+        return self._collection.radiance_material(self._index)
+
+    @radiance_material.setter
+    def radiance_material(self, material):
+        self._collection.set_radiance_material(self._index, material)
+
+    @property
+    def has_child_surfaces(self):
+        """Views don't have child surfaces."""
+        return False
+
+    @property
+    def children_surfaces(self):
+        """Views don't have child surfaces."""
+        return ()
+
+    def duplicate_vertices(self, flipped=False):
+        """Duplicate surface vertices."""
+        return (self._collection.points(self._index, flipped),)
+
+    def to_hb_surface(self):
+        """Create a full HBSurface from this view."""
+        return self._collection.to_hb_surface(self._index)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Surface representation."""
+        return 'HBSurfaceView: %s' % self.name
@@ -4,8 +4,12 @@ from ..utilcol import random_name
 from ..dataoperation import match_data
 from ..schedule import Schedule
 from .analysispoint import AnalysisPoint
+from .spatialindex import KDTree
+from ..vectormath import vectorarray
 
 import os
+import math
+from array import array
 from itertools import izip
 from collections import namedtuple, OrderedDict
 
@@ -30,8 +34,8 @@ class AnalysisGrid(object):
         analysis_points: A collection of analysis points.
     """
 
-    __slots__ = ('_analysis_points', '_name', '_sources', '_wgroups', '_directFiles',
-                 '_totalFiles')
+    __slots__ = ('_analysis_points', '_coordinates', '_name', '_sources', '_wgroups',
+                 '_directFiles', '_totalFiles', '_spatial_index', '_created_count')
 
     def __init__(self, analysis_points, name=None, window_groups=None):
         """Initialize a AnalysisPointGroup.
@@ -53,13 +57,20 @@ class AnalysisGrid(object):
         else:
             self._wgroups = ()
 
+        analysis_points = tuple(analysis_points)
         for ap in analysis_points:
             assert hasattr(ap, '_dir'), \
                 '{} is not an AnalysisPoint.'.format(ap)
 
         self._analysis_points = analysis_points
+        # coordinates as a flat array of x, y, z, dx, dy, dz for grids which are
+        # created from coordinates. AnalysisPoints will be created on demand.
+        self._coordinates = None
+        # number of AnalysisPoints which are already created
+        self._created_count = len(analysis_points)
         self._directFiles = []  # list of results files
         self._totalFiles = []  # list of results files
+        self._spatial_index = None  # KDTree is created on demand
 
     @classmethod
     def from_json(cls, ag_json):
@@ -81,22 +92,65 @@ class AnalysisGrid(object):
         """
         vectors = vectors or ()
         points, vectors = match_data(points, vectors, (0, 0, 1))
-        aps = tuple(AnalysisPoint(pt, v) for pt, v in izip(points, vectors))
-        return cls(aps, name, window_groups)
+        coordinates = vectorarray.interleave(
+            vectorarray.to_array(points), vectorarray.to_array(vectors))
+        return cls.from_coordinates(coordinates, name, window_groups)
 
     @classmethod
-    def from_file(cls, file_path):
+    def from_coordinates(cls, coordinates, name=None, window_groups=None):
+        """Create an analysis grid from a flat list of coordinates.
+
+        AnalysisPoints are only created once they are requested which makes creating
+        and writing large grids much faster.
+
+        Args:
+            coordinates: A flat list or array of values as x, y, z, dx, dy, dz for
+                each point.
+        """
+        if not isinstance(coordinates, array) or coordinates.typecode != 'd':
+            coordinates = array('d', coordinates)
+        assert len(coordinates) % 6 == 0, \
+            'Number of coordinates [%d] must be a multiple of 6.' % len(coordinates)
+        grid = cls((), name, window_groups)
+        grid._coordinates = coordinates
+        grid._analysis_points = [None] * (len(coordinates) // 6)
+        grid._created_count = 0
+        return grid
+
+    @classmethod
+    def from_file(cls, file_path, binary=False):
         """Create an analysis grid from a pts file.
 
         Args:
             file_path: Full path to points file
+            binary: Set to True if the file is in binary float format which is the
+                input format for rtrace -if (Default: False).
         """
         assert os.path.isfile(file_path), IOError("Can't find {}.".format(file_path))
-        ap = AnalysisPoint  # load analysis point locally for better performance
+        coordinates = array('d')
         with open(file_path, 'rb') as inf:
-            points = tuple(ap.from_raw_values(*l.split()) for l in inf)
+            if binary:
+                size = os.path.getsize(file_path)
+                if size % 4 != 0:
+                    raise ValueError(
+                        'Size of {} is not a multiple of 4 bytes.'.format(file_path))
+                values = array('f')
+                values.fromfile(inf, size // 4)
+                coordinates = array('d', values)
+            else:
+                for count, line in enumerate(inf):
+                    try:
+                        coordinates.extend(float(v) for v in line.split())
+                    except ValueError as e:
+                        raise ValueError('Failed to parse line {} in {}:\n{}'.format(
+                            count + 1, file_path, e))
+
+        if len(coordinates) % 6 != 0:
+            raise ValueError(
+                'Number of values in {} [{}] is not a multiple of 6.'.format(
+                    file_path, len(coordinates)))
 
-        return cls(points)
+        return cls.from_coordinates(coordinates)
 
     @property
     def isAnalysisGrid(self):
@@ -124,23 +178,62 @@ class AnalysisGrid(object):
     @property
     def points(self):
         """A generator of points as x, y, z."""
-        return (ap.location for ap in self._analysis_points)
+        if self._coordinates is None:
+            return (ap.location for ap in self._analysis_points)
+        return self._iter_coordinates(0)
 
     @property
     def vectors(self):
         """Get generator of vectors as x, y , z."""
-        return (ap.direction for ap in self._analysis_points)
+        if self._coordinates is None:
+            return (ap.direction for ap in self._analysis_points)
+        return self._iter_coordinates(3)
+
+    def _iter_coordinates(self, start):
+        """Iterate over point (start=0) or vector (start=3) coordinates."""
+        coordinates = self._coordinates
+        for count, ap in enumerate(self._analysis_points):
+            if ap is None:
+                i = count * 6 + start
+                yield coordinates[i], coordinates[i + 1], coordinates[i + 2]
+            elif start == 0:
+                yield ap.location
+            else:
+                yield ap.direction
+
+    @property
+    def coordinates(self):
+        """Coordinates as a flat array of x, y, z, dx, dy, dz for each point."""
+        if self._coordinates is not None and self._created_count == 0:
+            # no analysis point is created yet
+            return self._coordinates
+        coordinates = array('d')
+        for pt, v in izip(self.points, self.vectors):
+            coordinates.extend((pt[0], pt[1], pt[2], v[0], v[1], v[2]))
+        return coordinates
 
     @property
     def analysis_points(self):
         """Return a list of analysis points."""
+        if not isinstance(self._analysis_points, tuple):
+            # create the missing analysis points
+            self._analysis_points = tuple(
+                self._create_analysis_point(count) if ap is None else ap
+                for count, ap in enumerate(self._analysis_points))
+            self._created_count = len(self._analysis_points)
         return self._analysis_points
 
+    def _create_analysis_point(self, index):
+        """Create an AnalysisPoint from coordinates."""
+        c = self._coordinates
+        i = index * 6
+        return AnalysisPoint((c[i], c[i + 1], c[i + 2]), (c[i + 3], c[i + 4], c[i + 5]))
+
     @property
     def sources(self):
         """Get sorted list fo sources."""
         if not self._sources:
-            return self.analysis_points[0].sources
+            return self[0].sources
         else:
             srcs = range(len(self._sources))
             for name, d in self._sources.iteritems():
@@ -150,7 +243,7 @@ class AnalysisGrid(object):
     @property
     def has_values(self):
         """Check if this analysis grid has result values."""
-        return self.analysis_points[0].has_values
+        return self[0].has_values
 
     @property
     def has_direct_values(self):
@@ -158,12 +251,12 @@ class AnalysisGrid(object):
 
         In point-in-time and 3phase recipes only total values are available.
         """
-        return self.analysis_points[0].has_direct_values
+        return self[0].has_direct_values
 
     @property
     def hoys(self):
         """Return hours of the year for results if any."""
-        return self.analysis_points[0].hoys
+        return self[0].hoys
 
     @property
     def is_results_point_in_time(self):
@@ -199,6 +292,26 @@ class AnalysisGrid(object):
             self.analysis_points[count].set_values(
                 hourlyValues, hoys, source, state, is_direct)
 
+    def set_zero_values(self, hoys, source=None, state=None, is_coupled=False):
+        """Set values to 0 for all the points.
+
+        Use this method for sources that don't contribute to this analysis grid.
+
+        Args:
+            hoys: List of hours of the year.
+            source: Name of the source of light.
+            state: State of the source.
+            is_coupled: Set to True to set both total and direct values.
+        """
+        if is_coupled:
+            values = ((0, 0),) * len(hoys)
+            for ap in self.analysis_points:
+                ap.set_coupled_values(values, hoys, source, state)
+        else:
+            values = (0,) * len(hoys)
+            for ap in self.analysis_points:
+                ap.set_values(values, hoys, source, state)
+
     def parse_header(self, inf, start_line, hoys, check_point_count=False):
         """Parse radiance matrix header."""
         # read the header
@@ -210,10 +323,10 @@ class AnalysisGrid(object):
             elif start_line == 0 and line[:5] == 'NROWS':
                 points_count = int(line.split('=')[-1])
                 if check_point_count:
-                    assert len(self._analysis_points) == points_count, \
+                    assert len(self) == points_count, \
                         "Length of points [{}] must match the number " \
                         "of rows [{}].".format(
-                            len(self._analysis_points), points_count)
+                            len(self), points_count)
 
             elif start_line == 0 and line[:5] == 'NCOLS':
                 hours_count = int(line.split('=')[-1])
@@ -269,7 +382,7 @@ class AnalysisGrid(object):
             for i in xrange(st):
                 inf.next()
 
-            end = len(self._analysis_points)
+            end = len(self)
             if mode == 0:
                 values = (tuple(int(float(r)) for r in inf.next().split())
                           for count in xrange(end))
@@ -324,7 +437,7 @@ class AnalysisGrid(object):
                 inf.next()
                 dinf.next()
 
-            end = len(self._analysis_points)
+            end = len(self)
 
             if mode == 0:
                 coupled_values = (
@@ -471,7 +584,7 @@ class AnalysisGrid(object):
             # which unlike the other method doesn't load all the values to the memory
             # at once.
             blinds_state_ids = [[0] * len(self.sources)] * len(hoys)
-            calculate_annual_metrics = self.analysis_points[0]._calculate_annual_metrics
+            calculate_annual_metrics = self[0]._calculate_annual_metrics
 
             for file_data in self.result_files[0]:
                 file_path, hoys, start_line, header, mode = file_data
@@ -494,7 +607,7 @@ class AnalysisGrid(object):
                     for i in xrange(st):
                         inf.next()
 
-                    end = len(self._analysis_points)
+                    end = len(self)
 
                     # load one line at a time
                     for count in xrange(end):
@@ -560,7 +673,7 @@ class AnalysisGrid(object):
             # at once.
             blinds_state_ids = [[0] * len(self.sources)] * len(hoys)
             calculate_daylight_autonomy = \
-                self.analysis_points[0]._calculate_daylight_autonomy
+                self[0]._calculate_daylight_autonomy
 
             for file_data in self.result_files[0]:
                 file_path, hoys, start_line, header, mode = file_data
@@ -583,7 +696,7 @@ class AnalysisGrid(object):
                     for i in xrange(st):
                         inf.next()
 
-                    end = len(self._analysis_points)
+                    end = len(self)
 
                     # load one line at a time
                     for count in xrange(end):
@@ -670,7 +783,7 @@ class AnalysisGrid(object):
             # at once.
             blinds_state_ids = [[0] * len(self.sources)] * len(hoys)
             calculate_annual_sunlight_exposure = \
-                self.analysis_points[0]._calculate_annual_sunlight_exposure
+                self[0]._calculate_annual_sunlight_exposure
 
             for file_data in self.result_files[1]:
                 file_path, hoys, start_line, header, mode = file_data
@@ -693,7 +806,7 @@ class AnalysisGrid(object):
                     for i in xrange(st):
                         inf.next()
 
-                    end = len(self._analysis_points)
+                    end = len(self)
 
                     # load one line at a time
                     for count in xrange(end):
@@ -736,12 +849,12 @@ class AnalysisGrid(object):
                 be used. Length of each item in states should be equal to number
                 of sources.
         """
-        return self.analysis_points[0].parse_blind_states(blinds_state_ids)
+        return self[0].parse_blind_states(blinds_state_ids)
 
     def load_values_from_files(self):
         """Load grid values from self.result_files."""
         # remove old results
-        for ap in self._analysis_points:
+        for ap in self.analysis_points:
             ap._sources = OrderedDict()
             ap._values = []
         r_files = self.result_files[0][:]
@@ -790,17 +903,187 @@ class AnalysisGrid(object):
                     header=header, check_point_count=False, mode=mode
                 )
 
+    def neighbors(self, grid_size, tolerance=0.01):
+        """Get the indices of the neighbor points in a regular grid.
+
+        Two points are neighbors if their distance is not larger than grid_size. In a
+        regular grid each point will have up to 4 neighbors.
+
+        Args:
+            grid_size: Distance between the points in this grid.
+            tolerance: Relative tolerance for comparing distances (Default: 0.01).
+
+        Returns:
+            A list of neighbor indices for each point.
+        """
+        max_dist = (grid_size * (1 + tolerance)) ** 2
+        locations = tuple(tuple(ap.location) for ap in self.analysis_points)
+
+        # hash the points into cells with the size of grid_size
+        cells = {}
+        for count, pt in enumerate(locations):
+            key = tuple(int(math.floor(c / grid_size)) for c in pt)
+            cells.setdefault(key, []).append(count)
+
+        offsets = tuple((i, j, k) for i in (-1, 0, 1) for j in (-1, 0, 1)
+                        for k in (-1, 0, 1))
+        neighbors = []
+        for count, pt in enumerate(locations):
+            x, y, z = (int(math.floor(c / grid_size)) for c in pt)
+            ids = []
+            for i, j, k in offsets:
+                for other in cells.get((x + i, y + j, z + k), ()):
+                    if other == count:
+                        continue
+                    opt = locations[other]
+                    dist = (pt[0] - opt[0]) ** 2 + (pt[1] - opt[1]) ** 2 + \
+                        (pt[2] - opt[2]) ** 2
+                    if dist <= max_dist:
+                        ids.append(other)
+            neighbors.append(sorted(ids))
+        return neighbors
+
+    def refine(self, grid_size, threshold=0.5, hoys=None, blinds_state_ids=None):
+        """Subdivide the points with a high value gradient to their neighbors.
+
+        Use this method to refine a coarse regular grid after loading the results. The
+        difference between values of two neighbor points is divided by the larger
+        value and if the difference is larger than threshold both points will be
+        subdivided. Each subdivided point is replaced by 4 points in the same plane
+        with half of the grid_size spacing.
+
+        Args:
+            grid_size: Distance between the points in this grid.
+            threshold: Relative difference between values of two neighbor points to
+                subdivide them (Default: 0.5).
+            hoys: Hours of the year to be used for calculating the values. Values
+                will be summed up for all the hours (Default: All the hours).
+            blinds_state_ids: List of state ids for all the sources for input hoys.
+
+        Returns:
+            A tuple of (refined_ids, AnalysisGrid). refined_ids are the indices of
+            subdivided points in this grid and AnalysisGrid includes the new points.
+        """
+        assert self.has_values, \
+            'Results must be loaded to the grid before refining {}.'.format(self.name)
+
+        values = tuple(v[0] for v in self.sum_values_by_id(hoys, blinds_state_ids))
+        neighbors = self.neighbors(grid_size)
+
+        refined_ids = set()
+        for count, ids in enumerate(neighbors):
+            for other in ids:
+                if other < count:
+                    continue
+                max_value = max(abs(values[count]), abs(values[other]))
+                if max_value == 0:
+                    continue
+                if abs(values[count] - values[other]) / max_value > threshold:
+                    refined_ids.add(count)
+                    refined_ids.add(other)
+
+        refined_ids = sorted(refined_ids)
+        offset = grid_size / 4.0
+        aps = []
+        for count in refined_ids:
+            ap = self.analysis_points[count]
+            pt = tuple(ap.location)
+            normal = tuple(ap.direction)
+            # use the direction to the first neighbor as the u axis of the cell
+            npt = tuple(self.analysis_points[neighbors[count][0]].location)
+            u = tuple(n - p for n, p in izip(npt, pt))
+            # make sure u is in the plane of the cell
+            dot = sum(a * b for a, b in izip(u, normal)) / \
+                (sum(n ** 2 for n in normal) or 1)
+            u = tuple(a - dot * b for a, b in izip(u, normal))
+            length = math.sqrt(sum(a ** 2 for a in u))
+            u = tuple(a / length for a in u)
+            v = (normal[1] * u[2] - normal[2] * u[1],
+                 normal[2] * u[0] - normal[0] * u[2],
+                 normal[0] * u[1] - normal[1] * u[0])
+            length = math.sqrt(sum(a ** 2 for a in v))
+            v = tuple(a / length for a in v)
+            for i, j in ((-1, -1), (1, -1), (1, 1), (-1, 1)):
+                loc = tuple(p + offset * (i * a + j * b) for p, a, b in izip(pt, u, v))
+                aps.append(AnalysisPoint(loc, normal))
+
+        return refined_ids, AnalysisGrid(tuple(aps), self.name)
+
+    @property
+    def spatial_index(self):
+        """A KDTree for the points in this grid.
+
+        The tree is created the first time it is requested.
+        """
+        if self._spatial_index is None:
+            self._spatial_index = KDTree(tuple(self.points))
+        return self._spatial_index
+
+    def nearest_points(self, point, k=1):
+        """Find the k nearest analysis points to a point.
+
+        Returns:
+            A list of (distance, index) sorted by distance.
+        """
+        return self.spatial_index.nearest(point, k)
+
+    def points_within_radius(self, point, radius):
+        """Find the analysis points within a distance from a point.
+
+        Returns:
+            A list of (distance, index) sorted by distance.
+        """
+        return self.spatial_index.within_radius(point, radius)
+
+    def points_in_box(self, min_point, max_point):
+        """Get indices of the analysis points inside a bounding box."""
+        return self.spatial_index.within_box(min_point, max_point)
+
+    def resample_values(self, values, target, k=4, power=2):
+        """Interpolate values from this grid to the points of another grid.
+
+        Values are interpolated using inverse distance weighting of the k nearest
+        points. Use this method to compare the results of two design options with
+        different grids.
+
+        Args:
+            values: A list of values for the points in this grid. Values can be
+                numbers or lists of numbers (e.g. values from sum_values_by_id).
+            target: A target AnalysisGrid or a list of (x, y, z) points.
+            k: Number of nearest points to be used for interpolation (Default: 4).
+            power: Power for inverse distance weighting (Default: 2).
+
+        Returns:
+            A list of values for the target points.
+        """
+        points = target.points if hasattr(target, 'isAnalysisGrid') else target
+        return self.spatial_index.interpolate(values, tuple(points), k, power)
+
     def unload(self):
         """Remove all the sources and values from analysis_points."""
         self._totalFiles = []
         self._directFiles = []
 
         for ap in self._analysis_points:
+            if ap is None:
+                continue
             ap._sources = OrderedDict()
             ap._values = []
 
     def duplicate(self):
         """Duplicate AnalysisGrid."""
+        if self._coordinates is not None and \
+                not isinstance(self._analysis_points, tuple):
+            dup = AnalysisGrid.from_coordinates(array('d', self._coordinates),
+                                                self._name)
+            dup._analysis_points = [None if ap is None else ap.duplicate()
+                                    for ap in self._analysis_points]
+            created = tuple(ap for ap in dup._analysis_points if ap is not None)
+            dup._created_count = len(created)
+            dup._sources = created[0]._sources if created else self._sources
+            dup._wgroups = self._wgroups
+            return dup
+
         aps = tuple(ap.duplicate() for ap in self._analysis_points)
         dup = AnalysisGrid(aps, self._name)
         dup._sources = aps[0]._sources
@@ -809,7 +1092,41 @@ class AnalysisGrid(object):
 
     def to_rad_string(self):
         """Return analysis points group as a Radiance string."""
-        return "\n".join((ap.to_rad_string() for ap in self._analysis_points))
+        return "\n".join(self.iter_rad_strings())
+
+    def iter_rad_strings(self):
+        """Iterate over Radiance strings for analysis points. One line for each point."""
+        line = '%.3f %.3f %.3f %.3f %.3f %.3f'
+        for pt, v in izip(self.points, self.vectors):
+            yield line % (pt[0], pt[1], pt[2], v[0], v[1], v[2])
+
+    def write(self, folder, filename, binary=False, mkdir=False):
+        """Write analysis points to a file.
+
+        Args:
+            folder: Target folder.
+            filename: File name and extension as a string.
+            binary: Set to True to write the points as binary floats which can be
+                used as the input for rtrace and rcontrib with -if option. Binary
+                files keep the precision of coordinates (Default: False).
+            mkdir: Create the folder if does not exist already.
+
+        Returns:
+            Full path to file.
+        """
+        if not os.path.isdir(folder):
+            if not mkdir:
+                raise ValueError('Failed to find %s.' % folder)
+            os.makedirs(folder)
+        file_path = os.path.join(folder, filename)
+        if binary:
+            with open(file_path, 'wb') as outf:
+                array('f', self.coordinates).tofile(outf)
+        else:
+            with open(file_path, 'w') as outf:
+                for line in self.iter_rad_strings():
+                    outf.write(line + '\n')
+        return file_path
 
     def ToString(self):
         """Overwrite ToString .NET method."""
@@ -856,11 +1173,20 @@ class AnalysisGrid(object):
 
     def __getitem__(self, index):
         """Get value for an index."""
-        return self._analysis_points[index]
+        if isinstance(self._analysis_points, tuple) or isinstance(index, slice):
+            return self.analysis_points[index]
+        ap = self._analysis_points[index]
+        if ap is None:
+            if index < 0:
+                index += len(self)
+            ap = self._create_analysis_point(index)
+            self._analysis_points[index] = ap
+            self._created_count += 1
+        return ap
 
     def __iter__(self):
         """Iterate points."""
-        return iter(self._analysis_points)
+        return iter(self.analysis_points)
 
     def __str__(self):
         """String repr."""
@@ -901,5 +1227,5 @@ class AnalysisGrid(object):
     def __repr__(self):
         """Return analysis points and directions."""
         return 'AnalysisGrid::{}::#{}::{}'.format(
-            self._name, len(self._analysis_points), self._sign
+            self._name, len(self), self._sign
         )
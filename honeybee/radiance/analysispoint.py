@@ -616,7 +616,7 @@ class AnalysisPoint(object):
         try:
             direct = sum(v[1] for v in values)
         except TypeError as e:
-            if "'long' and 'NoneType'" in str(e):
+            if "and 'NoneType'" in str(e):
                 # direct value is not loaded
                 direct = 0
             else:
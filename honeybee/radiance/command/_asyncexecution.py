@@ -0,0 +1,337 @@
+"""Run Radiance commands in background threads with bounded concurrency.
+
+Commands are executed in a thread and the number of commands that are running at the
+same time is limited by a shared semaphore. By default the limit is the number of cpus
+on the machine. Use set_max_concurrency to change the limit.
+
+Usage:
+
+    runs = [Rtrace(...).execute_async() for _ in xrange(100)]
+    results = wait_all(runs)
+"""
+import multiprocessing
+import os
+import subprocess
+import tempfile
+import threading
+
+
+class CommandExecutionError(Exception):
+    """Exception for Radiance commands that fail with a non-zero return code."""
+
+    def __init__(self, command, returncode, stderr=''):
+        self.command = command
+        self.returncode = returncode
+        self.stderr = stderr
+        message = 'Command failed with return code {}:\n{}'.format(returncode, command)
+        if stderr:
+            message += '\n{}'.format(stderr)
+        super(CommandExecutionError, self).__init__(message)
+
+
+def _default_concurrency():
+    try:
+        return multiprocessing.cpu_count()
+    except NotImplementedError:
+        return 1
+
+
+_semaphore = threading.BoundedSemaphore(_default_concurrency())
+
+
+def set_max_concurrency(count):
+    """Set maximum number of commands that can run at the same time.
+
+    Commands which are already running are not affected.
+    """
+    global _semaphore
+    count = int(count)
+    assert count > 0, 'Concurrency should be larger than 0. Got {}'.format(count)
+    _semaphore = threading.BoundedSemaphore(count)
+
+
+def get_semaphore():
+    """Get the shared semaphore for running commands."""
+    return _semaphore
+
+
+def split_command(rad_string):
+    """Split a command string to a list of arguments for each command in the pipe.
+
+    Pipes (|) and redirections (<, >, >>) are supported. Any other shell syntax
+    (e.g. ;, &&, $, backquotes, wildcards or ~) outside of quotes and variables
+    inside double quotes are not supported.
+
+    Returns:
+        A tuple of (commands, input_file, output_file, append) where commands is
+        a list of argument lists. Returns None if the command can only be executed
+        through the shell.
+    """
+    posix = os.name != 'nt'
+    quotes = '"\'' if posix else '"'
+    tokens = []  # a list of (value, is_operator)
+    current = []
+    has_token = False
+    quote = None
+    chars = iter(rad_string)
+    for c in chars:
+        if quote:
+            if c == quote:
+                quote = None
+            elif c in '$`' and posix and quote == '"':
+                # variables and commands are expanded inside double quotes
+                return None
+            elif c == '\\' and posix and quote == '"':
+                nxt = next(chars, '')
+                if nxt not in ('"', '\\', '$', '`'):
+                    current.append(c)
+                current.append(nxt)
+            else:
+                current.append(c)
+        elif c in quotes:
+            quote = c
+            has_token = True
+        elif c == '\\' and posix:
+            current.append(next(chars, ''))
+            has_token = True
+        elif c.isspace() or c in '|<>':
+            if c in '<>' and not has_token and ''.join(current).isdigit():
+                # redirecting file descriptors (e.g. 2>)
+                return None
+            if has_token or current:
+                tokens.append((''.join(current), False))
+                current = []
+                has_token = False
+            if c == '>' and tokens and tokens[-1] == ('>', True):
+                tokens[-1] = ('>>', True)
+            elif not c.isspace():
+                tokens.append((c, True))
+        elif c in ';&$`()' or (posix and c in '*?[~'):
+            # shell only syntax and wildcards that should be expanded by shell
+            return None
+        else:
+            current.append(c)
+
+    if quote:
+        raise ValueError('Unbalanced quotes in command:\n{}'.format(rad_string))
+    if has_token or current:
+        tokens.append((''.join(current), False))
+
+    commands = [[]]
+    input_file = output_file = None
+    append = False
+    tokens = iter(tokens)
+    for value, is_operator in tokens:
+        if not is_operator:
+            commands[-1].append(value)
+        elif value == '|':
+            commands.append([])
+        else:
+            target, target_is_operator = next(tokens, (None, True))
+            if target_is_operator:
+                raise ValueError(
+                    'Missing file name after {} in command:\n{}'.format(
+                        value, rad_string))
+            if value == '<':
+                input_file = target
+            else:
+                output_file = target
+                append = value == '>>'
+
+    if not all(commands):
+        raise ValueError('Empty command in pipe:\n{}'.format(rad_string))
+
+    return commands, input_file, output_file, append
+
+
+class AsyncExecution(object):
+    """Execution of a command string in a background thread.
+
+    Attributes:
+        command: Command as a string.
+        result: Value that will be returned once the execution is finished
+            successfully (e.g. path to the output file).
+        semaphore: A semaphore to limit the number of running commands. By default
+            the shared semaphore will be used.
+        output_handler: A function that will be called for each line of the
+            standard output if the output is not redirected to a file. By default
+            lines are printed.
+        env: Optional environment variables for the process.
+    """
+
+    def __init__(self, command, result=None, semaphore=None, output_handler=None,
+                 env=None):
+        self.command = command
+        self._result = result
+        self._semaphore = semaphore or _semaphore
+        self._output_handler = output_handler or self._print
+        self._env = env
+        self._returncode = None
+        self._stderr = ''
+        self._error = None
+        self._thread = threading.Thread(target=self._run, name=command[:50])
+        self._thread.daemon = True
+
+    @staticmethod
+    def _print(line):
+        print(line.rstrip())
+
+    def start(self):
+        """Start the execution and return self."""
+        self._thread.start()
+        return self
+
+    @property
+    def is_finished(self):
+        """Check if the execution is finished."""
+        return self._thread.ident is not None and not self._thread.is_alive()
+
+    @property
+    def returncode(self):
+        """Return code of the command. None if the execution is not finished."""
+        return self._returncode
+
+    @property
+    def stderr(self):
+        """Standard error of the command."""
+        return self._stderr
+
+    def _run(self):
+        with self._semaphore:
+            try:
+                self._execute()
+            except Exception as e:
+                self._error = e
+
+    def _execute(self):
+        parsed = split_command(self.command)
+        if not parsed:
+            self._execute_in_shell()
+            return
+
+        commands, input_file, output_file, append = parsed
+        stdin = open(input_file, 'rb') if input_file else None
+        stdout = open(output_file, 'ab' if append else 'wb') if output_file else None
+        processes = []
+        error_files = []
+        try:
+            try:
+                for count, args in enumerate(commands):
+                    error_files.append(tempfile.TemporaryFile())
+                    is_last = count == len(commands) - 1
+                    processes.append(subprocess.Popen(
+                        args, env=self._env,
+                        stdin=processes[-1].stdout if processes else stdin,
+                        stdout=(stdout or subprocess.PIPE) if is_last
+                        else subprocess.PIPE,
+                        stderr=error_files[-1]))
+                    if count:
+                        # let the previous process receive SIGPIPE
+                        processes[-2].stdout.close()
+            except Exception:
+                # a later command in the pipe failed to start. stop the ones that
+                # are already running.
+                self._terminate(processes)
+                raise
+
+            if not stdout:
+                for line in iter(processes[-1].stdout.readline, b''):
+                    self._output_handler(line)
+                processes[-1].stdout.close()
+
+            codes = [p.wait() for p in processes]
+            stderr = []
+            for f in error_files:
+                f.seek(0)
+                stderr.append(f.read().strip())
+            self._stderr = '\n'.join(s for s in stderr if s)
+            self._returncode = next((c for c in codes if c != 0), 0)
+        finally:
+            for f in error_files:
+                f.close()
+            for f in (stdin, stdout):
+                if f:
+                    f.close()
+
+    @staticmethod
+    def _terminate(processes):
+        """Kill processes, drain their open output and wait for them to exit."""
+        for p in processes:
+            try:
+                p.kill()
+            except OSError:
+                # the process is already finished
+                pass
+        for p in processes:
+            if p.stdout and not p.stdout.closed:
+                p.stdout.read()
+                p.stdout.close()
+            p.wait()
+
+    def _execute_in_shell(self):
+        p = subprocess.Popen(self.command, shell=True, env=self._env,
+                             stdout=subprocess.PIPE, stderr=subprocess.PIPE)
+        # read stderr in a separate thread to avoid filling up the pipe
+        stderr = []
+        reader = threading.Thread(target=lambda: stderr.append(p.stderr.read()))
+        reader.daemon = True
+        reader.start()
+        for line in iter(p.stdout.readline, b''):
+            self._output_handler(line)
+        p.stdout.close()
+        reader.join()
+        self._stderr = stderr[0].strip() if stderr else ''
+        self._returncode = p.wait()
+
+    def wait(self, timeout=None):
+        """Wait for the execution to finish and return the result.
+
+        Args:
+            timeout: Optional timeout in seconds.
+
+        Returns:
+            The result of the execution or None if the execution is not finished
+            before timeout.
+
+        Raises:
+            CommandExecutionError: If the command fails.
+        """
+        self._thread.join(timeout)
+        if self._thread.is_alive():
+            return None
+        if self._error:
+            raise self._error
+        if self._returncode != 0:
+            raise CommandExecutionError(self.command, self._returncode, self._stderr)
+        return self._result
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """AsyncExecution representation."""
+        if not self.is_finished:
+            state = 'running' if self._thread.ident else 'not started'
+        else:
+            state = 'return code: {}'.format(self._returncode)
+        return 'AsyncExecution: {} ({})'.format(self.command, state)
+
+
+def wait_all(executions, raise_exception=True):
+    """Wait for a list of executions and return their results.
+
+    Args:
+        executions: A list of AsyncExecutions.
+        raise_exception: Set to False to return the exceptions instead of raising
+            the first one (Default: True).
+    """
+    results = []
+    for execution in executions:
+        try:
+            results.append(execution.wait())
+        except Exception as e:
+            if raise_exception:
+                raise
+            results.append(e)
+    return results
@@ -1,12 +1,14 @@
 """Radiance base command."""
 from ... import config
+from ...futil import missing_files
+from ._asyncexecution import AsyncExecution
 
 from abc import ABCMeta, abstractmethod, abstractproperty
 import os
+import re
 import subprocess
 
 
-# TODO: Implement piping as on option
 class RadianceCommand(object):
     """Base class for commands."""
 
@@ -118,7 +120,11 @@ class RadianceCommand(object):
             assert f.normpath is not None, _msg
 
     def __check_executable(self, radbin_path=None, raise_exception=False):
-        """Check if executable file exist."""
+        """Check if executable file exist.
+
+        Executables are looked up in the cached Radiance environment. The folder is
+        only checked again if the executable is not in the cached environment.
+        """
         radbin_path = self.radbin_path if not radbin_path else radbin_path
 
         # Check if the operating system is Windows or Mac/Linux. At present
@@ -144,6 +150,12 @@ class RadianceCommand(object):
                 __executable = os.path.normpath(
                     os.path.join(str(radbin_path), self.__class__.__name__.lower()))
 
+        name = os.path.basename(__executable)
+        if config.radiance_environment(radbin=radbin_path).has_executable(name) or \
+                config.radiance_environment(radbin=radbin_path, refresh=True) \
+                .has_executable(name):
+            return
+
         if not os.path.isfile(__executable):
             # FIX: Heroku Permission Patch
             print('Executable: {}'.format(__executable))
@@ -161,7 +173,7 @@ class RadianceCommand(object):
         """Check if path to libraries is set correctly."""
         radlib_path = self.radlib_path if not radlib_path else radlib_path
 
-        if not os.path.isdir(radlib_path):
+        if not config.radiance_environment(radlib=radlib_path).has_radlib:
             __err = "Can't find %s.\n" % radlib_path + \
                 "Use radlib_path method to set the path to " + \
                 "Radiance libraries before executing the command."
@@ -170,27 +182,27 @@ class RadianceCommand(object):
             else:
                 print(__err)
 
-    def __check_input_files_exist(self):
-
+    def _input_paths(self):
+        """Return input files as a list of strings."""
         if self.input_files is None:
-            return
+            return []
 
         # In case there is only a single file and it wasn't specified as a tuple
         # or list.
-        if isinstance(self.input_files, basestring)and \
-                os.path.exists(self.input_files):
-            return
+        if isinstance(self.input_files, basestring):
+            return [self.input_files]
 
         assert len(self.input_files) != 0, \
             "You have not specified any input files!."
 
-        for f in self.input_files:
-            assert os.path.exists(str(f)), \
-                "Invalid Input File: %s doesn't exist" % f
+        return [str(f) for f in self.input_files]
 
-    def __check_files(self, raise_exception_bin=True, raise_exception_lib=True):
+    def _check_files(self, check_inputs=True):
         """Check files before runnig the command."""
-        self.__check_input_files_exist()
+        if check_inputs:
+            missing = missing_files(self._input_paths())
+            assert not missing, \
+                "Invalid Input File: %s doesn't exist" % ', '.join(missing)
         self.__check_executable(raise_exception=True)
         self.__check_libs(raise_exception=True)
 
@@ -220,7 +232,7 @@ class RadianceCommand(object):
             Return fullpath to the result file if any as a string.
         """
         # check if the files exist on the computer
-        self.__check_files()
+        self._check_files()
 
         self.on_execution()
 
@@ -235,6 +247,49 @@ class RadianceCommand(object):
             print(line)
         p.wait()
 
+        return self._result_file()
+
+    def execute_async(self, semaphore=None, output_handler=None):
+        """Execute the command in a background thread.
+
+        The command is executed without the shell when possible and the number of
+        commands that are running at the same time is limited by a shared semaphore.
+        Use _asyncexecution.set_max_concurrency to change the limit.
+
+        Args:
+            semaphore: An optional semaphore to limit the number of running commands.
+                By default the shared semaphore will be used.
+            output_handler: A function that will be called for each line of the
+                standard output if the output is not redirected to a file. By
+                default lines are printed.
+
+        Returns:
+            An AsyncExecution. Use wait method to get the full path to the result file
+            similar to execute. wait will raise a CommandExecutionError if the
+            command fails.
+
+        Usage:
+
+            runs = [rtrace.execute_async() for rtrace in rtrace_commands]
+            for run in runs:
+                print(run.wait())
+        """
+        # check if the files exist on the computer
+        self._check_files()
+
+        self.on_execution()
+
+        env = None
+        if os.name == 'nt':
+            env = dict(os.environ)
+            env['PATH'] = env.get('PATH', '') + ';%s' % config.radbin_path
+            env['RAYPATH'] = env.get('RAYPATH', '') + ';%s' % config.radlib_path
+
+        return AsyncExecution(self.to_rad_string(), self._result_file(), semaphore,
+                              output_handler, env).start()
+
+    def _result_file(self):
+        """Return full path to the result file if any."""
         try:
             if os.path.split(self.output_file.normpath)[0] == "":
                 # add directory to file if it's not a full path
@@ -247,6 +302,173 @@ class RadianceCommand(object):
             # this command doesn't have an output file
             pass
 
+    def __or__(self, other):
+        """Pipe the output of this command to another command.
+
+        Usage:
+
+            dct = Dctimestep(...)  # writes to tmp/results.rgb
+            rmtx = Rmtxop(matrix_files=('tmp/results.rgb',), output_file='res.ill')
+            print((dct | rmtx).to_rad_string())
+            > dctimestep ... | rmtxop -c 47.4 119.9 11.6 - > res.ill
+        """
+        return RadiancePipeline((self, other))
+
+    def __repr__(self):
+        """Class representation."""
+        return self.to_rad_string()
+
+
+def validate_commands(commands):
+    """Check executables and input files for a sequence of commands at once.
+
+    Executables are checked against the cached Radiance environment and all the input
+    files are checked in a single batch. Output files of each command are considered
+    as available inputs for the next commands.
+
+    Args:
+        commands: A list of Radiance commands and pipelines in the order of execution.
+    """
+    produced = set()
+    inputs = []
+    for cmd in commands:
+        for c in getattr(cmd, 'commands', (cmd,)):
+            c._check_files(check_inputs=False)
+            inputs.extend(f for f in c._input_paths()
+                          if os.path.abspath(f) not in produced)
+            output = c._result_file()
+            if output:
+                produced.add(os.path.abspath(str(output)))
+
+    missing = missing_files(inputs)
+    assert not missing, \
+        "Invalid Input File: %s doesn't exist" % ', '.join(missing)
+
+
+class RadiancePipeline(object):
+    """A chain of Radiance commands connected with OS pipes.
+
+    The output of each command is passed to the next command through the standard
+    output instead of an intermediate file. The output file of each command but the
+    last one is removed from its command and the same file in the input of the next
+    command is replaced by - which tells Radiance commands to read from the standard
+    input. Intermediate files will never be written to disk.
+
+    Attributes:
+        commands: A list of Radiance commands. Commands are usually created by
+            joining them with | (e.g. Dctimestep() | Rmtxop()).
+    """
+
+    def __init__(self, commands):
+        """Create a pipeline."""
+        self.commands = []
+        for cmd in commands:
+            if isinstance(cmd, RadiancePipeline):
+                self.commands.extend(cmd.commands)
+            else:
+                assert hasattr(cmd, 'to_rad_string'), \
+                    '{} is not a Radiance command.'.format(cmd)
+                self.commands.append(cmd)
+        assert len(self.commands) > 1, 'A pipeline needs at least two commands.'
+
+    @property
+    def output_file(self):
+        """Output file of the last command."""
+        return self.commands[-1].output_file
+
+    @property
+    def input_files(self):
+        """Input files of the first command."""
+        return self.commands[0].input_files
+
+    @staticmethod
+    def _file_pattern(file_path):
+        """Regex pattern for a file path in a command with or without quotes."""
+        paths = set((str(file_path), os.path.normpath(str(file_path))))
+        names = '|'.join(re.escape(p) for p in sorted(paths, key=len, reverse=True))
+        return r'(["\']?)(?:{})\1'.format(names)
+
+    def to_rad_string(self, relative_path=False):
+        """Return full command as a string."""
+        rad_strings = []
+        piped_file = None
+        last = len(self.commands) - 1
+        for count, cmd in enumerate(self.commands):
+            rad_string = cmd.to_rad_string()
+            if piped_file:
+                pattern = r'(?<=\s){}(?=\s|$)'.format(self._file_pattern(piped_file))
+                rad_string, n = re.subn(pattern, '-', rad_string)
+                if not n:
+                    raise ValueError(
+                        '{} does not use the output of the previous command in the '
+                        'pipeline: {}'.format(cmd.__class__.__name__, piped_file))
+
+            piped_file = None
+            if count < last:
+                try:
+                    piped_file = cmd.output_file.to_rad_string().strip() or None
+                except AttributeError:
+                    # command has no output file and writes to stdout
+                    pass
+                if piped_file:
+                    pattern = r'\s*>\s*{}\s*$'.format(self._file_pattern(piped_file))
+                    rad_string = re.sub(pattern, '', rad_string)
+
+            rad_strings.append(rad_string)
+
+        return ' | '.join(rad_strings)
+
+    def execute(self):
+        """Execute the pipeline.
+
+        Returns:
+            Return fullpath to the result file of the last command if any.
+        """
+        validate_commands(self.commands)
+        for cmd in self.commands:
+            cmd.on_execution()
+
+        if os.name == 'nt':
+            normspace = RadianceCommand.normspace
+            os.environ['PATH'] += ';%s' % normspace(config.radbin_path)
+            os.environ['RAYPATH'] += ';%s' % normspace(config.radlib_path)
+
+        p = subprocess.Popen(self.to_rad_string(), shell=True,
+                             stdout=subprocess.PIPE, stderr=subprocess.STDOUT)
+
+        for line in p.stdout.readlines():
+            print(line)
+        p.wait()
+
+        return self.commands[-1]._result_file()
+
+    def execute_async(self, semaphore=None, output_handler=None):
+        """Execute the pipeline in a background thread.
+
+        See RadianceCommand.execute_async for the inputs. The whole pipeline
+        counts as a single command for the concurrency limit.
+        """
+        validate_commands(self.commands)
+        for cmd in self.commands:
+            cmd.on_execution()
+
+        env = None
+        if os.name == 'nt':
+            env = dict(os.environ)
+            env['PATH'] = env.get('PATH', '') + ';%s' % config.radbin_path
+            env['RAYPATH'] = env.get('RAYPATH', '') + ';%s' % config.radlib_path
+
+        return AsyncExecution(self.to_rad_string(), self.commands[-1]._result_file(),
+                              semaphore, output_handler, env).start()
+
+    def __or__(self, other):
+        """Add a command to the end of the pipeline."""
+        return RadiancePipeline((self, other))
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
     def __repr__(self):
         """Class representation."""
         return self.to_rad_string()
@@ -92,6 +92,12 @@ class Rmtxop(RadianceCommand):
     #Then the to_rad_string will be:
         c:/radiance/bin/rmtxop     x.ill + -s -1 y.ill + z.ill > res.ill
 
+    #Concatenate (multiply) matrices instead of adding them.
+    mtx = Rmtxop(concatenate=True)
+    mtx.matrix_files = [sky.smx, hours.mtx]
+    mtx.output_file = cumulative.smx
+    #Then to_rad_string will be:
+        'rmtxop sky.smx hours.mtx > cumulative.smx'
     """
 
     output_file = RadiancePath('output_file',
@@ -99,7 +105,7 @@ class Rmtxop(RadianceCommand):
                                relative_path=None, check_exists=False)
 
     def __init__(self, matrix_files=None, rmtxop_matrices=None,
-                 output_file=None, rmtxop_parameters=None):
+                 output_file=None, rmtxop_parameters=None, concatenate=False):
         RadianceCommand.__init__(self)
 
         self.matrix_files = matrix_files
@@ -110,6 +116,9 @@ class Rmtxop(RadianceCommand):
 
         self.rmtxop_matrices = rmtxop_matrices
 
+        self.concatenate = concatenate
+        """Set to True to multiply the matrices instead of adding them."""
+
     @property
     def rmtxop_parameters(self):
         """Get and set rmtxop_parameters."""
@@ -164,19 +173,21 @@ class Rmtxop(RadianceCommand):
 
         # If matrices are complex .i.e containing transformations scalars etc., get to
         # them first.
+        # matrices are multiplied if they are not separated by a + sign.
+        operator = " " if self.concatenate else " + "
         compound_matrices = ''
         if self.rmtxop_matrices:
             matrices = [matrix.to_rad_string() for matrix in self.rmtxop_matrices]
-            compound_matrices = " + ".join(matrices)
+            compound_matrices = operator.join(matrices)
 
         # This are just plain matrix files..for simple addition.
         matrix_files = ''
         if self.matrix_files:
-            matrix_files = " + ".join(self.matrix_files)
+            matrix_files = operator.join(self.matrix_files)
             # If compound matrices have already been specified, then add a plus in
             # the beginning.
             if compound_matrices:
-                matrix_files = "+ %s" % matrix_files
+                matrix_files = "%s%s" % (operator.lstrip(), matrix_files)
 
         rad_string = "%s %s %s %s > %s" % (
             self.normspace(os.path.join(self.radbin_path, 'rmtxop')),
@@ -1,4 +1,14 @@
 """Material utility."""
+import geometry.bubble
+import geometry.cone
+import geometry.cylinder
+import geometry.instance
+import geometry.mesh
+import geometry.polygon
+import geometry.ring
+import geometry.source
+import geometry.sphere
+import geometry.tube
 import material.bsdf
 import material.glass
 import material.glow
@@ -7,6 +17,7 @@ import material.metal
 import material.mirror
 import material.plastic
 import material.spotlight
+import material.trans
 import primitive
 import radparser
 
@@ -18,7 +29,21 @@ material_mapper = {
     'metal': material.metal,
     'mirror': material.mirror,
     'plastic': material.plastic,
-    'spotlight': material.spotlight
+    'spotlight': material.spotlight,
+    'trans': material.trans
+}
+
+geometry_mapper = {
+    'bubble': geometry.bubble,
+    'cone': geometry.cone,
+    'cylinder': geometry.cylinder,
+    'instance': geometry.instance,
+    'mesh': geometry.mesh,
+    'polygon': geometry.polygon,
+    'ring': geometry.ring,
+    'source': geometry.source,
+    'sphere': geometry.sphere,
+    'tube': geometry.tube
 }
 
 
@@ -76,11 +101,13 @@ def material_from_json(mat_json):
         return matcls.from_json(mat_json)
 
 
-def primitive_from_string(prm_string):
+def primitive_from_string(prm_string, modifier=None):
     """Create Honeybee Radiance primitives from string.
 
     Args:
         prim_string: A radiance modifier string. The input can be a multi-line string.
+        modifier: An optional modifier for the last primitive in the string. Use this
+            input if the modifier is not part of prm_string.
 
     Returns:
         A list of Honeybee Radiance primitives. If input includes polygons and
@@ -95,18 +122,21 @@ def primitive_from_string(prm_string):
     materials = radparser.parse_from_string(prm_string)
     type = materials[-1].split()[1]
     if type in primitive.Primitive.MATERIALTYPES:
-        return material_from_string(prm_string)
+        return material_from_string(prm_string, modifier)
+    elif type in geometry_mapper:
+        return geometry_from_string(prm_string, modifier)
     else:
         raise NotImplementedError(
             'Pasring for {} primitives is not implemented!'.format(type)
         )
 
 
-def material_from_string(mat_string):
+def material_from_string(mat_string, modifier=None):
     """Create Honeybee Radiance material from string.
 
     Args:
         mat_string: A radiance modifier string. The input can be a multi-line string.
+        modifier: An optional modifier for the material.
 
     Returns:
         A list of Honeybee Radiance materials.
@@ -126,8 +156,96 @@ def material_from_string(mat_string):
     # create a Radiance material based on the input
     try:
         matcls = getattr(material_mapper[type], type.capitalize())
-        return matcls.from_string(mat_string)
+        return matcls.from_string(mat_string, modifier)
     except AttributeError:
         # BSDF
         matcls = getattr(material_mapper[type], type)
-        return matcls.from_string(mat_string)
+        return matcls.from_string(mat_string, modifier)
+
+
+def geometry_from_string(geo_string, modifier=None):
+    """Create Honeybee Radiance geometry from string.
+
+    Args:
+        geo_string: A radiance geometry string. The input can be a multi-line string
+            and can include the modifiers of the geometry.
+        modifier: An optional modifier for the geometry. Use this input if the modifier
+            is not part of geo_string.
+
+    Returns:
+        A Honeybee Radiance geometry.
+    """
+    geometries = radparser.parse_from_string(geo_string)
+    type = geometries[-1].split()[1]
+
+    assert type in geometry_mapper, \
+        '{} is not a supported Radiance geometry:\n{}'.format(
+            type, '\n'.join(geometry_mapper)
+        )
+
+    geocls = getattr(geometry_mapper[type], type.capitalize())
+    return geocls.from_string(geo_string, modifier)
+
+
+def primitive_class(primitive_type):
+    """Get Honeybee Radiance class for a primitive type.
+
+    Returns:
+        A subclass of Primitive or None if the primitive type is not supported.
+    """
+    if primitive_type in material_mapper:
+        module = material_mapper[primitive_type]
+    elif primitive_type in geometry_mapper:
+        module = geometry_mapper[primitive_type]
+    else:
+        return None
+    try:
+        return getattr(module, primitive_type.capitalize())
+    except AttributeError:
+        # BSDF
+        return getattr(module, primitive_type)
+
+
+def primitives_from_file(file_path):
+    """Create Honeybee Radiance primitives from a Radiance file.
+
+    The file is parsed one primitive at a time and modifiers are looked up by name from
+    the primitives that are already created. Primitives which are not supported or
+    fail to be created and primitives that use them as modifier will be ignored.
+    Commands [!] are ignored.
+
+    Args:
+        file_path: Path to a Radiance file.
+
+    Returns:
+        A generator of Honeybee Radiance primitives.
+    """
+    modifiers = {}
+    skipped = {}
+    for record in radparser.parse_records_from_file(file_path):
+        if record.modifier == 'void':
+            modifier = None
+        elif record.modifier in modifiers:
+            modifier = modifiers[record.modifier]
+        else:
+            skipped[record.type] = skipped.get(record.type, 0) + 1
+            continue
+
+        prmcls = primitive_class(record.type)
+        if not prmcls:
+            skipped[record.type] = skipped.get(record.type, 0) + 1
+            continue
+
+        try:
+            prm = prmcls.from_record(record, modifier)
+        except Exception as e:
+            print('Failed to create {} {}:\n\t{}'.format(record.type, record.name, e))
+            skipped[record.type] = skipped.get(record.type, 0) + 1
+            continue
+
+        if prm.can_be_modifier:
+            modifiers[prm.name] = prm
+        yield prm
+
+    for primitive_type, count in skipped.iteritems():
+        print('{} {} primitives are ignored.'.format(count, primitive_type))
@@ -23,9 +23,9 @@ class Cone(RadianceGeometry):
 
     """
     center_pt_start = RadianceTuple('center_pt_start', tuple_size=3, num_type=float)
-    radius_start = RadianceNumber('radius_start', check_positive=True)
+    radius_start = RadianceNumber('radius_start', num_type=float, check_positive=True)
     center_pt_end = RadianceTuple('center_pt_end', tuple_size=3, num_type=float)
-    radius_end = RadianceNumber('radius_end', check_positive=True)
+    radius_end = RadianceNumber('radius_end', num_type=float, check_positive=True)
 
     def __init__(self, name, center_pt_start=None, radius_start=None,
                  center_pt_end=None, radius_end=None, modifier=None):
@@ -42,7 +42,7 @@ class Cone(RadianceGeometry):
         """
         RadianceGeometry.__init__(self, name, modifier=modifier)
         self.center_pt_start = center_pt_start or (0, 0, 0)
-        self.radius_start = radius_start or 10
+        self.radius_start = radius_start if radius_start is not None else 10
         self.center_pt_end = center_pt_end or (0, 0, 10)
         self.radius_end = radius_end or 0
 
@@ -21,7 +21,7 @@ class Cylinder(RadianceGeometry):
     """
     center_pt_start = RadianceTuple('center_pt_start', tuple_size=3, num_type=float)
     center_pt_end = RadianceTuple('center_pt_end', tuple_size=3, num_type=float)
-    radius = RadianceNumber('radius', check_positive=True)
+    radius = RadianceNumber('radius', num_type=float, check_positive=True)
 
     def __init__(self, name, center_pt_start=None, center_pt_end=None, radius=None,
                  modifier=None):
@@ -24,8 +24,8 @@ class Ring(RadianceGeometry):
     """
     center_pt = RadianceTuple('center_pt', tuple_size=3, num_type=float)
     surface_normal = RadianceTuple('surface_normal', tuple_size=3, num_type=float)
-    radius_inner = RadianceNumber('radius_inner', check_positive=True)
-    radius_outer = RadianceNumber('radius_outer', check_positive=True)
+    radius_inner = RadianceNumber('radius_inner', num_type=float, check_positive=True)
+    radius_outer = RadianceNumber('radius_outer', num_type=float, check_positive=True)
 
     def __init__(self, name, center_pt=None, radius_inner=None,
                  surface_normal=None, radius_outer=None, modifier=None):
@@ -42,7 +42,7 @@ class Ring(RadianceGeometry):
         """
         RadianceGeometry.__init__(self, name, modifier=modifier)
         self.center_pt = center_pt or (0, 0, 0)
-        self.radius_inner = radius_inner or 10
+        self.radius_inner = radius_inner if radius_inner is not None else 10
         self.surface_normal = surface_normal or (0, 0, 10)
         self.radius_outer = radius_outer or 0
 
@@ -61,7 +61,8 @@ class Ring(RadianceGeometry):
 
         x0, y0, z0, x1, y1, z1, r0, r1 = base_geometry_data[3:]
 
-        return cls(name, (x0, y0, z0), (x1, y1, z1), r0, r1, modifier)
+        return cls(name, center_pt=(x0, y0, z0), radius_inner=r0,
+                   surface_normal=(x1, y1, z1), radius_outer=r1, modifier=modifier)
 
     @classmethod
     def from_json(cls, geo_json):
@@ -0,0 +1,210 @@
+"""Generate analysis grids from floor surfaces.
+
+Test points are generated row by row using a scanline even-odd test. Edges are sorted
+by their lower v value and an active edge list keeps the edges which cross the current
+row, so the cost for each row is the number of active edges plus the number of points
+in the row. Floors can be any planar polygon with holes.
+"""
+from .analysisgrid import AnalysisGrid
+from ..vectormath import vectorarray
+
+from array import array
+from bisect import bisect_right
+import math
+
+
+def _newell_normal(pts):
+    """Calculate unit normal for a planar polygon."""
+    nx = ny = nz = 0.0
+    x1, y1, z1 = pts[-1][0], pts[-1][1], pts[-1][2]
+    for pt in pts:
+        x2, y2, z2 = pt[0], pt[1], pt[2]
+        nx += (y1 - y2) * (z1 + z2)
+        ny += (z1 - z2) * (x1 + x2)
+        nz += (x1 - x2) * (y1 + y2)
+        x1, y1, z1 = x2, y2, z2
+    length = math.sqrt(nx * nx + ny * ny + nz * nz)
+    assert length > 0, 'Failed to calculate normal for {}.'.format(pts)
+    return nx / length, ny / length, nz / length
+
+
+def _plane_axes(normal):
+    """Get u and v axes for a plane.
+
+    u is aligned with the x axis unless the plane is perpendicular to the x axis.
+    """
+    nx, ny, nz = normal
+    # project x axis to plane
+    ux, uy, uz = 1 - nx * nx, -nx * ny, -nx * nz
+    length = math.sqrt(ux * ux + uy * uy + uz * uz)
+    if length < 1e-6:
+        # plane is perpendicular to x axis. use y axis instead.
+        ux, uy, uz = -ny * nx, 1 - ny * ny, -ny * nz
+        length = math.sqrt(ux * ux + uy * uy + uz * uz)
+    ux, uy, uz = ux / length, uy / length, uz / length
+    v = (ny * uz - nz * uy, nz * ux - nx * uz, nx * uy - ny * ux)
+    return (ux, uy, uz), v
+
+
+def _edges_2d(polygons, origin, u, v):
+    """Project polygons to uv plane and return a list of edges as (u1, v1, u2, v2)."""
+    ox, oy, oz = origin
+    edges = []
+    for pts in polygons:
+        uv = [((pt[0] - ox) * u[0] + (pt[1] - oy) * u[1] + (pt[2] - oz) * u[2],
+               (pt[0] - ox) * v[0] + (pt[1] - oy) * v[1] + (pt[2] - oz) * v[2])
+              for pt in pts]
+        for count, (u1, v1) in enumerate(uv):
+            u2, v2 = uv[count - 1]
+            edges.append((u1, v1, u2, v2))
+    return edges
+
+
+def _segment_distance_squared(pu, pv, edge):
+    """Squared distance between a 2D point and an edge."""
+    u1, v1, u2, v2 = edge
+    du, dv = u2 - u1, v2 - v1
+    length = du * du + dv * dv
+    if length == 0:
+        t = 0
+    else:
+        t = max(0, min(1, ((pu - u1) * du + (pv - v1) * dv) / length))
+    eu = u1 + t * du - pu
+    ev = v1 + t * dv - pv
+    return eu * eu + ev * ev
+
+
+def _axis_values(start, end, grid_size):
+    """Get cell centers between start and end. The grid is centered in the range."""
+    span = end - start
+    count = int(span / grid_size)
+    if count == 0:
+        return ()
+    first = start + (span - (count - 1) * grid_size) / 2.0
+    return tuple(first + i * grid_size for i in xrange(count))
+
+
+def grid_points_from_polygon(boundary, holes=None, grid_size=1, offset=0.75,
+                             wall_distance=0):
+    """Generate test points for a planar polygon.
+
+    Args:
+        boundary: A list of (x, y, z) points for the outer boundary of the polygon.
+        holes: An optional list of point lists for the holes in the polygon.
+        grid_size: Distance between test points (Default: 1).
+        offset: Distance between the test points and the polygon along the normal.
+            Normal is flipped to face upwards for horizontal polygons such as floors
+            (Default: 0.75).
+        wall_distance: Exclude the points closer than this distance to the boundary
+            or the holes of the polygon (Default: 0).
+
+    Returns:
+        A tuple of (points, normal). points is a flat array of coordinates as
+        (x0, y0, z0, x1, y1, z1, ...) and normal is the direction of test points.
+    """
+    assert grid_size > 0, 'grid_size must be larger than 0.'
+    polygons = [boundary] + list(holes or ())
+    normal = _newell_normal(boundary)
+    if normal[2] < 0:
+        # floors are facing down
+        normal = tuple(-n for n in normal)
+    u, v = _plane_axes(normal)
+    origin = tuple(boundary[0])
+    edges = _edges_2d(polygons, origin, u, v)
+
+    u_values = _axis_values(min(min(e[0], e[2]) for e in edges),
+                            max(max(e[0], e[2]) for e in edges), grid_size)
+    v_values = _axis_values(min(min(e[1], e[3]) for e in edges),
+                            max(max(e[1], e[3]) for e in edges), grid_size)
+
+    # sort edges by their lower v value and add them to active edges row by row
+    edges = sorted((min(e[1], e[3]), max(e[1], e[3]), e) for e in edges)
+    next_edge = 0
+    active = []
+    wall_sq = wall_distance ** 2
+    ox, oy, oz = origin
+    dx, dy, dz = normal[0] * offset, normal[1] * offset, normal[2] * offset
+    points = array('d')
+    for row in v_values:
+        # add the edges which start before this row and remove the edges which end
+        # before this row. rows are sorted so removed edges are not needed anymore.
+        while next_edge < len(edges) and edges[next_edge][0] <= row + wall_distance:
+            active.append(edges[next_edge])
+            next_edge += 1
+        active = [e for e in active if e[1] >= row - wall_distance]
+
+        crossings = []
+        for _, _, (u1, v1, u2, v2) in active:
+            if (v1 <= row < v2) or (v2 <= row < v1):
+                crossings.append(u1 + (row - v1) * (u2 - u1) / (v2 - v1))
+        if not crossings:
+            continue
+        crossings.sort()
+        if wall_distance:
+            near_edges = [e for _, _, e in active]
+
+        bx = ox + row * v[0] + dx
+        by = oy + row * v[1] + dy
+        bz = oz + row * v[2] + dz
+        for col in u_values:
+            # even-odd rule
+            if bisect_right(crossings, col) % 2 == 0:
+                continue
+            if wall_distance and any(
+                    _segment_distance_squared(col, row, e) < wall_sq
+                    for e in near_edges):
+                continue
+            points.extend((bx + col * u[0], by + col * u[1], bz + col * u[2]))
+
+    return points, normal
+
+
+def analysis_grid_from_floor(floor, grid_size=1, offset=0.75, wall_distance=0,
+                             holes=None, name=None):
+    """Create an analysis grid for a floor surface.
+
+    Args:
+        floor: A planar HBSurface. Child surfaces of the floor (e.g. openings) will be
+            considered as holes.
+        grid_size: Distance between test points (Default: 1).
+        offset: Distance between the test points and the floor (Default: 0.75).
+        wall_distance: Exclude the points closer than this distance to the edges
+            of the floor (Default: 0).
+        holes: An optional list of point lists for additional holes.
+        name: Analysis grid name. Default is the name of the floor.
+
+    Returns:
+        An AnalysisGrid. The grid will be empty if no point is generated.
+    """
+    holes = list(holes or ())
+    if floor.has_child_surfaces:
+        holes.extend(child.absolute_points[0] for child in floor.children_surfaces)
+
+    points, normal = grid_points_from_polygon(
+        floor.absolute_points[0], holes, grid_size, offset, wall_distance)
+
+    coordinates = vectorarray.interleave(points, normal)
+    return AnalysisGrid.from_coordinates(coordinates, name or floor.name)
+
+
+def analysis_grids_from_floors(floors, grid_size=1, offset=0.75, wall_distance=0):
+    """Create an analysis grid for each floor surface.
+
+    Floors with no test points are skipped.
+
+    Args:
+        floors: A list of planar HBSurfaces.
+        grid_size: Distance between test points (Default: 1).
+        offset: Distance between the test points and the floors (Default: 0.75).
+        wall_distance: Exclude the points closer than this distance to the edges
+            of the floors (Default: 0).
+
+    Returns:
+        A list of AnalysisGrids.
+    """
+    grids = []
+    for floor in floors:
+        grid = analysis_grid_from_floor(floor, grid_size, offset, wall_distance)
+        if len(grid):
+            grids.append(grid)
+    return grids
@@ -7,7 +7,7 @@ and honeybee.radiance.geometry
 http://radsite.lbl.gov/radiance/refer/ray.html
 """
 from ..utilcol import check_name
-from .radparser import parse_from_string
+from .radparser import parse_from_string, RadianceRecord
 try:
     from .factory import primitive_from_string
 except ImportError:
@@ -135,6 +135,17 @@ class Primitive(object):
             # subclass - type will be assigned based on name
             return cls(name, modifier, values)
 
+    @classmethod
+    def from_record(cls, record, modifier=None):
+        """Create a Radiance primitive from a RadianceRecord.
+
+        Use this method for primitives that are already parsed (e.g. by
+        radparser.parse_records) to avoid converting them back to a string. If the
+        primitive has a modifier the modifier should be provided using modifier
+        argument.
+        """
+        return cls.from_string(record, modifier)
+
     @classmethod
     def from_json(cls, mat_json):
         """Make radiance primitive from json
@@ -315,6 +326,9 @@ class Primitive(object):
         Returns:
             primitive type.
         """
+        if isinstance(input_string, RadianceRecord):
+            return input_string.type
+
         input_objects = parse_from_string(input_string)
 
         if not input_objects:
@@ -333,23 +347,31 @@ class Primitive(object):
 
         Args:
             desired_type: Desired type of base modifier as a string (e.g. plastic).
-            input_string: Radiance input string
+            input_string: Radiance input string or a RadianceRecord.
             modifier: A radiance modifier for base input string.
         Returns:
             modifier, name, modifier data as a list
         """
-        input_objects = parse_from_string(input_string)
+        if isinstance(input_string, RadianceRecord):
+            # the primitive is already parsed
+            input_objects = (input_string,)
+            bm = input_string
+            bm_modifier, bm_type, bm_name = bm.modifier, bm.type, bm.name
+            bm_values = bm.arguments
+        else:
+            input_objects = parse_from_string(input_string)
 
-        if not input_objects:
-            raise ValueError(
-                '{} includes no radiance primitives.'.format(input_string)
-            )
+            if not input_objects:
+                raise ValueError(
+                    '{} includes no radiance primitives.'.format(input_string)
+                )
 
-        bm = input_objects[-1]
-        bm_data = bm.split()
-        bm_modifier = bm_data[0]
-        bm_type = bm_data[1]
-        bm_name = bm_data[2]
+            bm = input_objects[-1]
+            bm_data = bm.split()
+            bm_modifier = bm_data[0]
+            bm_type = bm_data[1]
+            bm_name = bm_data[2]
+            bm_values = bm_data[3:]
 
         if desired_type:
             # custom primitives won't have desired_type
@@ -362,7 +384,7 @@ class Primitive(object):
             if bm_modifier != 'void':
                 assert modifier, \
                     '{} has a modifier: "{}" which is not provided.'.format(
-                        bm_data[2], bm_modifier
+                        bm_name, bm_modifier
                     )
                 assert modifier.can_be_modifier, \
                     '{} cannot be a modifier!'.format(modifier)
@@ -383,7 +405,7 @@ class Primitive(object):
                 from .factory import primitive_from_string
                 modifier = primitive_from_string(modifier_primitives)
 
-        return modifier, bm_name, bm_data[3:]
+        return modifier, bm_name, bm_values
 
     @staticmethod
     def _analyze_json_input(desired_type, input_json):
@@ -4,11 +4,15 @@ Create, modify and generate radiance files from a collection of hbobjects.
 """
 from ..futil import write_to_file_by_name, copy_files_to_folder, preparedir
 from .geometry.polygon import Polygon
+from .geometry.instance import Instance
 from .material.plastic import BlackMaterial
 from .material.glow import WhiteGlow
-from .radparser import parse_from_file
+from .factory import primitives_from_file
+from .command.oconv import Oconv
 
+from collections import OrderedDict
 import datetime
+import math
 import os
 
 
@@ -34,15 +38,41 @@ class RadFile(object):
 
     @classmethod
     def from_file(cls, file_paths):
-        """create a RadFile from Radiance files."""
-        # parse the file and get the materials and geometries
-        geometries = []
-        materials = []
+        """Create a RadFile from Radiance files.
+
+        Files are parsed one primitive at a time. Each polygon will be converted to a
+        context HBSurface with its modifier as the radiance material. Other geometry
+        types and materials which are not assigned to any polygon are ignored.
+
+        Args:
+            file_paths: A list of paths to Radiance files.
+        """
+        # avoid circular import
+        from ..hbsurface import HBSurface
+        from ..surfacetype import Context
+        from .properties import RadianceProperties
+
+        if isinstance(file_paths, basestring):
+            file_paths = (file_paths,)
+
+        surfaces = []
+        ignored = 0
         for file_path in file_paths:
-            for obj in parse_from_file(file_path):
-                if obj.startswith('#'):
+            for prm in primitives_from_file(file_path):
+                if not prm.isRadianceGeometry:
                     continue
-        return cls(geometries, materials)
+                elif prm.type != 'polygon' or \
+                        not hasattr(prm.modifier, 'isRadianceMaterial'):
+                    ignored += 1
+                    continue
+                surfaces.append(
+                    HBSurface(prm.name, prm.points, Context(), True, True,
+                              RadianceProperties(prm.modifier))
+                )
+
+        if ignored:
+            print('{} non-polygon geometries are ignored.'.format(ignored))
+        return cls(surfaces)
 
     def find_bsdf_materials(self, mode=1):
         """Return a list fo BSDF materials if any."""
@@ -332,6 +362,244 @@ class RadFile(object):
         text = self.header() + '\n\n' + data
         return write_to_file_by_name(folder, filename, text, mkdir)
 
+    def write_streamed(self, folder, geometry_file=None, material_file=None,
+                       black_material_file=None, glow_material_file=None, mode=1,
+                       flipped=False, mkdir=False):
+        """Write geometries and materials to files in a single pass.
+
+        Surfaces are written to open files one by one and the full strings are never
+        created in memory. Materials are interned by name so each material is only
+        written once and blacked and glowed versions of the materials are written in
+        the same pass. Pass None for any of the files that is not needed.
+
+        Args:
+            folder: Target folder.
+            geometry_file: Geometry file name.
+            material_file: Material file name.
+            black_material_file: Blacked material file name. All the materials will be
+                set to plastic 0 0 0 0 0 in this file.
+            glow_material_file: Glowed material file name. All the materials will be
+                set to glow 0 0 1 1 1 0 in this file.
+            mode: An integer 0-2 (Default: 1)
+                0 - Do not include children surfaces.
+                1 - Include children surfaces.
+                2 - Only children surfaces.
+            flipped: Flip the surface geometry.
+            mkdir: Create the folder if does not exist already.
+
+        Returns:
+            A tuple of file paths as (geometry, material, black material, glow
+            material). Path will be None for files that are not requested.
+        """
+        if not os.path.isdir(folder):
+            if not (mkdir and preparedir(folder, False)):
+                raise ValueError("Failed to find %s." % folder)
+
+        file_names = (geometry_file, material_file, black_material_file,
+                      glow_material_file)
+        file_paths = tuple(os.path.join(folder, f) if f else None for f in file_names)
+        handles = [open(fp, 'w') if fp else None for fp in file_paths]
+        geo_file, mat_file, blk_file, glw_file = handles
+        header = self.header() + '\n\n'
+        try:
+            for outf in handles:
+                if outf:
+                    outf.write(header)
+
+            get_polygon = self.get_surface_rad_string
+            materials = set()
+            for srf in self._iter_surfaces(mode):
+                if geo_file:
+                    geo_file.write(get_polygon(srf, flipped) + '\n')
+
+                material = srf.radiance_material
+                name = material.name
+                if name in materials:
+                    continue
+                materials.add(name)
+                if mat_file:
+                    mat = material.to_rad_string()
+                    if hasattr(material, 'xmlfile'):
+                        mat = self.copy_and_replace_xml_files(mat, (material,), folder)
+                    mat_file.write(mat + '\n')
+                if blk_file:
+                    blk_file.write(BlackMaterial(name).to_rad_string() + '\n')
+                if glw_file:
+                    glw_file.write(WhiteGlow(name).to_rad_string() + '\n')
+        finally:
+            for outf in handles:
+                if outf:
+                    outf.close()
+
+        return file_paths
+
+    def _iter_surfaces(self, mode=1):
+        """Iterate over surfaces based on mode."""
+        mode = mode or 1
+        for srf in self.hb_surfaces:
+            if mode != 2:
+                yield srf
+            if mode != 0 and srf.has_child_surfaces:
+                for child_srf in srf.children_surfaces:
+                    yield child_srf
+
+    def find_repeated_surfaces(self, mode=0, flipped=False, tolerance=0.001,
+                               min_count=2, surface_groups=None):
+        """Find repeated groups of surfaces with the same shape and materials.
+
+        Surfaces are grouped by their zone and child surfaces are grouped with their
+        parent surface. Surfaces without a zone are single groups unless they are
+        grouped together in surface_groups (e.g. the faces of a louver blade). Two
+        groups are considered identical if one can be mapped to the other by a
+        rotation around z axis and a translation. This is the case for repeated
+        shading devices on a facade or repeated floor plates. Surfaces and vertices
+        should be in the same order for the groups to be matched and mirrored copies
+        are not matched. Groups with a single polygon are never instanced and groups
+        with BSDF materials are never matched.
+
+        Args:
+            mode: An integer 0-2 (Default: 0)
+                0 - Do not include children surfaces.
+                1 - Include children surfaces.
+                2 - Only children surfaces.
+            flipped: Flip the surface geometry.
+            tolerance: Tolerance for comparing vertices (Default: 0.001).
+            min_count: Minimum number of copies to create a group (Default: 2).
+            surface_groups: An optional list of lists of surfaces. Surfaces in each
+                list will be grouped together instead of being grouped by their zone.
+
+        Returns:
+            A tuple of (groups, others). Each group is a list of
+            (surfaces, canonical_points, angle, center) for each copy. canonical_points
+            is a tuple of point groups for each surface. The surfaces will match
+            canonical_points once they are rotated by angle (in degrees) around z and
+            moved to center. others is the list of surfaces which are not repeated.
+        """
+        surfaces = tuple(self._iter_surfaces(mode))
+        point_groups = tuple(srf.duplicate_vertices(flipped) for srf in surfaces)
+
+        groups = []
+        # groups with the same materials and number of vertices
+        candidates = {}
+        others = []
+        for ids in _group_surfaces(surfaces, surface_groups):
+            members = tuple(surfaces[i] for i in ids)
+            polygons = [pts for i in ids for pts in point_groups[i]]
+            if len(polygons) < 2 or \
+                    any(hasattr(srf.radiance_material, 'xmlfile') for srf in members):
+                others.extend(members)
+                continue
+
+            canonical, angle, center = _canonical_points(polygons, tolerance)
+            # split canonical point groups for each surface
+            canonical_srfs = []
+            start = 0
+            for i in ids:
+                end = start + len(point_groups[i])
+                canonical_srfs.append(canonical[start:end])
+                start = end
+            copy = (members, tuple(canonical_srfs), angle, center)
+
+            key = tuple((srf.radiance_material.name,
+                         tuple(len(pts) for pts in point_groups[i]))
+                        for srf, i in zip(members, ids))
+            for group in candidates.setdefault(key, []):
+                if _is_equal_points(group[0][1], copy[1], tolerance):
+                    group.append(copy)
+                    break
+            else:
+                group = [copy]
+                candidates[key].append(group)
+                groups.append(group)
+
+        repeated = []
+        for group in groups:
+            if len(group) >= min_count:
+                repeated.append(group)
+            else:
+                others.extend(srf for g in group for srf in g[0])
+
+        return repeated, others
+
+    def write_geometries_instanced(self, folder, filename, mode=0, flipped=False,
+                                   blacked=False, tolerance=0.001, min_count=2,
+                                   relative_to=None, mkdir=False, surface_groups=None):
+        """Write geometries to a file and replace repeated surfaces with instances.
+
+        For each repeated group of surfaces a prototype file will be written next to
+        the geometry file and each copy will be written as an instance of the frozen
+        octree of the prototype. Use the returned oconv commands to create the octrees
+        before using the geometry file. See find_repeated_surfaces.
+
+        Copies are only found if their surfaces and vertices are in the same order as
+        the first group. The rotation of each copy is measured from the first vertex
+        which is not at the center of the group, so copies with a different vertex
+        order and mirrored copies are written as separate surfaces.
+
+        Args:
+            folder: Target folder.
+            filename: File name and extension as a string.
+            mode: An integer 0-2 (Default: 0)
+                0 - Do not include children surfaces.
+                1 - Include children surfaces.
+                2 - Only children surfaces.
+            flipped: Flip the surface geometry.
+            blacked: If True prototypes will be written with BlackMaterial.
+            tolerance: Tolerance for comparing vertices (Default: 0.001).
+            min_count: Minimum number of copies to use an instance (Default: 2).
+            relative_to: An optional folder. If provided path to octrees will be
+                relative to this folder. Use this input to set the path relative to the
+                folder that the commands will be executed from.
+            mkdir: Create the folder if does not exist already.
+            surface_groups: An optional list of lists of surfaces. Surfaces in each
+                list will be grouped together instead of being grouped by their zone.
+
+        Returns:
+            Path to geometry file and a list of Oconv commands for prototypes.
+        """
+        groups, others = self.find_repeated_surfaces(mode, flipped, tolerance,
+                                                     min_count, surface_groups)
+        if not os.path.isdir(folder) and mkdir:
+            preparedir(folder)
+
+        base_name = os.path.splitext(filename)[0]
+        geo = [self.get_surface_rad_string(srf, flipped) for srf in others]
+        commands = []
+        for count, group in enumerate(groups):
+            members, canonical = group[0][:2]
+            materials = OrderedDict()
+            polygons = []
+            for srf, point_groups in zip(members, canonical):
+                material = BlackMaterial(srf.radiance_material.name) if blacked \
+                    else srf.radiance_material
+                materials[material.name] = material
+                polygons.extend(
+                    Polygon('%s_%d' % (srf.name, pcount) if len(point_groups) > 1
+                            else srf.name, pts, modifier=material)
+                    .to_rad_string(include_modifier=False)
+                    for pcount, pts in enumerate(point_groups))
+
+            proto_file = write_to_file_by_name(
+                folder, '%s..proto_%d.rad' % (base_name, count),
+                self.header() + '\n\n' +
+                '\n'.join(mat.to_rad_string() for mat in materials.itervalues()) +
+                '\n' + '\n'.join(polygons) + '\n')
+
+            octree = os.path.splitext(proto_file)[0] + '.oct'
+            if relative_to:
+                octree = os.path.relpath(octree, relative_to)
+                proto_file = os.path.relpath(proto_file, relative_to)
+            commands.append(Oconv(octree, (proto_file,)))
+
+            for hb_srfs, _, angle, center in group:
+                transform = '-rz {} -t {} {} {}'.format(
+                    _format_number(angle), *(_format_number(v) for v in center))
+                geo.append(Instance(hb_srfs[0].name, octree.replace('\\', '/'),
+                                    transform).to_rad_string())
+
+        text = self.header() + '\n\n' + '\n'.join(geo) + '\n'
+        return write_to_file_by_name(folder, filename, text, mkdir), commands
+
     def write_black_material(self, folder, filename, mkdir=False):
         """Write black material to a file."""
         text = self.header() + '\n\n' + BlackMaterial().to_rad_string()
@@ -423,3 +691,82 @@ class RadFile(object):
     def __repr__(self):
         """rad file."""
         return 'RadFile::#{}'.format(len(self.hb_surfaces))
+
+
+def _format_number(value, precision=6):
+    """Format a number for xform arguments."""
+    value = round(value, precision)
+    return '%d' % value if value == int(value) else repr(value)
+
+
+def _canonical_points(point_groups, tolerance=0.001):
+    """Move and rotate point groups to a canonical position.
+
+    Points are moved so the center of all the points is at origin and are rotated
+    around z axis so the first point with a horizontal distance from the center
+    sits on +x axis.
+
+    Returns:
+        canonical point groups, rotation angle in degrees and center.
+    """
+    pts = [pt for pts in point_groups for pt in pts]
+    count = float(len(pts))
+    cx = sum(pt[0] for pt in pts) / count
+    cy = sum(pt[1] for pt in pts) / count
+    cz = sum(pt[2] for pt in pts) / count
+
+    angle = 0
+    for pt in pts:
+        dx, dy = pt[0] - cx, pt[1] - cy
+        if dx * dx + dy * dy > tolerance * tolerance:
+            angle = math.atan2(dy, dx)
+            break
+
+    cos_a, sin_a = math.cos(-angle), math.sin(-angle)
+    canonical = tuple(
+        tuple(((pt[0] - cx) * cos_a - (pt[1] - cy) * sin_a,
+               (pt[0] - cx) * sin_a + (pt[1] - cy) * cos_a,
+               pt[2] - cz) for pt in pts)
+        for pts in point_groups)
+
+    return canonical, math.degrees(angle), (cx, cy, cz)
+
+
+def _group_surfaces(surfaces, surface_groups=None):
+    """Group surfaces by their zone or by the groups that are set by user.
+
+    Child surfaces are grouped with their parent surface.
+
+    Args:
+        surfaces: A list of honeybee surfaces.
+        surface_groups: An optional list of lists of surfaces. Surfaces in each list
+            will be grouped together instead of being grouped by their zone.
+
+    Returns:
+        A list of lists of surface indices. Groups are sorted by their first index.
+    """
+    user_groups = {}
+    for count, srfs in enumerate(surface_groups or ()):
+        for srf in srfs:
+            user_groups[id(srf)] = count
+
+    groups = OrderedDict()
+    for count, srf in enumerate(surfaces):
+        owner = srf
+        while id(owner) not in user_groups and \
+                getattr(owner, 'parent', None) is not None:
+            owner = owner.parent
+        key = ('group', user_groups[id(owner)]) if id(owner) in user_groups \
+            else ('owner', id(owner))
+        groups.setdefault(key, []).append(count)
+    return groups.values()
+
+
+def _is_equal_points(point_groups, other_point_groups, tolerance=0.001):
+    """Check if two nested collections of points are equal within tolerance."""
+    if isinstance(point_groups[0], (int, float)):
+        return all(abs(v - ov) <= tolerance
+                   for v, ov in zip(point_groups, other_point_groups))
+    return len(point_groups) == len(other_point_groups) and \
+        all(_is_equal_points(pts, opts, tolerance)
+            for pts, opts in zip(point_groups, other_point_groups))
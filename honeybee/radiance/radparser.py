@@ -1,9 +1,165 @@
 """A collection of auxiliary funtions for working with radiance files and objects."""
-import re
+from collections import namedtuple
 import os
 
 
-# support comments [#] and commands [!]
+class RadianceRecord(namedtuple('RadianceRecord',
+                                'modifier type name string_args int_args real_args')):
+    """A single Radiance primitive as parsed from a scene description.
+
+    Attributes:
+        modifier: Modifier name as a string (e.g. void).
+        type: Primitive type (e.g. plastic, polygon).
+        name: Primitive name.
+        string_args: A tuple of string arguments.
+        int_args: A tuple of integer arguments.
+        real_args: A tuple of real arguments as floats.
+    """
+
+    __slots__ = ()
+
+    @property
+    def arguments(self):
+        """Arguments as a list of strings including the number of arguments.
+
+        e.g. ['0', '0', '5', '0.5', '0.5', '0.5', '0', '0']
+        """
+        if self.type == 'alias':
+            return list(self.string_args)
+
+        values = [str(len(self.string_args))]
+        values.extend(self.string_args)
+        values.append(str(len(self.int_args)))
+        values.extend(str(v) for v in self.int_args)
+        values.append(str(len(self.real_args)))
+        values.extend(_format_real(v) for v in self.real_args)
+        return values
+
+    def to_rad_string(self):
+        """Get the record as a single line Radiance string."""
+        return ' '.join([self.modifier, self.type, self.name] + self.arguments)
+
+
+def _format_real(value):
+    """Format a real argument without losing precision."""
+    value = repr(value)
+    return value[:-2] if value.endswith('.0') else value
+
+
+def tokenize(stream):
+    """Yield tokens from a Radiance scene description.
+
+    The stream is read line by line so the memory usage is independent of the size of
+    the input. Comments [#] are removed and each command [!] is yielded as a single
+    token which starts with "!".
+
+    Args:
+        stream: An iterable of lines (e.g. an open file or a list of strings).
+    """
+    lines = iter(stream)
+    for line in lines:
+        line = line.strip()
+        if not line:
+            continue
+        if line[0] == '!':
+            # a command can continue in the next line
+            while line.endswith('\\'):
+                line = line[:-1] + ' ' + next(lines, '').strip()
+            yield line
+            continue
+        for token in line.split():
+            if token[0] == '#':
+                break
+            yield token
+
+
+def _iter_token_groups(tokens):
+    """Group tokens for each Radiance primitive.
+
+    Yields a list of tokens for each primitive and a string for each command.
+    """
+    tokens = iter(tokens)
+    for token in tokens:
+        if token[0] == '!':
+            yield token
+            continue
+        group = [token]
+        try:
+            group.append(next(tokens))
+            group.append(next(tokens))
+            if group[1] == 'alias':
+                # mod alias id [modifier] has no arguments
+                group.append(next(tokens))
+                yield group
+                continue
+            for _ in xrange(3):
+                count = next(tokens)
+                group.append(count)
+                for _ in xrange(int(count)):
+                    group.append(next(tokens))
+        except StopIteration:
+            raise ValueError(
+                'Incomplete Radiance primitive: {}'.format(' '.join(group)))
+        except ValueError:
+            raise ValueError(
+                'Invalid number of arguments for Radiance primitive: {}'.format(
+                    ' '.join(group)))
+        yield group
+
+
+def _to_record(group):
+    """Convert a group of tokens to a RadianceRecord."""
+    modifier, primitive_type, name = group[:3]
+    if primitive_type == 'alias':
+        return RadianceRecord(modifier, primitive_type, name, (group[3],), (), ())
+
+    count_1 = int(group[3])
+    string_args = tuple(group[4: 4 + count_1])
+    st = 5 + count_1
+    count_2 = int(group[st - 1])
+    int_args = tuple(int(v) for v in group[st: st + count_2])
+    st += count_2 + 1
+    try:
+        real_args = tuple(float(v) for v in group[st:])
+    except ValueError:
+        raise ValueError(
+            'Invalid real arguments for Radiance primitive: {}'.format(' '.join(group)))
+    return RadianceRecord(modifier, primitive_type, name, string_args, int_args,
+                          real_args)
+
+
+def parse_records(stream, include_commands=False):
+    """Yield a RadianceRecord for each primitive in a stream.
+
+    Args:
+        stream: An iterable of lines (e.g. an open file or a list of strings).
+        include_commands: Set to True to also yield commands [!] as strings. By
+            default commands are ignored.
+    """
+    for group in _iter_token_groups(tokenize(stream)):
+        if isinstance(group, basestring):
+            if include_commands:
+                yield group
+            continue
+        yield _to_record(group)
+
+
+def parse_records_from_file(file_path, include_commands=False):
+    """Yield a RadianceRecord for each primitive in a Radiance file.
+
+    The file is read line by line and is not loaded to memory.
+
+    Args:
+        file_path: Path to Radiance file
+        include_commands: Set to True to also yield commands [!] as strings.
+    """
+    assert os.path.isfile(file_path), "Can't find %s." % file_path
+
+    with open(file_path, "r") as rad_file:
+        for record in parse_records(rad_file, include_commands):
+            yield record
+
+
 def parse_from_string(full_string):
     """
     separate a Radiance file string into multiple strings for each object.
@@ -14,18 +170,9 @@ def parse_from_string(full_string):
     Returns:
         A list of strings. Each string represents a different Radiance Object
     """
-    raw_rad_objects = re.findall(
-        r'^\s*([^0-9].*(\s*[\d.-]+.*)*)',
-        full_string,
-        re.MULTILINE)
-
-    rad_objects = (' '.join(radiance_object[0].split())
-                   for radiance_object in raw_rad_objects)
-
-    filtered_objects = tuple(rad_object for rad_object in rad_objects
-                             if rad_object and rad_object[0] not in ['#', '!'])
-
-    return filtered_objects
+    return tuple(' '.join(group)
+                 for group in _iter_token_groups(tokenize(full_string.splitlines()))
+                 if not isinstance(group, basestring))
 
 
 def parse_from_file(file_path):
@@ -44,4 +191,6 @@ def parse_from_file(file_path):
     assert os.path.isfile(file_path), "Can't find %s." % file_path
 
     with open(file_path, "r") as rad_file:
-        return parse_from_string(rad_file.read())
+        return tuple(' '.join(group)
+                     for group in _iter_token_groups(tokenize(rad_file))
+                     if not isinstance(group, basestring))
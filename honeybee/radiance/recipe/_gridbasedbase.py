@@ -6,13 +6,16 @@ sunlighthours recipe and annual analysis recipe.
 
 from abc import ABCMeta, abstractmethod
 from ..analysisgrid import AnalysisGrid
-from ...futil import write_to_file
+from ..spatialindex import KDTree
+from ...futil import bat_to_sh
 from ...utilcol import random_name
 from ._recipebase import AnalysisRecipe
 
 from ladybug.legendparameters import LegendParameters
 
 import os
+from bisect import bisect_right
+from itertools import izip
 
 
 class GenericGridBased(AnalysisRecipe):
@@ -67,6 +70,7 @@ class GenericGridBased(AnalysisRecipe):
     def analysis_grids(self, ags):
         """Set analysis grids."""
         self._analysis_grids = tuple(ag.duplicate() for ag in ags)
+        self._spatial_index = None
 
         for ag in self._analysis_grids:
             assert hasattr(ag, 'isAnalysisGrid'), \
@@ -92,6 +96,35 @@ class GenericGridBased(AnalysisRecipe):
         """Number of total points."""
         return sum(len(tuple(pts)) for pts in self.points)
 
+    @property
+    def spatial_index(self):
+        """A KDTree for the points of all the analysis grids.
+
+        Points are added grid by grid. Use closest_points to get the grid and point
+        index for the results. The tree is created the first time it is requested.
+        """
+        if self._spatial_index is None:
+            self._spatial_index = KDTree(
+                pt for ag in self.analysis_grids for pt in ag.points)
+        return self._spatial_index
+
+    def closest_points(self, point, k=1):
+        """Find the k nearest points to a point in all the analysis grids.
+
+        Returns:
+            A list of (distance, grid index, point index) sorted by distance.
+        """
+        offsets = []
+        total = 0
+        for ag in self.analysis_grids:
+            offsets.append(total)
+            total += len(ag)
+        closest = []
+        for dist, index in self.spatial_index.nearest(point, k):
+            grid_id = bisect_right(offsets, index) - 1
+            closest.append((dist, grid_id, index - offsets[grid_id]))
+        return closest
+
     @property
     def legend_parameters(self):
         """Legend parameters for grid based analysis."""
@@ -143,15 +176,91 @@ class GenericGridBased(AnalysisRecipe):
             file_name = file_name if file_name.lower().endswith('.pts') \
                 else file_name + '.pts'
 
-            grids = '\n'.join((ag.to_rad_string() for ag in self.analysis_grids)) + '\n'
-            return write_to_file(os.path.join(target_dir, file_name), grids, mkdir)
+            if not os.path.isdir(target_dir):
+                if not mkdir:
+                    raise ValueError('Failed to find %s.' % target_dir)
+                os.makedirs(target_dir)
+            file_path = os.path.join(target_dir, file_name)
+            # write the grids one by one to avoid creating the full string
+            with open(file_path, 'w') as outf:
+                for ag in self.analysis_grids:
+                    for line in ag.iter_rad_strings():
+                        outf.write(line + '\n')
+            return file_path
         else:
-            return tuple(
-                write_to_file(os.path.join(target_dir, ag.name + '.pts'),
-                              ag.to_rad_string() + '\n',
-                              mkdir)
-                for ag in self.analysis_grids
-            )
+            return tuple(ag.write(target_dir, ag.name + '.pts', mkdir=mkdir)
+                         for ag in self.analysis_grids)
+
+    def run_adaptive(self, target_folder, project_name='untitled', grid_size=1,
+                     threshold=0.5, max_level=2, debug=False, env=None):
+        """Write and run the recipe with adaptive refinement of analysis grids.
+
+        The recipe is first calculated for the current analysis grids which should be
+        coarse regular grids with grid_size spacing. Then the points with a high value
+        gradient to their neighbors are subdivided and only the new points will be
+        calculated. This process continues for max_level times or until there is no
+        point to be refined. The new points will be merged to the analysis grids.
+
+        See AnalysisGrid.refine for more information.
+
+        Args:
+            target_folder: Path to parent folder.
+            project_name: Name of this project as a string. Each level of refinement
+                will be written to a separate project as project_name_level_x.
+            grid_size: Distance between the points in the current analysis grids.
+            threshold: Relative difference between values of two neighbor points to
+                subdivide them (Default: 0.5).
+            max_level: Maximum number of refinements (Default: 2).
+
+        Returns:
+            A list of analysis grids with the results.
+        """
+        def _run(project):
+            self._commands = []
+            self._result_files = []
+            command_file = self.write(target_folder, project)
+            if os.name != 'nt':
+                command_file = bat_to_sh(command_file)
+            self.run(command_file, debug, env)
+            return self.results()
+
+        grids = tuple(_run(project_name))
+        names = tuple(ag.name for ag in grids)
+        merged = [list(ag.analysis_points) for ag in grids]
+        # index of the refined points in merged grids
+        removed = [set() for _ in grids]
+        # index of the grids in the last run and index of their first point in the
+        # merged grids
+        current_ids = range(len(grids))
+        starts = [0] * len(grids)
+
+        for level in xrange(max_level):
+            refined = [ag.refine(grid_size, threshold) for ag in grids]
+            new_ids = [current_ids[c] for c, r in enumerate(refined) if len(r[1])]
+            if not new_ids:
+                break
+
+            print('Refining %d points for level %d.' %
+                  (sum(len(r[1]) for r in refined), level + 1))
+
+            # remove the refined points from merged grids
+            for count, (ids, _) in enumerate(refined):
+                removed[current_ids[count]].update(starts[count] + i for i in ids)
+
+            self.analysis_grids = (r[1] for r in refined if len(r[1]))
+            grids = tuple(_run('{}_level_{}'.format(project_name, level + 1)))
+            starts = []
+            for gid, ag in izip(new_ids, grids):
+                starts.append(len(merged[gid]))
+                merged[gid].extend(ag.analysis_points)
+
+            current_ids = new_ids
+            grid_size /= 2.0
+
+        self.analysis_grids = (
+            AnalysisGrid(tuple(ap for c, ap in enumerate(aps) if c not in ids), name)
+            for aps, ids, name in izip(merged, removed, names))
+        return self.analysis_grids
 
     @abstractmethod
     def results(self):
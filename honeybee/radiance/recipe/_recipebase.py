@@ -1,7 +1,11 @@
 """Base class for RADIANCE Analysis Recipes."""
 from ...futil import preparedir, get_radiance_path_lines
 from .recipeutil import input_srfs_to_rad_files
+from ..runmanager.task import Task, batch_file_to_subtasks
+from ..runmanager.journal import Journal
+from ..runmanager.estimator import estimate_batch_file
 
+from contextlib import contextmanager
 import os
 import subprocess
 
@@ -30,6 +34,7 @@ class AnalysisRecipe(object):
         self._commands = []
         self._result_files = []
         self._isCalculated = False
+        self._profiler = None
         self.isChanged = True
 
     @classmethod
@@ -49,6 +54,11 @@ class AnalysisRecipe(object):
         """Return True if the recipe is calculated."""
         return self._isCalculated
 
+    @property
+    def profiler(self):
+        """Profiler from the last run. None if the recipe is run without a profiler."""
+        return self._profiler
+
     @property
     def result_files(self):
         """Get list of result files for this recipe."""
@@ -218,11 +228,29 @@ class AnalysisRecipe(object):
         return _basePath
 
     # TODO: Write a runmanager class to handle runs
-    def run(self, command_file, debug=False, env=None):
-        """Run the analysis."""
+    def run(self, command_file, debug=False, env=None, resume=False, profiler=None):
+        """Run the analysis.
+
+        Args:
+            command_file: Path to commands file.
+            debug: Set to True to add a pause at the end of the batch file.
+            env: Optional environment variables.
+            resume: Set to True to execute the commands one by one and keep track of
+                completed commands in a journal file next to the command_file. If the
+                run is stopped, running the recipe again will resume from the first
+                incomplete command. Outputs of completed commands will be validated
+                against the size and the hash in the journal (Default: False).
+            profiler: An optional runmanager.profiler.Profiler. If provided the commands
+                will be executed one by one and resource usage of each command will be
+                recorded. Loading the results will also be recorded in the profiler.
+        """
         assert os.path.isfile(command_file), \
             ValueError('Failed to find command file: {}'.format(command_file))
 
+        self._profiler = profiler
+        if resume or profiler:
+            return self._run_subtasks(command_file, env, resume, profiler)
+
         if debug:
             with open(command_file, "a") as bf:
                 bf.write("\npause\n")
@@ -242,6 +270,54 @@ class AnalysisRecipe(object):
         self._isCalculated = True
         return True
 
+    def _run_subtasks(self, command_file, env=None, resume=False, profiler=None):
+        """Run the commands in command file one by one.
+
+        If resume is True a journal of completed commands will be kept next to the
+        command file.
+        """
+        batch = batch_file_to_subtasks(command_file)
+        cwd = os.path.dirname(os.path.abspath(command_file))
+        if batch.env:
+            env = dict(env or os.environ)
+            env.update(batch.env)
+        journal = Journal(os.path.join(cwd, 'journal.json')) if resume else None
+        task = Task(os.path.split(command_file)[-1], batch.subtasks)
+        success = task.execute(batch.cwd, env, update_freq=1, journal=journal,
+                               profiler=profiler)
+        self._isCalculated = success
+        return success
+
+    def estimate(self, command_file, calibration=None):
+        """Estimate runtime and disk usage of a written recipe before running it.
+
+        Args:
+            command_file: Path to commands file from write method.
+            calibration: An optional runmanager.estimator.Calibration. Use the
+                Calibration from profiled runs on the same machine for better
+                runtime estimates.
+
+        Returns:
+            A runmanager.estimator.Estimate with estimated number of rays, runtime and
+            output size for each command.
+        """
+        assert os.path.isfile(command_file), \
+            ValueError('Failed to find command file: {}'.format(command_file))
+        point_count = getattr(self, 'total_point_count', None)
+        hoys = getattr(self, 'result_hoys', None)
+        return estimate_batch_file(
+            command_file, point_count, len(hoys) if hoys else None,
+            self._result_files, calibration)
+
+    @contextmanager
+    def _profile(self, phase, title=None):
+        """Record a block of Python code in the profiler of the last run if any."""
+        if self._profiler is None:
+            yield None
+        else:
+            with self._profiler.phase(phase, title) as record:
+                yield record
+
     @property
     def legend_parameters(self):
         """Returns suggested legend parameters for this recipe."""
@@ -10,6 +10,7 @@ from ...sky.skymatrix import SkyMatrix
 from ...analysisgrid import AnalysisGrid
 from ...parameters.rfluxmtx import RfluxmtxParameters
 from ....hbsurface import HBSurface
+from ....schedule import Schedule
 
 import os
 
@@ -32,17 +33,19 @@ class GridBased(DaylightCoeffGridBased):
             should be an instance of RfluxmtxParameters.
         hb_objects: An optional list of Honeybee surfaces or zones (Default: None).
         sub_folder: Analysis subfolder for this recipe. (Default: "gridbased_annual").
+        occupancy: An optional occupancy Schedule or a list of 8760 values as an hour
+            mask. Unoccupied hours will not be calculated (Default: None).
 
     """
 
     def __init__(self, sky_mtx, analysis_grids, simulation_type=0,
                  radiance_parameters=None, reuse_daylight_mtx=True, hb_objects=None,
-                 sub_folder="gridbased_annual"):
+                 sub_folder="gridbased_annual", occupancy=None):
         """Create an annual recipe."""
 
         DaylightCoeffGridBased.__init__(
             self, sky_mtx, analysis_grids, simulation_type, radiance_parameters,
-            reuse_daylight_mtx, hb_objects, sub_folder)
+            reuse_daylight_mtx, hb_objects, sub_folder, occupancy)
 
     @classmethod
     def from_json(cls, rec_json):
@@ -57,7 +60,8 @@ class GridBased(DaylightCoeffGridBased):
             "rad_parameters": {
                 gridbased_parameters: string //  A standard radiance parameter string
                 (e.g. -ab 5 -aa 0.05 -ar 128)
-                }
+                },
+            "occupancy": {} // optional occupancy schedule json file
             }
         """
         sky_mtx = SkyMatrix.from_json(rec_json["sky_mtx"])
@@ -69,10 +73,12 @@ class GridBased(DaylightCoeffGridBased):
             simulation_type = rec_json["simulation_type"]
         else:
             simulation_type = None
+        occupancy = Schedule.from_json(rec_json["occupancy"]) \
+            if rec_json.get("occupancy") else None
 
         return cls(sky_mtx=sky_mtx, analysis_grids=analysis_grids,
                    radiance_parameters=rad_parameters, hb_objects=hb_objects,
-                   simulation_type=simulation_type)
+                   simulation_type=simulation_type, occupancy=occupancy)
 
     def write(self, target_folder, project_name='untitled', header=True,
               transpose=False):
@@ -109,7 +115,8 @@ class GridBased(DaylightCoeffGridBased):
             "rad_parameters": {
                 gridbased_parameters: string //  A standard radiance parameter string
                 (e.g. -ab 5 -aa 0.05 -ar 128)
-                }
+                },
+            "occupancy": {} // optional occupancy schedule json file
             }
         """
         return {
@@ -119,7 +126,8 @@ class GridBased(DaylightCoeffGridBased):
             "analysis_grids": [ag.to_json() for ag in self.analysis_grids],
             "surfaces": [srf.to_json() for srf in self.hb_objects],
             "simulation_type": self.simulation_type,
-            "rad_parameters": self.radiance_parameters.to_json()
+            "rad_parameters": self.radiance_parameters.to_json(),
+            "occupancy": self.occupancy.to_json() if self.occupancy else None
         }
 
     def results(self):
@@ -147,7 +155,7 @@ class GridBased(DaylightCoeffGridBased):
                           .format(rf, analysisGrid.name))
                     # total value only
                     analysisGrid.add_result_files(
-                        rf, self.sky_matrix.hoys, start_line, False, header=True,
+                        rf, self.result_hoys, start_line, False, header=True,
                         mode=mode
                     )
                 else:
@@ -156,12 +164,12 @@ class GridBased(DaylightCoeffGridBased):
                           .format(rf, df, analysisGrid.name))
 
                     analysisGrid.add_result_files(
-                        rf, self.sky_matrix.hoys, start_line, False, header=True,
+                        rf, self.result_hoys, start_line, False, header=True,
                         mode=mode
                     )
 
                     analysisGrid.add_result_files(
-                        df, self.sky_matrix.hoys, start_line, True, header=True,
+                        df, self.result_hoys, start_line, True, header=True,
                         mode=mode
                     )
 
@@ -1,5 +1,5 @@
 """Radiance Daylight Coefficient Grid-Based Analysis Recipe."""
-from ..recipeutil import write_extra_files
+from ..recipeutil import write_extra_files, screen_window_groups
 from ..recipedcutil import write_rad_files_daylight_coeff, get_commands_sky
 from ..recipedcutil import get_commands_scene_daylight_coeff
 from ..recipedcutil import get_commands_w_groups_daylight_coeff
@@ -10,6 +10,7 @@ from ....futil import write_to_file
 from ...analysisgrid import AnalysisGrid
 from ...parameters.rfluxmtx import RfluxmtxParameters
 from ....hbsurface import HBSurface
+from ....schedule import Schedule
 
 import os
 
@@ -28,6 +29,9 @@ class DaylightCoeffGridBased(GenericGridBased):
             should be an instance of RfluxmtxParameters.
         hb_objects: An optional list of Honeybee surfaces or zones (Default: None).
         sub_folder: Analysis subfolder for this recipe. (Default: "daylightcoeff").
+        occupancy: An optional occupancy Schedule or a list of 8760 values as an hour
+            mask. Unoccupied hours will be removed from the sky and the sun matrix
+            before the calculation (Default: None).
 
 
     Usage:
@@ -52,13 +56,18 @@ class DaylightCoeffGridBased(GenericGridBased):
 
     def __init__(self, sky_mtx, analysis_grids, simulation_type=0,
                  radiance_parameters=None, reuse_daylight_mtx=True, hb_objects=None,
-                 sub_folder="gridbased_daylightcoeff"):
+                 sub_folder="gridbased_daylightcoeff", occupancy=None):
         """Create an annual recipe."""
         GenericGridBased.__init__(
             self, analysis_grids, hb_objects, sub_folder
         )
 
+        self._occupancy = None
+        # indices of analysis grids for each window group after screening
+        self._screened_grids = None
+        self._result_grids = {}
         self.sky_matrix = sky_mtx
+        self.occupancy = occupancy
 
         self.radiance_parameters = radiance_parameters
 
@@ -69,6 +78,10 @@ class DaylightCoeffGridBased(GenericGridBased):
 
         self.reuse_daylight_mtx = reuse_daylight_mtx
 
+        self.instancing = False
+        """Set to True to write repeated opaque surfaces such as shading devices as
+           instances of frozen octrees (Default: False)."""
+
     @classmethod
     def from_json(cls, rec_json):
         """Create daylight coefficient recipe from JSON file
@@ -79,7 +92,8 @@ class DaylightCoeffGridBased(GenericGridBased):
             "analysis_grids": [], // list of analysis grids
             "surfaces": [], // list of honeybee surfaces
             "simulation_type": int // value between 0-2
-            "rad_parameters": {} // radiance gridbased parameters json file
+            "rad_parameters": {}, // radiance gridbased parameters json file
+            "occupancy": {} // optional occupancy schedule json file
             }
         """
         sky_mtx = SkyMatrix.from_json(rec_json["sky_mtx"])
@@ -88,10 +102,12 @@ class DaylightCoeffGridBased(GenericGridBased):
         hb_objects = tuple(HBSurface.from_json(srf) for srf in rec_json["surfaces"])
         rad_parameters = RfluxmtxParameters.from_json(rec_json["rad_parameters"])
         simulation_type = rec_json["simulation_type"]
+        occupancy = Schedule.from_json(rec_json["occupancy"]) \
+            if rec_json.get("occupancy") else None
 
         return cls(sky_mtx=sky_mtx, analysis_grids=analysis_grids,
                    radiance_parameters=rad_parameters, hb_objects=hb_objects,
-                   simulation_type=simulation_type)
+                   simulation_type=simulation_type, occupancy=occupancy)
 
     @classmethod
     def from_weather_file_points_and_vectors(
@@ -196,6 +212,37 @@ class DaylightCoeffGridBased(GenericGridBased):
         assert not new_sky.is_point_in_time, \
             TypeError('Sky for daylight coefficient recipe must be a sky matrix.')
         self._sky_matrix = new_sky.duplicate()
+        # keep the original hours so occupancy can be changed later
+        self._sky_hoys = tuple(self._sky_matrix.hoys)
+        self._apply_occupancy()
+
+    @property
+    def occupancy(self):
+        """Get and set occupancy schedule.
+
+        Only the occupied hours of the sky matrix will be calculated. Results for
+        each hour are still loaded under the original hour of the year. Set to None
+        to calculate all the hours of the sky matrix.
+        """
+        return self._occupancy
+
+    @occupancy.setter
+    def occupancy(self, occ):
+        if occ is not None and not hasattr(occ, 'occupied_hours'):
+            # an hour mask
+            occ = Schedule(occ)
+        self._occupancy = occ
+        self._apply_occupancy()
+
+    def _apply_occupancy(self):
+        """Remove unoccupied hours from the sky matrix."""
+        if self._occupancy is None:
+            self._sky_matrix.hoys = list(self._sky_hoys)
+            return
+
+        hoys = self._occupancy.occupied_hoys(self._sky_hoys)
+        assert hoys, ValueError('There is no occupied hour in the sky matrix hours.')
+        self._sky_matrix.hoys = list(hoys)
 
     @property
     def radiance_parameters(self):
@@ -223,6 +270,96 @@ class DaylightCoeffGridBased(GenericGridBased):
         """Number of total runs for all window groups and states."""
         return sum(wg.state_count for wg in self.window_groups) + 1  # 1 for base case
 
+    @property
+    def screened_grids(self):
+        """Indices of related analysis grids for each window group.
+
+        The value is None if window groups are not screened. Use screen_window_groups
+        method to screen window groups.
+        """
+        return self._screened_grids
+
+    def screen_window_groups(self, threshold=0.0001, sample_count=64):
+        """Find the window groups that can't contribute to each analysis grid.
+
+        Window groups will only be calculated for the analysis grids that they
+        contribute to and the results for the rest of the grids will be set to zero.
+        The contribution is estimated by a low-resolution visibility test between
+        analysis grids and window groups. See recipeutil.window_group_contribution.
+
+        Args:
+            threshold: Minimum estimated view factor for a window group to be
+                calculated for an analysis grid (Default: 0.0001).
+            sample_count: Maximum number of sample points from each analysis grid
+                (Default: 64).
+
+        Returns:
+            A dictionary with window group names as keys and tuple of indices of related
+            analysis grids as values.
+        """
+        obstacles = self.opaque_surfaces if self.opaque_rad_file else None
+        self._screened_grids = screen_window_groups(
+            self.window_groups, self.analysis_grids, obstacles, threshold, sample_count)
+        return self._screened_grids
+
+    def _write_window_group_points(self, project_folder, project_name):
+        """Write points files for screened window groups.
+
+        Returns:
+            A list of (points_file, point_count) for each window group or None if the
+            window groups are not screened. The value for window groups with no related
+            analysis grid will be None.
+        """
+        self._result_grids = {}
+        if self._screened_grids is None:
+            return None
+
+        points_files = []
+        for wg in self.window_groups:
+            ids = self._screened_grids.get(wg.name, range(len(self.analysis_grids)))
+            for state in wg.states:
+                rf = os.path.join(
+                    project_folder, 'result/{}..{}.ill'.format(wg.name, state.name))
+                self._result_grids[os.path.normpath(rf)] = tuple(ids)
+
+            if not ids:
+                points_files.append(None)
+                continue
+
+            fp = os.path.join(project_folder, '{}..{}.pts'.format(project_name, wg.name))
+            # write the grids one by one to avoid creating the full string
+            with open(fp, 'w') as outf:
+                for i in ids:
+                    for line in self.analysis_grids[i].iter_rad_strings():
+                        outf.write(line + '\n')
+            points_files.append(
+                (fp, sum(len(self.analysis_grids[i]) for i in ids)))
+
+        return points_files
+
+    def _add_screened_result_files(self, project_folder, points_files,
+                                   result_folders=('result',)):
+        """Add result files for window groups with no related analysis grid.
+
+        These files will not be calculated and their values will be set to 0.
+
+        Args:
+            project_folder: Path to project folder.
+            points_files: Output of _write_window_group_points.
+            result_folders: Relative path to result folders in project folder. A
+                result file will be added to each folder (Default: ('result',)).
+        """
+        if not points_files:
+            return
+        for wg, pf in zip(self.window_groups, points_files):
+            if pf:
+                continue
+            self._result_files.extend(
+                os.path.join(project_folder, folder,
+                             '{}..{}.ill'.format(wg.name, state.name))
+                for folder in result_folders for state in wg.states
+            )
+
     def preproc_commands(self):
         """Add echo in front of comments in batch file comments."""
         cmd = [c for c in self._commands if c]
@@ -255,7 +392,8 @@ class DaylightCoeffGridBased(GenericGridBased):
             "analysis_grids": [], // list of analysis grids
             "surfaces": [], // list of honeybee surfaces
             "simulation_type": int // value between 0-2
-            "rad_parameters": {} // radiance gridbased parameters json file
+            "rad_parameters": {}, // radiance gridbased parameters json file
+            "occupancy": {} // optional occupancy schedule json file
             }
         """
         return {
@@ -265,7 +403,8 @@ class DaylightCoeffGridBased(GenericGridBased):
             "analysis_grids": [ag.to_json() for ag in self.analysis_grids],
             "surfaces": [srf.to_json() for srf in self.hb_objects],
             "simulation_type": self.simulation_type,
-            "rad_parameters": self.radiance_parameters.to_json()
+            "rad_parameters": self.radiance_parameters.to_json(),
+            "occupancy": self.occupancy.to_json() if self.occupancy else None
         }
 
     def write(self, target_folder, project_name='untitled', header=True,
@@ -291,7 +430,7 @@ class DaylightCoeffGridBased(GenericGridBased):
         # write geometry and material files
         opqfiles, glzfiles, wgsfiles = write_rad_files_daylight_coeff(
             project_folder + '/scene', project_name, self.opaque_rad_file,
-            self.glazing_rad_file, self.window_groups_rad_files
+            self.glazing_rad_file, self.window_groups_rad_files, self.instancing
         )
         # additional radiance files added to the recipe as scene
         extrafiles = write_extra_files(self.scene, project_folder + '/scene', True)
@@ -303,6 +442,9 @@ class DaylightCoeffGridBased(GenericGridBased):
         if header:
             self._commands.append(self.header(project_folder))
 
+        # create frozen octrees for instances
+        self._commands.extend(cmd.to_rad_string() for cmd in opqfiles.commands)
+
         # # 2.1.Create sky matrix.
         # # 2.2. Create sun matrix
         skycommands, skyfiles = get_commands_sky(project_folder, self.sky_matrix,
@@ -326,16 +468,19 @@ class DaylightCoeffGridBased(GenericGridBased):
 
         if self.window_groups:
             # calculate the contribution for all window groups
+            points_files = self._write_window_group_points(project_folder, project_name)
             commands, results = get_commands_w_groups_daylight_coeff(
                 project_name, self.sky_matrix.sky_density, project_folder,
                 self.window_groups, skyfiles, inputfiles, points_file,
                 self.total_point_count, self.radiance_parameters,
-                self.reuse_daylight_mtx, self.total_runs_count, transpose=transpose)
+                self.reuse_daylight_mtx, self.total_runs_count, transpose=transpose,
+                points_files=points_files)
 
             self._add_commands(skycommands, commands)
             self._result_files.extend(
                 os.path.join(project_folder, str(result)) for result in results
             )
+            self._add_screened_result_files(project_folder, points_files)
 
         # # 2.5 write batch file
         batch_file = os.path.join(project_folder, 'commands.bat')
@@ -345,6 +490,11 @@ class DaylightCoeffGridBased(GenericGridBased):
 
         return batch_file
 
+    @property
+    def result_hoys(self):
+        """Hours of the year for the columns of the result files."""
+        return self.sky_matrix.hoys
+
     def results(self):
         """Return results for this analysis."""
         assert self._isCalculated, \
@@ -355,39 +505,54 @@ class DaylightCoeffGridBased(GenericGridBased):
         for ag in self.analysis_grids:
             ag.unload()
 
-        # results are merged as a single file
-        for rf in self._result_files:
-            fn = os.path.split(rf)[-1][:-4].split("..")
-            source = fn[-2]
-            state = fn[-1]
-
-            folder, name = os.path.split(rf)
-            df = os.path.join(folder, 'sun..%s' % name)
-            mode = 179 if self.simulation_type == 1 else 0
-            start_line = 0
-            for count, analysisGrid in enumerate(self.analysis_grids):
-                if count:
-                    start_line += len(self.analysis_grids[count - 1])
-
-                if not os.path.exists(df):
-                    print('\nloading the results for {} AnalysisGrid form {}::{}\n{}\n'
-                          .format(analysisGrid.name, source, state, rf))
-                    # total value only
-                    analysisGrid.set_values_from_file(
-                        rf, self.sky_matrix.hoys, source, state, start_line=start_line,
-                        header=True, check_point_count=False, mode=mode
-                    )
-                else:
-                    # total and direct values
-                    print(
-                        '\nloading total and direct results for {} AnalysisGrid'
-                        ' from {}::{}\n{}\n{}\n'.format(
-                            analysisGrid.name, source, state, rf, df))
-
-                    analysisGrid.set_coupled_values_from_file(
-                        rf, df, self.sky_matrix.hoys, source, state,
-                        start_line=start_line, header=True, check_point_count=False,
-                        mode=mode
-                    )
+        # check if direct values are available for zero values of screened grids
+        is_coupled = any(
+            os.path.exists(os.path.join(os.path.split(rf)[0],
+                                        'sun..%s' % os.path.split(rf)[1]))
+            for rf in self._result_files)
+
+        with self._profile('loading', 'load results'):
+            # results are merged as a single file
+            for rf in self._result_files:
+                fn = os.path.split(rf)[-1][:-4].split("..")
+                source = fn[-2]
+                state = fn[-1]
+
+                folder, name = os.path.split(rf)
+                df = os.path.join(folder, 'sun..%s' % name)
+                mode = 179 if self.simulation_type == 1 else 0
+                # indices of analysis grids in result file. None means all the grids.
+                grid_ids = self._result_grids.get(os.path.normpath(rf))
+                start_line = 0
+                for count, analysisGrid in enumerate(self.analysis_grids):
+                    if grid_ids is not None and count not in grid_ids:
+                        print('\nsetting the results for {} AnalysisGrid form {}::{} '
+                              'to 0'.format(analysisGrid.name, source, state))
+                        analysisGrid.set_zero_values(
+                            self.result_hoys, source, state, is_coupled)
+                        continue
+
+                    if not os.path.exists(df):
+                        print('\nloading the results for {} AnalysisGrid form {}::{}'
+                              '\n{}\n'.format(analysisGrid.name, source, state, rf))
+                        # total value only
+                        analysisGrid.set_values_from_file(
+                            rf, self.result_hoys, source, state, start_line=start_line,
+                            header=True, check_point_count=False, mode=mode
+                        )
+                    else:
+                        # total and direct values
+                        print(
+                            '\nloading total and direct results for {} AnalysisGrid'
+                            ' from {}::{}\n{}\n{}\n'.format(
+                                analysisGrid.name, source, state, rf, df))
+
+                        analysisGrid.set_coupled_values_from_file(
+                            rf, df, self.result_hoys, source, state,
+                            start_line=start_line, header=True, check_point_count=False,
+                            mode=mode
+                        )
+
+                    start_line += len(analysisGrid)
 
         return self.analysis_grids
@@ -0,0 +1,341 @@
+"""Radiance Daylight Coefficient Point-in-time Series Recipe."""
+from ..recipeutil import write_extra_files
+from ..recipedcutil import write_rad_files_daylight_coeff, get_commands_sky_vectors
+from ..recipedcutil import get_commands_scene_daylight_coeff
+from ..recipedcutil import get_commands_w_groups_daylight_coeff
+from .gridbased import DaylightCoeffGridBased
+from .._gridbasedbase import GenericGridBased
+from ...sky.skyvector import SkyVector
+from ...analysisgrid import AnalysisGrid
+from ...parameters.rfluxmtx import RfluxmtxParameters
+from ....futil import write_to_file
+from ....hbsurface import HBSurface
+
+from ladybug.dt import DateTime
+
+import os
+
+
+class DaylightCoeffPointInTimeSeries(DaylightCoeffGridBased):
+    """Point-in-time analysis for a series of skies using daylight coefficients.
+
+    Daylight matrices are calculated once for the analysis grids and each sky is
+    calculated as a matrix-vector multiplication. Use this recipe instead of several
+    point-in-time GridBased recipes for the same scene (e.g. 21st of each month at 9,
+    12 and 15).
+
+    Attributes:
+        sky_vectors: A list of radiance SkyVectors. All the skies should have the same
+            sky density and must have unique names. Skies can be for the same hour of
+            the year (e.g. uniform skies from different illuminance values).
+        analysis_grids: A list of Honeybee analysis grids.
+        simulation_type: 0: Illuminance(lux), 1: Radiation (kWh), 2: Luminance (Candela)
+            (Default: 0)
+        radiance_parameters: Radiance parameters for this analysis. Parameters
+            should be an instance of RfluxmtxParameters.
+        reuse_daylight_mtx: A boolean not to recalculate daylight matrices if they
+            already exist in the folder (Default: False).
+        hb_objects: An optional list of Honeybee surfaces or zones (Default: None).
+        sub_folder: Analysis subfolder for this recipe.
+            (Default: "gridbased_pointintimeseries").
+        exact_sun: Set to True to calculate the sun in each sky from its exact position
+            instead of the nearest sky patches. This adds a black daylight matrix and a
+            sun coefficient matrix to the calculation (Default: False).
+
+    Usage:
+
+        skies = [SkyVector.from_cie_sky(location, month, 21, hour)
+                 for month in xrange(1, 13) for hour in (9, 12, 15)]
+
+        analysis_recipe = DaylightCoeffPointInTimeSeries(
+            skies, analysis_grids, hb_objects=hb_objects, exact_sun=True)
+
+        # write analysis files to local drive
+        commands_file = analysis_recipe.write(_folder_, _name_)
+
+        # run the analysis
+        analysis_recipe.run(commands_file)
+
+        # get the results. Values are loaded for the index of each sky.
+        analysis_grids = analysis_recipe.results()
+        print(analysis_grids[0][0].combined_value_by_id(0))
+    """
+
+    def __init__(self, sky_vectors, analysis_grids, simulation_type=0,
+                 radiance_parameters=None, reuse_daylight_mtx=False, hb_objects=None,
+                 sub_folder="gridbased_pointintimeseries", exact_sun=False):
+        """Create a point-in-time series recipe."""
+        # sky vectors are set through sky_matrix setter
+        DaylightCoeffGridBased.__init__(
+            self, sky_vectors, analysis_grids, simulation_type, radiance_parameters,
+            reuse_daylight_mtx, hb_objects, sub_folder
+        )
+        self.exact_sun = exact_sun
+
+    @classmethod
+    def from_json(cls, rec_json):
+        """Create point-in-time series recipe from JSON file
+            {
+            "id": "daylight_coeff",
+            "type": "pointintimeseries",
+            "sky_vectors": [], // list of sky vector json files
+            "analysis_grids": [], // list of analysis grids
+            "surfaces": [], // list of honeybee surfaces
+            "simulation_type": int // value between 0-2
+            "rad_parameters": {}, // radiance gridbased parameters json file
+            "exact_sun": bool // calculate the sun from its exact position
+            }
+        """
+        sky_vectors = tuple(SkyVector.from_json(sky) for sky in rec_json["sky_vectors"])
+        analysis_grids = \
+            tuple(AnalysisGrid.from_json(ag) for ag in rec_json["analysis_grids"])
+        hb_objects = tuple(HBSurface.from_json(srf) for srf in rec_json["surfaces"])
+        rad_parameters = RfluxmtxParameters.from_json(rec_json["rad_parameters"])
+        simulation_type = rec_json["simulation_type"]
+
+        return cls(sky_vectors=sky_vectors, analysis_grids=analysis_grids,
+                   radiance_parameters=rad_parameters, hb_objects=hb_objects,
+                   simulation_type=simulation_type,
+                   exact_sun=rec_json.get("exact_sun", False))
+
+    @property
+    def simulation_type(self):
+        """Get/set simulation Type.
+
+        0: Illuminance(lux), 1: Radiation (kWh), 2: Luminance (Candela) (Default: 0)
+        """
+        return self._simType
+
+    @simulation_type.setter
+    def simulation_type(self, value):
+        try:
+            value = int(value)
+        except TypeError:
+            value = 0
+
+        assert 0 <= value <= 2, \
+            "Simulation type should be between 0-2. Current value: {}".format(value)
+
+        if value == 1:
+            assert all(sky.is_climate_based for sky in self.sky_vectors), \
+                "The skies for radition analysis should be climate-based."
+
+        self._simType = value
+        self.radiance_parameters.irradiance_calc = True if value < 2 else None
+
+    @property
+    def sky_vectors(self):
+        """Get and set the list of sky vectors."""
+        return self._sky_vectors
+
+    @sky_vectors.setter
+    def sky_vectors(self, skies):
+        skies = tuple(skies)
+        assert skies, ValueError('At least one sky vector is required.')
+        for sky in skies:
+            assert hasattr(sky, 'isSkyVector'), \
+                TypeError('{} is not a SkyVector.'.format(type(sky)))
+
+        assert len(set(sky.sky_density for sky in skies)) == 1, \
+            ValueError('All the sky vectors must have the same sky density.')
+        assert len(set(sky.name for sky in skies)) == len(skies), \
+            ValueError('Sky vectors must have unique names.')
+
+        self._sky_vectors = skies
+        self._sky_hoys = tuple(self._sky_hoy(sky) for sky in skies)
+
+    @property
+    def sky_matrix(self):
+        """Point-in-time series recipe has no sky matrix. Use sky_vectors instead."""
+        return None
+
+    @sky_matrix.setter
+    def sky_matrix(self, skies):
+        self.sky_vectors = skies
+
+    def _apply_occupancy(self):
+        """Occupancy is not used for point-in-time skies."""
+        assert self._occupancy is None, \
+            ValueError('Occupancy is not supported for point-in-time series recipe.')
+
+    @staticmethod
+    def _sky_hoy(sky):
+        """Hour of the year for a sky vector."""
+        hour = sky.hour
+        return DateTime(sky.month, sky.day, int(hour),
+                        int(60 * (hour - int(hour)))).hoy
+
+    @property
+    def sky_density(self):
+        """Radiance sky type e.g. r1, r2, r4."""
+        return "r{}".format(self.sky_vectors[0].sky_density)
+
+    @property
+    def sky_hoys(self):
+        """Hours of the year for sky vectors in the same order as sky_vectors."""
+        return self._sky_hoys
+
+    @property
+    def result_hoys(self):
+        """Index of sky vectors that are used as the ids for the results.
+
+        Results are not loaded for the hour of the year since several skies can be
+        for the same hour. Use sky_hoys to get the hour of the year for each sky.
+        """
+        return tuple(xrange(len(self.sky_vectors)))
+
+    def to_json(self):
+        """Create point-in-time series recipe JSON file
+            {
+            "id": "daylight_coeff",
+            "type": "pointintimeseries",
+            "sky_vectors": [], // list of sky vector json files
+            "analysis_grids": [], // list of analysis grids
+            "surfaces": [], // list of honeybee surfaces
+            "simulation_type": int // value between 0-2
+            "rad_parameters": {}, // radiance gridbased parameters json file
+            "exact_sun": bool // calculate the sun from its exact position
+            }
+        """
+        return {
+            "id": "daylight_coeff",
+            "type": "pointintimeseries",
+            "sky_vectors": [sky.to_json() for sky in self.sky_vectors],
+            "analysis_grids": [ag.to_json() for ag in self.analysis_grids],
+            "surfaces": [srf.to_json() for srf in self.hb_objects],
+            "simulation_type": self.simulation_type,
+            "rad_parameters": self.radiance_parameters.to_json(),
+            "exact_sun": self.exact_sun
+        }
+
+    def write(self, target_folder, project_name='untitled', header=True):
+        """Write analysis files to target folder.
+
+        Sky files are generated while writing the recipe and daylight matrices are
+        calculated once for all the skies.
+
+        Args:
+            target_folder: Path to parent folder. Files will be created under
+                target_folder/gridbased. use self.sub_folder to change subfolder name.
+            project_name: Name of this project as a string.
+            header: A boolean to include the header lines in commands.bat. header
+                includes PATH and cd toFolder
+        Returns:
+            Full path to command.bat
+        """
+        # 0.prepare target folder
+        subfolders = ['tmp', 'result/matrix'] + \
+            ['result/{}'.format(sky.name) for sky in self.sky_vectors]
+        project_folder = \
+            super(GenericGridBased, self).write_content(
+                target_folder, project_name, False, subfolders=subfolders
+            )
+
+        # write geometry and material files
+        opqfiles, glzfiles, wgsfiles = write_rad_files_daylight_coeff(
+            project_folder + '/scene', project_name, self.opaque_rad_file,
+            self.glazing_rad_file, self.window_groups_rad_files, self.instancing
+        )
+        # additional radiance files added to the recipe as scene
+        extrafiles = write_extra_files(self.scene, project_folder + '/scene', True)
+
+        # 1.write points
+        points_file = self.write_analysis_grids(project_folder, project_name)
+
+        # 2.write batch file
+        if header:
+            self._commands.append(self.header(project_folder))
+
+        # create frozen octrees for instances
+        self._commands.extend(cmd.to_rad_string() for cmd in opqfiles.commands)
+
+        # 2.1. create sky vectors and suns
+        skycommands, skyfiles = get_commands_sky_vectors(
+            project_folder, self.sky_vectors, self.exact_sun)
+        self._commands.extend(skycommands)
+
+        # black and sun coefficient matrices are only needed for the exact sun
+        simplified = skyfiles.analemma is None
+        sky_matrices = (None, None, skyfiles.analemma, skyfiles.sunlist, None)
+        inputfiles = opqfiles, glzfiles, wgsfiles, extrafiles
+
+        commands, results = get_commands_scene_daylight_coeff(
+            project_name, self.sky_vectors[0].sky_density, project_folder,
+            sky_matrices, inputfiles, points_file, self.total_point_count,
+            self.radiance_parameters, self.reuse_daylight_mtx, self.total_runs_count,
+            simplified=simplified, sky_vectors=skyfiles.sky_vectors)
+        self._commands.extend(commands)
+        self._result_files.extend(results)
+
+        if self.window_groups:
+            points_files = self._write_window_group_points(project_folder, project_name)
+            commands, results = get_commands_w_groups_daylight_coeff(
+                project_name, self.sky_vectors[0].sky_density, project_folder,
+                self.window_groups, sky_matrices, inputfiles, points_file,
+                self.total_point_count, self.radiance_parameters,
+                self.reuse_daylight_mtx, self.total_runs_count,
+                points_files=points_files, simplified=simplified,
+                sky_vectors=skyfiles.sky_vectors)
+            self._commands.extend(commands)
+            self._result_files.extend(results)
+            self._add_screened_result_files(
+                project_folder, points_files,
+                ['result/{}'.format(sky.name) for sky in self.sky_vectors])
+
+        batch_file = os.path.join(project_folder, 'commands.bat')
+        write_to_file(batch_file, '\n'.join(self.preproc_commands()))
+
+        return batch_file
+
+    def results(self):
+        """Return results for this analysis.
+
+        Values for each sky are loaded for the index of the sky in sky_vectors.
+        """
+        assert self._isCalculated, \
+            "You haven't run the Recipe yet. Use self.run " + \
+            "to run the analysis before loading the results."
+
+        print('Unloading the current values from the analysis grids.')
+        for ag in self.analysis_grids:
+            ag.unload()
+
+        hoys = dict((sky.name, (count,))
+                    for count, sky in enumerate(self.sky_vectors))
+        mode = 179 if self.simulation_type == 1 else 0
+
+        with self._profile('loading', 'load results'):
+            for rf in self._result_files:
+                folder, name = os.path.split(rf)
+                result_folder, sky_name = os.path.split(folder)
+                source, state = name[:-4].split('..')[-2:]
+                df = os.path.join(folder, 'sun..%s' % name)
+                # screened grids are stored for result folder
+                grid_ids = self._result_grids.get(
+                    os.path.normpath(os.path.join(result_folder, name)))
+                start_line = 0
+                for count, analysis_grid in enumerate(self.analysis_grids):
+                    if grid_ids is not None and count not in grid_ids:
+                        analysis_grid.set_zero_values(
+                            hoys[sky_name], source, state, self.exact_sun)
+                        continue
+
+                    if os.path.exists(df):
+                        analysis_grid.set_coupled_values_from_file(
+                            rf, df, hoys[sky_name], source, state,
+                            start_line=start_line, header=True,
+                            check_point_count=False, mode=mode)
+                    else:
+                        analysis_grid.set_values_from_file(
+                            rf, hoys[sky_name], source, state, start_line=start_line,
+                            header=True, check_point_count=False, mode=mode)
+
+                    start_line += len(analysis_grid)
+
+        return self.analysis_grids
+
+    def __repr__(self):
+        """Represent point-in-time series recipe."""
+        return '%s: #skies: %d #PointGroups: %d #Points: %d' % \
+            (self.__class__.__name__, len(self.sky_vectors),
+             self.analysis_grid_count, self.total_point_count)
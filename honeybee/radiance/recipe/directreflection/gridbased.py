@@ -7,10 +7,10 @@ from ...command.oconv import Oconv
 from ...command.rcontrib import Rcontrib
 from ...analysisgrid import AnalysisGrid
 from ...sky.analemma import Analemma
+from ...sky.solarposition import sun_up_vectors
 from ....futil import write_to_file
 from ....hbsurface import HBSurface
 
-from ladybug.sunpath import Sunpath
 from ladybug.location import Location
 
 import os
@@ -72,9 +72,7 @@ class DirectReflectionGridBased(SolarAccessGridBased):
         if 'sun_vectors' not in rec_json or not rec_json['sun_vectors']:
             # create sun vectors from location inputs
             loc = Location.from_json(rec_json['location'])
-            sp = Sunpath.from_location(loc)
-            suns = (sp.calculate_sun_from_hoy(hoy) for hoy in hoys)
-            sun_vectors = tuple(s.sun_vector for s in suns if s.is_during_day)
+            sun_vectors, hoys = sun_up_vectors(loc, hoys)
         else:
             sun_vectors = rec_json['sun_vectors']
 
@@ -121,16 +119,11 @@ class DirectReflectionGridBased(SolarAccessGridBased):
                                timestep=1, reflective_surfaces=None,
                                context_surfaces=None, sub_folder='directreflection'):
         """Create direct reflection recipe from Location and hours of year."""
-        # update materials for reflective objects and context
-        reflective_surfaces = reflective_surfaces or []
-        context_surfaces = context_surfaces or []
-
-        hb_objects = cls.update_reflective_surfaces(reflective_surfaces) + \
-            context_surfaces
-
-        return cls.from_location_and_hoys(
-            location, hoys, point_groups, vector_groups, timestep, hb_objects, sub_folder
-        )
+        sun_vectors, sun_up_hoys = sun_up_vectors(location, hoys)
+        analysis_grids = cls.analysis_grids_from_points_and_vectors(point_groups,
+                                                                    vector_groups)
+        return cls(sun_vectors, sun_up_hoys, analysis_grids, timestep,
+                   reflective_surfaces, context_surfaces, sub_folder)
 
     @classmethod
     def from_location_and_analysis_period(
@@ -138,16 +131,12 @@ class DirectReflectionGridBased(SolarAccessGridBased):
             reflective_surfaces=None, context_surfaces=None,
             sub_folder='directreflection'):
         """Create direct reflection recipe from Location and analysis period."""
-        # update materials for reflective objects and context
-        reflective_surfaces = reflective_surfaces or []
-        context_surfaces = context_surfaces or []
-
-        hb_objects = cls.update_reflective_surfaces(reflective_surfaces) + \
-            context_surfaces
-
-        return cls.from_location_and_analysis_period(
-            location, analysis_period, point_groups, vector_groups,
-            hb_objects, sub_folder)
+        vector_groups = vector_groups or ()
+        sun_vectors, hoys = sun_up_vectors(location, analysis_period.hoys)
+        analysis_grids = cls.analysis_grids_from_points_and_vectors(point_groups,
+                                                                    vector_groups)
+        return cls(sun_vectors, hoys, analysis_grids, analysis_period.timestep,
+                   reflective_surfaces, context_surfaces, sub_folder)
 
     @staticmethod
     def update_reflective_surfaces(surfaces):
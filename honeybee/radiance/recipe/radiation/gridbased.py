@@ -17,9 +17,17 @@ from ....futil import write_to_file
 from ...analysisgrid import AnalysisGrid
 from ...parameters.rfluxmtx import RfluxmtxParameters
 from ....hbsurface import HBSurface
+from ....schedule import Schedule
 
 import os
 
+CUMULATIVE_HOY = -1
+"""Hour of the year key for cumulative results.
+
+Cumulative results don't belong to any hour of the year and are loaded under this key.
+Use analysis_point.values((CUMULATIVE_HOY,)) to get the cumulative value of a point.
+"""
+
 
 class GridBased(DaylightCoeffGridBased):
     """Grid based daylight coefficient analysis recipe.
@@ -33,19 +41,27 @@ class GridBased(DaylightCoeffGridBased):
             should be an instance of RfluxmtxParameters.
         hb_objects: An optional list of Honeybee surfaces or zones (Default: None).
         sub_folder: Analysis subfolder for this recipe. (Default: "daylightcoeff").
+        cumulative: Set to True to sum up the sky and the sun matrix for all the hours
+            before multiplying them by the daylight matrices. Cumulative results
+            are a single value for each sensor which will be loaded under
+            CUMULATIVE_HOY (-1) instead of an hour of the year (Default: False).
+        occupancy: An optional occupancy Schedule or a list of 8760 values as an hour
+            mask. Unoccupied hours will not be calculated (Default: None).
 
     """
 
     def __init__(self, sky_mtx, analysis_grids,
                  radiance_parameters=None, reuse_daylight_mtx=True, hb_objects=None,
-                 sub_folder="gridbased_radiation"):
+                 sub_folder="gridbased_radiation", cumulative=False, occupancy=None):
         """Create an annual recipe."""
 
         simulation_type = 1
 
         DaylightCoeffGridBased.__init__(
             self, sky_mtx, analysis_grids, simulation_type, radiance_parameters,
-            reuse_daylight_mtx, hb_objects, sub_folder)
+            reuse_daylight_mtx, hb_objects, sub_folder, occupancy)
+
+        self.cumulative = cumulative
 
     @classmethod
     def from_json(cls, rec_json):
@@ -56,7 +72,9 @@ class GridBased(DaylightCoeffGridBased):
             "sky_mtx": {}, // sky matrix json file
             "analysis_grids": [], // list of analysis grids
             "surfaces": [], // list of honeybee surfaces
-            "rad_parameters": {} // radiance gridbased parameters json file
+            "rad_parameters": {}, // radiance gridbased parameters json file
+            "cumulative": false, // optional boolean for cumulative sky
+            "occupancy": {} // optional occupancy schedule json file
             }
         """
         sky_mtx = SkyMatrix.from_json(rec_json["sky_mtx"])
@@ -65,9 +83,12 @@ class GridBased(DaylightCoeffGridBased):
         hb_objects = tuple(HBSurface.from_json(srf) for srf in rec_json["surfaces"])
 
         rad_parameters = RfluxmtxParameters.from_json(rec_json["rad_parameters"])
+        occupancy = Schedule.from_json(rec_json["occupancy"]) \
+            if rec_json.get("occupancy") else None
 
         return cls(sky_mtx=sky_mtx, analysis_grids=analysis_grids,
-                   radiance_parameters=rad_parameters, hb_objects=hb_objects)
+                   radiance_parameters=rad_parameters, hb_objects=hb_objects,
+                   cumulative=rec_json.get("cumulative", False), occupancy=occupancy)
 
     @classmethod
     def from_weather_file_points_and_vectors(
@@ -124,7 +145,9 @@ class GridBased(DaylightCoeffGridBased):
             "analysis_grids": [], // list of analysis grids
             "surfaces": [], // list of honeybee surfaces
             "simulation_type": int // value between 0-2
-            "rad_parameters": {} // radiance gridbased parameters json file
+            "rad_parameters": {}, // radiance gridbased parameters json file
+            "cumulative": bool, // a boolean for cumulative sky
+            "occupancy": {} // optional occupancy schedule json file
             }
         """
         return {
@@ -133,9 +156,35 @@ class GridBased(DaylightCoeffGridBased):
             "sky_mtx": self.sky_matrix.to_json(),
             "analysis_grids": [ag.to_json() for ag in self.analysis_grids],
             "surfaces": [srf.to_json() for srf in self.hb_objects],
-            "rad_parameters": self.radiance_parameters.to_json()
+            "rad_parameters": self.radiance_parameters.to_json(),
+            "cumulative": self.cumulative,
+            "occupancy": self.occupancy.to_json() if self.occupancy else None
         }
 
+    @property
+    def cumulative(self):
+        """A boolean to sum up the sky for all the hours before the calculation.
+
+        In cumulative mode the sky and the sun matrices are summed up for all the hours
+        and the result for each sensor will be a single cumulative value instead of
+        a value for each hour.
+        """
+        return self._cumulative
+
+    @cumulative.setter
+    def cumulative(self, value):
+        self._cumulative = bool(value)
+
+    @property
+    def result_hoys(self):
+        """Hours of the year for the columns of the result files.
+
+        Cumulative results are loaded under CUMULATIVE_HOY.
+        """
+        if self.cumulative:
+            return (CUMULATIVE_HOY,)
+        return self.sky_matrix.hoys
+
     def write(self, target_folder, project_name='untitled', header=True,
               transpose=False, simplified=False):
         """Write analysis files to target folder.
@@ -159,7 +208,7 @@ class GridBased(DaylightCoeffGridBased):
         # write geometry and material files
         opqfiles, glzfiles, wgsfiles = write_rad_files_daylight_coeff(
             project_folder + '/scene', project_name, self.opaque_rad_file,
-            self.glazing_rad_file, self.window_groups_rad_files
+            self.glazing_rad_file, self.window_groups_rad_files, self.instancing
         )
         # additional radiance files added to the recipe as scene
         extrafiles = write_extra_files(self.scene, project_folder + '/scene', True)
@@ -171,10 +220,14 @@ class GridBased(DaylightCoeffGridBased):
         if header:
             self._commands.append(self.header(project_folder))
 
+        # create frozen octrees for instances
+        self._commands.extend(cmd.to_rad_string() for cmd in opqfiles.commands)
+
         # # 2.1.Create sky matrix.
         # # 2.2. Create sun matrix
         skycommands, skyfiles = get_commands_radiation_sky(
-            project_folder, self.sky_matrix, reuse=True, simplified=simplified)
+            project_folder, self.sky_matrix, reuse=True, simplified=simplified,
+            cumulative=self.cumulative)
 
         self._commands.extend(skycommands)
 
@@ -195,17 +248,19 @@ class GridBased(DaylightCoeffGridBased):
 
         if self.window_groups:
             # calculate the contribution for all window groups
+            points_files = self._write_window_group_points(project_folder, project_name)
             commands, results = get_commands_w_groups_daylight_coeff(
                 project_name, self.sky_matrix.sky_density, project_folder,
                 self.window_groups, skyfiles, inputfiles, points_file,
                 self.total_point_count, self.radiance_parameters,
                 self.reuse_daylight_mtx, self.total_runs_count, radiation_only=True,
-                transpose=transpose)
+                transpose=transpose, points_files=points_files)
 
             self._add_commands(skycommands, commands)
             self._result_files.extend(
                 os.path.join(project_folder, str(result)) for result in results
             )
+            self._add_screened_result_files(project_folder, points_files)
 
         # # 2.5 write batch file
         batch_file = os.path.join(project_folder, 'commands.bat')
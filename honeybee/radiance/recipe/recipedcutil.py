@@ -4,6 +4,7 @@ from ..command.rfluxmtx import Rfluxmtx
 from ..command.dctimestep import Dctimestep
 from ..command.rmtxop import Rmtxop, RmtxopMatrix
 from ..command.gendaymtx import Gendaymtx
+from ..command.genskyvec import Genskyvec
 from ..sky.sunmatrix import SunMatrix
 from ..sky.analemma import AnalemmaReversed as Analemma
 from ..command.oconv import Oconv
@@ -11,15 +12,20 @@ from ..command.rpict import Rpict
 from ..command.rcontrib import Rcontrib
 from ..command.vwrays import Vwrays
 from ..parameters.rpict import RpictParameters
+from ..geometry.source import Source
+from ..material.light import Light
+from ..radparser import parse_records_from_file
 from .recipeutil import glz_srf_to_window_group
 from .parameters import get_radiance_parameters_grid_based, \
     get_radiance_parameters_image_based
 
+import hashlib
 import os
 from collections import namedtuple
 
 
-def write_rad_files_daylight_coeff(working_dir, project_name, opq, glz, wgs):
+def write_rad_files_daylight_coeff(working_dir, project_name, opq, glz, wgs,
+                                   instancing=False):
     """Write files to a target directory for daylight coefficeint method.
 
     The files will be written under
@@ -32,25 +38,46 @@ def write_rad_files_daylight_coeff(working_dir, project_name, opq, glz, wgs):
         opq: A RadFile for opaque surfaces.
         glz: A RadFile for glazing surfaces.
         wgs: A collection of RadFiles for window-groups.
+        instancing: Set to True to write repeated opaque surfaces as instances of
+            frozen octrees (Default: False).
 
     Returns:
-        A named tuple for each RadFile as (fp, fpblk)
+        A named tuple for each RadFile as (fp, fpblk, commands)
         fp returns the file path to the list of radiance files.
         fpblk returns the file path to the list of blacked radiance files.
+        commands returns the list of oconv commands to create the octrees for
+        instances. These commands must be executed before using the files.
     """
-    Files = namedtuple('Files', ['fp', 'fpblk'])
+    Files = namedtuple('Files', ['fp', 'fpblk', 'commands'])
 
     folder = os.path.join(working_dir, 'opaque')
-    of = opq.write_geometries(folder, '%s..opq.rad' % project_name, 0, mkdir=True)
-    om = opq.write_materials(folder, '%s..opq.mat' % project_name, 0, blacked=False)
-    bm = opq.write_materials(folder, '%s..blk.mat' % project_name, 0, blacked=True)
-    opqf = Files((om, of), (bm, of))
+    if instancing:
+        # instance octrees are referenced relative to project folder
+        project_folder = os.path.split(os.path.normpath(working_dir))[0]
+        of, ocmds = opq.write_geometries_instanced(
+            folder, '%s..opq.rad' % project_name, 0, relative_to=project_folder,
+            mkdir=True)
+        ofb, bcmds = opq.write_geometries_instanced(
+            folder, '%s..opq_blk.rad' % project_name, 0, blacked=True,
+            relative_to=project_folder)
+        commands = tuple(ocmds) + tuple(bcmds)
+        _, om, bm, _ = opq.write_streamed(
+            folder, None, '%s..opq.mat' % project_name, '%s..blk.mat' % project_name,
+            mode=0)
+    else:
+        # write geometries, materials and blacked materials in a single pass
+        of, om, bm, _ = opq.write_streamed(
+            folder, '%s..opq.rad' % project_name, '%s..opq.mat' % project_name,
+            '%s..blk.mat' % project_name, mode=0, mkdir=True)
+        ofb = of
+        commands = ()
+    opqf = Files((om, of), (bm, ofb), commands)
 
     folder = os.path.join(working_dir, 'glazing')
-    ogf = glz.write_geometries(folder, '%s..glz.rad' % project_name, 0, mkdir=True)
-    ogm = glz.write_materials(folder, '%s..glz.mat' % project_name, 0, blacked=False)
-    bgm = glz.write_materials(folder, '%s..blk.mat' % project_name, 0, blacked=True)
-    glzf = Files((ogm, ogf), (bgm, ogf))
+    ogf, ogm, bgm, _ = glz.write_streamed(
+        folder, '%s..glz.rad' % project_name, '%s..glz.mat' % project_name,
+        '%s..blk.mat' % project_name, mode=0, mkdir=True)
+    glzf = Files((ogm, ogf), (bgm, ogf), ())
 
     wgfs = []
     folder = os.path.join(working_dir, 'wgroup')
@@ -78,7 +105,7 @@ def write_rad_files_daylight_coeff(working_dir, project_name, opq, glz, wgs):
             wgfstate.append(wgfst)
 
         wg.state = 0  # set the state back to 0
-        wgfs.append(Files(wgfstate, (wgbm, wgbf)))
+        wgfs.append(Files(wgfstate, (wgbm, wgbf), ()))
 
         copy_files_to_folder(bsdfs, bsdffolder)
 
@@ -141,7 +168,107 @@ def get_commands_sky(project_folder, sky_matrix, reuse=True):
     return SkyCommands(commands, of)
 
 
-def get_commands_radiation_sky(project_folder, sky_matrix, reuse=True, simplified=False):
+SkyVectorFiles = namedtuple('SkyVectorFiles', 'name total direct sun')
+"""Sky vector files relative to project folder for a single sky."""
+
+
+def get_commands_sky_vectors(project_folder, sky_vectors, exact_sun=False):
+    """Get list of commands to generate sky vectors for a series of skies.
+
+    Sky files are generated under project_folder/sky by executing gensky/gendaylit
+    and this function returns the commands to generate the sky vectors for them. For
+    exact_sun the sun of each sky is also written to a single analemma to be
+    calculated from a sun coefficient matrix instead of being assigned to the nearest
+    sky patches.
+
+    Returns a namedtuple for (commands, output_files)
+    output_files in a namedtuple itself (sky_vectors, analemma, sunlist). sky_vectors
+        is a list of SkyVectorFiles (name, total, direct, sun) for each sky. direct
+        and sun are None if exact_sun is False or there is no sun in the sky.
+        analemma and sunlist are None if there is no sun in any of the skies.
+    """
+    OutputFiles = namedtuple('OutputFiles', 'sky_vectors analemma sunlist')
+    SkyCommands = namedtuple('SkyCommands', 'commands output_files')
+
+    sky_folder = os.path.join(project_folder, 'sky')
+    commands = []
+    files = []
+    suns = []
+    for sky in sky_vectors:
+        sky_file = os.path.join(sky_folder,
+                                os.path.split(str(sky.sky.output_file))[-1])
+        sky.sky.output_file = sky_file
+        sky.sky.execute()
+
+        total = 'sky/{}.vec'.format(sky.name)
+        gsv = Genskyvec(sky_subdivision=sky.sky_density, input_sky_file=os.path.relpath(
+            sky_file, project_folder), output_file=total)
+        commands.append(':: {} sky vector'.format(sky.name))
+        commands.append(gsv.to_rad_string())
+
+        sun = sun_from_sky_file(sky_file) if exact_sun else None
+        if not sun:
+            files.append(SkyVectorFiles(sky.name, total, None, None))
+            continue
+
+        # sun only sky vector to be replaced with the exact sun
+        direct = 'sky/{}_direct.vec'.format(sky.name)
+        gsv = Genskyvec(sky_subdivision=sky.sky_density, sun_only_vector=True,
+                        input_sky_file=os.path.relpath(sky_file, project_folder),
+                        output_file=direct)
+        commands.append(gsv.to_rad_string())
+        files.append(SkyVectorFiles(sky.name, total, direct,
+                                    'sky/{}.sun'.format(sky.name)))
+        suns.append(sun)
+
+    if not suns:
+        return SkyCommands(commands, OutputFiles(files, None, None))
+
+    analemma = os.path.join(sky_folder, 'suns.rad')
+    sunlist = os.path.join('.', 'sky', 'suns.mod')
+    with open(analemma, 'wb') as outf, \
+            open(os.path.join(project_folder, sunlist), 'wb') as outm:
+        for count, (vector, _) in enumerate(suns):
+            mat = Light('sol_%03d' % count, 1e6, 1e6, 1e6)
+            sun = Source('sun_%03d' % count, vector, 0.533, mat)
+            outf.write(sun.to_rad_string(True).replace('\n', ' ') + '\n')
+            outm.write('sol_%03d\n' % count)
+
+    # a column of values for all the suns with only one sun on for each sky
+    header = '#?RADIANCE\nSun vector created by Honeybee\n' \
+        'NROWS=%d\nNCOLS=1\nNCOMP=3\nFORMAT=ascii\n\n' % len(suns)
+    sky_files = (f for f in files if f.sun)
+    for count, (f, (_, values)) in enumerate(zip(sky_files, suns)):
+        sun_values = ['0 0 0'] * len(suns)
+        sun_values[count] = '{} {} {}'.format(*values)
+        with open(os.path.join(project_folder, f.sun), 'wb') as outf:
+            outf.write(header + '\n'.join(sun_values) + '\n')
+
+    return SkyCommands(commands, OutputFiles(files, analemma, sunlist))
+
+
+def sun_from_sky_file(sky_file):
+    """Get the sun from a sky file generated by gensky or gendaylit.
+
+    Returns:
+        A tuple of (direction, (r, g, b)) for the sun source. direction is toward the
+        sun. None if there is no sun in the sky.
+    """
+    if not os.path.isfile(sky_file):
+        return None
+    lights = {}
+    for record in parse_records_from_file(sky_file):
+        if record.type == 'light':
+            lights[record.name] = record.real_args[:3]
+        elif record.type == 'source' and record.modifier in lights:
+            values = lights[record.modifier]
+            if not any(values):
+                return None
+            return record.real_args[:3], values
+
+
+def get_commands_radiation_sky(project_folder, sky_matrix, reuse=True, simplified=False,
+                               cumulative=False):
     """Get list of commands to generate the skies.
 
     1. sky matrix diffuse
@@ -155,6 +282,10 @@ def get_commands_radiation_sky(project_folder, sky_matrix, reuse=True, simplifie
         sunlist, analemmaMtx).
 
     Simplified method will only calculate radiation under patched sky.
+
+    Cumulative method sums up the sky and the sun matrix for all the hours before
+    multiplying them by the daylight matrices. The output of the study will be a
+    single column matrix with the cumulative values for each sensor.
     """
     if not simplified:
         OutputFiles = namedtuple('OutputFiles',
@@ -177,13 +308,18 @@ def get_commands_radiation_sky(project_folder, sky_matrix, reuse=True, simplifie
     if gdm:
         note = ':: diffuse sky matrix' if not simplified else ':: total sky matrix'
         commands.extend((note, gdm))
+    if cumulative:
+        cum_sky = cumulative_sky_matrix(sky_matrix, project_folder)
+        commands.extend((':: cumulative sky matrix', cum_sky.to_rad_string()))
+        sky_mtx_diff = str(cum_sky.output_file)
     sky_matrix.mode = 0
 
     if not simplified:
         # # 2.2. Create sun matrix
         sm = SunMatrix(sky_matrix.wea, sky_matrix.north, sky_matrix.hoys,
                        sky_matrix.sky_type, suffix=sky_matrix.suffix)
-        analemma_mtx = sm.execute(os.path.join(project_folder, 'sky'), reuse=reuse)
+        analemma_mtx = sm.execute(os.path.join(project_folder, 'sky'), reuse=reuse,
+                                  cumulative=cumulative)
         ann = Analemma.from_wea(sky_matrix.wea, sky_matrix.hoys, sky_matrix.north)
         ann.execute(os.path.join(project_folder, 'sky'))
         sunlist = os.path.join('.', 'sky', ann.sunlist_file)
@@ -196,12 +332,57 @@ def get_commands_radiation_sky(project_folder, sky_matrix, reuse=True, simplifie
     return SkyCommands(commands, of)
 
 
+def cumulative_sky_matrix(sky_matrix, project_folder):
+    """Return rmtxop command to sum up the values of sky matrix for all the hours.
+
+    The sky matrix is multiplied by a single column matrix of ones which is written
+    to project_folder/sky. Multiplying the daylight matrix by the cumulative sky
+    results in a single column instead of one column for each hour.
+
+    Args:
+        sky_matrix: A SkyMatrix. The output sky matrix will be named based on the
+            current mode of the sky.
+        project_folder: Path to project_folder.
+    """
+    hours_count = len(sky_matrix.hoys)
+    ones_mtx = 'sky/ones_{}.mtx'.format(hours_count)
+    fp = os.path.join(project_folder, ones_mtx)
+    if not os.path.isfile(fp):
+        with open(fp, 'w') as outf:
+            outf.write('#?RADIANCE\nNROWS=%d\nNCOLS=1\nNCOMP=3\nFORMAT=ascii\n\n'
+                       % hours_count)
+            outf.write('1 1 1\n' * hours_count)
+
+    cum_sky = Rmtxop(
+        matrix_files=('sky/{}.smx'.format(sky_matrix.name), ones_mtx),
+        output_file='sky/{}_cum.smx'.format(sky_matrix.name), concatenate=True)
+    cum_sky.rmtxop_parameters.output_format = 'a'
+    return cum_sky
+
+
+def points_file_id(points_file, block_size=2 ** 20):
+    """A short id for the test points inside a points file.
+
+    The id is added to the name of daylight matrices for screened window groups so a
+    matrix which is calculated for a different set of points is not reused.
+    """
+    md5 = hashlib.md5()
+    with open(points_file, 'rb') as inf:
+        while True:
+            data = inf.read(block_size)
+            if not data:
+                break
+            md5.update(data)
+    return md5.hexdigest()[:8]
+
+
 # TODO(mostapha): restructure inputs to make the method useful for a normal user.
 # It's currently structured to satisfy what we need for the recipes.
 def get_commands_scene_daylight_coeff(
         project_name, sky_density, project_folder, skyfiles, inputfiles,
         points_file, total_point_count, rfluxmtx_parameters, reuse_daylight_mtx=False,
-        total_count=1, radiation_only=False, transpose=False, simplified=False):
+        total_count=1, radiation_only=False, transpose=False, simplified=False,
+        sky_vectors=None):
     """Get commands for the static windows in the scene.
 
     Use get_commands_w_groups_daylight_coeff to get the commands for the rest of the
@@ -223,6 +404,9 @@ def get_commands_scene_daylight_coeff(
         rfluxmtx_parameters: An instance of rfluxmtx_parameters for daylight matrix.
         reuse_daylight_mtx: A boolean not to include the commands for daylight matrix
             calculation if they already exist inside the folder.
+        sky_vectors: An optional list of SkyVectorFiles. Daylight matrices will be
+            multiplied by each sky vector instead of the sky matrix. Use
+            get_commands_sky_vectors to generate this list.
     """
     # unpack inputs
     opqfiles, glzfiles, wgsfiles, extrafiles = inputfiles
@@ -244,7 +428,8 @@ def get_commands_scene_daylight_coeff(
         project_name, sky_density, project_folder, window_group, skyfiles,
         inputfiles, points_file, total_point_count, blkmaterial, wgsblacked,
         rfluxmtx_parameters, 0, window_groupfiles, reuse_daylight_mtx, (1, total_count),
-        radiation_only=radiation_only, transpose=transpose, simplified=simplified)
+        radiation_only=radiation_only, transpose=transpose, simplified=simplified,
+        sky_vectors=sky_vectors)
 
     return commands, results
 
@@ -252,7 +437,8 @@ def get_commands_scene_daylight_coeff(
 def get_commands_w_groups_daylight_coeff(
         project_name, sky_density, project_folder, window_groups, skyfiles, inputfiles,
         points_file, total_point_count, rfluxmtx_parameters, reuse_daylight_mtx=False,
-        total_count=1, radiation_only=False, transpose=False):
+        total_count=1, radiation_only=False, transpose=False, points_files=None,
+        simplified=False, sky_vectors=None):
     """Get commands for the static windows in the scene.
 
     Use get_commands_w_groups_daylight_coeff to get the commands for the rest of the
@@ -275,12 +461,27 @@ def get_commands_w_groups_daylight_coeff(
         rfluxmtx_parameters: An instance of rfluxmtx_parameters for daylight matrix.
         reuse_daylight_mtx: A boolean not to include the commands for daylight matrix
             calculation if they already exist inside the folder.
+        points_files: An optional list of (points_file, point_count) for each window
+            group to be used instead of points_file and total_point_count. Use None
+            for window groups that should not be calculated.
+        simplified: Set to True to only calculate the total daylight matrix.
+        sky_vectors: An optional list of SkyVectorFiles. Daylight matrices will be
+            multiplied by each sky vector instead of the sky matrix.
     """
     # unpack inputs
     opqfiles, glzfiles, wgsfiles, extrafiles = inputfiles
     commands = []
     results = []
     for count, window_group in enumerate(window_groups):
+        if points_files:
+            if not points_files[count]:
+                continue
+            wg_points_file, wg_point_count = points_files[count]
+            matrix_id = points_file_id(wg_points_file)
+        else:
+            wg_points_file, wg_point_count = points_file, total_point_count
+            matrix_id = None
+
         # get black material file
         blkmaterial = [wgsfiles[count].fpblk[0]]
         # add all the blacked window groups but the one in use
@@ -293,10 +494,11 @@ def get_commands_w_groups_daylight_coeff(
 
         cmds, res = _get_commands_daylight_coeff(
             project_name, sky_density, project_folder, window_group, skyfiles,
-            inputfiles, points_file, total_point_count, blkmaterial, wgsblacked,
+            inputfiles, wg_points_file, wg_point_count, blkmaterial, wgsblacked,
             rfluxmtx_parameters, count, window_groupfiles=None,
             reuse_daylight_mtx=reuse_daylight_mtx, counter=(counter, total_count),
-            radiation_only=radiation_only, transpose=transpose)
+            radiation_only=radiation_only, transpose=transpose, simplified=simplified,
+            sky_vectors=sky_vectors, matrix_id=matrix_id)
 
         commands.extend(cmds)
         results.extend(res)
@@ -308,12 +510,14 @@ def _get_commands_daylight_coeff(
         project_name, sky_density, project_folder, window_group, skyfiles, inputfiles,
         points_file, total_point_count, blkmaterial, wgsblacked, rfluxmtx_parameters,
         window_group_count=0, window_groupfiles=None, reuse_daylight_mtx=False,
-        counter=None, radiation_only=False, transpose=False, simplified=False):
+        counter=None, radiation_only=False, transpose=False, simplified=False,
+        sky_vectors=None, matrix_id=None):
     """Get commands for the daylight coefficient recipe.
 
     This function is used by get_commands_scene_daylight_coeff and
     get_commands_w_groups_daylight_coeff. You usually don't want to use this function
-    directly.
+    directly. Use matrix_id to add the id of points_file to daylight matrix names if
+    points_file is not the points file for all the analysis grids.
     """
     commands = []
     result_files = []
@@ -363,14 +567,15 @@ def _get_commands_daylight_coeff(
              blkmaterial, wgsblacked)
             for f in fl)
 
-        d_matrix = 'result/matrix/normal_{}..{}..{}.dc'.format(
-            project_name, window_group.name, state.name)
+        matrix_name = '{}..{}..{}{}.dc'.format(
+            project_name, window_group.name, state.name,
+            '..{}'.format(matrix_id) if matrix_id else '')
 
-        d_matrix_direct = 'result/matrix/black_{}..{}..{}.dc'.format(
-            project_name, window_group.name, state.name)
+        d_matrix = 'result/matrix/normal_' + matrix_name
 
-        sun_matrix = 'result/matrix/sun_{}..{}..{}.dc'.format(
-            project_name, window_group.name, state.name)
+        d_matrix_direct = 'result/matrix/black_' + matrix_name
+
+        sun_matrix = 'result/matrix/sun_' + matrix_name
 
         if not os.path.isfile(os.path.join(project_folder, d_matrix)) \
                 or not reuse_daylight_mtx:
@@ -437,6 +642,17 @@ def _get_commands_daylight_coeff(
             commands.append(':: :: 1. reusing daylight matrices')
             commands.append('::')
 
+        if sky_vectors:
+            cmds, results = sky_vectors_calculation_commands(
+                window_group.name, state.name, d_matrix, d_matrix_direct, sun_matrix,
+                sky_vectors)
+            commands.extend(cmds)
+            result_files.extend(os.path.join(project_folder, r) for r in results)
+            commands.append(
+                ':: end of calculation for {}, {}'.format(window_group.name, state.name))
+            commands.append('::')
+            continue
+
         commands.append(':: :: 2. matrix multiplication')
         commands.append('::')
         if simplified:
@@ -446,37 +662,27 @@ def _get_commands_daylight_coeff(
         if radiation_only:
             commands.append(':: :: [1/2] calculating daylight mtx * %s sky' % rsky_type)
             commands.append(
-                ':: :: dctimestep [dc.mtx] [%s sky] ^> [%s results.rgb]' % (rsky_type,
-                                                                            rsky_type))
+                ':: :: dctimestep [dc.mtx] [%s sky] ^| '
+                'rmtxop -c 47.4 119.9 11.6 - ^> [%s results.ill]'
+                % (rsky_type, rsky_type))
             dct_total = matrix_calculation(
                 'tmp/{}..{}..{}.rgb'.format(rsky_type, window_group.name, state.name),
                 d_matrix=d_matrix, sky_matrix=sky_mtxDiff
             )
-        else:
-            commands.append(':: :: [1/3] calculating daylight mtx * total sky')
-            commands.append(
-                ':: :: dctimestep [dc.mtx] [total sky] ^> [total results.rgb]')
-
-            dct_total = matrix_calculation(
-                'tmp/total..{}..{}.rgb'.format(window_group.name, state.name),
-                d_matrix=d_matrix, sky_matrix=sky_mtx_total
-            )
-
-        commands.append(dct_total.to_rad_string())
-
-        if radiation_only:
-            commands.append(
-                ':: :: rmtxop -c 47.4 119.9 11.6 [results.rgb] ^> [%s results.ill]' %
-                rsky_type
-            )
             finalmtx = rgb_matrix_file_to_ill(
                 (dct_total.output_file,),
                 'result/{}..{}..{}.ill'.format(rsky_type, window_group.name, state.name),
                 transpose
             )
         else:
+            commands.append(':: :: [1/3] calculating daylight mtx * total sky')
             commands.append(
-                ':: :: rmtxop -c 47.4 119.9 11.6 [results.rgb] ^> [total results.ill]'
+                ':: :: dctimestep [dc.mtx] [total sky] ^| '
+                'rmtxop -c 47.4 119.9 11.6 - ^> [total results.ill]')
+
+            dct_total = matrix_calculation(
+                'tmp/total..{}..{}.rgb'.format(window_group.name, state.name),
+                d_matrix=d_matrix, sky_matrix=sky_mtx_total
             )
             finalmtx = rgb_matrix_file_to_ill(
                 (dct_total.output_file,),
@@ -484,32 +690,28 @@ def _get_commands_daylight_coeff(
                 transpose
             )
 
+        # pipe rgb values to rmtxop to avoid writing the intermediate matrix to disk
         commands.append('::')
-        commands.append(finalmtx.to_rad_string())
+        commands.append((dct_total | finalmtx).to_rad_string())
 
         if not radiation_only:
             commands.append(
                 ':: :: [2/3] calculating black daylight mtx * direct only sky')
             commands.append(
-                ':: :: dctimestep [black dc.mtx] [direct only sky] ^> '
-                '[direct results.rgb]')
+                ':: :: dctimestep [black dc.mtx] [direct only sky] ^| '
+                'rmtxop -c 47.4 119.9 11.6 - ^> [direct results.ill]')
 
             dct_direct = matrix_calculation(
                 'tmp/direct..{}..{}.rgb'.format(window_group.name, state.name),
                 d_matrix=d_matrix_direct, sky_matrix=sky_mtx_direct
             )
-            commands.append(dct_direct.to_rad_string())
-            commands.append(
-                ':: :: rmtxop -c 47.4 119.9 11.6 [direct results.rgb] ^> '
-                '[direct results.ill]'
-            )
             commands.append('::')
             finalmtx = rgb_matrix_file_to_ill(
                 (dct_direct.output_file,),
                 'result/direct..{}..{}.ill'.format(window_group.name, state.name),
                 transpose
             )
-            commands.append(finalmtx.to_rad_string())
+            commands.append((dct_direct | finalmtx).to_rad_string())
 
         if not simplified:
             if not radiation_only:
@@ -518,26 +720,20 @@ def _get_commands_daylight_coeff(
                 commands.append(':: :: [2/2] calculating black daylight mtx * analemma')
 
             commands.append(
-                ':: :: dctimestep [black dc.mtx] [analemma only sky] ^> '
-                '[sun results.rgb]')
+                ':: :: dctimestep [black dc.mtx] [analemma only sky] ^| '
+                'rmtxop -c 47.4 119.9 11.6 - ^> [sun results.ill]')
             dct_sun = sun_matrix_calculation(
                 'tmp/sun..{}..{}.rgb'.format(window_group.name, state.name),
                 dc_matrix=sun_matrix,
                 sky_matrix=os.path.relpath(analemmaMtx, project_folder)
             )
-            commands.append(dct_sun.to_rad_string())
-
-            commands.append(
-                ':: :: rmtxop -c 47.4 119.9 11.6 [sun results.rgb] ^> '
-                '[sun results.ill]'
-            )
             commands.append('::')
             finalmtx = rgb_matrix_file_to_ill(
                 (dct_sun.output_file,),
                 'result/sun..{}..{}.ill'.format(window_group.name, state.name),
                 transpose
             )
-            commands.append(finalmtx.to_rad_string())
+            commands.append((dct_sun | finalmtx).to_rad_string())
 
             commands.append(':: :: 3. calculating final results')
             if radiation_only:
@@ -861,6 +1057,56 @@ def sun_coeff_matrix_commands(output, point_file, scene_files, analemma, sunlist
     return (octree, rctb)
 
 
+def sky_vectors_calculation_commands(wg_name, state_name, d_matrix, d_matrix_direct,
+                                     sun_matrix, sky_vectors):
+    """Get commands to multiply daylight matrices by a list of sky vectors.
+
+    Results for each sky are written to result/[sky name] folder. For skies with exact
+    sun the sun only sky vector is multiplied by black daylight matrix and is
+    replaced by the results from the sun coefficient matrix.
+
+    Returns:
+        commands, result files
+    """
+    commands = []
+    results = []
+    commands.append(':: :: 2. matrix multiplication for {} skies'.format(
+        len(sky_vectors)))
+    commands.append('::')
+    for sky in sky_vectors:
+        output = 'result/{}/{}..{}.ill'.format(sky.name, wg_name, state_name)
+        commands.append(':: :: calculating daylight mtx * {}'.format(sky.name))
+        total = output if not sky.sun else \
+            'result/{}/total..{}..{}.ill'.format(sky.name, wg_name, state_name)
+        dct = matrix_calculation(
+            'tmp/total..{}..{}.rgb'.format(wg_name, state_name),
+            d_matrix=d_matrix, sky_matrix=sky.total)
+        commands.append((dct | rgb_matrix_file_to_ill((dct.output_file,), total))
+                        .to_rad_string())
+        results.append(output)
+        if not sky.sun:
+            continue
+
+        direct = 'result/{}/direct..{}..{}.ill'.format(sky.name, wg_name, state_name)
+        dct = matrix_calculation(
+            'tmp/direct..{}..{}.rgb'.format(wg_name, state_name),
+            d_matrix=d_matrix_direct, sky_matrix=sky.direct)
+        commands.append((dct | rgb_matrix_file_to_ill((dct.output_file,), direct))
+                        .to_rad_string())
+
+        sun = 'result/{}/sun..{}..{}.ill'.format(sky.name, wg_name, state_name)
+        dct = sun_matrix_calculation(
+            'tmp/sun..{}..{}.rgb'.format(wg_name, state_name),
+            dc_matrix=sun_matrix, sky_matrix=sky.sun)
+        commands.append((dct | rgb_matrix_file_to_ill((dct.output_file,), sun))
+                        .to_rad_string())
+
+        commands.append(
+            final_matrix_addition(total, direct, sun, output).to_rad_string())
+
+    return commands, results
+
+
 def final_matrix_addition(skymtx, skydirmtx, sunmtx, output):
     """Add final sky, direct sky and sun matrix."""
     # Instantiate matrices for subtraction and addition.
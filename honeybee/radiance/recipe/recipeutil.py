@@ -5,6 +5,7 @@ from ..radfile import RadFile
 from ...futil import write_to_file_by_name, copy_files_to_folder, preparedir
 
 import os
+import math
 from collections import Counter, namedtuple
 
 
@@ -178,3 +179,158 @@ def write_rad_files(scene_folder, project_name, opq, glz, wgs):
         wgfs.append(wgfstate)
 
     return opqf, glzf, wgfs
+
+
+def _polygon_properties(points):
+    """Return centroid, unit normal and area for a planar polygon."""
+    nx = ny = nz = 0
+    count = len(points)
+    for i in xrange(count):
+        x0, y0, z0 = points[i]
+        x1, y1, z1 = points[(i + 1) % count]
+        nx += (y0 - y1) * (z0 + z1)
+        ny += (z0 - z1) * (x0 + x1)
+        nz += (x0 - x1) * (y0 + y1)
+    length = math.sqrt(nx ** 2 + ny ** 2 + nz ** 2)
+    centroid = tuple(sum(pt[i] for pt in points) / float(count) for i in xrange(3))
+    if length == 0:
+        return centroid, (0, 0, 0), 0
+    return centroid, (nx / length, ny / length, nz / length), length / 2.0
+
+
+def _obstacle(points):
+    """Prepare an opaque polygon for intersection tests."""
+    centroid, normal, area = _polygon_properties(points)
+    # project the polygon to the plane with the largest normal component
+    axis = max(xrange(3), key=lambda i: abs(normal[i]))
+    u, v = [i for i in xrange(3) if i != axis]
+    poly2d = tuple((pt[u], pt[v]) for pt in points)
+    bbox = tuple((min(pt[i] for pt in points), max(pt[i] for pt in points))
+                 for i in xrange(3))
+    d = sum(n * c for n, c in zip(normal, centroid))
+    return normal, d, u, v, poly2d, bbox
+
+
+def _is_blocked(start, end, obstacles, tolerance=1e-6):
+    """Check if the line between start and end intersects any of the obstacles."""
+    vec = tuple(e - s for s, e in zip(start, end))
+    for normal, d, u, v, poly2d, bbox in obstacles:
+        denom = sum(n * c for n, c in zip(normal, vec))
+        if abs(denom) < tolerance:
+            continue
+        t = (d - sum(n * c for n, c in zip(normal, start))) / denom
+        if t <= tolerance or t >= 1 - tolerance:
+            continue
+        pt = tuple(s + t * c for s, c in zip(start, vec))
+        if any(pt[i] < bbox[i][0] - tolerance or pt[i] > bbox[i][1] + tolerance
+               for i in xrange(3)):
+            continue
+        # even-odd test for point in polygon
+        x, y = pt[u], pt[v]
+        inside = False
+        j = len(poly2d) - 1
+        for i in xrange(len(poly2d)):
+            xi, yi = poly2d[i]
+            xj, yj = poly2d[j]
+            if (yi > y) != (yj > y) and x < (xj - xi) * (y - yi) / float(yj - yi) + xi:
+                inside = not inside
+            j = i
+        if inside:
+            return True
+    return False
+
+
+def window_group_contribution(window_group, analysis_grid, obstacles=None,
+                              sample_count=64):
+    """Estimate the contribution of a window group to an analysis grid.
+
+    This is a low-resolution visibility test to find window groups that can't
+    illuminate an analysis grid. For a sample of points in the grid the view factor to
+    the window group is estimated as A * cos(theta) / (pi * d ^ 2) for each face of the
+    window group and it is scaled by the portion of visible sample points on the face
+    (center and vertices). The direction of analysis points is not considered as the
+    light can still reach the point after reflections.
+
+    Args:
+        window_group: A Honeybee dynamic surface.
+        analysis_grid: An AnalysisGrid.
+        obstacles: An optional list of opaque Honeybee surfaces that can block the
+            window group.
+        sample_count: Maximum number of sample points from analysis grid
+            (Default: 64).
+
+    Returns:
+        The maximum estimated view factor for the sample points.
+    """
+    faces = []
+    for pts in window_group.absolute_points:
+        centroid, normal, area = _polygon_properties(pts)
+        if area == 0:
+            continue
+        # move the vertices slightly toward the center to avoid the edges
+        samples = [centroid] + [tuple(c + 0.9 * (p - c) for p, c in zip(pt, centroid))
+                                for pt in pts]
+        faces.append((centroid, normal, area, samples))
+
+    points = tuple(tuple(pt) for pt in analysis_grid.points)
+    step = max(1, int(math.ceil(len(points) / float(sample_count))))
+    points = points[::step]
+
+    if obstacles:
+        # only keep obstacles which intersect the bounding box of points and window
+        all_pts = list(points) + [s for f in faces for s in f[3]]
+        bbox = tuple((min(pt[i] for pt in all_pts), max(pt[i] for pt in all_pts))
+                     for i in xrange(3))
+        obstacles = tuple(
+            _obstacle(pts) for srf in obstacles for pts in srf.absolute_points
+            if all(min(pt[i] for pt in pts) <= bbox[i][1] and
+                   max(pt[i] for pt in pts) >= bbox[i][0] for i in xrange(3))
+        )
+
+    contribution = 0
+    for pt in points:
+        value = 0
+        for centroid, normal, area, samples in faces:
+            vec = tuple(c - p for p, c in zip(pt, centroid))
+            dist2 = sum(c ** 2 for c in vec)
+            if dist2 == 0:
+                continue
+            cos = abs(sum(n * c for n, c in zip(normal, vec))) / math.sqrt(dist2)
+            vf = area * cos / (math.pi * dist2)
+            if vf == 0:
+                continue
+            if obstacles:
+                visible = sum(1 for s in samples if not _is_blocked(pt, s, obstacles))
+                vf *= visible / float(len(samples))
+            value += vf
+        contribution = max(contribution, value)
+    return contribution
+
+
+def screen_window_groups(window_groups, analysis_grids, obstacles=None,
+                         threshold=0.0001, sample_count=64):
+    """Find analysis grids that each window group can contribute to.
+
+    Args:
+        window_groups: A list of Honeybee dynamic surfaces.
+        analysis_grids: A list of AnalysisGrids.
+        obstacles: An optional list of opaque Honeybee surfaces that can block the
+            window groups.
+        threshold: Minimum estimated view factor for a window group to be
+            considered for an analysis grid (Default: 0.0001).
+        sample_count: Maximum number of sample points from each analysis grid
+            (Default: 64).
+
+    Returns:
+        A dictionary with window group names as keys and tuple of indices of related
+        analysis grids as values.
+    """
+    screened = {}
+    for wg in window_groups:
+        screened[wg.name] = tuple(
+            count for count, ag in enumerate(analysis_grids)
+            if window_group_contribution(wg, ag, obstacles, sample_count) > threshold
+        )
+        print('Window group {} contributes to {} of {} analysis grids.'.format(
+            wg.name, len(screened[wg.name]), len(analysis_grids)))
+    return screened
@@ -293,17 +293,15 @@ def matrix_calculation_three_phase(
         commands.append(':: :: State {} [{} out of {}]'
                         .format(state.name, stcount + 1, len(window_group.states)))
         commands.append(':: :: [3/3] v_matrix * d_matrix * t_matrix')
-        commands.append(':: :: dctimestep [vmx] [tmtx] [dmtx] ^ > [results.rgb]')
-        commands.append(dct.to_rad_string())
+        commands.append(':: :: dctimestep [vmx] [tmtx] [dmtx] ^| '
+                        'rmtxop -c 47.4 119.9 11.6 - ^> [results.ill]')
 
         # 5. convert r, g ,b values to illuminance
         final_output = r'result/{}..{}.ill'.format(window_group.name, state.name)
         finalmtx = rgb_matrix_file_to_ill((dct.output_file,), final_output, transpose)
-        commands.append(
-            ':: :: rmtxop -c 47.4 119.9 11.6 [results.rgb] ^> [results.ill]')
         commands.append('::')
         commands.append('::')
-        commands.append(finalmtx.to_rad_string())
+        commands.append((dct | finalmtx).to_rad_string())
 
         results.append(os.path.join(project_folder, final_output))
 
@@ -356,14 +354,14 @@ def matrix_calculation_five_phase(
         output = r'tmp/3phase..{}..{}.tmp'.format(window_group.name, state.name)
         dct = matrix_calculation(output, v_matrix, t_matrix, d_matrix, sky_mtx_total)
         commands.append(':: :: [3/5] v_matrix * d_matrix * t_matrix')
-        commands.append(':: :: dctimestep [vmx] [tmtx] [dmtx] ^ > [results.rgb]')
-        commands.append(dct.to_rad_string())
+        commands.append(':: :: dctimestep [vmx] [tmtx] [dmtx] ^| '
+                        'rmtxop -c 47.4 119.9 11.6 - ^> [results.ill]')
 
         # 5. convert r, g ,b values to illuminance
         final_output = r'result/3phase..{}..{}.ill'.format(
             window_group.name, state.name)
         finalmtx = rgb_matrix_file_to_ill((dct.output_file,), final_output, transpose)
-        commands.append(finalmtx.to_rad_string())
+        commands.append((dct | finalmtx).to_rad_string())
 
         results.append(os.path.join(project_folder, final_output))
 
@@ -373,14 +371,14 @@ def matrix_calculation_five_phase(
         output = r'tmp/direct..{}..{}.tmp'.format(window_group.name, state.name)
         dct = matrix_calculation(output, dv_matrix, t_matrix, dd_matrix, sky_mtx_direct)
         commands.append(':: :: [4/5] v_matrix * d_matrix * t_matrix')
-        commands.append(':: :: dctimestep [vmx] [tmtx] [dmtx] ^ > [results.rgb]')
-        commands.append(dct.to_rad_string())
+        commands.append(':: :: dctimestep [vmx] [tmtx] [dmtx] ^| '
+                        'rmtxop -c 47.4 119.9 11.6 - ^> [results.ill]')
 
         # 5. convert r, g ,b values to illuminance
         final_output = r'result/direct..{}..{}.ill'.format(
             window_group.name, state.name)
         finalmtx = rgb_matrix_file_to_ill((dct.output_file,), final_output, transpose)
-        commands.append(finalmtx.to_rad_string())
+        commands.append((dct | finalmtx).to_rad_string())
 
         results.append(os.path.join(project_folder, final_output))
 
@@ -424,24 +422,19 @@ def matrix_calculation_five_phase(
 
         commands.append(':: :: calculating black daylight mtx * analemma')
         commands.append(
-            ':: :: dctimestep [black dc.mtx] [analemma only sky] ^> [sun results.rgb]')
+            ':: :: dctimestep [black dc.mtx] [analemma only sky] ^| '
+            'rmtxop -c 47.4 119.9 11.6 - ^> [sun results.ill]')
         dct_sun = sun_matrix_calculation(
             'tmp/sun..{}..{}.rgb'.format(window_group.name, state.name),
             dc_matrix=sun_matrix,
             sky_matrix=os.path.relpath(analemmaMtx, project_folder)
         )
-        commands.append(dct_sun.to_rad_string())
-
-        commands.append(
-            ':: :: rmtxop -c 47.4 119.9 11.6 [sun results.rgb] ^> '
-            '[sun results.ill]'
-        )
         commands.append('::')
         finalmtx = rgb_matrix_file_to_ill(
             (dct_sun.output_file,),
             'result/sun..{}..{}.ill'.format(window_group.name, state.name), transpose
         )
-        commands.append(finalmtx.to_rad_string())
+        commands.append((dct_sun | finalmtx).to_rad_string())
 
         commands.append(':: :: calculating final results')
         commands.append(
@@ -7,11 +7,11 @@ from ...command.oconv import Oconv
 from ...command.rcontrib import Rcontrib
 from ...analysisgrid import AnalysisGrid
 from ...sky.analemma import Analemma
+from ...sky.solarposition import sun_up_vectors
 from ....futil import write_to_file
 from ....vectormath.euclid import Vector3
 from ....hbsurface import HBSurface
 
-from ladybug.sunpath import Sunpath
 from ladybug.location import Location
 from ladybug.legendparameters import LegendParameters
 from ladybug.color import Colorset
@@ -93,9 +93,7 @@ class SolarAccessGridBased(GenericGridBased):
         if 'sun_vectors' not in rec_json or not rec_json['sun_vectors']:
             # create sun vectors from location inputs
             loc = Location.from_json(rec_json['location'])
-            sp = Sunpath.from_location(loc)
-            suns = (sp.calculate_sun_from_hoy(hoy) for hoy in hoys)
-            sun_vectors = tuple(s.sun_vector for s in suns if s.is_during_day)
+            sun_vectors, hoys = sun_up_vectors(loc, hoys)
         else:
             sun_vectors = rec_json['sun_vectors']
 
@@ -164,12 +162,7 @@ class SolarAccessGridBased(GenericGridBased):
     def from_location_and_hoys(cls, location, hoys, point_groups, vector_groups=[],
                                timestep=1, hb_objects=None, sub_folder='sunlighthour'):
         """Create sunlighthours recipe from Location and hours of year."""
-        sp = Sunpath.from_location(location)
-
-        suns = tuple(sp.calculate_sun_from_hoy(hoy) for hoy in hoys)
-
-        sun_vectors = tuple(s.sun_vector for s in suns if s.is_during_day)
-        sun_up_hoys = tuple(s.hoy for s in suns if s.is_during_day)
+        sun_vectors, sun_up_hoys = sun_up_vectors(location, hoys)
         analysis_grids = cls.analysis_grids_from_points_and_vectors(point_groups,
                                                                     vector_groups)
         return cls(sun_vectors, sun_up_hoys, analysis_grids, timestep, hb_objects,
@@ -182,12 +175,7 @@ class SolarAccessGridBased(GenericGridBased):
         """Create sunlighthours recipe from Location and analysis period."""
         vector_groups = vector_groups or ()
 
-        sp = Sunpath.from_location(location)
-
-        suns = tuple(sp.calculate_sun_from_hoy(hoy) for hoy in analysis_period.hoys)
-
-        sun_vectors = tuple(s.sun_vector for s in suns if s.is_during_day)
-        hoys = tuple(s.hoy for s in suns if s.is_during_day)
+        sun_vectors, hoys = sun_up_vectors(location, analysis_period.hoys)
 
         analysis_grids = cls.analysis_grids_from_points_and_vectors(point_groups,
                                                                     vector_groups)
@@ -0,0 +1,652 @@
+"""Distribute Radiance subtasks to workers over TCP.
+
+A Coordinator runs on the machine with the project folder and dispatches subtasks to
+Workers which can run on other machines. Subtasks in a task are executed one after
+each other and different tasks are executed in parallel on different workers.
+
+Input files are moved to workers and output files are moved back to the project
+folder either through a shared ArtifactStore (e.g. a network drive) or streamed on
+demand over the same connection. Workers send heartbeats while a command is running
+and subtasks will be dispatched to another worker if a worker fails.
+
+Messages are json lines. A message for a file is followed by the content of the file.
+Workers must send the coordinator's token in the first message and file paths that
+resolve outside the project folder are rejected. The coordinator only listens on
+localhost by default. Set host to the address of the machine for remote workers.
+
+Usage:
+
+    # on the coordinator machine
+    coordinator = Coordinator('c:/ladybug/room/gridbased_daylightcoeff',
+                              host='10.0.0.5', port=8025, token='my-secret-token')
+    coordinator.start()
+    success = coordinator.execute(tasks)
+    coordinator.stop()
+
+    # on each worker machine
+    Worker('10.0.0.5', 8025, 'c:/ladybug/worker', token='my-secret-token').run()
+
+    # local stand-in with 4 workers on one machine
+    success = run_local(tasks, 'c:/ladybug/room/gridbased_daylightcoeff', workers=4)
+"""
+from .journal import Journal
+from .task import parse_command
+
+from collections import deque
+import binascii
+import json
+import os
+import shutil
+import socket
+import subprocess
+import tempfile
+import threading
+import time
+
+BLOCK_SIZE = 2 ** 16
+
+
+def _replace(source, target):
+    """Replace target file with source file."""
+    if os.path.isfile(target):
+        # os.rename fails on Windows if the file exists
+        os.remove(target)
+    os.rename(source, target)
+
+
+def _file_info(file_path):
+    """Return size and modification time for a file."""
+    st = os.stat(file_path)
+    return st.st_size, int(st.st_mtime)
+
+
+def _relative_path(folder, rel_path):
+    """Get full path to a file inside a folder.
+
+    Symbolic links are resolved before checking the path.
+
+    Raises ValueError if the path is outside the folder.
+    """
+    folder = os.path.realpath(folder)
+    file_path = os.path.realpath(os.path.join(folder, rel_path))
+    if not os.path.normcase(file_path).startswith(os.path.normcase(folder) + os.sep):
+        raise ValueError('{} is not inside {}.'.format(rel_path, folder))
+    return file_path
+
+
+def _merge_paths(paths, other_paths):
+    """Merge two lists of relative paths and remove the duplicates."""
+    merged = []
+    normalized = set()
+    for rel_path in tuple(paths) + tuple(other_paths or ()):
+        norm_path = os.path.normpath(rel_path)
+        if norm_path not in normalized:
+            normalized.add(norm_path)
+            merged.append(rel_path)
+    return merged
+
+
+def _is_valid_token(token, expected):
+    """Compare a token with the expected token in constant time."""
+    if not isinstance(token, basestring) or len(token) != len(expected):
+        return False
+    result = 0
+    for x, y in zip(token, expected):
+        result |= ord(x) ^ ord(y)
+    return result == 0
+
+
+def command_files(command, cwd):
+    """Find input and output files of a command.
+
+    Inputs are the arguments of the command which are existing files in cwd and
+    outputs are files after > and files after -o for rcontrib and rfluxmtx. Output
+    file patterns (e.g. sky_%03d.hdr) and commands (e.g. !pcomb) after -o are
+    ignored. Files which are referenced inside other files (e.g. BSDF files in a
+    material file) can't be found this way and should be set as input_files for the
+    SubTask.
+
+    Returns:
+        A tuple of (inputs, outputs) as relative paths.
+    """
+    inputs = []
+    outputs = []
+    for token, is_output in parse_command(command):
+        if is_output:
+            outputs.append(token)
+        elif not os.path.isabs(token) and not token.startswith('-') \
+                and os.path.isfile(os.path.join(cwd, token)) \
+                and token not in inputs:
+            inputs.append(token)
+    return inputs, outputs
+
+
+class Connection(object):
+    """A message connection over a socket.
+
+    Messages are json lines. A message can be followed by the content of a file in
+    which case the size of the file is included in the message.
+    """
+
+    def __init__(self, sock):
+        self._sock = sock
+        self._file = sock.makefile('rb')
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, host, port, timeout=None):
+        """Connect to a coordinator."""
+        return cls(socket.create_connection((host, port), timeout))
+
+    def settimeout(self, timeout):
+        self._sock.settimeout(timeout)
+
+    def send(self, message, file_path=None):
+        """Send a message and the content of an optional file."""
+        with self._lock:
+            if file_path:
+                message['size'] = os.path.getsize(file_path)
+            self._sock.sendall(json.dumps(message) + '\n')
+            if not file_path:
+                return
+            with open(file_path, 'rb') as inf:
+                while True:
+                    data = inf.read(BLOCK_SIZE)
+                    if not data:
+                        break
+                    self._sock.sendall(data)
+
+    def receive(self):
+        """Receive a message."""
+        line = self._file.readline()
+        if not line:
+            raise EOFError('Connection is closed.')
+        return json.loads(line)
+
+    def receive_file(self, size, file_path):
+        """Receive the content of a file and write it to file_path."""
+        folder = os.path.dirname(file_path)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        temp_file = file_path + '.part'
+        remaining = size
+        with open(temp_file, 'wb') as outf:
+            while remaining:
+                data = self._file.read(min(BLOCK_SIZE, remaining))
+                if not data:
+                    raise EOFError('Connection is closed while receiving a file.')
+                outf.write(data)
+                remaining -= len(data)
+        _replace(temp_file, file_path)
+
+    def close(self):
+        try:
+            self._file.close()
+            self._sock.close()
+        except socket.error:
+            pass
+
+
+class ArtifactStore(object):
+    """A shared folder to move files between the coordinator and workers.
+
+    Files are only copied if the size or the modification time is changed.
+
+    Attributes:
+        folder: Path to a folder which is accessible from all the machines.
+    """
+
+    def __init__(self, folder):
+        self.folder = folder
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+
+    @staticmethod
+    def _copy(source, target):
+        if os.path.isfile(target) and _file_info(source) == _file_info(target):
+            return
+        folder = os.path.dirname(target)
+        if folder and not os.path.isdir(folder):
+            os.makedirs(folder)
+        shutil.copy2(source, target + '.part')
+        _replace(target + '.part', target)
+
+    def put(self, rel_path, file_path):
+        """Add a file to the store."""
+        self._copy(file_path, _relative_path(self.folder, rel_path))
+
+    def get(self, rel_path, file_path):
+        """Copy a file from the store."""
+        self._copy(_relative_path(self.folder, rel_path), file_path)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """ArtifactStore representation."""
+        return 'ArtifactStore: %s' % self.folder
+
+
+class Coordinator(object):
+    """Dispatch subtasks to workers.
+
+    Attributes:
+        cwd: Project folder. Commands are executed relative to this folder.
+        host: Host to listen on. Use the address of the machine or 0.0.0.0 to accept
+            workers from other machines (Default: 127.0.0.1).
+        port: Port to listen on. Use 0 to select a free port (Default: 8025).
+        store: An optional ArtifactStore. If not provided files will be streamed
+            over the connections.
+        heartbeat_timeout: A worker is considered failed if it doesn't send any
+            message for this many seconds (Default: 60).
+        max_attempts: Maximum number of attempts for a subtask when workers fail
+            (Default: 3).
+        verbose: Print progress report (Default: True).
+        token: A shared secret that workers must send to connect. A random token
+            will be generated if not provided. Use token attribute to get the value.
+    """
+
+    def __init__(self, cwd, host='127.0.0.1', port=8025, store=None,
+                 heartbeat_timeout=60, max_attempts=3, verbose=True, token=None):
+        self.cwd = os.path.abspath(cwd)
+        self.host = host
+        self.port = port
+        self.store = store
+        self.heartbeat_timeout = heartbeat_timeout
+        self.max_attempts = max_attempts
+        self.verbose = verbose
+        self.token = token or binascii.hexlify(os.urandom(16))
+        self._server = None
+        self._stopping = False
+        self._condition = threading.Condition()
+        self._tasks = []
+        self._pending = deque()
+        self._running = {}
+        self._job_count = 0
+        self._failed = None
+        self._journal = None
+
+    @property
+    def address(self):
+        """Address of the coordinator as (host, port)."""
+        if self._server:
+            return self._server.getsockname()
+        return self.host, self.port
+
+    def start(self):
+        """Start listening to workers."""
+        self._stopping = False
+        self._server = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        self._server.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        self._server.bind((self.host, self.port))
+        self._server.listen(16)
+        thread = threading.Thread(target=self._accept)
+        thread.daemon = True
+        thread.start()
+        if self.verbose:
+            print('Coordinator is listening on {}:{}'.format(*self.address))
+        return self
+
+    def stop(self):
+        """Stop workers once they ask for the next subtask and close the server."""
+        self._stopping = True
+        if self._server:
+            self._server.close()
+            self._server = None
+
+    def _accept(self):
+        server = self._server
+        while not self._stopping:
+            try:
+                sock, address = server.accept()
+            except socket.error:
+                # server is closed
+                break
+            thread = threading.Thread(target=self._handle,
+                                      args=(Connection(sock), address))
+            thread.daemon = True
+            thread.start()
+
+    def execute(self, tasks, journal=None):
+        """Execute a list of tasks in parallel on workers.
+
+        This method is blocking and will wait until the execution is finished. Subtasks
+        of each task are executed one after each other.
+
+        Args:
+            tasks: A list of Tasks.
+            journal: An optional Journal or path to a journal file. Completed subtasks
+                in journal will be skipped until the first incomplete subtask.
+
+        Returns:
+            True if all the subtasks are executed successfully.
+        """
+        assert self._server, 'Coordinator is not started. Use start method first.'
+        if isinstance(journal, basestring):
+            journal = Journal(journal)
+        with self._condition:
+            self._tasks = list(tasks)
+            self._pending = deque()
+            self._running = {}
+            self._failed = None
+            self._journal = journal
+            for count in xrange(len(self._tasks)):
+                self._queue_next(count, 0)
+
+            while not self._is_finished():
+                self._condition.wait(1)
+
+        if self._failed:
+            print(self._failed)
+            return False
+        return True
+
+    def _is_finished(self):
+        if self._failed:
+            # wait for running subtasks
+            return not self._running
+        return not self._pending and not self._running
+
+    def _queue_next(self, task_index, subtask_index):
+        """Queue the next incomplete subtask of a task."""
+        subtasks = self._tasks[task_index].subtasks
+        while subtask_index < len(subtasks):
+            subtask = subtasks[subtask_index]
+            if self._journal is None or \
+                    not self._journal.is_completed(subtask, self.cwd):
+                self._pending.append((task_index, subtask_index, 1))
+                return
+            subtask.skip()
+            if self.verbose:
+                print('...Skipping completed subtask: {}'.format(subtask.title))
+            subtask_index += 1
+
+    def _next_job(self, worker):
+        """Get the next job for a worker. Returns None if there is no job."""
+        with self._condition:
+            if self._failed or not self._pending:
+                return None
+            task_index, subtask_index, attempt = self._pending.popleft()
+            self._job_count += 1
+            subtask = self._tasks[task_index].subtasks[subtask_index]
+            inputs, outputs = command_files(subtask.command, self.cwd)
+            # add explicit files to the files that are found from the command
+            inputs = _merge_paths(inputs, subtask.input_files)
+            outputs = _merge_paths(
+                outputs, (subtask.output_file,) if subtask.output_file else ())
+            job = {'type': 'job', 'id': self._job_count, 'title': subtask.title,
+                   'command': subtask.command, 'outputs': list(outputs),
+                   'inputs': [], 'store': self.store is not None}
+            self._running[job['id']] = (task_index, subtask_index, attempt, worker)
+
+        if self.verbose:
+            print('...Dispatching {} to {} [attempt {}]'.format(
+                subtask.title, worker, attempt))
+        try:
+            for rel_path in inputs:
+                file_path = _relative_path(self.cwd, rel_path)
+                size, mtime = _file_info(file_path)
+                job['inputs'].append({'path': rel_path, 'size': size, 'mtime': mtime})
+                if self.store:
+                    self.store.put(rel_path, file_path)
+        except (IOError, OSError, ValueError) as e:
+            self._finish(job, {'returncode': -1, 'stderr': str(e)})
+            return None
+        return job
+
+    def _requeue(self, job_id, worker):
+        """Dispatch a job again after the worker failed."""
+        with self._condition:
+            task_index, subtask_index, attempt, _ = self._running.pop(job_id)
+            title = self._tasks[task_index].subtasks[subtask_index].title
+            if attempt >= self.max_attempts:
+                self._failed = '{} failed after {} attempts.'.format(title, attempt)
+            else:
+                print('...Worker {} failed. Dispatching {} again.'.format(worker, title))
+                self._pending.appendleft((task_index, subtask_index, attempt + 1))
+            self._condition.notify_all()
+
+    def _finish(self, job, message):
+        """Record the result of a job."""
+        if self.store and message['returncode'] == 0:
+            try:
+                for rel_path in job['outputs']:
+                    self.store.get(rel_path, _relative_path(self.cwd, rel_path))
+            except (IOError, OSError, ValueError) as e:
+                message = {'returncode': -1, 'stderr': str(e)}
+
+        with self._condition:
+            task_index, subtask_index, _, worker = self._running.pop(job['id'])
+            subtask = self._tasks[task_index].subtasks[subtask_index]
+            if message['returncode'] != 0:
+                self._failed = '...{} failed on {}:\n\n\tError message:\n\t{}\n\t' \
+                    'Command:\n\t{}'.format(subtask.title, worker, message['stderr'],
+                                            subtask.command)
+            else:
+                if self.verbose:
+                    print('...Finished {} on {} successfully!'.format(
+                        subtask.title, worker))
+                if self._journal is not None:
+                    self._journal.record(subtask, self.cwd)
+                self._queue_next(task_index, subtask_index + 1)
+            self._condition.notify_all()
+
+    def _handle(self, conn, address):
+        """Handle messages from a worker."""
+        worker = '{}:{}'.format(*address)
+        job = None
+        try:
+            conn.settimeout(self.heartbeat_timeout)
+            message = conn.receive()
+            if message.get('type') != 'auth' or \
+                    not _is_valid_token(message.get('token'), self.token):
+                conn.send({'type': 'error', 'message': 'Invalid token.'})
+                print('...Rejected connection from {}.'.format(worker))
+                return
+            while True:
+                message = conn.receive()
+                msg_type = message['type']
+                if msg_type == 'ready':
+                    worker = message.get('worker') or worker
+                    if self._stopping:
+                        conn.send({'type': 'stop'})
+                        break
+                    job = self._next_job(worker)
+                    conn.send(job or {'type': 'wait'})
+                elif msg_type == 'get_file':
+                    file_path = _relative_path(self.cwd, message['path'])
+                    if os.path.isfile(file_path):
+                        conn.send({'type': 'file', 'path': message['path']}, file_path)
+                    else:
+                        conn.send({'type': 'file', 'path': message['path'], 'size': -1})
+                elif msg_type == 'put_file':
+                    conn.receive_file(message['size'],
+                                      _relative_path(self.cwd, message['path']))
+                elif msg_type == 'done':
+                    finished, job = job, None
+                    self._finish(finished, message)
+                # heartbeats only keep the connection alive
+        except (socket.error, EOFError, IOError, OSError, ValueError, KeyError,
+                AttributeError) as e:
+            if job:
+                print('...Lost connection to {}: {}'.format(worker, e))
+        finally:
+            if job:
+                self._requeue(job['id'], worker)
+            conn.close()
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Coordinator representation."""
+        return 'Coordinator: {}:{}'.format(*self.address)
+
+
+class Worker(object):
+    """Execute subtasks from a coordinator.
+
+    Attributes:
+        host: Coordinator host.
+        port: Coordinator port.
+        work_dir: Local folder for executing commands. Input files are cached in
+            this folder between subtasks.
+        store: An optional ArtifactStore. Use the same store as coordinator.
+        name: Worker name (Default: host name and process id).
+        heartbeat_interval: Time between heartbeats in seconds (Default: 10).
+        env: Optional environment variables for commands.
+        verbose: Print progress report (Default: True).
+        token: The shared secret of the coordinator.
+    """
+
+    def __init__(self, host, port, work_dir, store=None, name=None,
+                 heartbeat_interval=10, env=None, verbose=True, token=None):
+        self.host = host
+        self.port = port
+        self.work_dir = os.path.abspath(work_dir)
+        if not os.path.isdir(self.work_dir):
+            os.makedirs(self.work_dir)
+        self.store = store
+        self.name = name or '{}-{}'.format(socket.gethostname(), os.getpid())
+        self.heartbeat_interval = heartbeat_interval
+        self.env = env
+        self.verbose = verbose
+        self.token = token
+        self._cache = {}
+
+    def run(self, poll_interval=1):
+        """Connect to coordinator and execute subtasks until coordinator stops."""
+        conn = Connection.connect(self.host, self.port)
+        try:
+            conn.send({'type': 'auth', 'token': self.token})
+            while True:
+                conn.send({'type': 'ready', 'worker': self.name})
+                message = conn.receive()
+                if message['type'] == 'stop':
+                    break
+                elif message['type'] == 'error':
+                    print('{} is rejected by coordinator: {}'.format(
+                        self.name, message['message']))
+                    break
+                elif message['type'] == 'wait':
+                    time.sleep(poll_interval)
+                else:
+                    self._run_job(conn, message)
+        except (socket.error, EOFError) as e:
+            print('{} lost connection to coordinator: {}'.format(self.name, e))
+        finally:
+            conn.close()
+
+    def _fetch(self, conn, item, store):
+        """Get an input file if it is not already cached."""
+        file_path = _relative_path(self.work_dir, item['path'])
+        info = (item['size'], item['mtime'])
+        if self._cache.get(file_path) == info and os.path.isfile(file_path):
+            return
+        if store:
+            self.store.get(item['path'], file_path)
+        else:
+            conn.send({'type': 'get_file', 'path': item['path']})
+            message = conn.receive()
+            if message['size'] < 0:
+                raise ValueError('{} does not exist on coordinator.'.format(
+                    item['path']))
+            conn.receive_file(message['size'], file_path)
+        self._cache[file_path] = info
+
+    def _heartbeat(self, conn, event):
+        while not event.wait(self.heartbeat_interval):
+            conn.send({'type': 'heartbeat'})
+
+    def _run_job(self, conn, job):
+        """Execute a job and send the outputs back to coordinator."""
+        if self.verbose:
+            print('{} is executing {}'.format(self.name, job['title']))
+        store = job['store'] and self.store is not None
+        event = threading.Event()
+        heartbeat = threading.Thread(target=self._heartbeat, args=(conn, event))
+        heartbeat.daemon = True
+        heartbeat.start()
+        try:
+            for item in job['inputs']:
+                self._fetch(conn, item, store)
+            for rel_path in job['outputs']:
+                folder = os.path.dirname(_relative_path(self.work_dir, rel_path))
+                if not os.path.isdir(folder):
+                    os.makedirs(folder)
+            p = subprocess.Popen(job['command'], shell=True, cwd=self.work_dir,
+                                 env=self.env, stdout=subprocess.PIPE,
+                                 stderr=subprocess.PIPE)
+            stderr = p.communicate()[1]
+            returncode = p.returncode
+        except (ValueError, OSError, IOError) as e:
+            stderr, returncode = str(e), -1
+        finally:
+            event.set()
+            heartbeat.join()
+
+        if returncode == 0:
+            for rel_path in job['outputs']:
+                file_path = _relative_path(self.work_dir, rel_path)
+                if not os.path.isfile(file_path):
+                    continue
+                if store:
+                    self.store.put(rel_path, file_path)
+                else:
+                    conn.send({'type': 'put_file', 'path': rel_path}, file_path)
+
+        conn.send({'type': 'done', 'id': job['id'], 'returncode': returncode,
+                   'stderr': stderr.decode('utf-8', 'replace')[-4096:]})
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Worker representation."""
+        return 'Worker: {} -> {}:{}'.format(self.name, self.host, self.port)
+
+
+def run_local(tasks, cwd, workers=2, journal=None, store=None, heartbeat_timeout=60,
+              verbose=True):
+    """Execute tasks with a coordinator and workers on this machine.
+
+    Each worker has its own temporary folder so the run is similar to a run on
+    separate machines. Use this function to test distributed runs.
+
+    Args:
+        tasks: A list of Tasks.
+        cwd: Project folder.
+        workers: Number of workers (Default: 2).
+        journal: An optional Journal or path to a journal file.
+        store: An optional ArtifactStore. By default files are streamed.
+        heartbeat_timeout: Heartbeat timeout in seconds (Default: 60).
+
+    Returns:
+        True if all the subtasks are executed successfully.
+    """
+    coordinator = Coordinator(cwd, '127.0.0.1', 0, store, heartbeat_timeout,
+                              verbose=verbose)
+    coordinator.start()
+    host, port = coordinator.address
+    folders = [tempfile.mkdtemp(prefix='hbworker_') for _ in xrange(workers)]
+    threads = []
+    for count, folder in enumerate(folders):
+        worker = Worker(host, port, folder, store, 'worker_{}'.format(count),
+                        heartbeat_interval=max(0.1, heartbeat_timeout / 4.0),
+                        verbose=verbose, token=coordinator.token)
+        thread = threading.Thread(target=worker.run, kwargs={'poll_interval': 0.1})
+        thread.daemon = True
+        thread.start()
+        threads.append(thread)
+
+    try:
+        return coordinator.execute(tasks, journal)
+    finally:
+        coordinator.stop()
+        for thread in threads:
+            thread.join(heartbeat_timeout)
+        for folder in folders:
+            shutil.rmtree(folder, ignore_errors=True)
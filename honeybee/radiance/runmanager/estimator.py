@@ -0,0 +1,527 @@
+"""Estimate runtime and disk usage of Radiance commands before execution.
+
+The estimator reads the commands of a written recipe and follows the size of the
+matrices from one command to the next (e.g. rfluxmtx > dctimestep > rmtxop). The
+amount of work for each command is estimated as number of rays for ray-tracing
+commands, number of values for matrix commands and size of input files for oconv.
+Runtime is calculated from the work by a Calibration which can be updated from the
+profiled runs on the same machine.
+
+Usage:
+
+    batch_file = recipe.write(folder, name)
+    calibration = Calibration.from_file('c:/ladybug/calibration.json')
+    estimate = recipe.estimate(batch_file, calibration)
+    print(estimate.summary_table())
+
+    # run the recipe and update the calibration for the next estimates
+    profiler = Profiler()
+    recipe.run(batch_file, profiler=profiler)
+    calibration.update(estimate, profiler)
+    calibration.to_file('c:/ladybug/calibration.json')
+"""
+import json
+import os
+import re
+
+from ..command._asyncexecution import split_command
+from .profiler import command_phase, PHASES
+from .task import batch_file_to_subtasks
+
+# approximate number of characters for each value in an ascii matrix
+ASCII_VALUE_SIZE = 12
+
+_VALUE_SIZE = {'a': ASCII_VALUE_SIZE, 'f': 4, 'd': 8, 'c': 4}
+
+# commands which their work is measured as number of rays
+RAY_TRACING = ('rfluxmtx', 'rcontrib', 'rtrace')
+
+# seconds for each unit of work. These values are rough estimates for a single core
+# and should be calibrated from profiled runs.
+DEFAULT_RATES = {
+    # seconds per ray
+    'rfluxmtx': 2e-6, 'rcontrib': 2e-6, 'rtrace': 2e-6,
+    # seconds per matrix value
+    'gendaymtx': 1e-6, 'dctimestep': 2e-8, 'rmtxop': 5e-8,
+    # seconds per byte of input files
+    'oconv': 5e-8
+}
+
+
+def hemisphere_bins(hemi_type):
+    """Number of bins for a rfluxmtx hemisphere type (e.g. u, kf, r4, sc6)."""
+    hemi_type = hemi_type.lower()
+    if hemi_type == 'u':
+        return 1
+    klems = {'kf': 145, 'kh': 73, 'kq': 41}
+    if hemi_type in klems:
+        return klems[hemi_type]
+    match = re.match(r'^(r|sc)(\d*)$', hemi_type)
+    if not match:
+        raise ValueError('Invalid hemisphere type: {}'.format(hemi_type))
+    density = int(match.group(2) or 1)
+    if match.group(1) == 'r':
+        return 144 * density ** 2 + 1
+    return density ** 2
+
+
+def receiver_bins(receiver_file):
+    """Number of bins for a rfluxmtx receiver file. None if file doesn't exist."""
+    if not os.path.isfile(receiver_file):
+        return None
+    with open(receiver_file, 'rb') as inf:
+        types = re.findall(r'#@rfluxmtx[^\n]*\bh=[-+]?(\w+)', inf.read())
+    return sum(hemisphere_bins(t) for t in types) or None
+
+
+def rays_per_sample(ambient_bounces=0, ambient_divisions=512, limit_weight=2e-3,
+                    source_count=0):
+    """Approximate number of rays that are traced for each sample.
+
+    Each ambient bounce multiplies the number of rays by ambient divisions until the
+    weight of the rays drops below the limit weight.
+    """
+    max_rays = 1.0 / limit_weight if limit_weight > 0 else float('inf')
+    return 1 + source_count + sum(
+        min(float(ambient_divisions) ** bounce, max_rays)
+        for bounce in xrange(1, int(ambient_bounces) + 1))
+
+
+def _count_lines(file_path):
+    """Number of non-empty lines in a file. None if file doesn't exist."""
+    if not file_path or not os.path.isfile(file_path):
+        return None
+    with open(file_path, 'rb') as inf:
+        return sum(1 for line in inf if line.strip())
+
+
+def _option(args, flag, default=None, type_=float):
+    """Value after the last occurrence of a flag in command arguments."""
+    value = default
+    for count, arg in enumerate(args[:-1]):
+        if arg == flag:
+            try:
+                value = type_(args[count + 1])
+            except ValueError:
+                pass
+    return value
+
+
+def _value_size(args, flags):
+    """Size of each output value based on format flags (e.g. -faf, -of)."""
+    for arg in reversed(args):
+        for flag in flags:
+            if arg.startswith(flag) and 0 < len(arg) - len(flag) < 3 \
+                    and arg[-1] in _VALUE_SIZE:
+                return _VALUE_SIZE[arg[-1]]
+    return ASCII_VALUE_SIZE
+
+
+def _is_number(value):
+    try:
+        float(value)
+    except ValueError:
+        return False
+    return True
+
+
+class CommandEstimate(object):
+    """Estimated work, runtime and output size of a command.
+
+    Attributes:
+        title: Human readable title.
+        command: The command.
+        phase: Recipe phase (e.g. sky, daylight matrix, multiplication).
+        stages: A list of (executable, work, cpu_count) for each command in the pipe.
+            work is number of rays for ray-tracing commands, number of values for
+            matrix commands and number of bytes for oconv.
+        rays: Number of traced rays.
+        runtime: Estimated runtime in seconds.
+        output_file: Path to output file if any.
+        output_size: Estimated size of output file in bytes.
+        is_result: True if the output file is a result file of the recipe.
+    """
+
+    __slots__ = ('title', 'command', 'phase', 'stages', 'rays', 'runtime',
+                 'output_file', 'output_size', 'is_result')
+
+    def __init__(self, title, command, phase):
+        self.title = title
+        self.command = command
+        self.phase = phase
+        self.stages = []
+        self.rays = 0
+        self.runtime = 0
+        self.output_file = None
+        self.output_size = 0
+        self.is_result = False
+
+    def to_json(self):
+        """Return the estimate as a dictionary."""
+        return dict((key, getattr(self, key)) for key in self.__slots__)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """CommandEstimate representation."""
+        return 'CommandEstimate: {} [{}] {:.1f}s {:.1f}MB'.format(
+            self.title, self.phase, self.runtime, self.output_size / 1048576.0)
+
+
+class Estimate(object):
+    """Estimated runtime and disk usage for a collection of commands."""
+
+    def __init__(self, commands):
+        self.commands = list(commands)
+
+    @property
+    def runtime(self):
+        """Total runtime in seconds."""
+        return sum(c.runtime for c in self.commands)
+
+    @property
+    def rays(self):
+        """Total number of rays."""
+        return sum(c.rays for c in self.commands)
+
+    @property
+    def result_size(self):
+        """Total size of result files in bytes."""
+        return sum(c.output_size for c in self.commands if c.is_result)
+
+    @property
+    def intermediate_size(self):
+        """Total size of intermediate files (e.g. matrices and octrees) in bytes."""
+        return sum(c.output_size for c in self.commands if not c.is_result)
+
+    @property
+    def disk_usage(self):
+        """Total size of all the output files in bytes."""
+        return self.result_size + self.intermediate_size
+
+    def summary(self):
+        """Summary of estimates for each phase.
+
+        Returns:
+            A list of dictionaries with phase, count, rays, runtime and output_size
+            keys.
+        """
+        phases = {}
+        for command in self.commands:
+            row = phases.setdefault(command.phase, {
+                'phase': command.phase, 'count': 0, 'rays': 0, 'runtime': 0,
+                'output_size': 0})
+            row['count'] += 1
+            row['rays'] += command.rays
+            row['runtime'] += command.runtime
+            row['output_size'] += command.output_size
+
+        order = dict((phase, count) for count, phase in enumerate(PHASES))
+        return sorted(phases.values(), key=lambda r: (order.get(r['phase'], 99),
+                                                      r['phase']))
+
+    def summary_table(self):
+        """Summary of phases as a human readable table."""
+        lines = ['{:<16}{:>7}{:>14}{:>12}{:>12}'.format(
+            'phase', 'count', 'rays', 'time (s)', 'size (MB)')]
+        for row in self.summary():
+            lines.append('{:<16}{:>7}{:>14.3g}{:>12.1f}{:>12.1f}'.format(
+                row['phase'], row['count'], row['rays'], row['runtime'],
+                row['output_size'] / 1048576.0))
+        lines.append('{:<16}{:>7}{:>14.3g}{:>12.1f}{:>12.1f}'.format(
+            'total', len(self.commands), self.rays, self.runtime,
+            self.disk_usage / 1048576.0))
+        return '\n'.join(lines)
+
+    def to_json(self):
+        """Return estimates and summary as a dictionary."""
+        return {'commands': [c.to_json() for c in self.commands],
+                'summary': self.summary(), 'runtime': self.runtime,
+                'result_size': self.result_size,
+                'intermediate_size': self.intermediate_size}
+
+    def __len__(self):
+        return len(self.commands)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Estimate representation."""
+        return 'Estimate: #{} commands {:.1f}s {:.1f}MB'.format(
+            len(self), self.runtime, self.disk_usage / 1048576.0)
+
+
+class Calibration(object):
+    """Seconds for each unit of work for Radiance commands on a machine.
+
+    The calibration keeps the total measured seconds and work for each executable
+    and can be updated after each profiled run.
+    """
+
+    def __init__(self, samples=None):
+        # {executable: [seconds, work]}
+        self._samples = dict((k, list(v)) for k, v in (samples or {}).items())
+
+    @classmethod
+    def from_file(cls, file_path):
+        """Load calibration from a json file. Returns defaults if file doesn't exist."""
+        if not os.path.isfile(file_path):
+            return cls()
+        with open(file_path, 'rb') as inf:
+            return cls(json.load(inf))
+
+    def to_file(self, file_path):
+        """Write calibration to a json file."""
+        with open(file_path, 'wb') as outf:
+            json.dump(self._samples, outf, indent=2)
+        return file_path
+
+    @property
+    def samples(self):
+        """Measured seconds and work for each executable."""
+        return self._samples
+
+    def rate(self, executable):
+        """Seconds for each unit of work for an executable."""
+        seconds, work = self._samples.get(executable, (0, 0))
+        if work > 0:
+            return float(seconds) / work
+        return DEFAULT_RATES.get(executable, 0)
+
+    def add(self, executable, seconds, work):
+        """Add a measurement for an executable."""
+        sample = self._samples.setdefault(executable, [0, 0])
+        sample[0] += seconds
+        sample[1] += work
+
+    def update(self, estimate, profiler):
+        """Update calibration from a profiled run of estimated commands.
+
+        For piped commands the measured time is distributed between the commands
+        based on their estimated runtime.
+
+        Args:
+            estimate: Estimate for the commands before the run.
+            profiler: Profiler of the run.
+        """
+        estimates = dict((c.command.strip(), c) for c in estimate.commands)
+        for record in profiler.records:
+            if record.returncode != 0 or record.end is None or not record.command:
+                continue
+            command = estimates.get(record.command.strip())
+            if not command:
+                continue
+            stages = [s for s in command.stages if s[1] > 0]
+            predicted = [self.rate(exe) * work / cpus for exe, work, cpus in stages]
+            total = sum(predicted)
+            for (exe, work, cpus), seconds in zip(stages, predicted):
+                share = seconds / total if total else 1.0 / len(stages)
+                self.add(exe, record.wall_time * share * cpus, work)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Calibration representation."""
+        return 'Calibration: %s' % ', '.join(
+            '{}: {:.3g}'.format(exe, self.rate(exe)) for exe in sorted(self._samples))
+
+
+class _Shape(object):
+    """Number of rows, columns and components of a matrix."""
+
+    __slots__ = ('rows', 'cols', 'components')
+
+    def __init__(self, rows, cols, components=3):
+        self.rows = rows
+        self.cols = cols
+        self.components = components
+
+    @property
+    def values(self):
+        if self.rows is None or self.cols is None:
+            return 0
+        return self.rows * self.cols * self.components
+
+
+class _Estimator(object):
+    """Follow the shape of matrices between commands and estimate the work."""
+
+    def __init__(self, cwd, point_count, hour_count):
+        self.cwd = cwd or os.getcwd()
+        self.point_count = point_count
+        self.hour_count = hour_count
+        self.shapes = {}
+
+    def path(self, file_path):
+        return os.path.normpath(os.path.join(self.cwd, file_path))
+
+    def shape(self, file_path):
+        return self.shapes.get(self.path(file_path))
+
+    def points(self, args, input_file):
+        count = _option(args, '-y', None, int)
+        if count is None and input_file:
+            count = _count_lines(self.path(input_file))
+        return count or self.point_count
+
+    @staticmethod
+    def ambient_rays(args, source_count=0):
+        return rays_per_sample(
+            _option(args, '-ab', 0, int), _option(args, '-ad', 512),
+            _option(args, '-lw', 2e-3), source_count) * _option(args, '-c', 1, int)
+
+    def stage(self, args, input_file, previous):
+        """Estimate a command in a pipe.
+
+        Returns:
+            (executable, work, cpu_count, rays, output shape, output size)
+        """
+        executable = os.path.splitext(os.path.basename(args[0]))[0].lower()
+        positionals = [arg for arg in args[1:]
+                       if arg == '-' or not (arg.startswith('-') or _is_number(arg))]
+        cpus = _option(args, '-n', 1, int) if executable in RAY_TRACING else 1
+        rays = 0
+        shape = None
+        value_size = ASCII_VALUE_SIZE
+
+        if executable == 'rfluxmtx':
+            points = self.points(args, input_file)
+            bins = None
+            if '-' in args:
+                receiver = args[args.index('-') + 1:][:1]
+                bins = receiver_bins(self.path(receiver[0])) if receiver else None
+            shape = _Shape(points, bins)
+            rays = (points or 0) * self.ambient_rays(args)
+            value_size = _value_size(args, ('-f',))
+        elif executable == 'rcontrib':
+            points = self.points(args, input_file)
+            modifiers = args.count('-m')
+            mod_file = _option(args, '-M', None, str)
+            if mod_file:
+                modifiers += _count_lines(self.path(mod_file)) or self.hour_count or 0
+            shape = _Shape(points, modifiers)
+            rays = (points or 0) * self.ambient_rays(args, modifiers)
+            value_size = _value_size(args, ('-f',))
+        elif executable == 'rtrace':
+            points = self.points(args, input_file)
+            shape = _Shape(points, 1)
+            rays = (points or 0) * self.ambient_rays(args)
+            value_size = _value_size(args, ('-f',))
+        elif executable == 'gendaymtx':
+            density = _option(args, '-m', 1, int)
+            hours = None
+            if positionals:
+                # 6 header lines in wea files
+                hours = _count_lines(self.path(positionals[-1]))
+                hours = hours - 6 if hours else None
+            shape = _Shape(144 * density ** 2 + 2, hours or self.hour_count)
+            value_size = _value_size(args, ('-o',))
+        elif executable == 'dctimestep':
+            matrices = [self.shape(f) for f in positionals]
+            first = matrices[0] if matrices else None
+            last = matrices[-1] if len(matrices) > 1 else None
+            shape = _Shape(first.rows if first else self.point_count,
+                           last.cols if last else self.hour_count)
+            value_size = _value_size(args, ('-o',))
+        elif executable == 'rmtxop':
+            inputs = []
+            for arg in args[1:]:
+                if arg == '-':
+                    inputs.append(previous)
+                elif arg.startswith('-') or arg == '+' or _is_number(arg):
+                    continue
+                else:
+                    inputs.append(self.shape(arg))
+            inputs = [s for s in inputs if s] or \
+                [_Shape(self.point_count, self.hour_count)]
+            first = inputs[0]
+            rows, cols = first.rows, first.cols
+            if '-t' in args:
+                rows, cols = cols, rows
+            shape = _Shape(rows, cols, 1 if '-c' in args else first.components)
+            return executable, sum(s.values for s in inputs), cpus, rays, shape, \
+                _value_size(args, ('-f',)) * shape.values
+        elif executable == 'oconv':
+            files = [self.path(f) for f in positionals]
+            work = sum(os.path.getsize(f) for f in files if os.path.isfile(f))
+            return executable, work, cpus, rays, None, work
+
+        work = rays if executable in RAY_TRACING else (shape.values if shape else 0)
+        return executable, work, cpus, rays, shape, \
+            value_size * shape.values if shape else 0
+
+    def estimate(self, title, command, calibration):
+        """Estimate a command."""
+        estimate = CommandEstimate(title, command, command_phase(command))
+        split = split_command(command)
+        if not split:
+            return estimate
+        commands, input_file, output_file, _ = split
+        previous = None
+        output_size = 0
+        for count, args in enumerate(commands):
+            executable, work, cpus, rays, shape, output_size = self.stage(
+                args, input_file if count == 0 else None, previous)
+            estimate.stages.append((executable, work, cpus))
+            estimate.rays += rays
+            estimate.runtime += calibration.rate(executable) * work / cpus
+            previous = shape
+
+        if output_file:
+            estimate.output_file = output_file
+            estimate.output_size = output_size
+            if previous:
+                self.shapes[self.path(output_file)] = previous
+        return estimate
+
+
+def estimate_commands(commands, cwd=None, point_count=None, hour_count=None,
+                      result_files=None, calibration=None):
+    """Estimate runtime and output size of commands.
+
+    Args:
+        commands: A list of SubTasks or command strings. Commands are estimated in
+            order as outputs of a command can be inputs for the next commands.
+        cwd: Working directory of the commands. Input files will be read from this
+            folder to find the number of points, sky patches and hours.
+        point_count: Number of points if it can't be found from the commands.
+        hour_count: Number of hours if it can't be found from the commands.
+        result_files: An optional list of result files. Outputs which are not in this
+            list are intermediate files.
+        calibration: A Calibration. Default values will be used if not provided.
+
+    Returns:
+        An Estimate.
+    """
+    calibration = calibration or Calibration()
+    estimator = _Estimator(cwd, point_count, hour_count)
+    results = set(estimator.path(f) for f in (result_files or ()))
+    estimates = []
+    for command in commands:
+        if hasattr(command, 'command'):
+            title, command = command.title, command.command
+        else:
+            title = command.split()[0]
+        estimate = estimator.estimate(title, command, calibration)
+        if estimate.output_file:
+            estimate.is_result = estimator.path(estimate.output_file) in results
+        estimates.append(estimate)
+    return Estimate(estimates)
+
+
+def estimate_batch_file(command_file, point_count=None, hour_count=None,
+                        result_files=None, calibration=None):
+    """Estimate runtime and output size of commands in a honeybee batch file.
+
+    See estimate_commands for the arguments.
+    """
+    batch = batch_file_to_subtasks(command_file)
+    cwd = batch.cwd or os.path.dirname(os.path.abspath(command_file))
+    return estimate_commands(batch.subtasks, cwd, point_count, hour_count,
+                             result_files, calibration)
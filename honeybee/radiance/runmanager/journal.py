@@ -0,0 +1,214 @@
+"""Radiance run journal.
+
+A journal keeps track of completed subtasks in a json lines file. Each completed
+subtask is appended to the file as a single line so recording a subtask doesn't rewrite
+the whole journal. The journal will be used to resume a run from the first incomplete
+subtask.
+"""
+import hashlib
+import json
+import os
+import time
+
+
+class Journal(object):
+    """A persistent record of completed subtasks.
+
+    For each completed subtask the journal keeps the command, the path to output file
+    and the size and md5 hash of the output file. The hash is only calculated if
+    check_hash is True. A subtask is considered completed only if the output file
+    still exists and it matches the recorded size and hash.
+
+    Usage:
+
+        journal = Journal('c:/ladybug/test/gridbased_daylightcoeff/journal.json')
+        task = Task('annual', subtasks)
+        task.execute(cwd, journal=journal)
+    """
+
+    def __init__(self, file_path, check_hash=True):
+        """Create a journal.
+
+        Args:
+            file_path: Path to journal file. If the file already exists the journal
+                will be loaded from the file.
+            check_hash: Set to False to only check the size of output files. Checking
+                hash is safer but it can be slow for large matrices (Default: True).
+        """
+        self._file_path = os.path.normpath(file_path)
+        self.check_hash = check_hash
+        self._entries = {}
+        self.load()
+
+    @property
+    def file_path(self):
+        """Path to journal file."""
+        return self._file_path
+
+    @property
+    def entries(self):
+        """A dictionary of journal entries."""
+        return self._entries
+
+    @staticmethod
+    def _key(command, cwd=None):
+        """Unique key for a command in a working directory."""
+        key = '{}|{}'.format(os.path.normpath(cwd) if cwd else '', command.strip())
+        return hashlib.md5(key.encode('utf-8')).hexdigest()
+
+    @staticmethod
+    def file_hash(file_path, block_size=2 ** 20):
+        """Calculate md5 hash for a file."""
+        md5 = hashlib.md5()
+        with open(file_path, 'rb') as inf:
+            while True:
+                data = inf.read(block_size)
+                if not data:
+                    break
+                md5.update(data)
+        return md5.hexdigest()
+
+    @staticmethod
+    def _output_path(subtask, cwd=None):
+        """Full path to output file of a subtask."""
+        output_file = subtask.output_file
+        if not output_file:
+            return None
+        if cwd and not os.path.isabs(output_file):
+            output_file = os.path.join(cwd, output_file)
+        return os.path.normpath(output_file)
+
+    @property
+    def _temp_file(self):
+        """Path to temporary file for saving the journal."""
+        return self.file_path + '.tmp'
+
+    def load(self):
+        """Load journal from file.
+
+        Lines which are replaced by a later line for the same subtask are removed from
+        the file once it is loaded.
+        """
+        file_path = self.file_path
+        if not os.path.isfile(file_path):
+            # the process might have stopped before renaming the compacted journal
+            file_path = self._temp_file
+        self._entries = {}
+        if not os.path.isfile(file_path):
+            return
+        line_count = 0
+        with open(file_path, 'rb') as inf:
+            for line in inf:
+                if not line.strip():
+                    continue
+                line_count += 1
+                try:
+                    key, entry = json.loads(line)
+                except ValueError:
+                    # the process might have stopped while writing the last line
+                    print('Failed to load a line from journal {}. The line is ignored.'
+                          .format(self.file_path))
+                    continue
+                if entry is None:
+                    self._entries.pop(key, None)
+                else:
+                    self._entries[key] = entry
+        if line_count != len(self._entries) or file_path != self.file_path:
+            self.save()
+
+    def _append(self, key, entry):
+        """Append an entry to journal file. Set entry to None to remove the key."""
+        with open(self.file_path, 'ab') as outf:
+            outf.write(json.dumps([key, entry]) + '\n')
+            outf.flush()
+            os.fsync(outf.fileno())
+
+    def save(self):
+        """Rewrite journal file with current entries.
+
+        record and remove append to the file and there is no need to call save after
+        them.
+        """
+        temp_file = self._temp_file
+        with open(temp_file, 'wb') as outf:
+            for key, entry in self._entries.iteritems():
+                outf.write(json.dumps([key, entry]) + '\n')
+            outf.flush()
+            os.fsync(outf.fileno())
+        # rename replaces the file in a single step on posix. Windows can't rename to
+        # an existing file. load will use the temp file if the process stops before
+        # renaming.
+        if os.name == 'nt' and os.path.isfile(self.file_path):
+            os.remove(self.file_path)
+        os.rename(temp_file, self.file_path)
+
+    def is_completed(self, subtask, cwd=None):
+        """Check if a subtask is already completed and its output is valid.
+
+        Args:
+            subtask: A SubTask.
+            cwd: Working directory for subtask.
+        """
+        entry = self._entries.get(self._key(subtask.command, cwd))
+        if not entry:
+            return False
+
+        output_file = entry['output_file']
+        if not output_file:
+            # there is no output file to validate
+            return True
+        if not os.path.isfile(output_file):
+            return False
+        if os.path.getsize(output_file) != entry['size']:
+            return False
+        if self.check_hash and self.file_hash(output_file) != entry['md5']:
+            return False
+        return True
+
+    def record(self, subtask, cwd=None):
+        """Record a subtask as completed.
+
+        Args:
+            subtask: A SubTask that is executed successfully.
+            cwd: Working directory for subtask.
+        """
+        output_file = self._output_path(subtask, cwd)
+        if output_file and os.path.isfile(output_file):
+            size = os.path.getsize(output_file)
+            md5 = self.file_hash(output_file) if self.check_hash else None
+        else:
+            output_file = size = md5 = None
+
+        key = self._key(subtask.command, cwd)
+        self._entries[key] = {
+            'title': subtask.title,
+            'command': subtask.command,
+            'output_file': output_file,
+            'size': size,
+            'md5': md5,
+            'completed_at': time.strftime('%Y-%m-%d %H:%M:%S')
+        }
+        self._append(key, self._entries[key])
+
+    def remove(self, subtask, cwd=None):
+        """Remove a subtask from journal."""
+        key = self._key(subtask.command, cwd)
+        if self._entries.pop(key, None) is not None:
+            self._append(key, None)
+
+    def clear(self):
+        """Remove all the entries from journal."""
+        self._entries = {}
+        self.save()
+
+    def __len__(self):
+        """Number of completed subtasks."""
+        return len(self._entries)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Journal representation."""
+        return 'Journal: %s #%d' % (self.file_path, len(self))
@@ -0,0 +1,366 @@
+"""Profile resource usage of Radiance commands.
+
+The profiler records wall time, user and system cpu time, peak resident memory and
+bytes written for every command. On Linux the numbers are collected from the kernel
+process accounting (wait4 and /proc/<pid>/io) and include all the child processes of
+the command (e.g. commands in a pipe). On other systems only the values which are
+available are recorded.
+
+Records are grouped by recipe phase and can be exported as a Chrome trace which can
+be opened in chrome://tracing or https://ui.perfetto.dev.
+
+Usage:
+
+    profiler = Profiler()
+    recipe.run(command_file, profiler=profiler)
+    with profiler.phase('metrics'):
+        results = [ag.annual_metrics() for ag in recipe.results()]
+    print(profiler.summary_table())
+    profiler.write_chrome_trace('c:/ladybug/room/trace.json')
+"""
+from contextlib import contextmanager
+import json
+import os
+import re
+import subprocess
+import time
+
+try:
+    import resource
+except ImportError:
+    # Windows and IronPython
+    resource = None
+
+PHASES = ('sky', 'scene', 'daylight matrix', 'sun matrix', 'raytrace',
+          'multiplication', 'loading', 'metrics', 'other')
+
+_PHASE_EXECUTABLES = {
+    'epw2wea': 'sky', 'gendaymtx': 'sky', 'gensky': 'sky', 'gendaylit': 'sky',
+    'genskyvec': 'sky',
+    'oconv': 'scene', 'xform': 'scene', 'obj2rad': 'scene', 'genbsdf': 'scene',
+    'rfluxmtx': 'daylight matrix', 'rcontrib': 'daylight matrix',
+    'rtrace': 'raytrace', 'rpict': 'raytrace', 'vwrays': 'raytrace',
+    'mkpmap': 'raytrace',
+    'dctimestep': 'multiplication', 'rmtxop': 'multiplication',
+    'pcomb': 'multiplication', 'rcalc': 'multiplication', 'rcollate': 'multiplication'
+}
+
+
+def command_phase(command):
+    """Find the recipe phase for a command based on the executable name.
+
+    Contribution and scene commands for the analemma are considered as sun matrix.
+    """
+    first = command.strip().split('|')[0].split()
+    if not first:
+        return 'other'
+    executable = os.path.splitext(os.path.basename(first[0].strip('"\'')))[0].lower()
+    phase = _PHASE_EXECUTABLES.get(executable, 'other')
+    if phase in ('daylight matrix', 'scene') and \
+            re.search(r'analemma|sun(s|list|_)', command, re.IGNORECASE):
+        phase = 'sun matrix'
+    return phase
+
+
+class CommandRecord(object):
+    """Resource usage of a command or a block of Python code.
+
+    Attributes:
+        title: Human readable title.
+        command: The command.
+        phase: Recipe phase (e.g. sky, daylight matrix, multiplication).
+        start: Start time in seconds since epoch.
+        end: End time in seconds since epoch. None if still running.
+        user_time: User cpu time in seconds.
+        system_time: System cpu time in seconds.
+        max_rss: Peak resident memory in kilobytes.
+        bytes_written: Number of bytes written to disk.
+        returncode: Return code of the command.
+    """
+
+    __slots__ = ('title', 'command', 'phase', 'start', 'end', 'user_time',
+                 'system_time', 'max_rss', 'bytes_written', 'returncode')
+
+    def __init__(self, title, command, phase):
+        self.title = title
+        self.command = command
+        self.phase = phase
+        self.start = time.time()
+        self.end = None
+        self.user_time = None
+        self.system_time = None
+        self.max_rss = None
+        self.bytes_written = None
+        self.returncode = None
+
+    @property
+    def wall_time(self):
+        """Wall time in seconds."""
+        return (self.end or time.time()) - self.start
+
+    def to_json(self):
+        """Return the record as a dictionary."""
+        data = dict((key, getattr(self, key)) for key in self.__slots__)
+        data['wall_time'] = self.wall_time
+        return data
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """CommandRecord representation."""
+        return 'CommandRecord: {} [{}] {:.2f}s'.format(
+            self.title, self.phase, self.wall_time)
+
+
+def _max_rss_kb(max_rss):
+    """ru_maxrss is in bytes on Mac and in kilobytes on Linux."""
+    if max_rss and os.uname()[0] == 'Darwin':
+        return max_rss // 1024
+    return max_rss
+
+
+class ProfiledProcess(object):
+    """A wrapper for subprocess.Popen which records the resource usage of the process.
+
+    The process is reaped by this class so the resource usage of the process and all
+    its children can be collected. Use poll and wait from this class instead of the
+    methods of the original process.
+    """
+
+    def __init__(self, process, record):
+        self._process = process
+        self.record = record
+        self._proc_folder = '/proc/%d' % process.pid
+        if not os.path.isdir(self._proc_folder):
+            self._proc_folder = None
+
+    @property
+    def pid(self):
+        return self._process.pid
+
+    @property
+    def stdout(self):
+        return self._process.stdout
+
+    @property
+    def stderr(self):
+        return self._process.stderr
+
+    @property
+    def returncode(self):
+        return self._process.returncode
+
+    def _state(self):
+        """Process state from /proc. Z for a finished process."""
+        try:
+            with open(os.path.join(self._proc_folder, 'stat'), 'rb') as inf:
+                return inf.read().rsplit(')', 1)[-1].split()[0]
+        except (IOError, IndexError):
+            return None
+
+    def _bytes_written(self):
+        """Bytes written by the process and its children from /proc/<pid>/io."""
+        try:
+            with open(os.path.join(self._proc_folder, 'io'), 'rb') as inf:
+                for line in inf:
+                    key, value = line.split(':')
+                    if key == 'write_bytes':
+                        return int(value)
+        except (IOError, ValueError):
+            return None
+
+    def _finish(self, status, rusage):
+        """Set the return code and resource usage."""
+        if os.WIFSIGNALED(status):
+            self._process.returncode = -os.WTERMSIG(status)
+        else:
+            self._process.returncode = os.WEXITSTATUS(status)
+        record = self.record
+        record.end = time.time()
+        record.returncode = self._process.returncode
+        if rusage:
+            record.user_time = rusage.ru_utime
+            record.system_time = rusage.ru_stime
+            record.max_rss = _max_rss_kb(rusage.ru_maxrss)
+
+    def poll(self):
+        """Check if the process is finished and return the return code."""
+        if self._process.returncode is not None:
+            return self._process.returncode
+        if not hasattr(os, 'wait4'):
+            # Windows
+            returncode = self._process.poll()
+            if returncode is not None:
+                self.record.end = time.time()
+                self.record.returncode = returncode
+            return returncode
+
+        if self._proc_folder:
+            # /proc/<pid>/io is only available until the process is reaped
+            if self._state() != 'Z':
+                return None
+            self.record.bytes_written = self._bytes_written()
+            _, status, rusage = os.wait4(self.pid, 0)
+        else:
+            pid, status, rusage = os.wait4(self.pid, os.WNOHANG)
+            if pid == 0:
+                return None
+        self._finish(status, rusage)
+        return self._process.returncode
+
+    def wait(self, poll_interval=0.05):
+        """Wait for the process to finish and return the return code."""
+        while self.poll() is None:
+            time.sleep(poll_interval)
+        return self._process.returncode
+
+    def terminate(self):
+        self._process.terminate()
+
+    def communicate(self):
+        """Read standard output and error and wait for the process to finish."""
+        stdout = self._process.stdout.read() if self._process.stdout else None
+        stderr = self._process.stderr.read() if self._process.stderr else None
+        self.wait()
+        return stdout, stderr
+
+
+class Profiler(object):
+    """Collect resource usage of commands and Python code grouped by recipe phase."""
+
+    def __init__(self):
+        self.records = []
+
+    def popen(self, command, title=None, phase=None, **kwargs):
+        """Start a command with subprocess.Popen and profile it.
+
+        Args:
+            command: Command as a string. Command will be executed with shell=True.
+            title: Human readable title. Default is the executable name.
+            phase: Recipe phase. By default the phase is found from the command.
+            kwargs: Keyword arguments for subprocess.Popen (e.g. cwd, env, stdout).
+
+        Returns:
+            A ProfiledProcess.
+        """
+        record = CommandRecord(title or command.split()[0], command,
+                               phase or command_phase(command))
+        self.records.append(record)
+        kwargs.setdefault('shell', True)
+        return ProfiledProcess(subprocess.Popen(command, **kwargs), record)
+
+    def run(self, command, title=None, phase=None, **kwargs):
+        """Run a command and return the CommandRecord."""
+        self.popen(command, title, phase, **kwargs).wait()
+        return self.records[-1]
+
+    @contextmanager
+    def phase(self, name, title=None):
+        """Profile a block of Python code (e.g. loading results or metrics).
+
+        cpu time and peak memory are measured for the whole Python process.
+        """
+        record = CommandRecord(title or name, None, name)
+        self.records.append(record)
+        before = resource.getrusage(resource.RUSAGE_SELF) if resource else None
+        try:
+            yield record
+        finally:
+            record.end = time.time()
+            record.returncode = 0
+            if before:
+                after = resource.getrusage(resource.RUSAGE_SELF)
+                record.user_time = after.ru_utime - before.ru_utime
+                record.system_time = after.ru_stime - before.ru_stime
+                record.max_rss = _max_rss_kb(after.ru_maxrss)
+
+    def summary(self):
+        """Summary of records for each phase.
+
+        Returns:
+            A list of dictionaries with phase, count, wall_time, user_time,
+            system_time, max_rss and bytes_written keys. Phases are sorted in the
+            order of recipe phases.
+        """
+        phases = {}
+        for record in self.records:
+            row = phases.setdefault(record.phase, {
+                'phase': record.phase, 'count': 0, 'wall_time': 0, 'user_time': 0,
+                'system_time': 0, 'max_rss': 0, 'bytes_written': 0})
+            row['count'] += 1
+            row['wall_time'] += record.wall_time
+            row['user_time'] += record.user_time or 0
+            row['system_time'] += record.system_time or 0
+            row['max_rss'] = max(row['max_rss'], record.max_rss or 0)
+            row['bytes_written'] += record.bytes_written or 0
+
+        order = dict((phase, count) for count, phase in enumerate(PHASES))
+        return sorted(phases.values(), key=lambda r: (order.get(r['phase'], 99),
+                                                      r['phase']))
+
+    def summary_table(self):
+        """Summary of phases as a human readable table."""
+        lines = ['{:<16}{:>7}{:>11}{:>11}{:>11}{:>12}{:>14}'.format(
+            'phase', 'count', 'wall (s)', 'user (s)', 'sys (s)', 'rss (MB)',
+            'written (MB)')]
+        for row in self.summary():
+            lines.append('{:<16}{:>7}{:>11.2f}{:>11.2f}{:>11.2f}{:>12.1f}{:>14.1f}'
+                         .format(row['phase'], row['count'], row['wall_time'],
+                                 row['user_time'], row['system_time'],
+                                 row['max_rss'] / 1024.0,
+                                 row['bytes_written'] / 1048576.0))
+        return '\n'.join(lines)
+
+    def to_chrome_trace(self):
+        """Return records in Chrome trace event format.
+
+        Each phase is a separate row in the timeline.
+        """
+        if not self.records:
+            return {'traceEvents': []}
+        origin = min(r.start for r in self.records)
+        phase_ids = {}
+        events = []
+        for record in self.records:
+            tid = phase_ids.setdefault(record.phase, len(phase_ids) + 1)
+            args = dict((key, getattr(record, key)) for key in
+                        ('command', 'user_time', 'system_time', 'max_rss',
+                         'bytes_written', 'returncode'))
+            events.append({
+                'name': record.title, 'cat': record.phase, 'ph': 'X', 'pid': 1,
+                'tid': tid, 'ts': int((record.start - origin) * 1e6),
+                'dur': int(record.wall_time * 1e6), 'args': args})
+        for phase, tid in phase_ids.items():
+            events.append({'name': 'thread_name', 'ph': 'M', 'pid': 1, 'tid': tid,
+                           'args': {'name': phase}})
+        return {'traceEvents': events, 'displayTimeUnit': 'ms'}
+
+    def write_chrome_trace(self, file_path):
+        """Write records as a Chrome trace json file."""
+        with open(file_path, 'wb') as outf:
+            json.dump(self.to_chrome_trace(), outf)
+        return file_path
+
+    def to_json(self):
+        """Return records and summary as a dictionary."""
+        return {'records': [r.to_json() for r in self.records],
+                'summary': self.summary()}
+
+    def write_json(self, file_path):
+        """Write records and summary to a json file."""
+        with open(file_path, 'wb') as outf:
+            json.dump(self.to_json(), outf, indent=2)
+        return file_path
+
+    def __len__(self):
+        return len(self.records)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """Profiler representation."""
+        return 'Profiler: #%d records' % len(self)
@@ -1,4 +1,6 @@
 """Radiance Analysis workflows."""
+from .journal import Journal
+
 import time
 import os
 
@@ -21,14 +23,19 @@ class TaskGroup(object):
         for task in self._tasks:
             print('..%s' % task.progress_report)
 
-    def execute(self, cpus=1, cwd=None, env=None, update_freq=5, verbose=True):
-        """Execute tasks in this task group in parallel."""
+    def execute(self, cpus=1, cwd=None, env=None, update_freq=5, verbose=True,
+                journal=None):
+        """Execute tasks in this task group in parallel.
+
+        Completed subtasks in the optional journal will be skipped and successful
+        subtasks will be added to the journal.
+        """
         # execute first subtasks
         running = [None for task in self._tasks]
         for count, task in enumerate(self._tasks):
             if verbose:
                 print('..Starting task {}'.format(task.title))
-            running[count] = task.execute_next(cwd, env, verbose)
+            running[count] = task.execute_next(cwd, env, verbose, journal)
 
         while not self.is_finished:
             for count in xrange(len(self._tasks)):
@@ -41,8 +48,10 @@ class TaskGroup(object):
                     if not running[count].is_succeed:
                         # kill all the other runs
                         return -1
+                    self._tasks[count].record_subtask(running[count], cwd, journal)
                     # execute next task read to go
-                    running[count] = self._tasks[count].execute_next(cwd, env, verbose)
+                    running[count] = \
+                        self._tasks[count].execute_next(cwd, env, verbose, journal)
                 else:
                     print('{}'.format(running[count].progress_report))
                 time.sleep(update_freq)
@@ -72,19 +81,46 @@ class Runner(object):
         self._title = title
         self._taskgroups = [TaskGroup(task) for task in tasks]
 
-    def execute(self, cpus=1, cwd=None, env=None, update_freq=5, verbose=True):
-        """Execute all task groups."""
+    def execute(self, cpus=1, cwd=None, env=None, update_freq=5, verbose=True,
+                journal=None):
+        """Execute all task groups.
+
+        Args:
+            journal: An optional Journal or path to a journal file. Use a journal to
+                resume the run from the first incomplete subtask of each task.
+        """
+        if isinstance(journal, basestring):
+            journal = Journal(journal)
         if verbose:
             print('Starting {}'.format(self._title))
         for taskgroup in self._taskgroups:
             # this is a blocking call
-            success = taskgroup.execute(cpus, cwd, env, update_freq, verbose)
+            success = taskgroup.execute(cpus, cwd, env, update_freq, verbose, journal)
             if success == -1:
                 # task has failed
                 print('Terminating running tasks...')
                 taskgroup.terminate()
                 return
 
+    def execute_distributed(self, coordinator, journal=None):
+        """Execute all task groups on the workers of a distributed Coordinator.
+
+        Args:
+            coordinator: A started Coordinator from runmanager.distributed.
+            journal: An optional Journal or path to a journal file.
+
+        Returns:
+            True if all the subtasks are executed successfully.
+        """
+        if isinstance(journal, basestring):
+            journal = Journal(journal)
+        print('Starting {} on {}'.format(self._title, coordinator))
+        for taskgroup in self._taskgroups:
+            # this is a blocking call
+            if not coordinator.execute(taskgroup._tasks, journal):
+                return False
+        return True
+
     def __repr__(self):
         """Represent Runner class."""
         return 'RunManager: {}'.format(self._title)
@@ -3,9 +3,14 @@
 A task is a series of command that will be executed one after each other.
 """
 import re
+import shlex
 import subprocess
 import os
 import time
+from collections import namedtuple
+
+# programs which write output files to the path after -o
+OUTPUT_OPTION_PROGRAMS = ('rcontrib', 'rfluxmtx')
 
 
 class Task(object):
@@ -15,6 +20,8 @@ class Task(object):
         self._cpu_demand = 1  # will be overwritten based on input tasks.
         self._title = title
         self._last_task_executed = None
+        # skip completed subtasks until the first incomplete one
+        self._resuming = True
         self.subtasks = subtasks
 
     @classmethod
@@ -86,13 +93,27 @@ class Task(object):
         for task in self.subtasks:
             print('....%s' % task.progress_report)
 
-    def execute(self, cwd=None, env=None, verbose=True, update_freq=5):
+    def execute(self, cwd=None, env=None, verbose=True, update_freq=5, journal=None,
+                profiler=None):
         """Execute this taskself.
 
         This method is blocking and will wait until the execution is finished.
+
+        Args:
+            cwd: Working directory.
+            env: Environment variables.
+            verbose: Print progress report.
+            update_freq: Time between progress reports in seconds.
+            journal: An optional Journal. Completed subtasks in journal will be skipped
+                until the first incomplete subtask. Successful subtasks will be added
+                to the journal.
+            profiler: An optional Profiler to record resource usage of subtasks.
+
+        Returns:
+            True if all the subtasks are executed successfully.
         """
         for count in range(self.count):
-            task = self.execute_subtask(count, cwd, env, verbose)
+            task = self.execute_subtask(count, cwd, env, verbose, journal, profiler)
             while task.is_running:
                 if verbose:
                     # replace eith progress
@@ -105,19 +126,33 @@ class Task(object):
                                                   self.count,
                                                   task.progress_report))
                 break
+            self.record_subtask(task, cwd, journal)
+
+        return self.is_succeed()
 
-    def execute_subtask(self, task_index, cwd=None, env=None, verbose=True):
+    def execute_subtask(self, task_index, cwd=None, env=None, verbose=True,
+                        journal=None, profiler=None):
         task = self.subtasks[task_index]
-        if verbose:
-            print('...Starting subtask {} of {}: {}...'.format(
-                task_index + 1, self.count, task.title))
-        task.execute(cwd, env)
+        if self._resuming and journal is not None and journal.is_completed(task, cwd):
+            task.skip()
+            if verbose:
+                print('...Skipping completed subtask {} of {}: {}...'.format(
+                    task_index + 1, self.count, task.title))
+        else:
+            # once a subtask is executed all the next subtasks should be executed
+            self._resuming = False
+            if verbose:
+                print('...Starting subtask {} of {}: {}...'.format(
+                    task_index + 1, self.count, task.title))
+            task.execute(cwd, env, profiler)
         self._last_task_executed = task_index
         return task
 
-    def execute_next(self, cwd=None, env=None, verbose=True):
+    def execute_next(self, cwd=None, env=None, verbose=True, journal=None,
+                     profiler=None):
         """Execute next task in line."""
-        if self._last_task_executed and self._last_task_executed + 1 == self.count:
+        if self._last_task_executed is not None and \
+                self._last_task_executed + 1 == self.count:
             return
 
         if self._last_task_executed is None:
@@ -125,13 +160,13 @@ class Task(object):
         else:
             task_index = self._last_task_executed + 1
 
-        task = self.subtasks[task_index]
-        if verbose:
-            print('...Starting subtask {} of {}: {}...'.format(
-                task_index + 1, self.count, task.title))
-        task.execute(cwd, env)
-        self._last_task_executed = task_index
-        return task
+        return self.execute_subtask(task_index, cwd, env, verbose, journal, profiler)
+
+    @staticmethod
+    def record_subtask(subtask, cwd=None, journal=None):
+        """Add a successful subtask to journal."""
+        if journal is not None and not subtask.is_skipped and subtask.is_succeed:
+            journal.record(subtask, cwd)
 
     def terminate(self):
         """Terminate subtask."""
@@ -157,7 +192,8 @@ class Task(object):
 
 class SubTask(object):
 
-    def __init__(self, title, command, output_file=None, expected_output_size=None):
+    def __init__(self, title, command, output_file=None, expected_output_size=None,
+                 input_files=None):
         """Task
 
         Args:
@@ -167,14 +203,20 @@ class SubTask(object):
                 completion process.
             expected_output_size: Expected output size for output file. This number will
                 be used to report completion process.
+            input_files: An optional list of relative paths to input files. Input files
+                will be sent to remote workers in distributed runs in addition to the
+                input files that are found from the command (e.g. BSDF files that are
+                referenced in a material file).
         """
         self._title = title
         self._command = command
+        self._input_files = tuple(input_files or ())
         self._cpu_demand = self._get_cpu_count(command)
         self._process = None
         self._output_file = output_file
         self._expected_size = expected_output_size
         self._execution_started_at = None
+        self._is_skipped = False
 
     @classmethod
     def from_json(cls, task_json):
@@ -191,7 +233,8 @@ class SubTask(object):
         else:
             expected_size = None
 
-        return cls(task_json['title'], task_json['command'], output_file, expected_size)
+        return cls(task_json['title'], task_json['command'], output_file, expected_size,
+                   task_json.get('input_files'))
 
     @property
     def title(self):
@@ -207,9 +250,14 @@ class SubTask(object):
         """
         return self._cpu_demand
 
+    @property
+    def is_skipped(self):
+        """True if the subtask is skipped as it was already completed."""
+        return self._is_skipped
+
     @property
     def is_started(self):
-        if self._process:
+        if self._process or self._is_skipped:
             return True
         else:
             return False
@@ -223,14 +271,18 @@ class SubTask(object):
 
     @property
     def is_finished(self):
-        if self._process:
+        if self._is_skipped:
+            return True
+        elif self._process:
             return not self._process.poll() is None
         else:
             return False
 
     @property
     def is_succeed(self):
-        if self._process:
+        if self._is_skipped:
+            return True
+        elif self._process:
             return self._process.returncode == 0
         else:
             return False
@@ -240,6 +292,16 @@ class SubTask(object):
         """List of command for this task."""
         return self._command
 
+    @property
+    def output_file(self):
+        """Path to output file."""
+        return self._output_file
+
+    @property
+    def input_files(self):
+        """Relative path to input files."""
+        return self._input_files
+
     @property
     def progress(self):
         """Progress as a percentage."""
@@ -259,6 +321,8 @@ class SubTask(object):
         """Human readable progress report."""
         if not self.is_started:
             return '...{} is not started!'.format(self.title)
+        elif self._is_skipped:
+            return '...Skipped {}. It is already completed.'.format(self.title)
         elif self.is_finished:
             if self.is_succeed:
                 return '...Finished {} successfully!'.format(self.title)
@@ -308,18 +372,35 @@ class SubTask(object):
                 n = num_cpu
         return n
 
-    def execute(self, cwd=None, env=None):
-        """Execute command one after each other."""
+    def execute(self, cwd=None, env=None, profiler=None):
+        """Execute command one after each other.
+
+        Args:
+            cwd: Working directory.
+            env: Environment variables.
+            profiler: An optional Profiler to record resource usage of the command.
+        """
         self._execution_started_at = time.time()
         if cwd and self._output_file and cwd not in self._output_file:
             self._output_file = os.path.join(cwd, self._output_file)
 
+        if profiler is not None:
+            self._process = profiler.popen(
+                self.command, self.title, cwd=cwd, env=env,
+                stderr=subprocess.PIPE, stdout=subprocess.PIPE
+            )
+            return
+
         self._process = subprocess.Popen(
             self.command, cwd=cwd, env=env,
             stderr=subprocess.PIPE, stdout=subprocess.PIPE,
             shell=True
         )
 
+    def skip(self):
+        """Mark this subtask as completed without executing the command."""
+        self._is_skipped = True
+
     def terminate(self):
         """Terminate subtask."""
         if not self.is_started:
@@ -332,7 +413,8 @@ class SubTask(object):
 
         return {'title': self.title, 'command': self.command,
                 'output_file': self._output_file,
-                'expected_size': self._expected_size}
+                'expected_size': self._expected_size,
+                'input_files': list(self._input_files)}
 
     def ToString(self):
         """Overwrite .NET ToString method."""
@@ -341,3 +423,97 @@ class SubTask(object):
     def __repr__(self):
         """Task representation."""
         return 'SubTask: %s' % self.command
+
+
+def parse_command(command):
+    """Split a command to arguments and mark the arguments which are output files.
+
+    Output files are the files after > and the files after -o for rcontrib and
+    rfluxmtx. Output file patterns (e.g. sky_%03d.hdr) and commands (e.g. !pcomb)
+    after -o are not considered as output files.
+
+    Returns:
+        A list of (argument, is_output) tuples.
+    """
+    try:
+        tokens = shlex.split(command, posix=os.name != 'nt')
+    except ValueError:
+        tokens = command.split()
+    args = []
+    is_output = False
+    program = None
+    for token in tokens:
+        token = token.strip('"')
+        if token == '|':
+            program = None
+            continue
+        elif program is None:
+            program = os.path.splitext(os.path.basename(token))[0].lower()
+        if token in ('>', '>>') or \
+                (token == '-o' and program in OUTPUT_OPTION_PROGRAMS):
+            is_output = True
+            continue
+        elif token[:1] in ('<', '>'):
+            is_output = token[0] == '>'
+            token = token.lstrip('<>')
+            if not token:
+                continue
+        if is_output:
+            if '%' not in token and not token.startswith('!'):
+                args.append((token, True))
+            is_output = False
+        else:
+            args.append((token, False))
+    return args
+
+
+def batch_file_to_subtasks(file_path):
+    """Parse a honeybee batch file to subtasks.
+
+    Each command in the batch file will be converted to a SubTask. Comment lines
+    will be used as the title of the next command. Lines to change the directory and
+    to set the environment variables are collected and returned separately.
+
+    Args:
+        file_path: Path to a honeybee commands.bat or commands.sh file.
+
+    Returns:
+        A namedtuple as (cwd, env, subtasks). env is a dictionary of environment
+        variables that are set in the file.
+    """
+    BatchFile = namedtuple('BatchFile', 'cwd env subtasks')
+    cwd = os.path.dirname(os.path.abspath(file_path))
+    env = {}
+    subtasks = []
+    title = None
+    with open(file_path, 'rb') as inf:
+        for line in inf:
+            line = line.strip()
+            lower = line.lower()
+            if not line or lower in ('@echo off', 'pause') or line.startswith('#'):
+                continue
+            elif re.match(r'^[a-z]:$', lower):
+                # change drive
+                continue
+            elif lower.startswith('cd '):
+                cwd = line[3:].strip()
+            elif lower.startswith('set '):
+                key, value = line[4:].split('=', 1)
+                env[key.strip()] = value.strip()
+            elif lower.startswith('path='):
+                env['PATH'] = line[5:].replace('%PATH%', os.environ.get('PATH', ''))
+            elif lower.startswith('echo') or line.startswith('::'):
+                comment = line[4:] if lower.startswith('echo') else line
+                comment = comment.strip(' :')
+                if comment:
+                    title = comment
+            else:
+                # find output file from redirection or -o
+                outputs = [token for token, is_output in parse_command(line)
+                           if is_output]
+                subtasks.append(
+                    SubTask(title or line.split()[0], line,
+                            outputs[-1] if outputs else None))
+                title = None
+
+    return BatchFile(cwd, env, subtasks)
@@ -2,9 +2,9 @@
 from ._skyBase import RadianceSky
 from ..material.light import Light
 from ..geometry.source import Source
+from .solarposition import sun_up_vectors
 
 from ladybug.epw import EPW
-from ladybug.sunpath import Sunpath
 
 import os
 from itertools import izip
@@ -52,19 +52,9 @@ class Analemma(RadianceSky):
             is_leap_year: A boolean to indicate if hours are for a leap year
                 (default: False).
         """
-        sun_vectors = []
-        sun_up_hours = []
         hoys = hoys or range(8760)
-        north = north or 0
-
-        sp = Sunpath.from_location(location, north)
-        sp.is_leap_year = is_leap_year
-        for hour in hoys:
-            sun = sp.calculate_sun_from_hoy(hour)
-            if sun.altitude < 0:
-                continue
-            sun_vectors.append(sun.sun_vector)
-            sun_up_hours.append(hour)
+        sun_vectors, sun_up_hours = \
+            sun_up_vectors(location, hoys, north or 0, is_leap_year)
 
         return cls(sun_vectors, sun_up_hours)
 
@@ -2,6 +2,7 @@ from ._skyBase import RadianceSky
 from ..command.genskyvec import Genskyvec
 from ..command.gensky import Gensky
 from ..command.gendaylit import Gendaylit
+from ..parameters.gensky import GenskyParameters
 from ..parameters.gendaylit import GendaylitParameters
 
 from ladybug.epw import EPW
@@ -29,6 +30,34 @@ class SkyVector(RadianceSky):
         self.sky_density = sky_density or 1
         self.__is_climate_based = is_climate_based
 
+    @classmethod
+    def from_json(cls, rec_json):
+        """Create sky vector from json.
+            {
+            "sky": {
+                "type": string, // gensky or gendaylit
+                "output_file": string, // sky file name
+                "month_day_hour": [], // month, day and hour of the sky
+                "rotation": float, // sky rotation in degrees
+                "parameters": {} // gensky or gendaylit parameters by attribute name
+                },
+            "sky_density": int, // [1] Tregenza Sky, [2] Reinhart Sky, etc.
+            "is_climate_based": bool
+            }
+        """
+        sky_json = rec_json["sky"]
+        if sky_json["type"] == "gendaylit":
+            sky_class, parameters = Gendaylit, GendaylitParameters()
+        else:
+            sky_class, parameters = Gensky, GenskyParameters()
+
+        for key, value in sky_json["parameters"].iteritems():
+            setattr(parameters, key, value)
+
+        sky = sky_class(sky_json["output_file"], tuple(sky_json["month_day_hour"]),
+                        sky_json["rotation"], parameters)
+        return cls(sky, rec_json["sky_density"], rec_json["is_climate_based"])
+
     # from radiation values
     @classmethod
     def from_radiation_values(
@@ -140,9 +169,9 @@ class SkyVector(RadianceSky):
             return "SKYVEC_{}".format(
                 '.'.join(os.path.split(self.sky.output_file)[-1].split('.')[:-1])
             )
-        except TypeError:
+        except (TypeError, AttributeError):
             return "SKYVEC_{}".format(
-                '.'.join(str(self.sky.output_file).split('.')[:-1])
+                '.'.join(os.path.split(str(self.sky.output_file))[-1].split('.')[:-1])
             )
 
     # TODO: re-write the method! It's Currently very shaky
@@ -189,6 +218,43 @@ class SkyVector(RadianceSky):
         genskv.execute()
         return outfilepath
 
+    def to_json(self):
+        """Create json from sky vector.
+            {
+            "sky": {
+                "type": string, // gensky or gendaylit
+                "output_file": string, // sky file name
+                "month_day_hour": [], // month, day and hour of the sky
+                "rotation": float, // sky rotation in degrees
+                "parameters": {} // gensky or gendaylit parameters by attribute name
+                },
+            "sky_density": int, // [1] Tregenza Sky, [2] Reinhart Sky, etc.
+            "is_climate_based": bool
+            }
+        """
+        if isinstance(self.sky, Gendaylit):
+            sky_type, parameters = "gendaylit", self.sky.gendaylit_parameters
+        else:
+            sky_type, parameters = "gensky", self.sky.gensky_parameters
+
+        values = {}
+        for key in parameters.default_parameters:
+            value = getattr(parameters, key)._value
+            if value is not None:
+                values[key] = list(value) if isinstance(value, tuple) else value
+
+        return {
+            "sky": {
+                "type": sky_type,
+                "output_file": os.path.basename(str(self.sky.output_file)),
+                "month_day_hour": [self.month, self.day, self.hour],
+                "rotation": self.sky.rotation,
+                "parameters": values
+            },
+            "sky_density": int(self.sky_density),
+            "is_climate_based": self.is_climate_based
+        }
+
     def ToString(self):
         """Overwrite .NET ToString method."""
         return self.__repr__()
@@ -0,0 +1,209 @@
+"""Calculate solar position for a list of hours of the year in one call.
+
+The equations are the NOAA solar position equations which are also used by ladybug
+Sunpath. Sun vectors follow ladybug's convention and are pointing from the sun
+toward the ground (z is negative for sun up hours).
+
+Results are cached for each location, north angle and list of hours so the analemma
+and the sun matrix for the same sky only calculate the sun positions once.
+
+Usage:
+
+    from honeybee.radiance.sky.solarposition import calculate_solar_positions
+    # hours of the year for a 10 minutes timestep
+    hoys = [count / 6.0 for count in xrange(8760 * 6)]
+    positions = calculate_solar_positions(42.37, -71.03, -5, hoys, north=20)
+    print(positions.altitudes[72])
+    print(positions.sun_vectors[72])
+"""
+from collections import namedtuple
+import math
+
+SolarPositions = namedtuple('SolarPositions',
+                            'hoys altitudes azimuths sun_vectors')
+"""Hours of the year, altitudes and azimuths in degrees and sun vectors as (x, y, z).
+"""
+
+_CACHE = {}
+_CACHE_SIZE = 16
+
+
+def _julian_day_start(is_leap_year):
+    """Julian day for 1st of January at 00:00 of 2016 for leap years or 2017."""
+    return 2457388.5 if is_leap_year else 2457754.5
+
+
+def _refraction(altitude):
+    """Approximate atmospheric refraction in degrees for an altitude in degrees."""
+    if altitude > 85:
+        return 0
+    elif altitude > 5:
+        tan_alt = math.tan(math.radians(altitude))
+        return (58.1 / tan_alt - 0.07 / tan_alt ** 3 + 0.000086 / tan_alt ** 5) / 3600
+    elif altitude > -0.575:
+        return (1735 + altitude * (-518.2 + altitude * (
+            103.4 + altitude * (-12.79 + altitude * 0.711)))) / 3600
+    else:
+        return -20.772 / math.tan(math.radians(altitude)) / 3600
+
+
+def _solar_positions(latitude, longitude, time_zone, hoys, north, is_leap_year):
+    """Calculate solar positions with no caching."""
+    lat = math.radians(latitude)
+    sin_lat, cos_lat = math.sin(lat), math.cos(lat)
+    sin_north, cos_north = math.sin(math.radians(north)), math.cos(math.radians(north))
+    # offset for true solar time in minutes
+    time_offset = 4 * longitude - 60 * time_zone
+    jd_start = _julian_day_start(is_leap_year) - time_zone / 24.0
+
+    altitudes = []
+    azimuths = []
+    sun_vectors = []
+    for hoy in hoys:
+        jc = (jd_start + hoy / 24.0 - 2451545) / 36525.0
+
+        # solar declination and equation of time
+        mean_long = math.radians(
+            (280.46646 + jc * (36000.76983 + jc * 0.0003032)) % 360)
+        mean_anom = math.radians(357.52911 + jc * (35999.05029 - 0.0001537 * jc))
+        eccent = 0.016708634 - jc * (0.000042037 + 0.0000001267 * jc)
+        eq_of_ctr = math.sin(mean_anom) * (1.914602 - jc * (0.004817 + 0.000014 * jc)) \
+            + math.sin(2 * mean_anom) * (0.019993 - 0.000101 * jc) \
+            + math.sin(3 * mean_anom) * 0.000289
+        omega = math.radians(125.04 - 1934.136 * jc)
+        app_long = math.radians(
+            math.degrees(mean_long) + eq_of_ctr - 0.00569 - 0.00478 * math.sin(omega))
+        obliq = math.radians(
+            23 + (26 + (21.448 - jc * (46.815 + jc * (0.00059 - jc * 0.001813))) / 60)
+            / 60 + 0.00256 * math.cos(omega))
+        sin_dec = math.sin(obliq) * math.sin(app_long)
+        cos_dec = math.sqrt(1 - sin_dec ** 2)
+        var_y = math.tan(obliq / 2) ** 2
+        eq_of_time = 4 * math.degrees(
+            var_y * math.sin(2 * mean_long) -
+            2 * eccent * math.sin(mean_anom) +
+            4 * eccent * var_y * math.sin(mean_anom) * math.cos(2 * mean_long) -
+            0.5 * var_y ** 2 * math.sin(4 * mean_long) -
+            1.25 * eccent ** 2 * math.sin(2 * mean_anom))
+
+        # hour angle in degrees
+        solar_time = ((hoy % 24) * 60 + eq_of_time + time_offset) % 1440
+        hour_angle = solar_time / 4 - 180
+
+        cos_zenith = sin_lat * sin_dec + \
+            cos_lat * cos_dec * math.cos(math.radians(hour_angle))
+        cos_zenith = max(-1.0, min(1.0, cos_zenith))
+        zenith = math.acos(cos_zenith)
+        altitude = 90 - math.degrees(zenith)
+
+        # azimuth in degrees from north clockwise
+        denominator = cos_lat * math.sin(zenith)
+        if abs(denominator) < 1e-9:
+            azimuth = 180.0 if latitude > 0 else 0.0
+        else:
+            cos_az = max(-1.0, min(1.0, (sin_lat * cos_zenith - sin_dec) / denominator))
+            if hour_angle > 0:
+                azimuth = (math.degrees(math.acos(cos_az)) + 180) % 360
+            else:
+                azimuth = (540 - math.degrees(math.acos(cos_az))) % 360
+
+        altitude += _refraction(altitude)
+
+        # vector toward the sun rotated for north and flipped toward the ground
+        alt, az = math.radians(altitude), math.radians(azimuth)
+        x = math.cos(alt) * math.sin(az)
+        y = math.cos(alt) * math.cos(az)
+        sun_vectors.append((-(x * cos_north - y * sin_north),
+                            -(x * sin_north + y * cos_north),
+                            -math.sin(alt)))
+        altitudes.append(altitude)
+        azimuths.append(azimuth)
+
+    return SolarPositions(tuple(hoys), tuple(altitudes), tuple(azimuths),
+                          tuple(sun_vectors))
+
+
+def calculate_solar_positions(latitude, longitude, time_zone, hoys, north=0,
+                              is_leap_year=False):
+    """Calculate altitude, azimuth and sun vector for a list of hours of the year.
+
+    Args:
+        latitude: Latitude in degrees.
+        longitude: Longitude in degrees. Positive values are east of Greenwich.
+        time_zone: Time zone as hours from GMT (e.g. -5 for EST).
+        hoys: A list of hours of the year. Hours can be float values for sub-hourly
+            timesteps (e.g. 12.5 for 12:30 on 1st of January).
+        north: North angle from Y direction in degrees. Positive values are
+            counterclockwise (default: 0).
+        is_leap_year: A boolean to indicate if hours are for a leap year
+            (default: False).
+
+    Returns:
+        SolarPositions as a named tuple of hoys, altitudes, azimuths and sun_vectors.
+        Results are cached and should not be modified.
+    """
+    hoys = tuple(hoys)
+    key = (float(latitude), float(longitude), float(time_zone), float(north or 0),
+           bool(is_leap_year), hoys)
+    try:
+        return _CACHE[key]
+    except KeyError:
+        pass
+
+    positions = _solar_positions(float(latitude), float(longitude), float(time_zone),
+                                 hoys, float(north or 0), is_leap_year)
+    if len(_CACHE) >= _CACHE_SIZE:
+        _CACHE.clear()
+    _CACHE[key] = positions
+    return positions
+
+
+def solar_positions_from_location(location, hoys, north=0, is_leap_year=False):
+    """Calculate solar positions for a ladybug location.
+
+    Args:
+        location: A ladybug location.
+        hoys: A list of hours of the year.
+        north: North angle from Y direction in degrees (default: 0).
+        is_leap_year: A boolean to indicate if hours are for a leap year
+            (default: False).
+
+    Returns:
+        SolarPositions as a named tuple of hoys, altitudes, azimuths and sun_vectors.
+    """
+    return calculate_solar_positions(location.latitude, location.longitude,
+                                     location.time_zone, hoys, north, is_leap_year)
+
+
+def is_sun_up(altitude):
+    """Check if the sun is up for a solar altitude in degrees.
+
+    This is the same check that ladybug Sunpath uses for sun up hours and should be
+    used by all the skies that filter hours based on solar positions.
+    """
+    return altitude >= 0
+
+
+def sun_up_vectors(location, hoys, north=0, is_leap_year=False):
+    """Get sun vectors and hours of the year for sun up hours of a location.
+
+    Args:
+        location: A ladybug location.
+        hoys: A list of hours of the year.
+        north: North angle from Y direction in degrees (default: 0).
+        is_leap_year: A boolean to indicate if hours are for a leap year
+            (default: False).
+
+    Returns:
+        sun_vectors, sun_up_hoys
+    """
+    positions = solar_positions_from_location(location, hoys, north, is_leap_year)
+    sun_up = [count for count, altitude in enumerate(positions.altitudes)
+              if is_sun_up(altitude)]
+    return tuple(positions.sun_vectors[i] for i in sun_up), \
+        tuple(positions.hoys[i] for i in sun_up)
+
+
+def clear_cache():
+    """Clear the cached solar positions."""
+    _CACHE.clear()
@@ -1,8 +1,8 @@
 from ._skyBase import RadianceSky
 from .gendaylit import gendaylit
+from .solarposition import solar_positions_from_location, is_sun_up
 
 from ladybug.dt import DateTime
-from ladybug.sunpath import Sunpath
 from ladybug.wea import Wea
 
 import os
@@ -139,6 +139,11 @@ class SunMatrix(RadianceSky):
         """Sun matrix file."""
         return self.name + '.mtx'
 
+    @property
+    def cumulative_sunmtxfile(self):
+        """Cumulative sun matrix file."""
+        return self.name + '_cum.mtx'
+
     @property
     def solar_values(self):
         """List of radiance values for each sun_up_hour.
@@ -158,6 +163,10 @@ class SunMatrix(RadianceSky):
     @property
     def output_header(self):
         """Sun matrix file header output."""
+        return self._header(len(self.hoys))
+
+    def _header(self, column_count):
+        """Sun matrix file header for a matrix with column_count columns."""
         # Start creating header for the sun matrix.
         latitude, longitude = self.wea.location.latitude, -self.wea.location.longitude
         file_header = '#?RADIANCE\n' \
@@ -167,7 +176,7 @@ class SunMatrix(RadianceSky):
             'NCOLS=%s\n' \
             'NCOMP=3\n' \
             'FORMAT=ascii\n\n' % (
-                latitude, -longitude, len(self._sun_up_hours_indices), len(self.hoys)
+                latitude, -longitude, len(self._sun_up_hours_indices), column_count
             )
         return file_header
 
@@ -193,39 +202,43 @@ class SunMatrix(RadianceSky):
         """
         wea = self.wea
         output_type = self.output_type
-        month_date_time = (DateTime.from_hoy(idx) for idx in self.hoys)
-
-        sp = Sunpath.from_location(wea.location, self.north)
+        positions = solar_positions_from_location(wea.location, self.hoys, self.north)
 
         # use gendaylit to calculate radiation values for each hour.
         print('Calculating solar values...')
-        for timecount, dt in enumerate(month_date_time):
+        for timecount, altitude in enumerate(positions.altitudes):
+            if not is_sun_up(altitude):
+                continue
+            dt = DateTime.from_hoy(positions.hoys[timecount])
             month, day, hour = dt.month, dt.day, dt.float_hour
             dnr, dhr = wea.get_radiation_values(month, day, hour)
-            sun = sp.calculate_sun(month, day, hour)
-            if sun.altitude < 0:
-                continue
             if dnr == 0:
                 solarradiance = 0
             else:
                 solarradiance = \
-                    int(gendaylit(sun.altitude, month, day, hour, dnr, dhr, output_type))
+                    int(gendaylit(altitude, month, day, hour, dnr, dhr, output_type))
 
             self._solar_values.append(solarradiance)
             # keep the number of hour relative to hoys in this sun matrix
             self._sun_up_hours_indices.append(timecount)
 
-    def execute(self, working_dir, reuse=True):
+    def execute(self, working_dir, reuse=True, cumulative=False):
         """Generate sun matrix.
 
         Args:
             working_dir: Folder to execute and write the output.
             reuse: Reuse the matrix if already existed in the folder.
+            cumulative: Set to True to write a single column matrix with the sum of
+                values for all the hours. Since every sun is only up for a single hour
+                the cumulative value for each sun is its solar value (Default: False).
 
         Returns:
             Full path to analemma, sunlist and sun_matrix.
         """
-        mfp = os.path.join(working_dir, self.sunmtxfile)  # annual sun matrix
+        if cumulative:
+            mfp = os.path.join(working_dir, self.cumulative_sunmtxfile)
+        else:
+            mfp = os.path.join(working_dir, self.sunmtxfile)  # annual sun matrix
         hrf = os.path.join(working_dir, self.name + '.hrs')  # list of hours
 
         if reuse and self.hours_match(hrf) and os.path.isfile(mfp):
@@ -240,12 +253,17 @@ class SunMatrix(RadianceSky):
         print('Writing sun matrix to {}'.format(mfp))
         # Write the matrix to file.
         with open(mfp, 'w') as sunmtx:
-            sunmtx.write(self.output_header)
-            for idx, sun_value in enumerate(self.solar_values):
-                sun_rad_list = ['0 0 0'] * len(self.hoys)
-                sun_rad_list[self._sun_up_hours_indices[idx]] = \
-                    '{0} {0} {0}'.format(sun_value)
-                sunmtx.write('\n'.join(sun_rad_list) + '\n\n')
+            if cumulative:
+                sunmtx.write(self._header(1))
+                for sun_value in self.solar_values:
+                    sunmtx.write('{0} {0} {0}\n\n'.format(sun_value))
+            else:
+                sunmtx.write(self.output_header)
+                for idx, sun_value in enumerate(self.solar_values):
+                    sun_rad_list = ['0 0 0'] * len(self.hoys)
+                    sun_rad_list[self._sun_up_hours_indices[idx]] = \
+                        '{0} {0} {0}'.format(sun_value)
+                    sunmtx.write('\n'.join(sun_rad_list) + '\n\n')
 
             sunmtx.write('\n')
 
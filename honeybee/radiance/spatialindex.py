@@ -0,0 +1,255 @@
+"""A KD-tree for fast spatial queries over analysis points."""
+from array import array
+from heapq import heappush, heapreplace
+import math
+
+
+class KDTree(object):
+    """A static KD-tree for 3D points.
+
+    The tree is stored as a permutation of point indices. Each node covers a range of
+    the permutation and the point in the middle of the range is the node point which
+    splits the range on the axis with the largest spread. Ranges with fewer than
+    leaf_size points are searched by brute force.
+
+    Attributes:
+        points: A list of (x, y, z) points.
+        leaf_size: Maximum number of points in a leaf (Default: 8).
+
+    Usage:
+
+        tree = KDTree(analysis_grid.points)
+        print(tree.nearest((1, 2, 0.75), k=4))
+        > [(0.25, 12), (0.25, 13), (0.75, 8), (0.75, 9)]
+    """
+
+    __slots__ = ('_coordinates', '_ids', '_axes', '_leaf_size')
+
+    def __init__(self, points, leaf_size=8):
+        """Create a KD-tree."""
+        coordinates = array('d')
+        for pt in points:
+            coordinates.extend((pt[0], pt[1], pt[2]))
+        self._coordinates = coordinates
+        self._leaf_size = max(1, int(leaf_size))
+        count = len(coordinates) // 3
+        self._ids = array('l', xrange(count))
+        self._axes = array('b', (0,) * count)
+        self._build(0, count)
+
+    def _build(self, start, end):
+        """Build the tree for a range of ids."""
+        coordinates = self._coordinates
+        axis_values = tuple(coordinates[axis::3].tolist() for axis in xrange(3))
+        ids = self._ids
+        # use a stack instead of recursion for large grids
+        stack = [(start, end)]
+        while stack:
+            start, end = stack.pop()
+            if end - start <= self._leaf_size:
+                continue
+            # find the axis with the largest spread
+            node_ids = ids[start:end].tolist()
+            spreads = []
+            for values in axis_values:
+                node_values = [values[i] for i in node_ids]
+                spreads.append(max(node_values) - min(node_values))
+            axis = spreads.index(max(spreads))
+            node_ids.sort(key=axis_values[axis].__getitem__)
+            ids[start:end] = array('l', node_ids)
+            mid = (start + end) // 2
+            self._axes[mid] = axis
+            stack.append((start, mid))
+            stack.append((mid + 1, end))
+
+    @property
+    def leaf_size(self):
+        """Maximum number of points in a leaf."""
+        return self._leaf_size
+
+    def point(self, index):
+        """Get a point by index."""
+        c = self._coordinates
+        return c[index * 3], c[index * 3 + 1], c[index * 3 + 2]
+
+    def _distance_squared(self, index, x, y, z):
+        c = self._coordinates
+        dx = c[index * 3] - x
+        dy = c[index * 3 + 1] - y
+        dz = c[index * 3 + 2] - z
+        return dx * dx + dy * dy + dz * dz
+
+    def nearest(self, point, k=1):
+        """Find the k nearest points to a point.
+
+        Args:
+            point: A point as (x, y, z).
+            k: Number of points (Default: 1).
+
+        Returns:
+            A list of (distance, index) sorted by distance.
+        """
+        k = min(int(k), len(self))
+        if k < 1:
+            return []
+        x, y, z = point[0], point[1], point[2]
+        target = (x, y, z)
+        coordinates = self._coordinates
+        ids = self._ids
+        axes = self._axes
+        leaf_size = self._leaf_size
+        dist = self._distance_squared
+        # max heap of the best candidates as (-distance, -index)
+        heap = []
+
+        def add(index):
+            d = dist(index, x, y, z)
+            if len(heap) < k:
+                heappush(heap, (-d, -index))
+            elif -d > heap[0][0]:
+                heapreplace(heap, (-d, -index))
+
+        stack = [(0, len(ids), 0)]
+        while stack:
+            start, end, gap = stack.pop()
+            if len(heap) == k and gap > -heap[0][0]:
+                continue
+            if end - start <= leaf_size:
+                for index in ids[start:end]:
+                    add(index)
+                continue
+            mid = (start + end) // 2
+            index = ids[mid]
+            add(index)
+            axis = axes[mid]
+            diff = target[axis] - coordinates[index * 3 + axis]
+            if diff < 0:
+                near, far = (start, mid), (mid + 1, end)
+            else:
+                near, far = (mid + 1, end), (start, mid)
+            # push far side first so the near side is searched first
+            stack.append((far[0], far[1], diff * diff))
+            stack.append((near[0], near[1], 0))
+
+        return [(math.sqrt(-d), -i) for d, i in sorted(heap, reverse=True)]
+
+    def within_radius(self, point, radius):
+        """Find the points within a distance from a point.
+
+        Returns:
+            A list of (distance, index) sorted by distance.
+        """
+        x, y, z = point[0], point[1], point[2]
+        target = (x, y, z)
+        radius_sq = radius * radius
+        coordinates = self._coordinates
+        ids = self._ids
+        axes = self._axes
+        dist = self._distance_squared
+        found = []
+        stack = [(0, len(ids))]
+        while stack:
+            start, end = stack.pop()
+            if end - start <= self._leaf_size:
+                for index in ids[start:end]:
+                    d = dist(index, x, y, z)
+                    if d <= radius_sq:
+                        found.append((d, index))
+                continue
+            mid = (start + end) // 2
+            index = ids[mid]
+            d = dist(index, x, y, z)
+            if d <= radius_sq:
+                found.append((d, index))
+            axis = axes[mid]
+            diff = target[axis] - coordinates[index * 3 + axis]
+            if diff <= radius:
+                stack.append((start, mid))
+            if diff >= -radius:
+                stack.append((mid + 1, end))
+
+        return [(math.sqrt(sq_dist), i) for sq_dist, i in sorted(found)]
+
+    def within_box(self, min_point, max_point):
+        """Find the points inside an axis aligned bounding box.
+
+        Returns:
+            A sorted list of indices.
+        """
+        coordinates = self._coordinates
+        ids = self._ids
+        axes = self._axes
+
+        def inside(index):
+            for axis in xrange(3):
+                v = coordinates[index * 3 + axis]
+                if v < min_point[axis] or v > max_point[axis]:
+                    return False
+            return True
+
+        found = []
+        stack = [(0, len(ids))]
+        while stack:
+            start, end = stack.pop()
+            if end - start <= self._leaf_size:
+                found.extend(i for i in ids[start:end] if inside(i))
+                continue
+            mid = (start + end) // 2
+            index = ids[mid]
+            if inside(index):
+                found.append(index)
+            axis = axes[mid]
+            value = coordinates[index * 3 + axis]
+            if min_point[axis] <= value:
+                stack.append((start, mid))
+            if max_point[axis] >= value:
+                stack.append((mid + 1, end))
+
+        return sorted(found)
+
+    def interpolate(self, values, points, k=4, power=2):
+        """Interpolate values at new points using inverse distance weighting.
+
+        Args:
+            values: A list of values for the points in the tree. Values can be numbers
+                or lists of numbers with the same length (e.g. hourly values).
+            points: A list of (x, y, z) points to interpolate values for.
+            k: Number of nearest points to be used for interpolation (Default: 4).
+            power: Power for inverse distance weighting (Default: 2).
+
+        Returns:
+            A list of values. One for each point.
+        """
+        assert len(values) == len(self), \
+            'Length of values [%d] must match number of points [%d].' % (
+                len(values), len(self))
+        is_list = hasattr(values[0], '__iter__') if len(values) else False
+        results = []
+        for pt in points:
+            nearest = self.nearest(pt, k)
+            if nearest[0][0] == 0:
+                # point is on top of an existing point
+                results.append(values[nearest[0][1]])
+                continue
+            weights = [1.0 / d ** power for d, _ in nearest]
+            total = sum(weights)
+            if is_list:
+                results.append(
+                    [sum(w * values[i][c] for w, (_, i) in zip(weights, nearest)) / total
+                     for c in xrange(len(values[nearest[0][1]]))])
+            else:
+                results.append(
+                    sum(w * values[i] for w, (_, i) in zip(weights, nearest)) / total)
+        return results
+
+    def __len__(self):
+        """Number of points."""
+        return len(self._ids)
+
+    def ToString(self):
+        """Overwrite .NET ToString method."""
+        return self.__repr__()
+
+    def __repr__(self):
+        """KDTree representation."""
+        return 'KDTree: #%d' % len(self)
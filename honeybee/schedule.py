@@ -135,6 +135,39 @@ class Schedule(object):
         """Occupied hours of the year as a set."""
         return self._occupiedHours
 
+    def occupied_hoys(self, hoys):
+        """Filter a list of hours of the year to occupied hours.
+
+        An hour of the year is occupied if the hour it falls in is occupied. For
+        instance 8.5 is occupied if 8 is an occupied hour. The order of the input hours
+        will be kept.
+
+        Args:
+            hoys: A list of hours of the year.
+
+        Returns:
+            A tuple of occupied hours from input hoys.
+        """
+        occ_hours = self._occupiedHours
+        return tuple(h for h in hoys if int(h) in occ_hours)
+
+    @classmethod
+    def from_json(cls, sch_json):
+        """Create a schedule from a dictionary.
+            {
+            "values": [], // list of schedule values
+            "hoys": [] // list of hours of the year for values
+            }
+        """
+        return cls(sch_json["values"], sch_json.get("hoys"))
+
+    def to_json(self):
+        """Create a dictionary from schedule."""
+        return {
+            "values": list(self._values),
+            "hoys": list(self._hoys)
+        }
+
     def write(self, file_path):
         """Write the schedule to a csv file."""
         raise NotImplementedError('Write method is not implemented yet!')
@@ -1,26 +1,239 @@
-import urllib2
-from mpupload import MultiPartForm
+import base64
+import hashlib
+import httplib
+import json
+import os
+import shutil
+import socket
+import tempfile
+import urlparse
+from mpupload import MultiPartForm, GzipReader, BLOCK_SIZE
 
 
 class Client():
-    """Client class for honeybee to set requests to server."""
+    """Client class for honeybee to set requests to server.
 
-    def __init__(self, url):
+    Bodies are streamed from disk and the connection to the server is reused
+    between requests.
+
+    Usage:
+
+        client = Client('http://localhost:8000/upload')
+        client.upload_file('c:/ladybug/room.zip', compress=True)
+        # multi-gigabyte files
+        client.upload_file_resumable('c:/ladybug/room.zip',
+                                     state_file='c:/ladybug/room.upload')
+    """
+
+    def __init__(self, url, timeout=None):
         self.url = url
         self.headers = {
             'Content-Type': 'application/zip'
         }
+        self.timeout = timeout
+        self._connection = None
+
+    def _get_connection(self, url):
+        """Get a connection to the host of url. The open connection is reused."""
+        parts = urlparse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        if self._connection and self._connection[0] == key:
+            return self._connection[1], True
+        self.close()
+        if parts.scheme == 'https':
+            connection = httplib.HTTPSConnection(parts.netloc, timeout=self.timeout)
+        else:
+            connection = httplib.HTTPConnection(parts.netloc, timeout=self.timeout)
+        self._connection = (key, connection)
+        return connection, False
+
+    def close(self):
+        """Close the connection to server."""
+        if self._connection:
+            self._connection[1].close()
+            self._connection = None
+
+    @staticmethod
+    def _path(url):
+        parts = urlparse.urlsplit(url)
+        return (parts.path or '/') + ('?' + parts.query if parts.query else '')
 
-    def upload_file(self, filename):
-        """Upload a file and send it to the server."""
+    def _request(self, method, url, headers=None, body=None, length=None):
+        """Send a request and return the response as (status, headers, data).
+
+        Args:
+            body: A function that returns an iterable of strings for the body. The
+                function will be called again if the request is retried on a new
+                connection.
+            length: Length of the body. If None the body is sent with chunked
+                transfer encoding.
+        """
+        for attempt in range(2):
+            connection, is_reused = self._get_connection(url)
+            try:
+                connection.putrequest(method, self._path(url))
+                for key, value in (headers or {}).items():
+                    connection.putheader(key, value)
+                if body and length is None:
+                    connection.putheader('Transfer-Encoding', 'chunked')
+                else:
+                    connection.putheader('Content-Length', str(length or 0))
+                connection.endheaders()
+                if body:
+                    for data in body():
+                        if not data:
+                            continue
+                        if length is None:
+                            connection.send('%x\r\n%s\r\n' % (len(data), data))
+                        else:
+                            connection.send(data)
+                    if length is None:
+                        connection.send('0\r\n\r\n')
+                response = connection.getresponse()
+                data = response.read()
+            except (httplib.HTTPException, socket.error):
+                self.close()
+                if is_reused and attempt == 0:
+                    # server has closed the idle connection. try a new connection.
+                    continue
+                raise
+            if response.getheader('connection', '').lower() == 'close':
+                self.close()
+            return response.status, dict(response.getheaders()), data
+
+    @staticmethod
+    def _check(status, data, url):
+        if not 200 <= status < 300:
+            raise ValueError(
+                'Request to {} failed with status {}:\n{}'.format(url, status, data))
+
+    @staticmethod
+    def _file_form(filename, compress=False, fields=None, boundary=None):
+        """Create a form for a file. Returns the form and the open file handle."""
         form = MultiPartForm()
-        # add file
-        form.add_file('file', filename, open(filename, 'rb'))
-        request = urllib2.Request(self.url)
-        body = str(form)
-        request.add_header('Content-type', form.get_content_type())
-        request.add_header('Content-length', str(len(body)))
-        request.add_data(body)
-        request.get_data()
-        data = urllib2.urlopen(request).read()
+        if boundary:
+            form.boundary = boundary
+        for key, value in (fields or {}).items():
+            form.add_field(key, value)
+        inf = open(filename, 'rb')
+        if compress:
+            form.add_file('file', os.path.basename(filename) + '.gz',
+                          GzipReader(inf), 'application/gzip')
+        else:
+            form.add_file('file', os.path.basename(filename), inf)
+        return form, inf
+
+    def upload_file(self, filename, compress=False, fields=None):
+        """Upload a file and send it to the server.
+
+        The file is streamed from disk and is never loaded to memory.
+
+        Args:
+            filename: Path to file.
+            compress: Set to True to gzip-compress the file while it is being sent.
+                The file will be sent as filename.gz with chunked transfer encoding
+                (Default: False).
+            fields: An optional dictionary of form fields.
+        """
+        form, inf = self._file_form(filename, compress, fields)
+        try:
+            length = form.content_length()
+        finally:
+            inf.close()
+
+        def body():
+            # a new form with the same boundary in case the request is retried
+            new_form, inf = self._file_form(filename, compress, fields, form.boundary)
+            try:
+                for data in new_form.iter_body():
+                    yield data
+            finally:
+                inf.close()
+
+        status, _, data = self._request(
+            'POST', self.url, {'Content-Type': form.get_content_type()}, body, length)
+        self._check(status, data, self.url)
         return data
+
+    def upload_file_resumable(self, filename, chunk_size=2 ** 23, compress=False,
+                              state_file=None, metadata=None):
+        """Upload a large file in chunks. The upload can be resumed after a failure.
+
+        This method uses tus resumable upload protocol (https://tus.io). Each chunk
+        is sent with an md5 checksum in Upload-Checksum header.
+
+        Args:
+            filename: Path to file.
+            chunk_size: Size of each chunk in bytes (Default: 8 MB).
+            compress: Set to True to gzip-compress the file before upload. The
+                compressed file is written to a temporary file.
+            state_file: An optional path to a json file to keep the upload url.
+                If the file exists the upload will be resumed from the last chunk that
+                the server has received.
+            metadata: An optional dictionary of metadata for the upload.
+
+        Returns:
+            Url to the uploaded file on the server.
+        """
+        temp_folder = None
+        source = filename
+        try:
+            if compress:
+                temp_folder = tempfile.mkdtemp()
+                source = os.path.join(temp_folder, os.path.basename(filename) + '.gz')
+                with open(filename, 'rb') as inf, open(source, 'wb') as outf:
+                    shutil.copyfileobj(GzipReader(inf), outf, BLOCK_SIZE)
+            return self._upload_resumable(source, chunk_size, state_file, metadata)
+        finally:
+            if temp_folder:
+                shutil.rmtree(temp_folder, ignore_errors=True)
+
+    def _upload_resumable(self, filename, chunk_size, state_file, metadata):
+        size = os.path.getsize(filename)
+        headers = {'Tus-Resumable': '1.0.0'}
+        upload_url = offset = None
+
+        # try to resume a previous upload
+        if state_file and os.path.isfile(state_file):
+            with open(state_file, 'rb') as inf:
+                state = json.load(inf)
+            if state.get('size') == size and state.get('url'):
+                status, res_headers, _ = self._request('HEAD', state['url'], headers)
+                if 200 <= status < 300 and 'upload-offset' in res_headers:
+                    upload_url = state['url']
+                    offset = int(res_headers['upload-offset'])
+
+        if upload_url is None:
+            metadata = dict(metadata or {})
+            metadata.setdefault('filename', os.path.basename(filename))
+            create_headers = dict(headers)
+            create_headers['Upload-Length'] = str(size)
+            create_headers['Upload-Metadata'] = ','.join(
+                '{} {}'.format(key, base64.b64encode(str(value)))
+                for key, value in sorted(metadata.items()))
+            status, res_headers, data = self._request('POST', self.url, create_headers)
+            self._check(status, data, self.url)
+            upload_url = urlparse.urljoin(self.url, res_headers['location'])
+            offset = 0
+            if state_file:
+                with open(state_file, 'wb') as outf:
+                    json.dump({'url': upload_url, 'size': size}, outf)
+
+        with open(filename, 'rb') as inf:
+            inf.seek(offset)
+            while offset < size:
+                chunk = inf.read(chunk_size)
+                chunk_headers = dict(headers)
+                chunk_headers['Content-Type'] = 'application/offset+octet-stream'
+                chunk_headers['Upload-Offset'] = str(offset)
+                chunk_headers['Upload-Checksum'] = 'md5 {}'.format(
+                    base64.b64encode(hashlib.md5(chunk).digest()))
+                status, res_headers, data = self._request(
+                    'PATCH', upload_url, chunk_headers, lambda: (chunk,), len(chunk))
+                self._check(status, data, upload_url)
+                offset = int(res_headers.get('upload-offset', offset + len(chunk)))
+                inf.seek(offset)
+
+        if state_file and os.path.isfile(state_file):
+            os.remove(state_file)
+        return upload_url
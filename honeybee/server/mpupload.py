@@ -1,10 +1,61 @@
-import itertools
 import mimetools
 import mimetypes
+import os
+import zlib
+
+BLOCK_SIZE = 2 ** 16
+
+
+def _remaining_size(file_handle):
+    """Number of bytes left in a file handle. None if the size is not known."""
+    try:
+        return os.fstat(file_handle.fileno()).st_size - file_handle.tell()
+    except (AttributeError, IOError, OSError, ValueError):
+        return None
+
+
+class GzipReader(object):
+    """A file-like object that gzip-compresses another file while it is being read.
+
+    The compressed file is never stored in memory or on disk.
+
+    Usage:
+
+        with open('project.zip', 'rb') as inf:
+            form.add_file('file', 'project.zip.gz', GzipReader(inf), 'application/gzip')
+    """
+
+    def __init__(self, file_handle, level=6):
+        self._file = file_handle
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+        self._buffer = ''
+        self._is_finished = False
+
+    def read(self, size=-1):
+        """Read compressed data."""
+        while not self._is_finished and (size < 0 or len(self._buffer) < size):
+            data = self._file.read(BLOCK_SIZE)
+            if data:
+                self._buffer += self._compressor.compress(data)
+            else:
+                self._buffer += self._compressor.flush()
+                self._is_finished = True
+        if size < 0:
+            data, self._buffer = self._buffer, ''
+        else:
+            data, self._buffer = self._buffer[:size], self._buffer[size:]
+        return data
+
+    def close(self):
+        self._file.close()
 
 
 class MultiPartForm(object):
-    """Accumulate the data to be used when posting a form."""
+    """Accumulate the data to be used when posting a form.
+
+    Files are only read when the form is sent. Use iter_body to stream the form
+    instead of creating the full body in memory with str(form).
+    """
 
     def __init__(self):
         self.form_fields = []
@@ -19,46 +70,68 @@ class MultiPartForm(object):
         self.form_fields.append((name, value))
 
     def add_file(self, fieldname, filename, file_handle, mimetype=None):
-        """Add a file to be uploaded."""
-        body = file_handle.read()
+        """Add a file to be uploaded.
+
+        file_handle can be any object with a read method (e.g. a GzipReader).
+        """
         if mimetype is None:
             mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
-        self.files.append((fieldname, filename, mimetype, body))
+        self.files.append((fieldname, filename, mimetype, file_handle))
 
-    def __str__(self):
-        """Return a string representing the form data, including attached files."""
-        # Build a list of lists, each containing "lines" of the
-        # request.  Each part is separated by a boundary string.
-        # Once the list is built, return a string where each
-        # line is separated by '\r\n'.
-        parts = []
+    def _parts(self):
+        """Return the parts of the form as strings and file handles."""
         part_boundary = '--' + self.boundary
-
+        parts = []
         # Add the form fields
-        parts.extend(
-            [part_boundary,
-             'Content-Disposition: form-data; name="%s"' % name,
-             '',
-             value,
-             ]
-            for name, value in self.form_fields
-        )
+        for name, value in self.form_fields:
+            parts.append('\r\n'.join(
+                (part_boundary,
+                 'Content-Disposition: form-data; name="%s"' % name,
+                 '',
+                 str(value),
+                 '')))
 
         # Add the files to upload
-        parts.extend(
-            [part_boundary,
-             'Content-Disposition: file; name="%s"; filename="%s"' %
-             (field_name, filename),
-             'Content-Type: %s' % content_type,
-             '',
-             body,
-             ]
-            for field_name, filename, content_type, body in self.files
-        )
-
-        # Flatten the list and add closing boundary marker,
-        # then return CR+LF separated data
-        flattened = list(itertools.chain(*parts))
-        flattened.append('--' + self.boundary + '--')
-        flattened.append('')
-        return '\r\n'.join(flattened)
+        for field_name, filename, content_type, file_handle in self.files:
+            parts.append('\r\n'.join(
+                (part_boundary,
+                 'Content-Disposition: file; name="%s"; filename="%s"' %
+                 (field_name, filename),
+                 'Content-Type: %s' % content_type,
+                 '',
+                 '')))
+            parts.append(file_handle)
+            parts.append('\r\n')
+
+        # add closing boundary marker
+        parts.append('--' + self.boundary + '--\r\n')
+        return parts
+
+    def content_length(self):
+        """Length of the body. None if the size of a file is not known."""
+        length = 0
+        for part in self._parts():
+            if isinstance(part, basestring):
+                length += len(part)
+                continue
+            size = _remaining_size(part)
+            if size is None:
+                return None
+            length += size
+        return length
+
+    def iter_body(self, chunk_size=BLOCK_SIZE):
+        """Iterate over the body of the form in chunks."""
+        for part in self._parts():
+            if isinstance(part, basestring):
+                yield part
+                continue
+            while True:
+                data = part.read(chunk_size)
+                if not data:
+                    break
+                yield data
+
+    def __str__(self):
+        """Return a string representing the form data, including attached files."""
+        return ''.join(self.iter_body())
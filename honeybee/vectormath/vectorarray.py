@@ -0,0 +1,221 @@
+"""Batched vector operations on flat arrays.
+
+A collection of N points or vectors is stored as a flat array('d') of 3 * N values
+(x0, y0, z0, x1, y1, z1, ...). All the functions in this module take and return
+flat arrays so they can be chained without creating an object for each vector. The
+results are consistent with the scalar Vector3, Point3 and Matrix4 classes in euclid.
+
+Usage:
+
+    from honeybee.vectormath import vectorarray as va
+
+    pts = va.to_array(((0, 0, 0), (10, 0, 0), (10, 10, 0)))
+    moved = va.translate(pts, (0, 0, 3))
+    print(va.to_tuples(moved))
+    > ((0.0, 0.0, 3.0), (10.0, 0.0, 3.0), (10.0, 10.0, 3.0))
+"""
+from array import array
+import math
+
+
+def to_array(vectors):
+    """Convert a list of (x, y, z) values, Vector3s or Dynamo points to a flat array."""
+    if isinstance(vectors, array):
+        return array('d', vectors)
+    values = array('d')
+    for v in vectors:
+        try:
+            values.extend((v[0], v[1], v[2]))
+        except TypeError:
+            # Vector3 without __getitem__ or Dynamo points
+            try:
+                values.extend((v.x, v.y, v.z))
+            except AttributeError:
+                values.extend((v.X, v.Y, v.Z))
+    return values
+
+
+def to_tuples(values):
+    """Convert a flat array to a tuple of (x, y, z) tuples."""
+    return tuple(zip(values[0::3], values[1::3], values[2::3]))
+
+
+def count(values):
+    """Number of vectors in a flat array."""
+    return len(values) // 3
+
+
+def _pairs(a, b):
+    """Iterate over vectors in a and b. b can be a single vector."""
+    if len(b) == 3 and len(a) != 3:
+        bx, by, bz = b[0], b[1], b[2]
+        for i in xrange(0, len(a), 3):
+            yield a[i], a[i + 1], a[i + 2], bx, by, bz
+    else:
+        assert len(a) == len(b), \
+            'Length of arrays [%d] and [%d] must be the same.' % (len(a), len(b))
+        for i in xrange(0, len(a), 3):
+            yield a[i], a[i + 1], a[i + 2], b[i], b[i + 1], b[i + 2]
+
+
+def add(a, b):
+    """Add vectors in b to vectors in a. b can be a single vector."""
+    values = array('d')
+    for ax, ay, az, bx, by, bz in _pairs(a, b):
+        values.extend((ax + bx, ay + by, az + bz))
+    return values
+
+
+def subtract(a, b):
+    """Subtract vectors in b from vectors in a. b can be a single vector."""
+    values = array('d')
+    for ax, ay, az, bx, by, bz in _pairs(a, b):
+        values.extend((ax - bx, ay - by, az - bz))
+    return values
+
+
+def scale(a, factor):
+    """Multiply all the vectors by a factor."""
+    return array('d', (v * factor for v in a))
+
+
+def dot(a, b):
+    """Dot product of vectors. Returns an array with one value for each vector."""
+    return array('d', (ax * bx + ay * by + az * bz
+                       for ax, ay, az, bx, by, bz in _pairs(a, b)))
+
+
+def cross(a, b):
+    """Cross product of vectors."""
+    values = array('d')
+    for ax, ay, az, bx, by, bz in _pairs(a, b):
+        values.extend((ay * bz - az * by, -ax * bz + az * bx, ax * by - ay * bx))
+    return values
+
+
+def magnitude(a):
+    """Length of vectors. Returns an array with one value for each vector."""
+    sqrt = math.sqrt
+    return array('d', (sqrt(a[i] ** 2 + a[i + 1] ** 2 + a[i + 2] ** 2)
+                       for i in xrange(0, len(a), 3)))
+
+
+def normalize(a):
+    """Normalize vectors. Zero length vectors will not be changed."""
+    values = array('d')
+    sqrt = math.sqrt
+    for i in xrange(0, len(a), 3):
+        x, y, z = a[i], a[i + 1], a[i + 2]
+        d = sqrt(x * x + y * y + z * z)
+        if d:
+            values.extend((x / d, y / d, z / d))
+        else:
+            values.extend((x, y, z))
+    return values
+
+
+def angle(a, b):
+    """Angle between vectors in radians.
+
+    Returns an array with one value for each vector. Similar to Vector3.angle the
+    vectors can't be zero length.
+    """
+    sqrt = math.sqrt
+    acos = math.acos
+    values = array('d')
+    for ax, ay, az, bx, by, bz in _pairs(a, b):
+        d = (ax * bx + ay * by + az * bz) / \
+            sqrt((ax * ax + ay * ay + az * az) * (bx * bx + by * by + bz * bz))
+        # avoid math domain error for parallel vectors
+        values.append(acos(max(-1.0, min(1.0, d))))
+    return values
+
+
+def _matrix_values(matrix):
+    """Get the first 12 values of an affine matrix in row order."""
+    if hasattr(matrix, 'a') and hasattr(matrix, 'p'):
+        # euclid Matrix4
+        return (matrix.a, matrix.b, matrix.c, matrix.d,
+                matrix.e, matrix.f, matrix.g, matrix.h,
+                matrix.i, matrix.j, matrix.k, matrix.l)
+    values = tuple(v for row in matrix for v in row) \
+        if hasattr(matrix[0], '__iter__') else tuple(matrix)
+    assert len(values) in (12, 16), \
+        'Matrix should have 12 or 16 values not {}.'.format(len(values))
+    return values[:12]
+
+
+def transform(a, matrix, is_point=True):
+    """Apply an affine transform to points or vectors.
+
+    Args:
+        a: A flat array of points or vectors.
+        matrix: A euclid Matrix4 or a 4x4 or 3x4 matrix as nested lists in row order.
+        is_point: Set to False to transform vectors. Translation is only applied to
+            points (Default: True).
+    """
+    ma, mb, mc, md, me, mf, mg, mh, mi, mj, mk, ml = _matrix_values(matrix)
+    if not is_point:
+        md = mh = ml = 0
+    values = array('d')
+    for i in xrange(0, len(a), 3):
+        x, y, z = a[i], a[i + 1], a[i + 2]
+        values.extend((ma * x + mb * y + mc * z + md,
+                       me * x + mf * y + mg * z + mh,
+                       mi * x + mj * y + mk * z + ml))
+    return values
+
+
+def translate(a, vector):
+    """Move all the points by a vector."""
+    return add(a, vector)
+
+
+def bounding_box(a):
+    """Get min and max points of the bounding box as ((x, y, z), (x, y, z))."""
+    assert len(a) > 0, 'Bounding box for an empty array is not defined.'
+    xs, ys, zs = a[0::3], a[1::3], a[2::3]
+    return (min(xs), min(ys), min(zs)), (max(xs), max(ys), max(zs))
+
+
+def polygon_normals(vertices, face_offsets):
+    """Calculate normals for a list of polygons.
+
+    Similar to geometryoperation.normal_from_points the normal is calculated from
+    the first, the second and the last point of each polygon.
+
+    Args:
+        vertices: A flat array of vertices for all the polygons.
+        face_offsets: Index of the first vertex of each polygon. The last item is the
+            total number of vertices.
+
+    Returns:
+        A flat array of unit normals.
+    """
+    values = array('d')
+    sqrt = math.sqrt
+    vt = vertices
+    for f in xrange(len(face_offsets) - 1):
+        st = face_offsets[f] * 3
+        en = face_offsets[f + 1] * 3
+        x0, y0, z0 = vt[st], vt[st + 1], vt[st + 2]
+        ax, ay, az = vt[st + 3] - x0, vt[st + 4] - y0, vt[st + 5] - z0
+        bx, by, bz = vt[en - 3] - x0, vt[en - 2] - y0, vt[en - 1] - z0
+        nx, ny, nz = ay * bz - az * by, -ax * bz + az * bx, ax * by - ay * bx
+        d = sqrt(nx * nx + ny * ny + nz * nz)
+        if d:
+            nx, ny, nz = nx / d, ny / d, nz / d
+        values.extend((nx, ny, nz))
+    return values
+
+
+def interleave(points, vectors):
+    """Interleave points and vectors as x, y, z, dx, dy, dz for each point.
+
+    vectors can be a single vector. Use this method to create the coordinates for
+    analysis grids.
+    """
+    values = array('d')
+    for item in _pairs(points, vectors):
+        values.extend(item)
+    return values
@@ -0,0 +1,90 @@
+import unittest
+import json
+import os
+import shutil
+import tempfile
+from honeybee.config import RadianceEnvironment
+from honeybee.futil import missing_files
+
+
+class RadianceEnvironmentTestCase(unittest.TestCase):
+    """Test for RadianceEnvironment (honeybee/config.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        self.radbin = os.path.join(self.folder, 'bin')
+        self.radlib = os.path.join(self.folder, 'lib')
+        os.makedirs(self.radbin)
+        os.makedirs(self.radlib)
+        for name in ('oconv', 'genskyvec.pl'):
+            open(os.path.join(self.radbin, name), 'wb').close()
+        self.cache_file = os.path.join(self.folder, 'radiance_env.json')
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_probe(self):
+        """Executables should be found with and without extension."""
+        env = RadianceEnvironment.probe(self.radbin, self.radlib)
+        self.assertTrue(env.has_executable('oconv'))
+        self.assertTrue(env.has_executable('genskyvec'))
+        self.assertTrue(env.has_executable('genSkyVec.pl'))
+        self.assertFalse(env.has_executable('rtrace'))
+        self.assertTrue(env.has_radlib)
+
+    def test_cache(self):
+        """Cache should be reused until the folder is changed."""
+        env = RadianceEnvironment.from_cache(self.radbin, self.radlib, self.cache_file)
+        self.assertTrue(os.path.isfile(self.cache_file))
+        cached = RadianceEnvironment.from_cache(self.radbin, self.radlib,
+                                                self.cache_file)
+        self.assertEqual(cached.to_json(), env.to_json())
+
+        open(os.path.join(self.radbin, 'rtrace'), 'wb').close()
+        # make sure modification time is changed
+        os.utime(self.radbin, (0, 0))
+        env = RadianceEnvironment.from_cache(self.radbin, self.radlib, self.cache_file)
+        self.assertTrue(env.has_executable('rtrace'))
+
+    def test_cache_entries(self):
+        """Each pair of Radiance folders should have its own entry in the cache."""
+        other_radbin = os.path.join(self.folder, 'other_bin')
+        os.makedirs(other_radbin)
+        open(os.path.join(other_radbin, 'rtrace'), 'wb').close()
+        env = RadianceEnvironment.from_cache(self.radbin, self.radlib, self.cache_file)
+        other_env = RadianceEnvironment.from_cache(other_radbin, self.radlib,
+                                                   self.cache_file)
+        with open(self.cache_file, 'rb') as inf:
+            cache = json.load(inf)
+        self.assertEqual(len(cache), 2)
+        self.assertFalse(env.has_executable('rtrace'))
+        self.assertTrue(other_env.has_executable('rtrace'))
+
+        # switching between the folders should use the cached probes
+        for entry in cache.itervalues():
+            entry['version'] = 'cached'
+        with open(self.cache_file, 'wb') as outf:
+            json.dump(cache, outf)
+        for radbin in (self.radbin, other_radbin):
+            env = RadianceEnvironment.from_cache(radbin, self.radlib, self.cache_file)
+            self.assertEqual(env.version, 'cached')
+
+    def test_cache_folder(self):
+        """Cache should not be written to the package folder."""
+        import honeybee
+        self.assertNotEqual(os.path.dirname(RadianceEnvironment.cache_file),
+                            os.path.dirname(honeybee.__file__))
+
+    def test_missing_files(self):
+        """Missing files should be found in a single batch."""
+        files = [os.path.join(self.radbin, 'oconv'), os.path.join(self.radbin, 'x'),
+                 os.path.join(self.folder, 'none', 'y')]
+        self.assertEqual(missing_files(files), files[1:])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,97 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.energyplus.filemanager import EnergyPlusFileIndex, \
+    get_energy_plus_objects_from_file
+
+
+class EnergyPlusFileIndexTestCase(unittest.TestCase):
+    """Test for (honeybee/energyplus/filemanager.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        self.idf_file = os.path.join(self.folder, 'test.idf')
+        with open(self.idf_file, 'wb') as outf:
+            outf.write(
+                '! test file\r\n'
+                'Version,8.3;  GlobalGeometryRules,\r\n'
+                '  LowerLeftCorner,  !- Starting Vertex Position\r\n'
+                '  CounterClockWise, !- Vertex Entry Direction\r\n'
+                '  Absolute;         !- Coordinate System\r\n'
+                'Zone,\r\n'
+                '  Zone_1,  !- Name; with a comment\r\n'
+                '  0, 0, 0, 0;\r\n'
+                'BuildingSurface:Detailed, Wall_1, Wall, Ext, Zone_1, Outdoors, ,\r\n'
+                '  SunExposed, WindExposed, autocalculate, 4,\r\n'
+                '  0, 0, 3,  0, 0, 0,  10, 0, 0,  10, 0, 3;\r\n'
+                'FenestrationSurface:Detailed, Win_1, Window, Glz, Wall_1, ,\r\n'
+                '  autocalculate, , , 1, 4,\r\n'
+                '  2, 0, 2,  2, 0, 1,  8, 0, 1,  8, 0, 2;\r\n'
+            )
+        self.idf = EnergyPlusFileIndex(self.idf_file)
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_index(self):
+        """Objects should be indexed by type and name."""
+        assert self.idf.names('zone') == ('Zone_1',)
+        assert self.idf.count('BuildingSurface:Detailed') == 1
+        assert self.idf.names('material') == ()
+        with open(self.idf_file, 'rb') as inf:
+            inf.seek(self.idf.index['globalgeometryrules']['LowerLeftCorner'])
+            assert inf.read(20) == 'GlobalGeometryRules,'
+
+    def test_get_object(self):
+        """Objects should be loaded without comments."""
+        fields = self.idf.get_object('Zone', 'Zone_1')
+        assert fields == ['Zone', 'Zone_1', '0', '0', '0', '0']
+        assert self.idf.geometry_rules().system == 'Absolute'
+
+    def test_hb_zones(self):
+        """Surfaces and fenestrations should be added to zones and surfaces."""
+        zones = self.idf.hb_zones()
+        assert len(zones) == 1
+        assert zones[0].name == 'Zone_1'
+        srf = zones[0].surfaces[0]
+        assert srf.name == 'Wall_1'
+        assert srf.children_surfaces[0].name == 'Win_1'
+
+    def test_hb_zones_order(self):
+        """Surfaces and fenestrations should be added if listed before parents."""
+        with open(self.idf_file, 'wb') as outf:
+            outf.write(
+                'FenestrationSurface:Detailed, Win_1, Window, Glz, Wall_1, ,\r\n'
+                '  autocalculate, , , 1, 4,\r\n'
+                '  2, 0, 2,  2, 0, 1,  8, 0, 1,  8, 0, 2;\r\n'
+                'FenestrationSurface:Detailed, Win_2, Window, Glz, Wall_2, ,\r\n'
+                '  autocalculate, , , 1, 4,\r\n'
+                '  2, 0, 2,  2, 0, 1,  8, 0, 1,  8, 0, 2;\r\n'
+                'BuildingSurface:Detailed, Wall_1, Wall, Ext, Zone_1, Outdoors, ,\r\n'
+                '  SunExposed, WindExposed, autocalculate, 4,\r\n'
+                '  0, 0, 3,  0, 0, 0,  10, 0, 0,  10, 0, 3;\r\n'
+                'BuildingSurface:Detailed, Wall_3, Wall, Ext, Zone_3, Outdoors, ,\r\n'
+                '  SunExposed, WindExposed, autocalculate, 4,\r\n'
+                '  0, 0, 3,  0, 0, 0,  10, 0, 0,  10, 0, 3;\r\n'
+                'Zone, Zone_1, 0, 0, 0, 0;\r\n'
+            )
+        zones = EnergyPlusFileIndex(self.idf_file).hb_zones()
+        assert [zone.name for zone in zones] == ['Zone_1']
+        assert [srf.name for srf in zones[0].surfaces] == ['Wall_1']
+        assert [srf.name for srf in zones[0].surfaces[0].children_surfaces] == \
+            ['Win_1']
+
+    def test_get_energy_plus_objects(self):
+        """Collected objects should be cleaned from spaces."""
+        objects = get_energy_plus_objects_from_file(self.idf_file)
+        assert objects['zone']['Zone_1'] == ['Zone', 'Zone_1', '0', '0', '0', '0']
+        assert 'Wall_1' in objects['buildingsurface:detailed']
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,42 @@
+import unittest
+from honeybee.hbsurface import HBSurface
+from honeybee.hbfensurface import HBFenSurface
+
+
+class HBSurfaceTestCase(unittest.TestCase):
+    """Test for (honeybee/hbsurface.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.wall = HBSurface('wall', ((0, 0, 0), (10, 0, 0), (10, 0, 3), (0, 0, 3)),
+                              0, True, True)
+        for count, x in enumerate((6.5, 1.2, 3.75)):
+            z = 0.9 + 0.1 * count
+            pts = ((x, 0, z), (x + 1, 0, z), (x + 1, 0, z + 1.2), (x, 0, z + 1.2))
+            self.wall.add_fenestration_surface(HBFenSurface('win_%d' % count, pts))
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def test_duplicate_vertices(self):
+        """Fenestrations should be bridged from the closest one to the surface."""
+        polyline = self.wall.duplicate_vertices()[0]
+        self.assertEqual(len(polyline), 4 + 3 * 4 + 2 * 3 + 1)
+        self.assertEqual(polyline[:3], ((0, 0, 0), (0, 0, 3), (1.2, 0, 2.2)))
+        self.assertEqual(self.wall.duplicate_vertices(True)[0],
+                         tuple(reversed(polyline)))
+
+    def test_duplicate_vertices_cache(self):
+        """Polyline should be recalculated only after a change in points."""
+        polyline = self.wall.duplicate_vertices()[0]
+        self.assertIs(self.wall.duplicate_vertices()[0], polyline)
+        self.wall.children_surfaces[0].points = \
+            ((7, 0, 1), (8, 0, 1), (8, 0, 2), (7, 0, 2))
+        self.assertNotEqual(self.wall.duplicate_vertices()[0], polyline)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import shutil
+from honeybee.hbsurface import HBSurface
+from honeybee.hbsurfacecollection import HBSurfaceCollection
+from honeybee.radiance.material.glass import Glass
+from honeybee.radiance.radfile import RadFile
+
+
+class HBSurfaceCollectionTestCase(unittest.TestCase):
+    """Test for (honeybee/hbsurfacecollection.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = 'tests/room/testrun/collection'
+        self.collection = HBSurfaceCollection()
+        self.collection.add_surface(
+            'floor', ((0, 0, 0), (0, 10, 0), (10, 10, 0), (10, 0, 0)))
+        self.collection.add_surface(
+            'wall', ((0, 0, 0), (10, 0, 0), (10, 0, 3), (0, 0, 3)))
+        self.collection.add_surface(
+            'roof', ((0, 0, 3), (10, 0, 3), (10, 5, 3), (5, 5, 3), (5, 10, 3),
+                     (0, 10, 3)))
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+
+    def test_calculated_values(self):
+        """Normal, area and type should match HBSurface."""
+        for view in self.collection:
+            srf = view.to_hb_surface()
+            self.assertEqual(view.surface_type.typeId, srf.surface_type.typeId)
+            for v1, v2 in zip(view.normal, srf.normal):
+                self.assertAlmostEqual(v1, v2)
+        self.assertEqual(list(self.collection.areas), [100.0, 30.0, 75.0])
+
+    def test_radfile(self):
+        """Views should be written the same as HBSurfaces."""
+        glass = Glass.by_single_trans_value('glass_mat', 0.6)
+        self.collection[1].radiance_material = glass
+        surfaces = self.collection.to_hb_surfaces()
+        self.assertEqual(RadFile(self.collection).to_rad_string(),
+                         RadFile(surfaces).to_rad_string())
+        self.assertEqual(len(self.collection.materials), 1)
+
+    def test_write(self):
+        """Writer should write each material once."""
+        fp = self.collection.write(self.folder, 'model.rad', mkdir=True)
+        with open(fp) as inf:
+            content = inf.read()
+        self.assertEqual(content.count('plastic generic_floor'), 1)
+        self.assertEqual(content.count(' polygon '), 3)
+
+    def test_from_hb_surfaces(self):
+        """A collection from HBSurfaces should keep names and types."""
+        srf = HBSurface('ceiling', ((0, 0, 3), (10, 0, 3), (10, 10, 3)), 3)
+        collection = HBSurfaceCollection.from_hb_surfaces([srf])
+        self.assertEqual(collection[0].name, 'ceiling')
+        self.assertEqual(collection.surface_type_keys[0], 3.0)
+
+
+if __name__ == '__main__':
+    unittest.main()
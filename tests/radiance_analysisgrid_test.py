@@ -0,0 +1,78 @@
+import unittest
+import os
+import shutil
+from honeybee.radiance.analysisgrid import AnalysisGrid
+
+
+class AnalysisGridTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/analysisgrid.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.points = [(x, y, 0) for x in range(4) for y in range(4)]
+        self.analysis_grid = AnalysisGrid.from_points_and_vectors(
+            self.points, name='test_grid')
+        self.folder = 'tests/room/testrun/analysisgrid'
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+
+    def test_neighbors(self):
+        """Corner points have 2 neighbors and inner points have 4."""
+        neighbors = self.analysis_grid.neighbors(1)
+        self.assertEqual(neighbors[0], [1, 4])
+        self.assertEqual(len(neighbors[5]), 4)
+
+    def test_refine(self):
+        """Only the points around the sharp change in values should be refined."""
+        values = [[100] if pt[0] < 2 else [1000] for pt in self.points]
+        self.analysis_grid.set_values([0], values)
+        refined_ids, new_grid = self.analysis_grid.refine(1, threshold=0.5)
+        self.assertEqual(refined_ids, [4, 5, 6, 7, 8, 9, 10, 11])
+        self.assertEqual(len(new_grid), 4 * len(refined_ids))
+        locations = set(tuple(ap.location) for ap in new_grid)
+        self.assertIn((1.25, 0.25, 0), locations)
+        self.assertIn((0.75, -0.25, 0), locations)
+
+    def test_lazy_analysis_points(self):
+        """Analysis points should only be created on demand."""
+        grid = AnalysisGrid.from_coordinates((0, 0, 0, 0, 0, 1, 1.25, 0, 0, 0, 0, 1))
+        self.assertEqual(len(grid), 2)
+        self.assertEqual(tuple(grid.points), ((0, 0, 0), (1.25, 0, 0)))
+        ap = grid[1]
+        self.assertEqual(tuple(ap.location), (1.25, 0, 0))
+        self.assertIs(grid[1], ap)
+        self.assertIs(grid.analysis_points[1], ap)
+
+    def test_coordinates(self):
+        """Coordinates should be reused until an analysis point is created."""
+        grid = AnalysisGrid.from_coordinates((0, 0, 0, 0, 0, 1, 1.25, 0, 0, 0, 0, 1))
+        self.assertIs(grid.coordinates, grid.coordinates)
+        grid[1].location = (2, 0, 0)
+        self.assertEqual(tuple(grid.coordinates), (0, 0, 0, 0, 0, 1, 2, 0, 0, 0, 0, 1))
+
+    def test_write_and_read(self):
+        """ASCII and binary files should load the same points."""
+        ascii_file = self.analysis_grid.write(self.folder, 'grid.pts', mkdir=True)
+        binary_file = self.analysis_grid.write(self.folder, 'grid.bin', binary=True)
+        with open(ascii_file) as inf:
+            self.assertEqual(inf.read(), self.analysis_grid.to_rad_string() + '\n')
+        self.assertEqual(os.path.getsize(binary_file), 16 * 6 * 4)
+        for grid in (AnalysisGrid.from_file(ascii_file),
+                     AnalysisGrid.from_file(binary_file, binary=True)):
+            self.assertEqual(tuple(grid.coordinates),
+                             tuple(self.analysis_grid.coordinates))
+
+        with open(ascii_file, 'a') as outf:
+            outf.write('0 0 0 0 0 x\n')
+        with self.assertRaises(ValueError) as context:
+            AnalysisGrid.from_file(ascii_file)
+        self.assertIn('line 17', str(context.exception))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,79 @@
+import unittest
+import os
+import shutil
+import sys
+import threading
+from honeybee.radiance.command._asyncexecution import split_command, \
+    AsyncExecution, CommandExecutionError, wait_all
+
+
+class AsyncExecutionTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/command/_asyncexecution.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = 'tests/room/testrun/asyncexecution'
+        if not os.path.isdir(self.folder):
+            os.makedirs(self.folder)
+        self.python = sys.executable
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+
+    def test_split_command(self):
+        """Pipes and redirections should be parsed."""
+        commands, inf, outf, append = split_command(
+            "rtrace -h -ab 2 'my room.oct' < room.pts | rcalc -e '$1=$1*179' > res.dat")
+        self.assertEqual(commands, [['rtrace', '-h', '-ab', '2', 'my room.oct'],
+                                    ['rcalc', '-e', '$1=$1*179']])
+        self.assertEqual((inf, outf, append), ('room.pts', 'res.dat', False))
+        self.assertTrue(split_command('gensky 9 21 12 >> sky.rad')[-1])
+        # shell only commands
+        self.assertIsNone(split_command('cd folder && oconv a.rad > a.oct'))
+        self.assertIsNone(split_command('rtrace a.oct < a.pts 2> err.txt'))
+        if os.name != 'nt':
+            self.assertIsNone(split_command('oconv *.rad > scene.oct'))
+            self.assertIsNone(split_command('oconv ~/scene.rad > scene.oct'))
+            self.assertIsNone(split_command('oconv "$HOME/scene.rad" > scene.oct'))
+            self.assertEqual(split_command("oconv '*.rad'")[0], [['oconv', '*.rad']])
+
+    def test_execute(self):
+        """Commands should run concurrently and write the results."""
+        semaphore = threading.BoundedSemaphore(2)
+        runs = []
+        for i in range(4):
+            output_file = os.path.join(self.folder, 'out_%d.txt' % i)
+            command = '%s -c "print(%d * 2)" > %s' % (self.python, i, output_file)
+            runs.append(AsyncExecution(command, output_file, semaphore).start())
+
+        for i, result in enumerate(wait_all(runs)):
+            with open(result) as inf:
+                self.assertEqual(int(inf.read()), i * 2)
+
+    def test_failure(self):
+        """Non-zero return code should raise an exception."""
+        lines = []
+        run = AsyncExecution(
+            '%s -c "import sys; print(1); sys.exit(3)"' % self.python,
+            output_handler=lines.append).start()
+        with self.assertRaises(CommandExecutionError) as context:
+            run.wait()
+        self.assertEqual(context.exception.returncode, 3)
+        self.assertEqual([line.strip() for line in lines], ['1'])
+
+    def test_failed_pipe(self):
+        """Started commands should be stopped if a later command fails to start."""
+        command = '%s -c "import time; time.sleep(30)" | %s' % (
+            self.python, os.path.join(self.folder, 'missing_command'))
+        run = AsyncExecution(command).start()
+        with self.assertRaises(OSError):
+            run.wait(10)
+        self.assertTrue(run.is_finished)
+
+
+if __name__ == '__main__':
+    unittest.main()
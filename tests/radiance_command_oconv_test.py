@@ -31,6 +31,11 @@ class OconvTestCase(unittest.TestCase):
         assert os.path.normpath(self.output_file.normpath) == \
             os.path.normpath('tests/room/testrun/room.oct')
 
+    def test_execute_async(self):
+        """Test the command runs correctly in background."""
+        self.output_file = self.oconv.execute_async().wait()
+        assert self.output_file == 'tests/room/testrun/room.oct'
+
 
 if __name__ == '__main__':
     unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.radiance.command._commandbase import RadiancePipeline, \
+    validate_commands
+from honeybee.radiance.command.dctimestep import Dctimestep
+from honeybee.radiance.command.rmtxop import Rmtxop
+
+
+class RadiancePipelineTestCase(unittest.TestCase):
+    """Test for RadiancePipeline (honeybee/radiance/command/_commandbase.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.dct = Dctimestep()
+        self.dct.dmatrix_file = 'result/matrix/room.dc'
+        self.dct.sky_vector_file = 'sky/skymtx.smx'
+        self.dct.output_file = 'tmp/room.rgb'
+        self.rmtx = Rmtxop(matrix_files=('tmp/room.rgb',),
+                           output_file='result/room.ill')
+        self.rmtx.rmtxop_parameters.combine_values = (47.4, 119.9, 11.6)
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def test_to_rad_string(self):
+        """Intermediate file should be replaced with a pipe."""
+        pipeline = self.dct | self.rmtx
+        self.assertIsInstance(pipeline, RadiancePipeline)
+        dct_string, rmtx_string = pipeline.to_rad_string().split(' | ')
+        self.assertTrue(dct_string.endswith('sky/skymtx.smx'))
+        self.assertTrue(rmtx_string.endswith('-c 47.4 119.9 11.6 - > result/room.ill'))
+        self.assertNotIn('tmp/room.rgb', pipeline.to_rad_string())
+        self.assertEqual(str(pipeline.output_file), 'result/room.ill')
+        # original commands should not change
+        self.assertIn('tmp/room.rgb', self.rmtx.to_rad_string())
+
+    def test_not_connected(self):
+        """Pipeline should fail if the output is not used by the next command."""
+        self.rmtx.matrix_files = ('tmp/other.rgb',)
+        with self.assertRaises(ValueError):
+            (self.dct | self.rmtx).to_rad_string()
+
+    def test_validate_commands(self):
+        """Outputs of previous commands should not be checked as inputs."""
+        folder = tempfile.mkdtemp()
+        cwd = os.getcwd()
+        try:
+            os.chdir(folder)
+            os.makedirs('result/matrix')
+            os.makedirs('sky')
+            open('result/matrix/room.dc', 'wb').close()
+            with self.assertRaises(AssertionError):
+                validate_commands([self.dct | self.rmtx])
+            open('sky/skymtx.smx', 'wb').close()
+            validate_commands([self.dct, self.rmtx])
+        finally:
+            os.chdir(cwd)
+            shutil.rmtree(folder)
+
+
+if __name__ == '__main__':
+    unittest.main()
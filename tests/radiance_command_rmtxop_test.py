@@ -0,0 +1,60 @@
+import unittest
+import os
+from honeybee.radiance.command.rmtxop import Rmtxop, RmtxopMatrix
+
+
+class RmtxopTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/command/rmtxop.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.matrix_files = ('sky/sky.smx', 'sky/ones_8760.mtx')
+        self.output_file = 'sky/sky_cum.smx'
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def _arguments(self, rmtxop):
+        """Command line without the path to rmtxop executable."""
+        command = rmtxop.to_rad_string()
+        executable, arguments = command.split(' ', 1)
+        self.assertEqual(os.path.basename(executable), 'rmtxop')
+        return arguments
+
+    def test_add(self):
+        """Matrices should be added by default."""
+        rmtxop = Rmtxop(matrix_files=self.matrix_files, output_file=self.output_file)
+        self.assertEqual(
+            self._arguments(rmtxop),
+            '%s + %s > %s' % (os.path.normpath(self.matrix_files[0]),
+                              os.path.normpath(self.matrix_files[1]),
+                              os.path.normpath(self.output_file)))
+
+    def test_concatenate(self):
+        """Matrices should be multiplied with no + sign in between."""
+        rmtxop = Rmtxop(matrix_files=self.matrix_files, output_file=self.output_file,
+                        concatenate=True)
+        rmtxop.rmtxop_parameters.output_format = 'a'
+        self.assertEqual(
+            self._arguments(rmtxop),
+            '-fa %s %s > %s' % (os.path.normpath(self.matrix_files[0]),
+                                os.path.normpath(self.matrix_files[1]),
+                                os.path.normpath(self.output_file)))
+
+    def test_concatenate_matrices(self):
+        """Compound matrices should be multiplied by matrix files."""
+        mtx = RmtxopMatrix(transpose=True, matrix_file='sky/sky.smx')
+        rmtxop = Rmtxop(matrix_files=self.matrix_files[1:], rmtxop_matrices=[mtx],
+                        output_file=self.output_file, concatenate=True)
+        arguments = self._arguments(rmtxop)
+        self.assertNotIn('+', arguments)
+        self.assertTrue(arguments.startswith('-t '))
+        self.assertTrue(arguments.endswith('%s > %s' % (
+            os.path.normpath(self.matrix_files[1]), os.path.normpath(self.output_file))))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+from honeybee.hbsurface import HBSurface
+from honeybee.hbfensurface import HBFenSurface
+from honeybee.radiance.gridgenerator import grid_points_from_polygon, \
+    analysis_grid_from_floor, analysis_grids_from_floors
+
+
+class GridGeneratorTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/gridgenerator.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        # an L-shape floor facing down
+        self.boundary = ((0, 0, 3), (0, 10, 3), (4, 10, 3), (4, 4, 3), (10, 4, 3),
+                         (10, 0, 3))
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def test_points_in_polygon(self):
+        """Only the points inside the polygon should be generated."""
+        points, normal = grid_points_from_polygon(self.boundary, grid_size=1,
+                                                  offset=0.75)
+        self.assertEqual(normal, (0, 0, 1))
+        self.assertEqual(len(points), (4 * 10 + 6 * 4) * 3)
+        locations = set(tuple(points[i:i + 3]) for i in range(0, len(points), 3))
+        self.assertIn((0.5, 0.5, 3.75), locations)
+        self.assertNotIn((5.5, 5.5, 3.75), locations)
+
+    def test_holes_and_wall_distance(self):
+        """Points in holes and close to walls should be excluded."""
+        hole = ((1, 1, 3), (3, 1, 3), (3, 3, 3), (1, 3, 3))
+        points, _ = grid_points_from_polygon(self.boundary, (hole,), 1, 0)
+        self.assertEqual(len(points), (4 * 10 + 6 * 4 - 4) * 3)
+        points, _ = grid_points_from_polygon(self.boundary, None, 1, 0, 0.6)
+        self.assertEqual(len(points), (2 * 8 + 3 + 5 * 2) * 3)
+
+    def test_analysis_grid_from_floor(self):
+        """Child surfaces should be considered as holes."""
+        floor = HBSurface('floor', self.boundary, 2, True, True)
+        floor.add_fenestration_surface(
+            HBFenSurface('opening', ((1, 1, 3), (3, 1, 3), (3, 3, 3), (1, 3, 3))))
+        grid = analysis_grid_from_floor(floor, offset=0.75)
+        self.assertEqual(grid.name, 'floor')
+        self.assertEqual(len(grid), 4 * 10 + 6 * 4 - 4)
+        self.assertEqual(tuple(grid[0].direction), (0, 0, 1))
+
+    def test_analysis_grids_from_floors(self):
+        """Floors with no test points should be skipped."""
+        floor = HBSurface('floor', self.boundary, 2, True, True)
+        small_floor = HBSurface(
+            'small_floor', ((20, 0, 3), (20, 0.5, 3), (20.5, 0.5, 3), (20.5, 0, 3)),
+            2, True, True)
+        grids = analysis_grids_from_floors([small_floor, floor])
+        self.assertEqual([grid.name for grid in grids], ['floor'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import unittest
+import math
+import os
+import shutil
+from honeybee.hbsurface import HBSurface
+from honeybee.room import Room
+from honeybee.radiance.radfile import RadFile
+
+
+class RadFileTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/radfile.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        # L-shaped fins from two connected surfaces
+        fin = (((0, 0, 0), (1, 0, 0), (1, 0, 3), (0, 0, 3)),
+               ((1, 0, 0), (1, 0.5, 0), (1, 0.5, 3), (1, 0, 3)))
+        surfaces = []
+        self.fins = []
+        for count in range(4):
+            angle = math.radians(30 * count)
+            cos_a, sin_a = math.cos(angle), math.sin(angle)
+            for scount, srf_pts in enumerate(fin):
+                pts = [[10 + x * cos_a - y * sin_a, 5 * count + x * sin_a + y * cos_a, z]
+                       for x, y, z in srf_pts]
+                if count == 3 and scount == 1:
+                    # move one vertex by less than tolerance
+                    pts[2][2] += 0.0006
+                surfaces.append(
+                    HBSurface('fin_%d_%d' % (count, scount), pts, 6, True, True))
+            self.fins.append(surfaces[-2:])
+        # repeated single polygons should not be instanced
+        for count in range(2):
+            surfaces.append(
+                HBSurface('panel_%d' % count,
+                          ((20, 10 * count, 0), (21, 10 * count, 0),
+                           (21, 10 * count, 1)), 6, True, True))
+        surfaces.append(
+            HBSurface('ground', ((0, 0, -1), (10, 0, -1), (10, 10, -1)), 6, True, True))
+        self.rad_file = RadFile(surfaces)
+        self.folder = 'tests/room/testrun/radfile'
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        if os.path.isdir(self.folder):
+            shutil.rmtree(self.folder)
+
+    def test_find_repeated_surfaces(self):
+        """Rotated and moved copies of connected surfaces should be grouped together."""
+        groups, others = self.rad_file.find_repeated_surfaces(
+            surface_groups=self.fins)
+        assert len(groups) == 1
+        assert [[srf.name for srf in g[0]] for g in groups[0]] == \
+            [['fin_%d_0' % count, 'fin_%d_1' % count] for count in range(4)]
+        assert sorted(srf.name for srf in others) == ['ground', 'panel_0', 'panel_1']
+
+    def test_repeated_surfaces_transform(self):
+        """Canonical points should map back to the surfaces by rotation and move."""
+        groups, _ = self.rad_file.find_repeated_surfaces(surface_groups=self.fins)
+        srfs, canonical, angle, center = groups[0][2]
+        angle = math.radians(angle)
+        pt = canonical[1][0][2]
+        x = pt[0] * math.cos(angle) - pt[1] * math.sin(angle) + center[0]
+        y = pt[0] * math.sin(angle) + pt[1] * math.cos(angle) + center[1]
+        self.assertAlmostEqual(x, srfs[1].points[0][2][0])
+        self.assertAlmostEqual(y, srfs[1].points[0][2][1])
+
+    def test_write_geometries_instanced(self):
+        """Each repeated group should be written as a single instance."""
+        geo, commands = self.rad_file.write_geometries_instanced(
+            self.folder, 'test.rad', mkdir=True, surface_groups=self.fins)
+        assert len(commands) == 1
+        with open(geo) as inf:
+            lines = [line for line in inf.read().split('\n') if ' instance ' in line]
+        assert [line.split()[2] for line in lines] == \
+            ['fin_%d_0' % count for count in range(4)]
+        proto = os.path.join(self.folder, 'test..proto_0.rad')
+        with open(proto) as inf:
+            assert inf.read().count(' polygon ') == 2
+
+    def test_ungrouped_surfaces(self):
+        """Surfaces without a zone should not be grouped by shared vertices."""
+        groups, others = self.rad_file.find_repeated_surfaces()
+        self.assertEqual(groups, [])
+        self.assertEqual(len(others), len(self.rad_file.hb_surfaces))
+
+    def test_repeated_zones(self):
+        """Touching zones should be found as separate copies."""
+        floors = [Room(origin=(0, 0, 3 * count), width=4, depth=6, height=3)
+                  for count in range(2)]
+        rad_file = RadFile([srf for floor in floors for srf in floor.surfaces])
+        groups, others = rad_file.find_repeated_surfaces()
+        self.assertEqual(len(groups), 1)
+        self.assertEqual(others, [])
+        self.assertEqual([list(copy[0]) for copy in groups[0]],
+                         [floor.surfaces for floor in floors])
+        self.assertAlmostEqual(groups[0][1][3][2] - groups[0][0][3][2], 3)
+
+    def test_write_streamed(self):
+        """Streamed files should match the files from separate writers."""
+        geo, mat, blk, glw = self.rad_file.write_streamed(
+            self.folder, 'test.rad', 'test.mat', 'test_blk.mat', 'test_glw.mat',
+            mkdir=True)
+        with open(geo) as inf:
+            self.assertEqual(inf.read().split('\n')[3:],
+                             (self.rad_file.geometries(join=True) + '\n').split('\n'))
+        for fp, blacked, glowed in ((mat, False, False), (blk, True, False),
+                                    (glw, False, True)):
+            with open(fp) as inf:
+                self.assertEqual(inf.read().split('\n')[3:],
+                                 (self.rad_file.materials(1, True, blacked, glowed) +
+                                  '\n').split('\n'))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,99 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.radiance import radparser
+from honeybee.radiance.radfile import RadFile
+from honeybee.radiance.factory import primitives_from_file
+
+
+class RadParserTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/radparser.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        self.rad_file = os.path.join(self.folder, 'context.rad')
+        with open(self.rad_file, 'wb') as outf:
+            outf.write(
+                '# context geometry\n'
+                '!xform -t 10 0 0 \\\n'
+                '    other.rad\n'
+                'void plastic wall_mat 0 0 5 0.5 0.5 0.5 0 0\n'
+                'void texfunc tex 4 dx dy dz tex.cal 0 0\n'
+                'tex plastic textured 0 0 5 .2 .2 .2 0 0\n'
+                'wall_mat polygon wall_1\n'
+                '0\n'
+                '0\n'
+                '12  0 0 0  # first vertex\n'
+                '    1 0 0\n'
+                '    1 0 1\n'
+                '    0 0 1\n'
+                'textured polygon wall_2 0 0 9 0 0 0 1 0 0 1 1 0\n'
+                'wall_mat sphere ball 0 0 4 0 0 0 1\n'
+            )
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_parse_records(self):
+        """Comments should be removed and commands should be a single token."""
+        records = tuple(radparser.parse_records_from_file(self.rad_file, True))
+        assert records[0] == '!xform -t 10 0 0  other.rad'
+        assert len(records) == 7
+        assert records[2].string_args == ('dx', 'dy', 'dz', 'tex.cal')
+        assert records[4].real_args == (0, 0, 0, 1, 0, 0, 1, 0, 1, 0, 0, 1)
+        assert records[4].to_rad_string() == \
+            'wall_mat polygon wall_1 0 0 12 0 0 0 1 0 0 1 0 1 0 0 1'
+
+    def test_parse_from_string(self):
+        """Inline comments should not break the primitives."""
+        with open(self.rad_file, 'rb') as inf:
+            objects = radparser.parse_from_string(inf.read())
+        assert len(objects) == 6
+        assert objects[3] == 'wall_mat polygon wall_1 0 0 12 0 0 0 1 0 0 1 0 1 0 0 1'
+
+    def test_incomplete_primitive(self):
+        """An incomplete primitive should raise a ValueError."""
+        with self.assertRaises(ValueError):
+            radparser.parse_from_string('void plastic wall_mat 0 0 5 0.5 0.5')
+
+    def test_radfile_from_file(self):
+        """Polygons with a supported material should be loaded as surfaces."""
+        rf = RadFile.from_file(self.rad_file)
+        assert len(rf.hb_surfaces) == 1
+        srf = rf.hb_surfaces[0]
+        assert srf.name == 'wall_1'
+        assert srf.radiance_material.name == 'wall_mat'
+
+    def test_primitives_from_file(self):
+        """Primitives should be created from records and invalid ones ignored."""
+        rad_file = os.path.join(self.folder, 'primitives.rad')
+        with open(rad_file, 'wb') as outf:
+            outf.write(
+                'void plastic wall_mat 0 0 5 0.5 0.5 0.5 0 0\n'
+                'wall_mat ring disk 0 0 8 0 0 1 0 0 1 0 1.5\n'
+                'wall_mat cone funnel 0 0 8 0 0 0 0 0 2 1.5 0.5\n'
+                'wall_mat cylinder pole 0 0 7 0 0 0 0 0 3 0.25\n'
+                'wall_mat cone broken 0 0 7 0 0 0 0 0 2 1.5\n'
+                'void plastic broken_mat 0 0 4 0.5 0.5 0.5 0\n'
+                'broken_mat polygon hidden 0 0 9 0 0 0 1 0 0 1 1 0\n'
+                'wall_mat polygon wall 0 0 9 0 0 0 1 0 0 1 1 0\n'
+            )
+        primitives = tuple(primitives_from_file(rad_file))
+        assert [p.name for p in primitives] == \
+            ['wall_mat', 'disk', 'funnel', 'pole', 'wall']
+        disk, funnel = primitives[1:3]
+        assert (disk.radius_inner, disk.radius_outer) == (0, 1.5)
+        assert disk.surface_normal == (0, 0, 1)
+        assert (funnel.radius_start, funnel.radius_end) == (1.5, 0.5)
+        assert disk.modifier is primitives[0]
+        assert primitives[-1].to_rad_string(minimal=True, include_modifier=False) == \
+            'wall_mat polygon wall 0 0 9 0.0 0.0 0.0 1.0 0.0 0.0 1.0 1.0 0.0'
+
+
+if __name__ == '__main__':
+    unittest.main()
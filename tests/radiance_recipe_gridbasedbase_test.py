@@ -0,0 +1,63 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.radiance.analysisgrid import AnalysisGrid
+from honeybee.radiance.recipe._gridbasedbase import GenericGridBased
+
+
+class AdaptiveGridBased(GenericGridBased):
+    """Grid-based recipe with analytical results for testing run_adaptive."""
+
+    def write(self, target_folder, project_name='untitled', header=True):
+        folder = os.path.join(target_folder, project_name)
+        if not os.path.isdir(folder):
+            os.makedirs(folder)
+        batch_file = os.path.join(folder, 'commands.bat')
+        with open(batch_file, 'wb') as outf:
+            outf.write('\n')
+        return batch_file
+
+    def run(self, command_file, debug=False, env=None):
+        self._isCalculated = True
+        return True
+
+    def results(self):
+        for ag in self.analysis_grids:
+            ag.set_values([0], [[100] if pt[0] < 1.6 else [1000] for pt in ag.points])
+        return self.analysis_grids
+
+
+class GenericGridBasedTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/recipe/_gridbasedbase.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        points = [(x, y, 0) for x in range(4) for y in range(4)]
+        self.rp = AdaptiveGridBased(
+            [AnalysisGrid.from_points_and_vectors(points, name='grid')])
+        self.folder = tempfile.mkdtemp()
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_run_adaptive(self):
+        """Refined points should be replaced by their subdivided points."""
+        grids = self.rp.run_adaptive(self.folder, 'adaptive', grid_size=1, max_level=2)
+        self.assertEqual([ag.name for ag in grids], ['grid'])
+        locations = [tuple(ap.location) for ap in grids[0]]
+        # 8 points are refined in level 1 and 16 of their 32 subdivisions in level 2
+        self.assertEqual(len(locations), 16 - 8 + 32 - 16 + 64)
+        self.assertEqual(len(set(locations)), len(locations))
+        self.assertIn((0, 0, 0), locations)
+        self.assertIn((0.75, 0.25, 0), locations)
+        self.assertNotIn((1, 0, 0), locations)
+        self.assertNotIn((1.25, 0.25, 0), locations)
+        self.assertIn((1.375, 0.125, 0), locations)
+
+
+if __name__ == '__main__':
+    unittest.main()
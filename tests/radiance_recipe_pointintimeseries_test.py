@@ -0,0 +1,141 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.room import Room
+from honeybee.hbdynamicsurface import HBDynamicSurface
+from honeybee.radiance.properties import RadianceProperties
+from honeybee.radiance.material.glass import Glass
+from honeybee.radiance.sky.skyvector import SkyVector
+from honeybee.radiance.command.gensky import Gensky
+from honeybee.radiance.analysisgrid import AnalysisGrid
+from honeybee.radiance.recipe.recipedcutil import sun_from_sky_file, points_file_id
+from honeybee.radiance.recipe.daylightcoeff.pointintimeseries import \
+    DaylightCoeffPointInTimeSeries
+
+
+class PointInTimeSeriesTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/recipe/daylightcoeff/pointintimeseries.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        self.skies = [
+            SkyVector(Gensky.from_sky_type(
+                'cie_%d.sky' % hour, month_day_hour=(6, 21, hour), sky_type=4,
+                latitude=42.37, longitude=-71.03, meridian=-75))
+            for hour in (9, 12, 15)]
+        points = [(0, 0, 0), (1, 1, 0), (3, 2, 0)]
+        analysis_grid = AnalysisGrid.from_points_and_vectors(points)
+        self.rp = DaylightCoeffPointInTimeSeries(self.skies, [analysis_grid])
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_sky_vectors(self):
+        """Skies should have unique names and results should use the sky index."""
+        self.assertEqual(self.rp.sky_hoys, (4113, 4116, 4119))
+        self.assertEqual(self.rp.result_hoys, (0, 1, 2))
+        self.assertEqual(self.rp.sky_density, 'r1')
+        with self.assertRaises(AssertionError):
+            self.rp.sky_vectors = self.skies + self.skies[:1]
+
+    def test_same_hour_skies(self):
+        """Results of skies for the same hour should be loaded separately."""
+        skies = [SkyVector(Gensky.uniform_skyfrom_illuminance_value(
+                 'uniform_%d.sky' % value, value)) for value in (1000, 2000)]
+        points = [(0, 0, 0), (1, 1, 0)]
+        rp = DaylightCoeffPointInTimeSeries(
+            skies, [AnalysisGrid.from_points_and_vectors(points)])
+        self.assertEqual(rp.sky_hoys, (6324, 6324))
+        self.assertEqual(rp.result_hoys, (0, 1))
+
+        rp.write(self.folder, 'test')
+        self.assertEqual(len(rp.result_files), 2)
+        for rf in rp.result_files:
+            value = 1000 if 'uniform_1000' in rf else 2000
+            with open(rf, 'wb') as outf:
+                outf.write('#?RADIANCE\nNROWS=2\nNCOLS=1\nNCOMP=1\nFORMAT=ascii\n\n')
+                outf.write('%d\n%d\n' % (value, value + 1))
+        rp._isCalculated = True
+
+        analysis_grid = rp.results()[0]
+        self.assertEqual(list(analysis_grid.hoys), [0, 1])
+        self.assertEqual([analysis_grid[1].combined_value_by_id(count)[0]
+                          for count in rp.result_hoys], [1001, 2001])
+
+    def test_json(self):
+        """Recipe should be written to and created from json."""
+        rec_json = self.rp.to_json()
+        self.assertEqual(rec_json['type'], 'pointintimeseries')
+        rp = DaylightCoeffPointInTimeSeries.from_json(rec_json)
+        self.assertEqual([sky.name for sky in rp.sky_vectors],
+                         [sky.name for sky in self.skies])
+        self.assertEqual([sky.sky.to_rad_string() for sky in rp.sky_vectors],
+                         [sky.sky.to_rad_string() for sky in self.skies])
+        self.assertEqual(rp.sky_hoys, self.rp.sky_hoys)
+        self.assertEqual(rp.total_point_count, 3)
+        self.assertEqual(rp.to_json()['sky_vectors'], rec_json['sky_vectors'])
+
+    def test_results(self):
+        """Results of each sky should be loaded for the index of the sky."""
+        batch_file = self.rp.write(self.folder, 'test')
+        with open(batch_file) as inf:
+            commands = [line for line in inf if not line.startswith('echo')]
+        # a single daylight matrix for all the skies
+        self.assertEqual(sum('rfluxmtx' in cmd for cmd in commands), 1)
+        self.assertEqual(sum('dctimestep' in cmd for cmd in commands), 3)
+
+        for count, rf in enumerate(self.rp.result_files):
+            with open(rf, 'wb') as outf:
+                outf.write('#?RADIANCE\nNROWS=3\nNCOLS=1\nNCOMP=1\nFORMAT=ascii\n\n')
+                outf.write('%d\n%d\n%d\n' % (count, count + 10, count + 20))
+        self.rp._isCalculated = True
+
+        analysis_grid = self.rp.results()[0]
+        self.assertEqual(list(analysis_grid.hoys), [0, 1, 2])
+        values = [analysis_grid[1].combined_value_by_id(hoy)[0]
+                  for hoy in self.rp.result_hoys]
+        self.assertEqual(values, [10, 11, 12])
+
+    def test_screened_matrix_names(self):
+        """Matrices for screened window groups should be named after their points."""
+        room = Room(origin=(0, 0, 0), width=4, depth=6, height=3)
+        wg = HBDynamicSurface.from_rad_ep_properties(
+            'wg', [[(1, 0, 1), (3, 0, 1), (3, 0, 2), (1, 0, 2)]], 5, True, True,
+            RadianceProperties(Glass.by_single_trans_value('wg_glass', 0.6)))
+        rp = DaylightCoeffPointInTimeSeries(
+            self.skies, [room.generate_test_points(1)], hb_objects=[room, wg])
+
+        def matrices():
+            batch_file = rp.write(self.folder, 'test')
+            with open(batch_file) as inf:
+                return [line.split('>')[-1].strip() for line in inf
+                        if 'rfluxmtx' in line and not line.startswith('echo')]
+
+        self.assertIn('result/matrix/normal_test..wg..default.dc', matrices())
+
+        rp.screen_window_groups()
+        screened = matrices()
+        pts_id = points_file_id(
+            os.path.join(self.folder, 'test', rp.sub_folder, 'test..wg.pts'))
+        self.assertIn(
+            'result/matrix/normal_test..wg..default..{}.dc'.format(pts_id), screened)
+
+    def test_sun_from_sky_file(self):
+        """Sun direction and radiance should be parsed from gensky output."""
+        sky_file = os.path.join(self.folder, 'sun.sky')
+        with open(sky_file, 'wb') as outf:
+            outf.write('void light solar\n0\n0\n3 6.8e+06 6.8e+06 6.8e+06\n\n'
+                       'solar source sun\n0\n0\n4 0.3 -0.6 0.7 0.5\n\n'
+                       'void brightfunc skyfunc\n2 skybr skybright.cal\n0\n0\n')
+        direction, values = sun_from_sky_file(sky_file)
+        self.assertEqual(direction, (0.3, -0.6, 0.7))
+        self.assertEqual(values, (6.8e6, 6.8e6, 6.8e6))
+
+
+if __name__ == '__main__':
+    unittest.main()
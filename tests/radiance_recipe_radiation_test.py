@@ -0,0 +1,86 @@
+import unittest
+from honeybee.radiance.recipe.radiation.gridbased import GridBased, CUMULATIVE_HOY
+from honeybee.radiance.sky.skymatrix import SkyMatrix
+from honeybee.radiance.analysisgrid import AnalysisGrid
+from honeybee.schedule import Schedule
+from ladybug.wea import Wea
+
+
+class _Location(object):
+    """Boston location."""
+
+    station_id = '725090'
+    city = 'Boston'
+    latitude = 42.37
+    longitude = -71.03
+    time_zone = -5
+
+
+class _Wea(object):
+    """Constant weather data for 21st of June."""
+
+    isWea = True
+    location = _Location()
+    timestep = 1
+    hoys = range(4104, 4128)
+
+    def to_json(self):
+        return {}
+
+
+class RadiationGridBasedTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/recipe/radiation/gridbased.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.sky = SkyMatrix(_Wea(), hoys=range(4110, 4114))
+        self.grid = AnalysisGrid.from_points_and_vectors([(0, 0, 0), (1, 0, 0)])
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def test_result_hoys(self):
+        """Cumulative results should be loaded under CUMULATIVE_HOY."""
+        recipe = GridBased(self.sky, (self.grid,))
+        self.assertEqual(list(recipe.result_hoys), range(4110, 4114))
+        recipe.cumulative = True
+        self.assertEqual(tuple(recipe.result_hoys), (CUMULATIVE_HOY,))
+
+    def test_cumulative_values(self):
+        """Cumulative values should not be labeled with an hour of the year."""
+        recipe = GridBased(self.sky, (self.grid,), cumulative=True)
+        point = self.grid[0]
+        point.set_values((120.5,), recipe.result_hoys, 'scene', 'default')
+        self.assertEqual(point.values((CUMULATIVE_HOY,), 'scene', 'default'), (120.5,))
+        self.assertNotIn(4110, point.hoys)
+
+    def test_occupancy_json(self):
+        """Occupancy should be written to JSON."""
+        occupancy = Schedule.eight_am_to_six_pm()
+        recipe = GridBased(self.sky, (self.grid,), occupancy=occupancy)
+        rec_json = recipe.to_json()
+        occupancy = Schedule.from_json(rec_json['occupancy'])
+        self.assertEqual(occupancy.occupied_hours, recipe.occupancy.occupied_hours)
+        # 6 and 7 am are not occupied
+        self.assertEqual(tuple(recipe.sky_matrix.hoys), (4112, 4113))
+        self.assertIsNone(GridBased(self.sky, (self.grid,)).to_json()['occupancy'])
+
+    @unittest.skipUnless(hasattr(Wea, 'from_json'), 'ladybug Wea is not available.')
+    def test_occupancy_json_round_trip(self):
+        """Occupancy should be loaded from JSON."""
+        sky = SkyMatrix.from_epw_file(
+            'tests/room/epws/USA_MA_Boston-City.WSO_TMY.epw', hoys=range(4110, 4114))
+        mask = [0] * 8760
+        mask[4111] = 1
+        recipe = GridBased(sky, (self.grid,), occupancy=mask)
+        new_recipe = GridBased.from_json(recipe.to_json())
+        self.assertEqual(new_recipe.occupancy.occupied_hours, set((4111,)))
+        self.assertEqual(new_recipe.to_json()['occupancy'],
+                         recipe.to_json()['occupancy'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,67 @@
+import unittest
+from honeybee.hbsurface import HBSurface
+from honeybee.hbdynamicsurface import HBDynamicSurface
+from honeybee.radiance.analysisgrid import AnalysisGrid
+from honeybee.radiance.recipe.recipeutil import window_group_contribution, \
+    screen_window_groups
+
+
+class RecipeUtilTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/recipe/recipeutil.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        # two rooms next to each other with a window on the back wall of each room
+        self.window_groups = [
+            HBDynamicSurface('wg_%d' % count, [(x + 1, 0, 1), (x + 3, 0, 1),
+                                               (x + 3, 0, 2), (x + 1, 0, 2)])
+            for count, x in enumerate((0, 4))]
+        self.analysis_grids = [
+            AnalysisGrid.from_points_and_vectors(
+                [(x + i + 0.5, j + 0.5, 0.8) for i in xrange(4) for j in xrange(6)],
+                name='room_%d' % count)
+            for count, x in enumerate((0, 4))]
+        # partition wall between the rooms
+        self.wall = HBSurface('wall', [(4, 0, 0), (4, 6, 0), (4, 6, 3), (4, 0, 3)])
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def test_window_group_contribution(self):
+        """Contribution should be larger for closer grids and zero if blocked."""
+        wg = self.window_groups[0]
+        near, far = self.analysis_grids
+        near_value = window_group_contribution(wg, near)
+        far_value = window_group_contribution(wg, far)
+        self.assertGreater(near_value, far_value)
+        self.assertGreater(far_value, 0)
+        self.assertEqual(window_group_contribution(wg, far, [self.wall]), 0)
+        self.assertAlmostEqual(
+            window_group_contribution(wg, near, [self.wall]), near_value)
+
+    def test_window_group_contribution_sample_count(self):
+        """Contribution should be calculated for a sample of points."""
+        wg = self.window_groups[0]
+        grid = self.analysis_grids[0]
+        self.assertLessEqual(window_group_contribution(wg, grid, sample_count=4),
+                             window_group_contribution(wg, grid))
+
+    def test_screen_window_groups(self):
+        """Each window group should only be related to the grid of its own room."""
+        screened = screen_window_groups(self.window_groups, self.analysis_grids)
+        self.assertEqual(screened, {'wg_0': (0, 1), 'wg_1': (0, 1)})
+
+        screened = screen_window_groups(self.window_groups, self.analysis_grids,
+                                        obstacles=[self.wall])
+        self.assertEqual(screened, {'wg_0': (0,), 'wg_1': (1,)})
+
+        screened = screen_window_groups(self.window_groups, self.analysis_grids,
+                                        threshold=1)
+        self.assertEqual(screened, {'wg_0': (), 'wg_1': ()})
+
+
+if __name__ == '__main__':
+    unittest.main()
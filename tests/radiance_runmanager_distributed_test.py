@@ -0,0 +1,163 @@
+import unittest
+import os
+import shutil
+import sys
+import tempfile
+import threading
+from honeybee.radiance.runmanager.distributed import Coordinator, Worker, \
+    Connection, ArtifactStore, run_local, command_files, _relative_path, _merge_paths
+from honeybee.radiance.runmanager.task import Task, SubTask
+
+
+class DistributedTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/runmanager/distributed.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.folder, 'scene'))
+        for name in ('a', 'b'):
+            with open(os.path.join(self.folder, 'scene', name + '.rad'), 'wb') as outf:
+                outf.write('scene %s\n' % name)
+        # copy the input to a new file with an upper case content
+        self.command = '"%s" -c "import sys; sys.stdout.write(' \
+            'open(sys.argv[1]).read().upper())" {} > {}' % sys.executable
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def _tasks(self):
+        tasks = []
+        for name in ('a', 'b'):
+            first = 'result/%s.txt' % name
+            second = 'result/%s_copy.txt' % name
+            tasks.append(Task(name, [
+                SubTask('upper ' + name,
+                        self.command.format('scene/%s.rad' % name, first), first),
+                SubTask('copy ' + name, self.command.format(first, second), second)]))
+        return tasks
+
+    def _check_results(self):
+        for name in ('a', 'b'):
+            with open(os.path.join(self.folder, 'result', name + '_copy.txt')) as inf:
+                self.assertEqual(inf.read(), 'SCENE %s\n' % name.upper())
+
+    def test_command_files(self):
+        """Inputs and outputs should be found from command."""
+        inputs, outputs = command_files(
+            'oconv scene/a.rad scene/b.rad scene/c.rad > room.oct', self.folder)
+        self.assertEqual(inputs, ['scene/a.rad', 'scene/b.rad'])
+        self.assertEqual(outputs, ['room.oct'])
+        inputs, outputs = command_files(
+            'rcontrib -o result/sky.dc -m sky scene/a.rad < points.pts | '
+            'rcalc -o \'$1 $2\' > result/sky.txt', self.folder)
+        self.assertEqual(inputs, ['scene/a.rad'])
+        self.assertEqual(outputs, ['result/sky.dc', 'result/sky.txt'])
+        # output patterns are not files
+        self.assertEqual(
+            command_files('rcontrib -o sky_%03d.hdr -m sky scene/a.rad',
+                          self.folder)[1], [])
+
+    def test_merge_paths(self):
+        """Explicit files should be added to the files from command."""
+        self.assertEqual(
+            _merge_paths(['scene/a.rad', 'result/sky.dc'],
+                         ['./scene/a.rad', 'scene/a.xml']),
+            ['scene/a.rad', 'result/sky.dc', 'scene/a.xml'])
+        self.assertEqual(_merge_paths(['room.oct'], None), ['room.oct'])
+
+    def test_explicit_files(self):
+        """Explicit input and output files should not replace command files."""
+        with open(os.path.join(self.folder, 'scene', 'a.xml'), 'wb') as outf:
+            outf.write('bsdf\n')
+        command = '"%s" -c "import shutil; shutil.copy(\'scene/a.rad\', ' \
+            '\'result/b.rad\')" scene/a.rad > result/a.txt' % sys.executable
+        tasks = [Task('explicit', [
+            SubTask('copy', command, 'result/b.rad', input_files=['scene/a.xml'])])]
+        store = ArtifactStore(os.path.join(self.folder, 'store'))
+        self.assertTrue(run_local(tasks, self.folder, workers=1, store=store,
+                                  heartbeat_timeout=5, verbose=False))
+        for rel_path in ('scene/a.rad', 'scene/a.xml', 'result/a.txt', 'result/b.rad'):
+            self.assertTrue(
+                os.path.isfile(os.path.join(self.folder, 'store', rel_path)), rel_path)
+
+    def test_relative_path(self):
+        """Paths outside the project folder should be rejected."""
+        self.assertEqual(_relative_path(self.folder, 'scene/a.rad'),
+                         os.path.join(os.path.realpath(self.folder), 'scene', 'a.rad'))
+        with self.assertRaises(ValueError):
+            _relative_path(self.folder, '../a.rad')
+        if hasattr(os, 'symlink'):
+            os.symlink(tempfile.gettempdir(), os.path.join(self.folder, 'link'))
+            with self.assertRaises(ValueError):
+                _relative_path(self.folder, 'link/a.rad')
+
+    def test_token(self):
+        """Workers with a wrong token should be rejected."""
+        coordinator = Coordinator(self.folder, port=0, verbose=False).start()
+        host, port = coordinator.address
+        self.assertEqual(host, '127.0.0.1')
+        conn = Connection.connect(host, port)
+        conn.send({'type': 'auth', 'token': 'wrong'})
+        self.assertEqual(conn.receive()['type'], 'error')
+        conn.close()
+        coordinator.stop()
+
+    def test_run_local(self):
+        """Outputs should be streamed back to the project folder."""
+        self.assertTrue(run_local(self._tasks(), self.folder, workers=2,
+                                  heartbeat_timeout=5, verbose=False))
+        self._check_results()
+
+    def test_artifact_store(self):
+        """Outputs should be moved through the artifact store."""
+        store = ArtifactStore(os.path.join(self.folder, 'store'))
+        self.assertTrue(run_local(self._tasks(), self.folder, workers=2, store=store,
+                                  heartbeat_timeout=5, verbose=False))
+        self._check_results()
+        self.assertTrue(os.path.isfile(os.path.join(self.folder, 'store', 'result',
+                                                    'a_copy.txt')))
+
+    def test_redispatch(self):
+        """Subtask of a failed worker should be dispatched to another worker."""
+        coordinator = Coordinator(self.folder, '127.0.0.1', 0, heartbeat_timeout=5,
+                                  verbose=False).start()
+        host, port = coordinator.address
+        # a worker that takes a job and disconnects
+        conn = Connection.connect(host, port)
+        conn.send({'type': 'auth', 'token': coordinator.token})
+        tasks = self._tasks()[:1]
+        result = []
+        thread = threading.Thread(
+            target=lambda: result.append(coordinator.execute(tasks)))
+        thread.start()
+        conn.send({'type': 'ready', 'worker': 'broken'})
+        while conn.receive()['type'] != 'job':
+            conn.send({'type': 'ready', 'worker': 'broken'})
+        conn.close()
+
+        worker_folder = os.path.join(self.folder, 'worker')
+        worker = Worker(host, port, worker_folder, verbose=False,
+                        token=coordinator.token)
+        worker_thread = threading.Thread(target=worker.run, args=(0.1,))
+        worker_thread.start()
+        thread.join(30)
+        coordinator.stop()
+        worker_thread.join(30)
+        self.assertEqual(result, [True])
+        with open(os.path.join(self.folder, 'result', 'a_copy.txt')) as inf:
+            self.assertEqual(inf.read(), 'SCENE A\n')
+
+    def test_failure(self):
+        """A failed command should fail the run."""
+        tasks = [Task('fail', [SubTask('fail', '"%s" -c "raise SystemExit(2)"' %
+                                       sys.executable)])]
+        self.assertFalse(run_local(tasks, self.folder, workers=1, heartbeat_timeout=5,
+                                   verbose=False))
+
+
+if __name__ == '__main__':
+    unittest.main()
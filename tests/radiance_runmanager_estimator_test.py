@@ -0,0 +1,92 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.radiance.runmanager.estimator import Calibration, estimate_commands, \
+    estimate_batch_file, hemisphere_bins, rays_per_sample, ASCII_VALUE_SIZE
+from honeybee.radiance.runmanager.profiler import Profiler, CommandRecord
+
+
+class EstimatorTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/runmanager/estimator.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        os.makedirs(os.path.join(self.folder, 'sky'))
+        with open(os.path.join(self.folder, 'room.pts'), 'wb') as outf:
+            outf.write('0 0 0.75 0 0 1\n' * 10)
+        with open(os.path.join(self.folder, 'sky', 'rfluxSky.rad'), 'wb') as outf:
+            outf.write('#@rfluxmtx h=u u=Y\nvoid glow ground_glow\n\n'
+                       '#@rfluxmtx h=r4 u=Y\nvoid glow sky_glow\n')
+        with open(os.path.join(self.folder, 'sky', 'sky.wea'), 'wb') as outf:
+            outf.write('header\n' * 6 + '1 1 12.5 100 100\n' * 24)
+        self.commands = [
+            'gendaymtx -m 4 sky/sky.wea > sky/sky.smx',
+            'rfluxmtx -y 10 -ab 2 -ad 100 -lw 0.001 -c 1 - sky/rfluxSky.rad '
+            'scene/room.rad < room.pts > result/matrix/room.dc',
+            'dctimestep result/matrix/room.dc sky/sky.smx | '
+            'rmtxop -fa -c 47.4 119.9 11.6 - > result/room.ill'
+        ]
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_rays(self):
+        """Rays should be limited by limit weight."""
+        self.assertEqual(hemisphere_bins('r4'), 2305)
+        self.assertEqual(hemisphere_bins('kf'), 145)
+        self.assertEqual(rays_per_sample(2, 100, 0.001), 1 + 100 + 1000)
+
+    def test_estimate(self):
+        """Matrix sizes should be followed between commands."""
+        estimate = estimate_commands(self.commands, self.folder,
+                                     result_files=['result/room.ill'])
+        sky, dc, ill = estimate.commands
+        self.assertEqual(sky.output_size, 2306 * 24 * 3 * ASCII_VALUE_SIZE)
+        self.assertEqual(dc.rays, 10 * 1101)
+        self.assertEqual(dc.output_size, 10 * 2306 * 3 * ASCII_VALUE_SIZE)
+        self.assertEqual(ill.phase, 'multiplication')
+        self.assertEqual(ill.output_size, 10 * 24 * ASCII_VALUE_SIZE)
+        self.assertEqual([s[1] for s in ill.stages], [10 * 24 * 3, 10 * 24 * 3])
+        self.assertTrue(ill.is_result)
+        self.assertEqual(estimate.result_size, ill.output_size)
+        self.assertGreater(estimate.runtime, 0)
+        self.assertIn('daylight matrix', estimate.summary_table())
+
+    def test_batch_file(self):
+        """Commands should be estimated from a batch file."""
+        batch_file = os.path.join(self.folder, 'commands.bat')
+        with open(batch_file, 'wb') as outf:
+            outf.write('@echo off\necho sky matrix\n' + '\n'.join(self.commands))
+        estimate = estimate_batch_file(batch_file)
+        self.assertEqual(len(estimate), 3)
+        self.assertEqual(estimate.commands[0].title, 'sky matrix')
+
+    def test_calibration(self):
+        """Calibration should be updated from profiled runs."""
+        estimate = estimate_commands(self.commands, self.folder)
+        profiler = Profiler()
+        for command in estimate.commands:
+            record = CommandRecord(command.title, command.command, command.phase)
+            record.end = record.start + 10
+            record.returncode = 0
+            profiler.records.append(record)
+
+        calibration = Calibration()
+        calibration.update(estimate, profiler)
+        self.assertAlmostEqual(calibration.rate('rfluxmtx'), 10.0 / (10 * 1101))
+        calibration_file = calibration.to_file(
+            os.path.join(self.folder, 'calibration.json'))
+        calibration = Calibration.from_file(calibration_file)
+        estimate = estimate_commands(self.commands, self.folder,
+                                     calibration=calibration)
+        for command in estimate.commands:
+            self.assertAlmostEqual(command.runtime, 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,108 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.radiance.runmanager.journal import Journal
+from honeybee.radiance.runmanager.task import Task, batch_file_to_subtasks
+
+
+class JournalTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/runmanager/journal.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        self.command_file = os.path.join(self.folder, 'commands.sh')
+        with open(self.command_file, 'wb') as outf:
+            outf.write('#!/usr/bin/env bash\n\n')
+            outf.write('echo first step\n')
+            outf.write('printf 1 > first.txt\n')
+            outf.write('echo second step\n')
+            outf.write('printf 2 > second.txt\n')
+        self.journal_file = os.path.join(self.folder, 'journal.json')
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_batch_file_to_subtasks(self):
+        """Comments should be used as titles and redirections as outputs."""
+        batch = batch_file_to_subtasks(self.command_file)
+        assert batch.cwd == self.folder
+        assert [st.title for st in batch.subtasks] == ['first step', 'second step']
+        assert [st.output_file for st in batch.subtasks] == ['first.txt', 'second.txt']
+
+    def test_output_option(self):
+        """Files after -o should be used as outputs."""
+        with open(self.command_file, 'wb') as outf:
+            outf.write('echo sky\n')
+            outf.write('rfluxmtx -I -o result/sky.dc - sky.rad scene.rad < pts.pts\n')
+            outf.write('rcontrib -o result/sun_%03d.hdr -M suns.mod scene.oct\n')
+        batch = batch_file_to_subtasks(self.command_file)
+        self.assertEqual([st.output_file for st in batch.subtasks],
+                         ['result/sky.dc', None])
+
+    def test_resume(self):
+        """Completed subtasks should be skipped unless their outputs are changed."""
+        batch = batch_file_to_subtasks(self.command_file)
+        journal = Journal(self.journal_file)
+        task = Task('test', batch.subtasks)
+        assert task.execute(batch.cwd, verbose=False, update_freq=0.1, journal=journal)
+        assert len(Journal(self.journal_file)) == 2
+
+        # change the output of second subtask
+        with open(os.path.join(self.folder, 'second.txt'), 'wb') as outf:
+            outf.write('3\n')
+
+        batch = batch_file_to_subtasks(self.command_file)
+        journal = Journal(self.journal_file)
+        task = Task('test', batch.subtasks)
+        assert task.execute(batch.cwd, verbose=False, update_freq=0.1, journal=journal)
+        assert batch.subtasks[0].is_skipped
+        assert not batch.subtasks[1].is_skipped
+        with open(os.path.join(self.folder, 'second.txt'), 'rb') as inf:
+            assert inf.read().strip() == '2'
+
+    def test_check_hash(self):
+        """Outputs should only be hashed if check_hash is True."""
+        batch = batch_file_to_subtasks(self.command_file)
+        journal = Journal(self.journal_file, check_hash=False)
+        task = Task('test', batch.subtasks)
+        assert task.execute(batch.cwd, verbose=False, update_freq=0.1, journal=journal)
+        entries = Journal(self.journal_file).entries.values()
+        assert [e['md5'] for e in entries] == [None, None]
+        assert sorted(e['size'] for e in entries) == [1, 1]
+        assert all(journal.is_completed(st, batch.cwd) for st in batch.subtasks)
+
+    def test_save(self):
+        """Journal should be saved without leaving the temp file behind."""
+        batch = batch_file_to_subtasks(self.command_file)
+        journal = Journal(self.journal_file)
+        journal.record(batch.subtasks[0], batch.cwd)
+        journal.record(batch.subtasks[1], batch.cwd)
+        assert sorted(os.listdir(self.folder)) == ['commands.sh', 'journal.json']
+
+        # each subtask is appended to the journal as a single line
+        with open(self.journal_file, 'rb') as inf:
+            self.assertEqual(len(inf.readlines()), 2)
+        journal.record(batch.subtasks[0], batch.cwd)
+        journal.remove(batch.subtasks[1], batch.cwd)
+        with open(self.journal_file, 'rb') as inf:
+            self.assertEqual(len(inf.readlines()), 4)
+
+        # replaced lines are removed on load
+        self.assertEqual(len(Journal(self.journal_file)), 1)
+        with open(self.journal_file, 'rb') as inf:
+            self.assertEqual(len(inf.readlines()), 1)
+        journal = Journal(self.journal_file)
+        journal.record(batch.subtasks[1], batch.cwd)
+
+        # a journal which is only written to the temp file should still be loaded
+        os.rename(self.journal_file, self.journal_file + '.tmp')
+        assert len(Journal(self.journal_file)) == 2
+
+
+if __name__ == '__main__':
+    unittest.main()
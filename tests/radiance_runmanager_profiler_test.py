@@ -0,0 +1,79 @@
+import unittest
+import json
+import os
+import shutil
+import sys
+import tempfile
+from honeybee.radiance.runmanager.profiler import Profiler, command_phase
+from honeybee.radiance.runmanager.task import Task, SubTask
+
+
+class ProfilerTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/runmanager/profiler.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        self.profiler = Profiler()
+        # burn some cpu and write 1 MB to a file
+        self.command = '"%s" -c "sum(range(10 ** 6)); ' \
+            'open(\'out.txt\', \'wb\').write(\'0\' * 2 ** 20)"' % sys.executable
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    def test_command_phase(self):
+        """Phase should be found from the command."""
+        self.assertEqual(command_phase('gendaymtx -m 1 sky.wea > sky.mtx'), 'sky')
+        self.assertEqual(
+            command_phase('rfluxmtx -I+ -y 10 - sky.rad scene.rad'), 'daylight matrix')
+        self.assertEqual(
+            command_phase('rcontrib -M suns.mod scene_analemma.oct'), 'sun matrix')
+        self.assertEqual(
+            command_phase('dctimestep dc.mtx sky.mtx | rmtxop -c 47 120 11 - '),
+            'multiplication')
+        self.assertEqual(command_phase('echo done'), 'other')
+
+    def test_run(self):
+        """Resource usage of a command should be recorded."""
+        record = self.profiler.run(self.command, 'write', cwd=self.folder)
+        self.assertEqual(record.returncode, 0)
+        self.assertEqual(record.phase, 'other')
+        self.assertGreater(record.wall_time, 0)
+        if hasattr(os, 'wait4'):
+            self.assertGreater(record.user_time + record.system_time, 0)
+            self.assertGreater(record.max_rss, 0)
+        if os.path.isdir('/proc/self'):
+            self.assertGreaterEqual(record.bytes_written, 2 ** 20)
+
+        failed = self.profiler.run('"%s" -c "raise SystemExit(3)"' % sys.executable)
+        self.assertEqual(failed.returncode, 3)
+
+    def test_subtask(self):
+        """Subtasks should be recorded in the profiler."""
+        task = Task('test', [SubTask('write', self.command), SubTask('second', 'echo')])
+        self.assertTrue(task.execute(self.folder, verbose=False, update_freq=0.01,
+                                     profiler=self.profiler))
+        self.assertEqual([r.title for r in self.profiler.records], ['write', 'second'])
+
+    def test_chrome_trace(self):
+        """Records should be exported as a Chrome trace."""
+        self.profiler.run(self.command, 'write', cwd=self.folder)
+        with self.profiler.phase('metrics'):
+            sum(range(10000))
+        trace_file = self.profiler.write_chrome_trace(
+            os.path.join(self.folder, 'trace.json'))
+        with open(trace_file) as inf:
+            events = json.load(inf)['traceEvents']
+        self.assertEqual([e['name'] for e in events if e['ph'] == 'X'],
+                         ['write', 'metrics'])
+        self.assertEqual([row['phase'] for row in self.profiler.summary()],
+                         ['metrics', 'other'])
+        self.assertIn('metrics', self.profiler.summary_table())
+
+
+if __name__ == '__main__':
+    unittest.main()
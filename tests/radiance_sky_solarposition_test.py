@@ -0,0 +1,91 @@
+import unittest
+import math
+from honeybee.vectormath.euclid import Vector3
+from honeybee.radiance.sky.solarposition import calculate_solar_positions, \
+    clear_cache, is_sun_up, sun_up_vectors
+from ladybug.location import Location
+from ladybug.sunpath import Sunpath
+
+
+class SolarPositionTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/sky/solarposition.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        # Boston for 21st of June with a 10 minutes timestep
+        self.location = 42.37, -71.03, -5
+        self.hoys = [4104 + count / 6.0 for count in xrange(24 * 6)]
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        clear_cache()
+
+    def test_altitude(self):
+        """Maximum altitude should be at solar noon."""
+        positions = calculate_solar_positions(*self.location, hoys=self.hoys)
+        self.assertEqual(len(positions.altitudes), len(self.hoys))
+        max_alt = max(positions.altitudes)
+        self.assertAlmostEqual(max_alt, 90 - 42.37 + 23.44, delta=0.1)
+        # solar noon in Boston is around 11:45 EST
+        noon = positions.hoys[positions.altitudes.index(max_alt)]
+        self.assertAlmostEqual(noon - 4104, 11.75, delta=0.1)
+        self.assertLess(positions.altitudes[0], 0)
+
+    def test_sun_vectors(self):
+        """Sun vectors should match rotating north vector for altitude and azimuth."""
+        north = 30
+        positions = calculate_solar_positions(*self.location, hoys=self.hoys,
+                                              north=north)
+        z_axis = Vector3(0, 0, -1)
+        for alt, az, vector in zip(positions.altitudes, positions.azimuths,
+                                   positions.sun_vectors):
+            expected = Vector3(0, 1, 0) \
+                .rotate_around(Vector3(1, 0, 0), math.radians(alt)) \
+                .rotate_around(z_axis, math.radians(az)) \
+                .rotate_around(z_axis, math.radians(-north))
+            for v, e in zip(vector, expected):
+                self.assertAlmostEqual(v, -e)
+            # sun vectors point toward the ground for sun up hours
+            self.assertEqual(vector[2] < 0, alt > 0)
+
+    def test_cache(self):
+        """Same inputs should not be recalculated."""
+        positions = calculate_solar_positions(*self.location, hoys=self.hoys)
+        self.assertIs(
+            calculate_solar_positions(*self.location, hoys=tuple(self.hoys)), positions)
+        self.assertIsNot(
+            calculate_solar_positions(*self.location, hoys=self.hoys, north=10),
+            positions)
+
+    @unittest.skipUnless(hasattr(Sunpath, 'calculate_sun_from_hoy'),
+                         'ladybug Sunpath is not available.')
+    def test_ladybug_sunpath(self):
+        """Solar positions and sun up hours should match ladybug Sunpath."""
+        latitude, longitude, time_zone = self.location
+        location = Location(city='Boston', latitude=latitude, longitude=longitude,
+                            time_zone=time_zone)
+        north = 30
+        hoys = [count / 6.0 for count in xrange(8760 * 6) if count % 127 == 0]
+        positions = calculate_solar_positions(*self.location, hoys=hoys, north=north)
+        sp = Sunpath.from_location(location, north)
+        sun_up_hoys = []
+        for count, hoy in enumerate(hoys):
+            sun = sp.calculate_sun_from_hoy(hoy)
+            self.assertAlmostEqual(positions.altitudes[count], sun.altitude,
+                                   delta=0.01)
+            if abs(sun.altitude) < 89:
+                # azimuths around north can be reported as 0 or 360
+                az_diff = (positions.azimuths[count] - sun.azimuth + 180) % 360 - 180
+                self.assertAlmostEqual(az_diff, 0, delta=0.01)
+            for v, e in zip(positions.sun_vectors[count], sun.sun_vector):
+                self.assertAlmostEqual(v, e, delta=0.001)
+            if is_sun_up(sun.altitude):
+                sun_up_hoys.append(hoy)
+
+        self.assertEqual(list(sun_up_vectors(location, hoys, north)[1]), sun_up_hoys)
+
+
+if __name__ == '__main__':
+    unittest.main()
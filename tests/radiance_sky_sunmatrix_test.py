@@ -0,0 +1,84 @@
+import unittest
+import os
+import shutil
+import tempfile
+from honeybee.radiance.sky.sunmatrix import SunMatrix
+
+
+class _Location(object):
+    """Boston location."""
+
+    station_id = '725090'
+    latitude = 42.37
+    longitude = -71.03
+    time_zone = -5
+
+
+class _Wea(object):
+    """Constant weather data for 21st of June."""
+
+    isWea = True
+    location = _Location()
+    timestep = 1
+    hoys = range(4104, 4128)
+
+    def get_radiation_values(self, month, day, hour):
+        return 500, 100
+
+
+class SunMatrixTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/sky/sunmatrix.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.folder = tempfile.mkdtemp()
+        self.sunmtx = SunMatrix(_Wea(), hoys=range(4104, 4128))
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        shutil.rmtree(self.folder)
+
+    @staticmethod
+    def _read_matrix(matrix_file):
+        """Return header and rows of values in a sun matrix file."""
+        with open(matrix_file) as inf:
+            header, values = inf.read().split('FORMAT=ascii\n\n')
+        return header, [row.split('\n') for row in values.strip().split('\n\n')]
+
+    def test_sun_up_hours(self):
+        """Only sun up hours should have a sun."""
+        sun_up_hours = self.sunmtx.sun_up_hours
+        self.assertTrue(0 < len(sun_up_hours) < 24)
+        self.assertEqual(len(self.sunmtx.solar_values), len(sun_up_hours))
+        self.assertNotIn(4104, sun_up_hours)
+        self.assertIn(4116, sun_up_hours)
+
+    def test_execute(self):
+        """Each sun should have a value only for its own hour."""
+        header, rows = self._read_matrix(self.sunmtx.execute(self.folder))
+        sun_count = len(self.sunmtx.sun_up_hours)
+        self.assertIn('NROWS=%d\nNCOLS=24\n' % sun_count, header)
+        self.assertEqual(len(rows), sun_count)
+        for row in rows:
+            self.assertEqual(len(row), 24)
+            self.assertEqual(sum(value != '0 0 0' for value in row), 1)
+
+    def test_execute_cumulative(self):
+        """Cumulative sun matrix should have a single column of solar values."""
+        mfp = self.sunmtx.execute(self.folder, cumulative=True)
+        self.assertEqual(os.path.basename(mfp), self.sunmtx.cumulative_sunmtxfile)
+        header, rows = self._read_matrix(mfp)
+        self.assertIn('NROWS=%d\nNCOLS=1\n' % len(self.sunmtx.sun_up_hours), header)
+        self.assertEqual(rows, [['{0} {0} {0}'.format(value)]
+                                for value in self.sunmtx.solar_values])
+        self.assertTrue(any(self.sunmtx.solar_values))
+
+        # hourly and cumulative matrices should not overwrite each other
+        self.assertNotEqual(self.sunmtx.execute(self.folder), mfp)
+        self.assertTrue(os.path.isfile(mfp))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+import random
+from honeybee.radiance.spatialindex import KDTree
+from honeybee.radiance.analysisgrid import AnalysisGrid
+
+
+class KDTreeTestCase(unittest.TestCase):
+    """Test for (honeybee/radiance/spatialindex.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        rnd = random.Random(0)
+        self.points = [(rnd.uniform(0, 50), rnd.uniform(0, 20), rnd.uniform(0, 3))
+                       for _ in range(500)]
+        self.tree = KDTree(self.points)
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def _brute_force(self, pt):
+        return sorted((sum((a - b) ** 2 for a, b in zip(pt, p)) ** 0.5, i)
+                      for i, p in enumerate(self.points))
+
+    def test_nearest(self):
+        """Nearest points should match brute force search."""
+        for pt in ((0, 0, 0), (25, 10, 1.5), (60, -5, 2)):
+            expected = self._brute_force(pt)[:5]
+            result = self.tree.nearest(pt, 5)
+            self.assertEqual([i for _, i in result], [i for _, i in expected])
+            self.assertAlmostEqual(result[0][0], expected[0][0])
+
+    def test_within_radius(self):
+        """Points within radius should match brute force search."""
+        pt = (25, 10, 1.5)
+        expected = [i for d, i in self._brute_force(pt) if d <= 4]
+        self.assertEqual([i for _, i in self.tree.within_radius(pt, 4)], expected)
+
+    def test_within_box(self):
+        """Points in box should match brute force search."""
+        mn, mx = (10, 5, 0), (20, 15, 1)
+        expected = [i for i, p in enumerate(self.points)
+                    if all(mn[c] <= p[c] <= mx[c] for c in range(3))]
+        self.assertEqual(self.tree.within_box(mn, mx), expected)
+
+    def test_resample_values(self):
+        """Values should be interpolated between two grids."""
+        source = AnalysisGrid.from_points_and_vectors(
+            [(x, y, 0) for x in range(5) for y in range(5)])
+        target = AnalysisGrid.from_points_and_vectors([(2, 2, 0), (0.5, 0, 0)])
+        values = [pt[0] * 100 for pt in source.points]
+        resampled = source.resample_values(values, target, k=2)
+        self.assertEqual(resampled[0], 200)
+        self.assertAlmostEqual(resampled[1], 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,7 @@
+
+
+cd /root/package/tests/room/testrun/test/solaraccess
+
+/tmp/fakerad/bin/oconv -f scene/opaque/test..opq.mat scene/opaque/test..opq.rad scene/glazing/test..glz.mat scene/glazing/test..glz.rad sky/analemma.rad > test.oct
+/tmp/fakerad/bin/rcontrib -aa 0.25 -dj 0.0 -ss 0.0 -st 0.85 -lr 4 -M ./sky/analemma.mod -y 3 -dt 0.0 -ar 16 -dp 64 -dc 1.0 -I -ds 0.5 -ad 512 -lw 0.05 -as 128 -ab 0 -dr 0 test.oct < test.pts > result/test.dc
+/tmp/fakerad/bin/rmtxop -fa -c 47.4 119.9 11.6 result/test.dc > result/test.ill
\ No newline at end of file
@@ -0,0 +1,9 @@
+sol_114480
+sol_120000
+sol_151800
+sol_195240
+sol_219480
+sol_240000
+sol_246960
+sol_379440
+sol_510480
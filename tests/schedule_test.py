@@ -0,0 +1,38 @@
+import unittest
+from honeybee.schedule import Schedule
+
+
+class ScheduleTestCase(unittest.TestCase):
+    """Test for (honeybee/schedule.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.schedule = Schedule.eight_am_to_six_pm()
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def test_occupied_hoys(self):
+        """Only occupied hours should be returned in the same order."""
+        hoys = [7.5, 8.5, 12.5, 17.5, 18.5, 32.5]
+        self.assertEqual(self.schedule.occupied_hoys(hoys), (8.5, 12.5, 17.5, 32.5))
+
+    def test_occupied_hoys_from_mask(self):
+        """An hour mask should be a valid schedule."""
+        mask = [0] * 8760
+        mask[10] = 1
+        schedule = Schedule(mask)
+        self.assertEqual(schedule.occupied_hoys(range(8760)), (10,))
+
+    def test_json(self):
+        """Schedule should be recreated from JSON."""
+        schedule = Schedule.from_json(self.schedule.to_json())
+        self.assertEqual(schedule.values, self.schedule.values)
+        self.assertEqual(schedule.occupied_hours, self.schedule.occupied_hours)
+
+
+if __name__ == '__main__':
+    unittest.main()
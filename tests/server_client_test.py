@@ -0,0 +1,139 @@
+import unittest
+import base64
+import gzip
+import hashlib
+import os
+import shutil
+import tempfile
+import threading
+from BaseHTTPServer import HTTPServer, BaseHTTPRequestHandler
+from StringIO import StringIO
+from honeybee.server.client import Client
+from honeybee.server.mpupload import MultiPartForm
+
+
+class _Handler(BaseHTTPRequestHandler):
+    """A minimal server for multipart and tus uploads."""
+
+    protocol_version = 'HTTP/1.1'
+
+    def log_message(self, *args):
+        pass
+
+    def _body(self):
+        if self.headers.get('transfer-encoding') == 'chunked':
+            data = []
+            while True:
+                size = int(self.rfile.readline().strip(), 16)
+                data.append(self.rfile.read(size))
+                self.rfile.readline()
+                if size == 0:
+                    return ''.join(data)
+        return self.rfile.read(int(self.headers.get('content-length', 0)))
+
+    def _reply(self, status, headers=None):
+        self.send_response(status)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def do_POST(self):
+        server = self.server
+        server.connections.add(self.client_address)
+        if 'upload-length' in self.headers:
+            server.uploads['/files/1'] = ''
+            self._reply(201, {'Location': '/files/1'})
+        else:
+            server.forms.append((self.headers.get('content-type'), self._body()))
+            self._reply(200)
+
+    def do_HEAD(self):
+        self._reply(200, {'Upload-Offset': str(len(self.server.uploads[self.path]))})
+
+    def do_PATCH(self):
+        data = self._body()
+        checksum = base64.b64encode(hashlib.md5(data).digest())
+        upload = self.server.uploads[self.path]
+        if self.headers['upload-checksum'] != 'md5 ' + checksum or \
+                int(self.headers['upload-offset']) != len(upload):
+            self._reply(409)
+            return
+        self.server.uploads[self.path] = upload + data
+        self.server.patch_count += 1
+        self._reply(204, {'Upload-Offset': str(len(upload + data))})
+
+
+class ClientTestCase(unittest.TestCase):
+    """Test for (honeybee/server/client.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        self.server = HTTPServer(('127.0.0.1', 0), _Handler)
+        self.server.forms = []
+        self.server.uploads = {}
+        self.server.connections = set()
+        self.server.patch_count = 0
+        self.thread = threading.Thread(target=self.server.serve_forever)
+        self.thread.daemon = True
+        self.thread.start()
+        self.url = 'http://127.0.0.1:%d/upload' % self.server.server_address[1]
+        self.folder = tempfile.mkdtemp()
+        self.file_path = os.path.join(self.folder, 'room.zip')
+        self.content = ''.join(chr(i % 251) for i in range(300000))
+        with open(self.file_path, 'wb') as outf:
+            outf.write(self.content)
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.folder)
+
+    def _file_content(self, body):
+        return body.split('\r\n\r\n', 1)[1].rsplit('\r\n--', 1)[0]
+
+    def test_form(self):
+        """Streamed form should match the form as a string."""
+        form = MultiPartForm()
+        form.add_field('name', 'room')
+        form.add_file('file', 'room.zip', StringIO('abc'))
+        form.boundary = 'xyz'
+        self.assertEqual(
+            str(form),
+            '--xyz\r\nContent-Disposition: form-data; name="name"\r\n\r\nroom\r\n'
+            '--xyz\r\nContent-Disposition: file; name="file"; filename="room.zip"\r\n'
+            'Content-Type: application/zip\r\n\r\nabc\r\n--xyz--\r\n')
+
+    def test_upload_file(self):
+        """Files should be streamed on a single connection."""
+        client = Client(self.url)
+        client.upload_file(self.file_path)
+        client.upload_file(self.file_path, compress=True)
+        self.assertEqual(len(self.server.connections), 1)
+        plain, compressed = (body for _, body in self.server.forms)
+        self.assertEqual(self._file_content(plain), self.content)
+        self.assertIn('filename="room.zip.gz"', compressed)
+        data = gzip.GzipFile(fileobj=StringIO(self._file_content(compressed))).read()
+        self.assertEqual(data, self.content)
+
+    def test_resumable_upload(self):
+        """Resumable upload should continue from the server offset."""
+        client = Client(self.url)
+        state_file = os.path.join(self.folder, 'room.upload')
+        # an interrupted upload
+        self.server.uploads['/files/1'] = self.content[:100000]
+        with open(state_file, 'wb') as outf:
+            outf.write('{"url": "%s", "size": %d}' % (
+                self.url.replace('/upload', '/files/1'), len(self.content)))
+        client.upload_file_resumable(self.file_path, chunk_size=65536,
+                                     state_file=state_file)
+        self.assertEqual(self.server.uploads['/files/1'], self.content)
+        self.assertEqual(self.server.patch_count, 4)
+        self.assertFalse(os.path.isfile(state_file))
+
+
+if __name__ == '__main__':
+    unittest.main()
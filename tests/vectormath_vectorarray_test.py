@@ -0,0 +1,84 @@
+import unittest
+import math
+import random
+from honeybee.vectormath import vectorarray as va
+from honeybee.vectormath.euclid import Vector3, Point3, Matrix4
+from honeybee.geometryoperation import normal_from_points, normals_from_point_groups
+
+
+class VectorArrayTestCase(unittest.TestCase):
+    """Test for (honeybee/vectormath/vectorarray.py)."""
+
+    # preparing to test
+    def setUp(self):
+        """Set up the test case by initiating the class."""
+        rnd = random.Random(0)
+        self.a = [(rnd.uniform(-5, 5), rnd.uniform(-5, 5), rnd.uniform(-5, 5))
+                  for _ in range(20)]
+        self.b = [(rnd.uniform(-5, 5), rnd.uniform(-5, 5), rnd.uniform(-5, 5))
+                  for _ in range(20)]
+
+    # ending the test
+    def tearDown(self):
+        """Cleaning up after the test."""
+        pass
+
+    def assert_vectors_equal(self, values, vectors):
+        self.assertEqual(va.count(values), len(vectors))
+        for v, e in zip(va.to_tuples(values), vectors):
+            for c in range(3):
+                self.assertAlmostEqual(v[c], e[c])
+
+    def test_products(self):
+        """Cross, dot and angle should match euclid."""
+        a, b = va.to_array(self.a), va.to_array(self.b)
+        ev = [(Vector3(*p), Vector3(*q)) for p, q in zip(self.a, self.b)]
+        self.assert_vectors_equal(va.cross(a, b), [tuple(p.cross(q)) for p, q in ev])
+        for v, (p, q) in zip(va.dot(a, b), ev):
+            self.assertAlmostEqual(v, p.dot(q))
+        for v, (p, q) in zip(va.angle(a, b), ev):
+            self.assertAlmostEqual(v, p.angle(q))
+        self.assert_vectors_equal(va.normalize(a),
+                                  [tuple(Vector3(*p).normalize()) for p in self.a])
+        # parallel vectors shouldn't fail
+        self.assertEqual(va.angle(a, va.scale(a, 2))[0], 0)
+
+    def test_transform(self):
+        """Transform should match euclid Matrix4."""
+        m = Matrix4.new_rotate_axis(0.3, Vector3(1, 2, 3)).translate(1, -2, 5)
+        pts = va.to_array(self.a)
+        self.assert_vectors_equal(va.transform(pts, m),
+                                  [tuple(m * Point3(*p)) for p in self.a])
+        self.assert_vectors_equal(va.transform(pts, m, is_point=False),
+                                  [tuple(m * Vector3(*p)) for p in self.a])
+
+    def test_broadcast(self):
+        """A single vector should be applied to all the vectors."""
+        pts = va.to_array(self.a)
+        self.assert_vectors_equal(va.translate(pts, (1, 2, 3)),
+                                  [(x + 1, y + 2, z + 3) for x, y, z in self.a])
+        with self.assertRaises(AssertionError):
+            va.add(pts, va.to_array(self.b[:2]))
+
+    def test_bounding_box(self):
+        """Bounding box should match min and max values."""
+        bmin, bmax = va.bounding_box(va.to_array(self.a))
+        for c in range(3):
+            self.assertEqual(bmin[c], min(p[c] for p in self.a))
+            self.assertEqual(bmax[c], max(p[c] for p in self.a))
+
+    def test_polygon_normals(self):
+        """Polygon normals should match normal_from_points."""
+        groups = [((0, 0, 0), (1, 0, 0), (1, 1, 0), (0, 1, 0)),
+                  ((0, 0, 3), (0, 0, 0), (5, 0, 0), (5, 0, 3)),
+                  tuple(self.a[:3])]
+        normals = normals_from_point_groups(groups)
+        for n, pts in zip(normals, groups):
+            for v, e in zip(n, normal_from_points(pts)):
+                self.assertAlmostEqual(v, e)
+        self.assertAlmostEqual(abs(normals[1][1]), 1)
+        self.assertFalse(math.isnan(normals[2][0]))
+
+
+if __name__ == '__main__':
+    unittest.main()